@@ -16,6 +16,25 @@ COMPETENCES_COLLECTION = "competences"
 EXERCISE_SHEETS_COLLECTION = "exercise_sheets"
 SHEET_ITEMS_COLLECTION = "sheet_items"
 
+# Exports PDF par artefacts (jobs + fichiers GridFS)
+PDF_EXPORT_JOBS_COLLECTION = "pdf_export_jobs"
+PDF_ARTIFACTS_BUCKET = "pdf_artifacts"
+
+# Cache des enrichissements IA (énoncés / corrections)
+AI_ENRICHMENT_CACHE_COLLECTION = "ai_enrichment_cache"
+
+# Rollups d'usage quotidiens (analytics Pro)
+USAGE_DAILY_ROLLUPS_COLLECTION = "usage_daily_rollups"
+
+# Ledger des quotas d'export (compteurs par identité et par fenêtre)
+QUOTA_COUNTERS_COLLECTION = "quota_counters"
+
+# Rate limiting partagé entre workers (stockage limits/slowapi)
+RATE_LIMIT_COUNTERS_COLLECTION = "rate_limit_counters"
+RATE_LIMIT_WINDOWS_COLLECTION = "rate_limit_windows"
+# Compteurs par fenêtre du stockage partagé (middleware/rate_limit_storage)
+RATE_LIMIT_SHARED_COUNTERS_COLLECTION = "rate_limit_shared_counters"
+
 # Collections curriculum
 CURRICULUM_CHAPTERS_COLLECTION = "curriculum_chapters"
 
@@ -0,0 +1,138 @@
+"""
+Registre déclaratif des index MongoDB (collection -> index).
+
+Source unique des index applicatifs : appliqué une fois au démarrage
+(services/index_manager.apply_index_registry) et par init_db_indexes.py,
+au lieu d'appels create_index dispersés sur le chemin des requêtes.
+
+Les noms reprennent ceux des index existants (noms générés par défaut
+"champ_1" ou noms explicites historiques) pour éviter tout conflit.
+
+Guard rails: toute nouvelle requête fréquente doit avoir son index ici
+(vérifié par tests/test_index_registry.py via explain()).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from backend.constants.collections import (
+    AI_ENRICHMENT_CACHE_COLLECTION,
+    EXERCISES_COLLECTION,
+    CURRICULUM_CHAPTERS_COLLECTION,
+    EXERCISE_TYPES_COLLECTION,
+    PDF_EXPORT_JOBS_COLLECTION,
+    QUOTA_COUNTERS_COLLECTION,
+    RATE_LIMIT_SHARED_COUNTERS_COLLECTION,
+    USAGE_DAILY_ROLLUPS_COLLECTION,
+)
+
+IndexKeys = Sequence[Tuple[str, int]]
+
+# Collation insensible à la casse (strength 2 : casse ignorée, accents comparés).
+# Une requête n'utilise un index avec collation que si elle passe la même collation.
+CASE_INSENSITIVE_COLLATION: Dict[str, Union[str, int]] = {"locale": "en", "strength": 2}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Spécification d'un index (mêmes options que create_index)"""
+    keys: IndexKeys
+    name: Optional[str] = None
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+    collation: Optional[Dict[str, Union[str, int]]] = None
+
+    @property
+    def index_name(self) -> str:
+        """Nom explicite, sinon nom généré comme par MongoDB (chapter_code_1_id_1)"""
+        return self.name or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def create_kwargs(self) -> Dict[str, Union[str, bool, int]]:
+        kwargs: Dict[str, Union[str, bool, int]] = {"name": self.index_name}
+        if self.unique:
+            kwargs["unique"] = True
+        if self.sparse:
+            kwargs["sparse"] = True
+        if self.expire_after_seconds is not None:
+            kwargs["expireAfterSeconds"] = self.expire_after_seconds
+        if self.collation is not None:
+            kwargs["collation"] = dict(self.collation)
+        return kwargs
+
+
+def _index(*keys: Union[str, Tuple[str, int]], **options) -> IndexSpec:
+    return IndexSpec(keys=tuple((key, 1) if isinstance(key, str) else key for key in keys), **options)
+
+
+INDEX_REGISTRY: Dict[str, List[IndexSpec]] = {
+    # Exercices par chapitre (ExercisePersistenceService)
+    EXERCISES_COLLECTION: [
+        _index("chapter_code", "id", unique=True),
+        _index("chapter_code"),
+        _index("difficulty"),
+        _index("offer"),
+        # Requête chaude get_exercises : {chapter_code, offer, difficulty} + sort(id)
+        _index("chapter_code", "offer", "difficulty", "id"),
+    ],
+    # Curriculum (CurriculumPersistenceService)
+    CURRICULUM_CHAPTERS_COLLECTION: [
+        _index("code_officiel", unique=True),
+        # Lookups par code insensibles à la casse (get_chapter_by_code, create/update/delete)
+        _index("code_officiel", name="code_officiel_ci", collation=CASE_INSENSITIVE_COLLATION),
+        _index("niveau"),
+        _index("domaine"),
+        _index("statut"),
+        _index("subject", "niveau", "code_officiel"),
+        _index("subject"),
+    ],
+    # exercise_types synchronisés par chapitre (CurriculumSyncService.sync_chapter_to_exercise_types)
+    EXERCISE_TYPES_COLLECTION: [
+        _index("chapter_code", "code_ref"),
+    ],
+    # Chapitres MathALÉA (ChapterService)
+    "chapters": [
+        _index("code", unique=True),
+        _index("niveau", "domaine"),
+        _index("legacy_code", sparse=True),
+    ],
+    # Sessions et authentification (ex init_db_indexes.py)
+    "login_sessions": [
+        _index("user_email", name="user_email_index"),
+        _index("user_email", "created_at", name="user_email_created_at_compound"),
+        _index("expires_at", name="session_expiry_ttl", expire_after_seconds=0),
+    ],
+    "magic_tokens": [
+        _index("expires_at", name="magic_token_ttl", expire_after_seconds=0),
+    ],
+    "pro_users": [
+        _index("email", name="unique_pro_user_email", unique=True),
+    ],
+    # Documents générés : listing paginé par curseur (document_listing_service)
+    "documents": [
+        _index("guest_id", ("created_at", -1), ("id", -1)),
+    ],
+    # Exports PDF par artefacts (pdf_artifact_service)
+    PDF_EXPORT_JOBS_COLLECTION: [
+        _index("job_id", unique=True),
+        _index("expires_at"),
+    ],
+    # Cache des enrichissements IA (ia_engine/enrichment_cache)
+    AI_ENRICHMENT_CACHE_COLLECTION: [
+        _index("key", unique=True),
+        _index("expires_at", expire_after_seconds=0),
+    ],
+    # Rollups d'usage quotidiens (usage_rollup_service)
+    USAGE_DAILY_ROLLUPS_COLLECTION: [
+        _index("owner", "day", name="owner_day_unique", unique=True),
+    ],
+    # Ledger des quotas (quota_ledger_service)
+    QUOTA_COUNTERS_COLLECTION: [
+        _index("key", name="key_unique", unique=True),
+        _index("window_end", name="window_end_ttl", expire_after_seconds=0),
+    ],
+    # Rate limiting partagé (middleware/rate_limit_storage) : _id = clé de fenêtre
+    RATE_LIMIT_SHARED_COUNTERS_COLLECTION: [
+        _index("expires_at", name="expires_at_ttl", expire_after_seconds=0),
+    ],
+}
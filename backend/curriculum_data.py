@@ -1,7 +1,7 @@
 # Curriculum data extracted from FlashExo Excel file
 # Structure: Matière -> Classe (Niveau) -> Chapitre Appli (Compétence)
 
-import latex2mathml.converter
+from backend.latex_to_mathml import mathml_converter
 from backend.logger import get_logger
 
 logger = get_logger()
@@ -344,74 +344,4 @@ def build_prompt_context(subject, level, chapter):
 
 def process_math_content_for_pdf(text: str) -> str:
     """Convert LaTeX mathematical expressions to MathML for PDF rendering"""
-    if not text:
-        return text
-    
-    try:
-        # Regex patterns for common LaTeX expressions
-        import re
-        
-        # CRITICAL FIX: Convert broken fraction formats to LaTeX FIRST
-        # Fix "X de Y" patterns
-        text = re.sub(r'(\d+)\s+de\s+(\d+)', r'\\frac{\1}{\2}', text)
-        # Fix "X par Y" patterns  
-        text = re.sub(r'(\d+)\s+par\s+(\d+)', r'\\frac{\1}{\2}', text)
-        # Fix simple "X/Y" patterns (but preserve URLs)
-        text = re.sub(r'(?<!http:)(?<!https:)(\d+)/(\d+)', r'\\frac{\1}{\2}', text)
-        
-        logger.info(f"🔧 Fixed broken fraction formats in text: {text[:100]}...")
-        
-        # Pattern for fractions: \frac{numerator}{denominator}
-        frac_pattern = r'\\frac\{([^}]+)\}\{([^}]+)\}'
-        
-        # Pattern for square roots: \sqrt{content}
-        sqrt_pattern = r'\\sqrt\{([^}]+)\}'
-        
-        # Pattern for powers: x^{exponent}
-        power_pattern = r'([a-zA-Z0-9]+)\^\{([^}]+)\}'
-        
-        def convert_frac(match):
-            """Convert \frac{a}{b} to MathML"""
-            numerator = match.group(1)
-            denominator = match.group(2)
-            try:
-                latex_expr = f"\\frac{{{numerator}}}{{{denominator}}}"
-                mathml = latex2mathml.converter.convert(latex_expr)
-                return mathml
-            except Exception as e:
-                logger.warning(f"Failed to convert fraction {match.group(0)}: {e}")
-                return f"{numerator}/{denominator}"  # Fallback
-        
-        def convert_sqrt(match):
-            """Convert \sqrt{content} to MathML"""
-            content = match.group(1)
-            try:
-                latex_expr = f"\\sqrt{{{content}}}"
-                mathml = latex2mathml.converter.convert(latex_expr)
-                return mathml
-            except Exception as e:
-                logger.warning(f"Failed to convert sqrt {match.group(0)}: {e}")
-                return f"√({content})"  # Fallback
-        
-        def convert_power(match):
-            """Convert x^{exp} to MathML"""
-            base = match.group(1)
-            exponent = match.group(2)
-            try:
-                latex_expr = f"{base}^{{{exponent}}}"
-                mathml = latex2mathml.converter.convert(latex_expr)
-                return mathml
-            except Exception as e:
-                logger.warning(f"Failed to convert power {match.group(0)}: {e}")
-                return f"{base}^{exponent}"  # Fallback
-        
-        # Apply conversions
-        result = re.sub(frac_pattern, convert_frac, text)
-        result = re.sub(sqrt_pattern, convert_sqrt, result)
-        result = re.sub(power_pattern, convert_power, result)
-        
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error processing math content for PDF: {e}")
-        return text  # Return original text on error
\ No newline at end of file
+    return mathml_converter.convert(text)
@@ -19,7 +19,7 @@ IMPORTANT: Tout le contenu est en HTML PUR.
 """
 
 from typing import List, Dict, Any, Optional
-import random
+from backend.data.static_pool import StaticExercisePool
 from backend.observability import (
     get_logger as get_obs_logger,
     safe_random_choice,
@@ -341,6 +341,10 @@ GM07_EXERCISES: List[Dict[str, Any]] = [
 # =============================================================================
 
 
+# Index (offre, difficulté) construit une fois au chargement du module
+_POOL = StaticExercisePool(GM07_EXERCISES)
+
+
 def get_gm07_exercises(
     offer: Optional[str] = None,
     difficulty: Optional[str] = None
@@ -355,25 +359,7 @@ def get_gm07_exercises(
     Returns:
         Liste d'exercices filtrés
     """
-    exercises = GM07_EXERCISES
-    
-    # Filtrer par offer
-    if offer:
-        offer = offer.lower()
-        if offer == "free":
-            exercises = [ex for ex in exercises if ex["offer"] == "free"]
-        elif offer == "pro":
-            pass  # PRO voit tout
-    else:
-        # Par défaut, FREE ne voit que free
-        exercises = [ex for ex in exercises if ex["offer"] == "free"]
-    
-    # Filtrer par difficulté
-    if difficulty:
-        difficulty = difficulty.lower()
-        exercises = [ex for ex in exercises if ex["difficulty"] == difficulty]
-    
-    return exercises
+    return list(_POOL.get(offer, difficulty))
 
 
 def get_random_gm07_exercise(
@@ -392,13 +378,13 @@ def get_random_gm07_exercise(
     Returns:
         Un exercice aléatoire ou None si aucun disponible
     """
-    available = get_gm07_exercises(offer=offer, difficulty=difficulty)
+    available = _POOL.get(offer, difficulty)
     
     if not available:
         return None
     
     if seed is not None:
-        random.seed(seed)
+        return _POOL.pick(offer, difficulty, seed)
     
     ctx = get_request_context()
     return safe_random_choice(available, ctx, obs_logger)
@@ -422,8 +408,7 @@ def get_gm07_batch(
     Returns:
         Tuple (exercices: List, batch_metadata: Dict)
     """
-    available = get_gm07_exercises(offer=offer, difficulty=difficulty)
-    pool_size = len(available)
+    pool_size = len(_POOL.get(offer, difficulty))
     
     batch_meta = {
         "requested": count,
@@ -439,16 +424,9 @@ def get_gm07_batch(
         batch_meta["warning"] = f"Aucun exercice disponible pour les filtres sélectionnés."
         return [], batch_meta
     
-    # Mélanger avec seed pour reproductibilité
-    if seed is not None:
-        random.seed(seed)
-    
-    shuffled = available.copy()
-    random.shuffle(shuffled)
-    
-    # Prendre au maximum ce qui est disponible
-    actual_count = min(count, pool_size)
-    selected = shuffled[:actual_count]
+    # Tirage sans doublons, reproductible avec seed
+    selected = _POOL.sample(offer, difficulty, count, seed)
+    actual_count = len(selected)
     
     batch_meta["returned"] = actual_count
     
@@ -466,18 +444,7 @@ def get_exercise_by_seed_index(
     """
     Sélectionne UN exercice de manière déterministe.
     """
-    available = get_gm07_exercises(offer=offer, difficulty=difficulty)
-    
-    if not available:
-        return None
-    
-    if seed is not None:
-        random.seed(seed)
-        index = random.randint(0, len(available) - 1)
-    else:
-        index = random.randint(0, len(available) - 1)
-    
-    return available[index]
+    return _POOL.pick(offer, difficulty, seed)
 
 
 def get_gm07_stats() -> Dict[str, Any]:
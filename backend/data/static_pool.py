@@ -0,0 +1,116 @@
+"""
+Pools d'exercices figés indexés par (offre, difficulté)
+=======================================================
+
+Les listes figées (GM07_EXERCISES, GM08_EXERCISES, TESTS_DYN_EXERCISES) sont
+indexées une seule fois au chargement du module (et à chaque importlib.reload
+après un export admin) : une requête récupère son pool par lookup, sans
+re-filtrer ni copier la liste.
+
+Le tirage (seeded_sample) est un Fisher-Yates partiel sur un dict
+d'échanges : O(count) quelle que soit la taille du pool, sans copie ni
+mélange complet, et sans toucher au random global.
+
+Déterminisme : même pool + même seed => même tirage. Le premier élément
+tiré avec un seed vaut random.Random(seed).choice(pool) : StaticExercisePool.pick
+sert le même exercice que les anciens get_random_*_exercise (random.choice).
+Les handlers GM07/GM08 gardent leur propre tirage d'un exercice seul (mélange
+complet puis premier élément) et n'utilisent seeded_sample que pour les lots.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+Exercise = Dict[str, Any]
+
+# Vues d'offre (clé d'index) : FREE ne voit que free ; PRO (et toute autre
+# offre renseignée) voit tout, sauf si le pool distingue un pool "pro" dédié
+OFFER_FREE = "free"
+OFFER_PRO = "pro"
+OFFER_ALL = "all"
+
+
+def seeded_sample(pool: Sequence[Exercise], count: int, seed: Optional[int] = None) -> List[Exercise]:
+    """
+    Tire min(count, len(pool)) exercices distincts, dans un ordre aléatoire.
+
+    Args:
+        pool: Exercices candidats (non modifié)
+        count: Nombre d'exercices souhaités
+        seed: Graine (None = tirage non reproductible)
+
+    Returns:
+        Liste des exercices tirés
+    """
+    rng = random.Random(seed)
+    size = len(pool)
+    swapped: Dict[int, int] = {}
+    selected = []
+    for i in range(min(count, size)):
+        j = i + rng.randrange(size - i)
+        selected.append(pool[swapped.get(j, j)])
+        swapped[j] = swapped.get(i, i)
+    return selected
+
+
+class StaticExercisePool:
+    """
+    Exercices figés d'un chapitre indexés par (vue d'offre, difficulté).
+
+    Les règles d'offre sont celles des anciennes fonctions de filtre :
+    - offre absente ou "free" : exercices free
+    - "pro" : tous les exercices ; avec pro_only=True, les exercices pro
+      seulement (repli sur free s'il n'y en a aucun)
+    - autre offre : tous les exercices
+    L'ordre du fichier est conservé dans chaque pool.
+    """
+
+    def __init__(self, exercises: Sequence[Exercise], pro_only: bool = False):
+        free = [ex for ex in exercises if ex["offer"] == "free"]
+        if pro_only:
+            pro = [ex for ex in exercises if ex["offer"] == "pro"] or free
+        else:
+            pro = list(exercises)
+        views = {OFFER_FREE: free, OFFER_PRO: pro, OFFER_ALL: list(exercises)}
+
+        self._pools: Dict[Tuple[str, Optional[str]], Tuple[Exercise, ...]] = {}
+        for view, view_exercises in views.items():
+            self._pools[(view, None)] = tuple(view_exercises)
+            by_difficulty: Dict[str, List[Exercise]] = {}
+            for ex in view_exercises:
+                by_difficulty.setdefault(ex["difficulty"], []).append(ex)
+            for difficulty, pool in by_difficulty.items():
+                self._pools[(view, difficulty)] = tuple(pool)
+
+    @staticmethod
+    def _view(offer: Optional[str]) -> str:
+        if not offer:
+            return OFFER_FREE
+        offer = offer.lower()
+        if offer in (OFFER_FREE, OFFER_PRO):
+            return offer
+        return OFFER_ALL
+
+    def get(self, offer: Optional[str] = None, difficulty: Optional[str] = None) -> Tuple[Exercise, ...]:
+        """Pool (partagé, non modifiable) pour une offre et une difficulté"""
+        return self._pools.get((self._view(offer), difficulty.lower() if difficulty else None), ())
+
+    def sample(
+        self,
+        offer: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        count: int = 1,
+        seed: Optional[int] = None
+    ) -> List[Exercise]:
+        """Tirage sans doublons de count exercices (voir seeded_sample)"""
+        return seeded_sample(self.get(offer, difficulty), count, seed)
+
+    def pick(
+        self,
+        offer: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        seed: Optional[int] = None
+    ) -> Optional[Exercise]:
+        """Un exercice (None si le pool est vide)"""
+        selected = self.sample(offer, difficulty, 1, seed)
+        return selected[0] if selected else None
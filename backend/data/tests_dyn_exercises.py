@@ -10,7 +10,7 @@ mais des templates avec placeholders {{variable}}.
 """
 
 from typing import List, Dict, Any, Optional
-import random
+from backend.data.static_pool import StaticExercisePool
 from backend.observability import (
     get_logger as get_obs_logger,
     safe_random_choice,
@@ -129,6 +129,11 @@ TESTS_DYN_EXERCISES: List[Dict[str, Any]] = [
 # FONCTIONS D'ACCÈS AUX EXERCICES
 # =============================================================================
 
+# Index (offre, difficulté) construit une fois au chargement du module.
+# Ici "pro" ne voit que les exercices pro (repli explicite sur free s'il n'y en a aucun)
+_POOL = StaticExercisePool(TESTS_DYN_EXERCISES, pro_only=True)
+
+
 def get_tests_dyn_exercises(
     offer: Optional[str] = None,
     difficulty: Optional[str] = None
@@ -139,29 +144,7 @@ def get_tests_dyn_exercises(
     IMPORTANT: Si offer="pro" mais qu'aucun exercice "pro" n'existe,
     on fait un fallback explicite vers "free" pour éviter un pool vide.
     """
-    exercises = TESTS_DYN_EXERCISES
-    
-    if offer:
-        offer = offer.lower()
-        if offer == "free":
-            exercises = [ex for ex in exercises if ex["offer"] == "free"]
-        elif offer == "pro":
-            # Filtrer les exercices "pro"
-            pro_exercises = [ex for ex in exercises if ex["offer"] == "pro"]
-            # Fallback explicite: si aucun exercice "pro", utiliser "free"
-            if not pro_exercises:
-                exercises = [ex for ex in exercises if ex["offer"] == "free"]
-            else:
-                exercises = pro_exercises
-        # Si offer est autre chose, on garde tous les exercices (comportement par défaut)
-    else:
-        exercises = [ex for ex in exercises if ex["offer"] == "free"]
-    
-    if difficulty:
-        difficulty = difficulty.lower()
-        exercises = [ex for ex in exercises if ex["difficulty"] == difficulty]
-    
-    return exercises
+    return list(_POOL.get(offer, difficulty))
 
 
 def get_random_tests_dyn_exercise(
@@ -174,15 +157,14 @@ def get_random_tests_dyn_exercise(
     
     Utilise random.Random(seed) pour éviter les effets de bord du random.seed() global.
     """
-    available = get_tests_dyn_exercises(offer=offer, difficulty=difficulty)
+    available = _POOL.get(offer, difficulty)
     
     if not available:
         return None
     
-    # Utiliser random.Random(seed) pour un déterminisme isolé
+    # Même tirage que random.Random(seed).choice(available)
     if seed is not None:
-        rng = random.Random(seed)
-        return rng.choice(available)
+        return _POOL.pick(offer, difficulty, seed)
     else:
         ctx = get_request_context()
         return safe_random_choice(available, ctx, obs_logger)
@@ -197,29 +179,19 @@ def get_tests_dyn_batch(
     """
     Retourne un batch d'exercices sans doublons.
     
-    Utilise random.Random(seed) pour un déterminisme isolé.
+    Tirage O(count) avec random.Random(seed) pour un déterminisme isolé.
     """
-    available = get_tests_dyn_exercises(offer=offer, difficulty=difficulty)
+    available = _POOL.get(offer, difficulty)
     
     if not available:
         return [], {"requested": count, "available": 0, "returned": 0}
     
-    # Utiliser random.Random(seed) pour un déterminisme isolé
-    if seed is not None:
-        rng = random.Random(seed)
-        shuffled = available.copy()
-        rng.shuffle(shuffled)
-    else:
-        shuffled = available.copy()
-        random.shuffle(shuffled)
-    
-    actual_count = min(count, len(shuffled))
-    selected = shuffled[:actual_count]
+    selected = _POOL.sample(offer, difficulty, count, seed)
     
     info = {
         "requested": count,
         "available": len(available),
-        "returned": actual_count,
+        "returned": len(selected),
         "filters": {
             "offer": offer or "free",
             "difficulty": difficulty
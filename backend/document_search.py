@@ -2,20 +2,37 @@
 # Spécialisé pour la Géographie avec cartes libres de droit
 
 import aiohttp
+import asyncio
 import json
+import os
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from cachetools import TTLCache
 from backend.logger import get_logger
 
 logger = get_logger()
 
+# Cache des résultats Wikimedia (recherches et métadonnées de fichiers)
+SEARCH_CACHE_TTL_SECONDS = int(os.environ.get("DOCUMENT_SEARCH_CACHE_TTL", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = 512
+HTTP_TIMEOUT_SECONDS = 10
+HTTP_POOL_LIMIT = 20
+
 class DocumentSearcher:
     """Recherche automatique de documents pédagogiques libres de droit"""
     
-    def __init__(self):
-        self.wikimedia_api_base = "https://commons.wikimedia.org/w/api.php"
+    def __init__(self, wikimedia_api_base: str = "https://commons.wikimedia.org/w/api.php",
+                 cache_ttl: int = SEARCH_CACHE_TTL_SECONDS):
+        self.wikimedia_api_base = wikimedia_api_base
         self.wikimedia_base_url = "https://commons.wikimedia.org"
         
+        # Session HTTP partagée (pool de connexions keep-alive), ouverte au démarrage de l'app
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Cache TTL : (doc_type, elements, langue) -> résultats, titre de fichier -> métadonnées
+        self._search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_MAX_ENTRIES, ttl=cache_ttl)
+        self._metadata_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_MAX_ENTRIES, ttl=cache_ttl)
+        
         # Cache des documents validés avec URLs TESTÉES ET VALIDES (Octobre 2025)
         self.validated_documents_cache = {
             # Cartes de base avec URLs vérifiées fonctionnelles
@@ -65,6 +82,31 @@ class DocumentSearcher:
             }
         }
     
+    async def open(self) -> None:
+        """Ouvre la session HTTP partagée (appelé au démarrage de l'application)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT)
+            )
+    
+    async def close(self) -> None:
+        """Ferme la session HTTP partagée (appelé à l'arrêt de l'application)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Ouverture paresseuse si utilisé hors de l'application (scripts, tests)
+        if self._session is None or self._session.closed:
+            await self.open()
+        return self._session
+    
+    def clear_cache(self) -> None:
+        """Vide les caches de recherche et de métadonnées"""
+        self._search_cache.clear()
+        self._metadata_cache.clear()
+    
     async def search_geographic_document(self, document_request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Recherche un document géographique selon les critères spécifiés avec DIVERSIFICATION FORCÉE
@@ -238,7 +280,11 @@ class DocumentSearcher:
         return "carte_monde"
     
     async def _search_wikimedia_commons(self, doc_type: str, elements_requis: List[str], langue: str) -> List[Dict[str, Any]]:
-        """Recherche via l'API Wikimedia Commons"""
+        """Recherche via l'API Wikimedia Commons (résultats mis en cache avec TTL)"""
+        
+        cache_key: Tuple[str, Tuple[str, ...], str] = (doc_type, tuple(elements_requis or []), langue)
+        if cache_key in self._search_cache:
+            return self._search_cache[cache_key]
         
         # Construction de la requête de recherche
         search_terms = self._build_search_terms(doc_type, elements_requis, langue)
@@ -253,20 +299,21 @@ class DocumentSearcher:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.wikimedia_api_base, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        search_results = data.get("query", {}).get("search", [])
-                        
-                        # Enrichir avec les métadonnées de chaque fichier
-                        enriched_results = []
-                        for result in search_results[:5]:  # Limiter à 5 résultats
-                            file_metadata = await self._get_file_metadata(result["title"])
-                            if file_metadata:
-                                enriched_results.append(file_metadata)
-                        
-                        return enriched_results
+            session = await self._get_session()
+            async with session.get(self.wikimedia_api_base, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    search_results = data.get("query", {}).get("search", [])
+                    
+                    # Enrichir avec les métadonnées de chaque fichier (requêtes concurrentes)
+                    all_metadata = await asyncio.gather(*(
+                        self._get_file_metadata(result["title"])
+                        for result in search_results[:5]  # Limiter à 5 résultats
+                    ))
+                    enriched_results = [metadata for metadata in all_metadata if metadata]
+                    
+                    self._search_cache[cache_key] = enriched_results
+                    return enriched_results
         except Exception as e:
             logger.error(f"Error in Wikimedia API call: {e}")
             return []
@@ -301,7 +348,10 @@ class DocumentSearcher:
         return base
     
     async def _get_file_metadata(self, filename: str) -> Optional[Dict[str, Any]]:
-        """Récupère les métadonnées détaillées d'un fichier"""
+        """Récupère les métadonnées détaillées d'un fichier (mises en cache avec TTL)"""
+        
+        if filename in self._metadata_cache:
+            return self._metadata_cache[filename]
         
         params = {
             "action": "query",
@@ -313,32 +363,33 @@ class DocumentSearcher:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.wikimedia_api_base, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        pages = data.get("query", {}).get("pages", {})
-                        
-                        for page_id, page_data in pages.items():
-                            if "imageinfo" in page_data:
-                                imageinfo = page_data["imageinfo"][0]
-                                
-                                # Extraire les informations essentielles
-                                metadata = {
-                                    "titre": filename.replace("File:", "").replace("_", " "),
-                                    "url_fichier_direct": imageinfo.get("url"),
-                                    "largeur_px": imageinfo.get("width", 0),
-                                    "hauteur_px": imageinfo.get("height", 0),
-                                    "mime_type": imageinfo.get("mime"),
-                                    "taille_bytes": imageinfo.get("size", 0),
-                                    "url_page_commons": f"{self.wikimedia_base_url}/wiki/{filename}"
-                                }
-                                
-                                # Analyser la licence
-                                licence_info = self._extract_license_info(page_data)
-                                metadata["licence"] = licence_info
-                                
-                                return metadata
+            session = await self._get_session()
+            async with session.get(self.wikimedia_api_base, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    pages = data.get("query", {}).get("pages", {})
+                    
+                    for page_id, page_data in pages.items():
+                        if "imageinfo" in page_data:
+                            imageinfo = page_data["imageinfo"][0]
+                            
+                            # Extraire les informations essentielles
+                            metadata = {
+                                "titre": filename.replace("File:", "").replace("_", " "),
+                                "url_fichier_direct": imageinfo.get("url"),
+                                "largeur_px": imageinfo.get("width", 0),
+                                "hauteur_px": imageinfo.get("height", 0),
+                                "mime_type": imageinfo.get("mime"),
+                                "taille_bytes": imageinfo.get("size", 0),
+                                "url_page_commons": f"{self.wikimedia_base_url}/wiki/{filename}"
+                            }
+                            
+                            # Analyser la licence
+                            licence_info = self._extract_license_info(page_data)
+                            metadata["licence"] = licence_info
+                            
+                            self._metadata_cache[filename] = metadata
+                            return metadata
         except Exception as e:
             logger.error(f"Error getting file metadata for {filename}: {e}")
         
@@ -8,13 +8,29 @@ Architecture:
 - Compatible avec les données du preview Sprint C
 """
 
+import asyncio
+import multiprocessing
+import os
 import weasyprint
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
 import logging
 
+from backend.observability.timing import stage, timed_stage
+
 logger = logging.getLogger(__name__)
 
+# Nombre de process de rendu WeasyPrint pour les exports multi-variantes
+# (0 ou 1 = rendu séquentiel dans le process courant)
+SHEET_PDF_WORKERS = int(os.environ.get("SHEET_PDF_WORKERS", "3"))
+
+SHEET_PDF_VARIANTS = ("subject", "student", "correction")
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
 
 def build_sheet_subject_pdf(sheet_preview: dict) -> bytes:
     """
@@ -33,7 +49,8 @@ def build_sheet_subject_pdf(sheet_preview: dict) -> bytes:
         bytes: Contenu du PDF
     """
     html_content = _build_html_subject(sheet_preview)
-    pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+    with stage("pdf"):
+        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
     
     logger.info(f"✅ PDF Sujet généré: {len(pdf_bytes)} bytes")
     return pdf_bytes
@@ -58,7 +75,8 @@ def build_sheet_student_pdf(sheet_preview: dict, layout: str = "eco") -> bytes:
         bytes: Contenu du PDF
     """
     html_content = _build_html_student(sheet_preview, layout=layout)
-    pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+    with stage("pdf"):
+        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
     
     logger.info(f"✅ PDF Élève généré (layout={layout}): {len(pdf_bytes)} bytes")
     return pdf_bytes
@@ -82,12 +100,159 @@ def build_sheet_correction_pdf(sheet_preview: dict, layout: str = "eco") -> byte
         bytes: Contenu du PDF
     """
     html_content = _build_html_correction(sheet_preview, layout=layout)
-    pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+    with stage("pdf"):
+        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
     
     logger.info(f"✅ PDF Corrigé généré (layout={layout}): {len(pdf_bytes)} bytes")
     return pdf_bytes
 
 
+# ============================================================================
+# Export multi-variantes (sujet / élève / corrigé en parallèle)
+# ============================================================================
+
+def prepare_sheet_preview(sheet_preview: dict) -> dict:
+    """
+    Prépare une seule fois ce qui est commun à toutes les variantes : énoncés
+    et solutions formatés en HTML, date d'édition.
+
+    Les builders HTML acceptent indifféremment un preview brut ou préparé.
+    """
+    prepared = dict(sheet_preview)
+    prepared["_date"] = datetime.now().strftime("%d/%m/%Y")
+    prepared_items = []
+    for item in sheet_preview.get("items", []):
+        generated = item.get("generated", {})
+        prepared_item = dict(item)
+        prepared_item["generated"] = {
+            **generated,
+            "questions": [_prepare_question(q) for q in generated.get("questions", [])],
+        }
+        prepared_items.append(prepared_item)
+    prepared["items"] = prepared_items
+    return prepared
+
+
+def _prepare_question(question: dict) -> dict:
+    prepared = dict(question)
+    prepared["_enonce_html"] = _content_to_html(question.get("enonce_brut", ""))
+    prepared["_solution_html"] = _content_to_html(question.get("solution_brut", ""))
+    return prepared
+
+
+def _variant_css_key(variant: str, layout: str) -> str:
+    if variant == "student":
+        return "student_eco" if layout == "eco" else "student_classic"
+    return variant
+
+
+def _build_variant_html(prepared_preview: dict, variant: str, layout: str) -> str:
+    """
+    HTML d'une variante, identique à celui du builder d'une seule variante.
+
+    Le CSS reste dans un <style> du document (feuille auteur) : passé en
+    write_pdf(stylesheets=...), WeasyPrint le traiterait comme feuille
+    utilisateur et les <style> des exercices l'emporteraient.
+    """
+    if variant == "subject":
+        return _build_html_subject(prepared_preview)
+    if variant == "student":
+        return _build_html_student(prepared_preview, layout=layout)
+    if variant == "correction":
+        return _build_html_correction(prepared_preview, layout=layout)
+    raise ValueError(f"Variante PDF inconnue: {variant}")
+
+
+@lru_cache(maxsize=1)
+def _get_font_config():
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+def _render_variant_pdf(html_content: str) -> bytes:
+    """Rendu WeasyPrint d'une variante (exécuté dans un process du pool)"""
+    return weasyprint.HTML(string=html_content).write_pdf(font_config=_get_font_config())
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        # spawn : pas de fork d'un process qui a déjà des threads (logs, pools)
+        _render_pool = ProcessPoolExecutor(
+            max_workers=SHEET_PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def _reset_render_pool() -> None:
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def shutdown_render_pool() -> None:
+    """Arrête le pool de rendu à l'arrêt de l'application (rendus en attente annulés)"""
+    _reset_render_pool()
+
+
+@timed_stage("pdf")
+async def _render_variant(html_content: str) -> bytes:
+    loop = asyncio.get_running_loop()
+    if SHEET_PDF_WORKERS > 1:
+        try:
+            return await loop.run_in_executor(_get_render_pool(), _render_variant_pdf, html_content)
+        except BrokenProcessPool as e:
+            logger.warning(f"[PDF_SHEET] Pool de rendu indisponible, rendu dans le process courant: {e}")
+            _reset_render_pool()
+    return await loop.run_in_executor(None, _render_variant_pdf, html_content)
+
+
+def start_sheet_variant_renders(
+    sheet_preview: dict,
+    variants: Sequence[str] = SHEET_PDF_VARIANTS,
+    layout: str = "eco",
+) -> Dict[str, "asyncio.Future[bytes]"]:
+    """
+    Lance le rendu de chaque variante et retourne une tâche par variante,
+    pour consommer chaque PDF dès qu'il est prêt (export par artefacts).
+
+    Le HTML est construit à partir d'un preview préparé une seule fois, puis
+    chaque variante est rendue dans un process séparé (WeasyPrint est lié au
+    GIL), avec une FontConfiguration conservée par process.
+    """
+    prepared = prepare_sheet_preview(sheet_preview)
+    return {
+        variant: asyncio.ensure_future(_render_variant(_build_variant_html(prepared, variant, layout)))
+        for variant in variants
+    }
+
+
+async def build_sheet_variant_pdfs(
+    sheet_preview: dict,
+    variants: Sequence[str] = SHEET_PDF_VARIANTS,
+    layout: str = "eco",
+) -> Dict[str, bytes]:
+    """
+    Génère plusieurs variantes PDF d'une fiche en parallèle : la durée totale
+    est proche de celle de la variante la plus lente.
+
+    Args:
+        sheet_preview: Dict contenant le preview complet de la fiche
+        variants: Variantes à générer parmi "subject", "student", "correction"
+        layout: Layout élève/corrigé ("eco" ou "classic") ; le sujet est toujours classic
+
+    Returns:
+        Dict variante -> bytes du PDF
+    """
+    renders = start_sheet_variant_renders(sheet_preview, variants, layout)
+    pdfs = dict(zip(renders, await asyncio.gather(*renders.values())))
+    for variant, pdf_bytes in pdfs.items():
+        logger.info(f"✅ PDF {variant} généré (layout={layout}): {len(pdf_bytes)} bytes")
+    return pdfs
+
+
 # ============================================================================
 # Fonctions internes de génération HTML
 # ============================================================================
@@ -105,19 +270,14 @@ def _build_html_subject(sheet_preview: dict) -> str:
     <html>
     <head>
         <meta charset="UTF-8">
-        <style>
-            {_get_base_css()}
-            .answer-space {{
-                display: none;
-            }}
-        </style>
+        {_style_block("subject")}
     </head>
     <body>
         <div class="header">
             <h1>{titre}</h1>
             <div class="metadata">
                 <span class="niveau">Niveau: {niveau}</span>
-                <span class="date">Date: {datetime.now().strftime("%d/%m/%Y")}</span>
+                <span class="date">Date: {_sheet_date(sheet_preview)}</span>
                 <span class="type">Sujet (Professeur)</span>
             </div>
         </div>
@@ -145,25 +305,20 @@ def _build_html_student(sheet_preview: dict, layout: str = "eco") -> str:
     niveau = sheet_preview.get("niveau", "")
     items = sheet_preview.get("items", [])
     
-    # Choisir le CSS selon le layout
-    css = _get_eco_css() if layout == "eco" else _get_base_css()
-    
-    # Header
+    # Header (CSS choisi selon le layout)
     html = f"""
     <!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
-        <style>
-            {css}
-        </style>
+        {_style_block(_variant_css_key("student", layout))}
     </head>
     <body>
         <div class="header">
             <h1>{titre}</h1>
             <div class="metadata">
                 <span class="niveau">Niveau: {niveau}</span>
-                <span class="date">Date: {datetime.now().strftime("%d/%m/%Y")}</span>
+                <span class="date">Date: {_sheet_date(sheet_preview)}</span>
             </div>
             <div class="student-info">
                 <p>Nom: ________________  Prénom: ________________  Classe: ________</p>
@@ -209,7 +364,6 @@ def _build_html_correction(sheet_preview: dict, layout: str = "eco") -> str:
     
     # PR6.1: Corrigé toujours en classic (1 colonne) pour éviter les trous
     # Ignorer layout=eco pour le corrigé
-    css = _get_base_css()
     if layout == "eco":
         logger.info("[PDF_CORRECTION] layout=eco ignoré pour corrigé, utilisation de classic (1 colonne)")
     
@@ -219,22 +373,14 @@ def _build_html_correction(sheet_preview: dict, layout: str = "eco") -> str:
     <html>
     <head>
         <meta charset="UTF-8">
-        <style>
-            {css}
-            .solution {{
-                background-color: #f0f8ff;
-                border-left: 4px solid #4CAF50;
-                padding: 10px;
-                margin-top: 10px;
-            }}
-        </style>
+        {_style_block("correction")}
     </head>
     <body>
         <div class="header">
             <h1 class="sheet-title">{titre}</h1>
             <div class="sheet-meta">
                 <span class="niveau">Niveau: {niveau}</span>
-                <span class="date">Date: {datetime.now().strftime("%d/%m/%Y")}</span>
+                <span class="date">Date: {_sheet_date(sheet_preview)}</span>
                 <span class="type">Corrigé</span>
             </div>
         </div>
@@ -255,6 +401,43 @@ def _build_html_correction(sheet_preview: dict, layout: str = "eco") -> str:
     return html
 
 
+_SUBJECT_EXTRA_CSS = """
+            .answer-space {
+                display: none;
+            }
+"""
+
+_CORRECTION_EXTRA_CSS = """
+            .solution {
+                background-color: #f0f8ff;
+                border-left: 4px solid #4CAF50;
+                padding: 10px;
+                margin-top: 10px;
+            }
+"""
+
+
+def _variant_css(css_key: str) -> str:
+    """CSS complet d'une variante (base/eco + règles propres à la variante)"""
+    if css_key == "subject":
+        return _get_base_css() + _SUBJECT_EXTRA_CSS
+    if css_key == "student_eco":
+        return _get_eco_css()
+    if css_key == "student_classic":
+        return _get_base_css()
+    if css_key == "correction":
+        return _get_base_css() + _CORRECTION_EXTRA_CSS
+    raise ValueError(f"CSS de variante inconnu: {css_key}")
+
+
+def _style_block(css_key: str) -> str:
+    return f"<style>{_variant_css(css_key)}</style>"
+
+
+def _sheet_date(sheet_preview: dict) -> str:
+    return sheet_preview.get("_date") or datetime.now().strftime("%d/%m/%Y")
+
+
 def _render_exercise(item: dict, ex_number: int, include_solutions: bool, is_student: bool, layout: str = "eco") -> str:
     """
     Rendu HTML d'un exercice complet
@@ -348,18 +531,10 @@ def _render_question(question: dict, q_number: int, include_solution: bool, is_s
         - html_text_with_placeholders: HTML avec placeholders pour les blocs fullwidth
         - fullwidth_blocks: Liste des blocs extraits (tableaux, figures)
     """
-    enonce = question.get("enonce_brut", "")
-    solution = question.get("solution_brut", "")
-    data = question.get("data", {})
-    
-    # P0: Detect if enonce is already HTML (contains HTML tags)
-    # If so, use it directly; otherwise format it with _format_text
-    if enonce and ("<" in enonce and ">" in enonce):
-        # Already HTML, use directly
-        enonce_html = enonce
-    else:
-        # Raw text, format it
-        enonce_html = _format_text(enonce)
+    # Énoncé déjà formaté si le preview a été préparé (prepare_sheet_preview)
+    enonce_html = question.get("_enonce_html")
+    if enonce_html is None:
+        enonce_html = _content_to_html(question.get("enonce_brut", ""))
     
     # Récupérer la figure HTML si présente
     figure_html = question.get("figure_html", "")
@@ -409,14 +584,9 @@ def _render_question(question: dict, q_number: int, include_solution: bool, is_s
     
     # Solution (uniquement pour corrigé) - PR6.1: Design "manuel scolaire"
     if include_solution:
-        # P0: Detect if solution is already HTML (contains HTML tags)
-        # If so, use it directly; otherwise format it with _format_text
-        if solution and ("<" in solution and ">" in solution):
-            # Already HTML, use directly
-            solution_html = solution
-        else:
-            # Raw text, format it
-            solution_html = _format_text(solution)
+        solution_html = question.get("_solution_html")
+        if solution_html is None:
+            solution_html = _content_to_html(question.get("solution_brut", ""))
         # PR6.3: Extraire aussi les blocs fullwidth de la solution si eco
         if layout == "eco":
             solution_html, blocks_from_solution = extract_fullwidth_blocks(solution_html)
@@ -438,6 +608,16 @@ def _render_question(question: dict, q_number: int, include_solution: bool, is_s
     return html, fullwidth_blocks
 
 
+def _content_to_html(content: str) -> str:
+    """
+    P0: Detect if content is already HTML (contains HTML tags)
+    If so, use it directly; otherwise format it with _format_text
+    """
+    if content and ("<" in content and ">" in content):
+        return content
+    return _format_text(content)
+
+
 def _format_text(text: str) -> str:
     """Formate le texte brut en HTML (gestion des sauts de ligne, etc.)"""
     if not text:
@@ -1168,7 +1348,8 @@ def build_sheet_pro_pdf(legacy_format: dict, template: str = "classique", user_c
     else:  # "classique" par défaut
         html_content = _build_html_pro_classique(legacy_format, user_config)
     
-    pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+    with stage("pdf"):
+        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
     
     logger.info(f"✅ PDF Pro généré ({template}): {len(pdf_bytes)} bytes")
     return pdf_bytes
@@ -8,13 +8,36 @@ Fonction principale:
 
 import logging
 import asyncio
-from typing import Dict, Any, List
-from copy import deepcopy
+import os
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Nombre maximal d'appels d'enrichissement IA simultanés pour une feuille
+AI_ENRICHMENT_CONCURRENCY = int(os.environ.get("AI_ENRICHMENT_CONCURRENCY", "8"))
 
-async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
+
+def _copy_for_enrichment(sheet_preview: dict) -> dict:
+    """
+    Copie les seuls conteneurs modifiés par l'enrichissement (preview, items,
+    generated, questions) ; data et le reste sont partagés en lecture seule.
+    """
+    enriched_preview = dict(sheet_preview)
+    items = []
+    for item in sheet_preview.get("items", []):
+        item_copy = dict(item)
+        generated = item.get("generated")
+        if isinstance(generated, dict):
+            item_copy["generated"] = {
+                **generated,
+                "questions": [dict(q) for q in generated.get("questions", [])]
+            }
+        items.append(item_copy)
+    enriched_preview["items"] = items
+    return enriched_preview
+
+
+async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict, db: Optional[Any] = None) -> dict:
     """
     Applique l'enrichissement IA au preview d'une feuille d'exercices
     
@@ -22,6 +45,10 @@ async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
     - Si config.ai_enonce: enrichit enonce_brut
     - Si config.ai_correction: enrichit solution_brut
     
+    Les appels IA de toutes les questions sont lancés en parallèle, limités à
+    AI_ENRICHMENT_CONCURRENCY simultanés ; les résultats sont mis en cache
+    (voir ia_engine.enrichment_cache).
+    
     En cas d'erreur IA:
     - Log l'erreur
     - Continue pour les autres questions
@@ -29,6 +56,7 @@ async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
     
     Args:
         sheet_preview: Preview complet de la feuille (dict)
+        db: Base de l'application, pour le cache persistant des enrichissements
         
     Returns:
         dict: Preview avec énoncés/corrections enrichis (nouveau dict)
@@ -37,8 +65,8 @@ async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
     
     logger.info("🎨 Début de l'enrichissement IA du preview")
     
-    # Créer une copie profonde pour ne pas modifier l'original
-    enriched_preview = deepcopy(sheet_preview)
+    # Copier les conteneurs modifiés pour ne pas toucher à l'original
+    enriched_preview = _copy_for_enrichment(sheet_preview)
     
     items = enriched_preview.get("items", [])
     niveau = enriched_preview.get("niveau", "")
@@ -49,7 +77,8 @@ async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
     corrections_enrichies = 0
     erreurs = 0
     
-    # Parcourir tous les items
+    # Collecter les enrichissements à faire: (question, champ, label)
+    jobs: List[Tuple[dict, str, str]] = []
     for item_idx, item in enumerate(items):
         try:
             config = item.get("config", {})
@@ -69,70 +98,62 @@ async def apply_ai_enrichment_to_sheet_preview(sheet_preview: dict) -> dict:
                 f"(énoncé={ai_enonce}, correction={ai_correction})"
             )
             
-            # Parcourir toutes les questions de cet item
             for q_idx, question in enumerate(questions):
                 total_questions += 1
-                
-                try:
-                    enonce_brut = question.get("enonce_brut", "")
-                    solution_brut = question.get("solution_brut", "")
-                    data = question.get("data", {})
-                    
-                    # Enrichissement de l'énoncé si demandé
-                    if ai_enonce and enonce_brut:
-                        try:
-                            enriched_enonce = await enrich_statement(
-                                enonce_brut=enonce_brut,
-                                data=data,
-                                niveau=niveau,
-                                style=None
-                            )
-                            
-                            # Remplacer l'énoncé brut par la version enrichie
-                            question["enonce_brut"] = enriched_enonce
-                            enonces_enrichis += 1
-                            
-                            logger.info(
-                                f"  ✅ Q{q_idx + 1}: Énoncé enrichi "
-                                f"({len(enonce_brut)}→{len(enriched_enonce)} chars)"
-                            )
-                        except Exception as e:
-                            logger.error(f"  ❌ Q{q_idx + 1}: Erreur enrichissement énoncé: {e}")
-                            erreurs += 1
-                            # Conserver l'énoncé brut (déjà en place)
-                    
-                    # Enrichissement de la correction si demandé
-                    if ai_correction and solution_brut:
-                        try:
-                            enriched_solution = await enrich_correction(
-                                solution_brut=solution_brut,
-                                data=data,
-                                niveau=niveau
-                            )
-                            
-                            # Remplacer la solution brute par la version enrichie
-                            question["solution_brut"] = enriched_solution
-                            corrections_enrichies += 1
-                            
-                            logger.info(
-                                f"  ✅ Q{q_idx + 1}: Correction enrichie "
-                                f"({len(solution_brut)}→{len(enriched_solution)} chars)"
-                            )
-                        except Exception as e:
-                            logger.error(f"  ❌ Q{q_idx + 1}: Erreur enrichissement correction: {e}")
-                            erreurs += 1
-                            # Conserver la solution brute (déjà en place)
-                
-                except Exception as e:
-                    logger.error(f"  ❌ Q{q_idx + 1}: Erreur traitement question: {e}")
-                    erreurs += 1
-                    # Continuer avec les autres questions
+                label = f"Item {item_idx + 1} Q{q_idx + 1}"
+                if ai_enonce and question.get("enonce_brut", ""):
+                    jobs.append((question, "enonce_brut", label))
+                if ai_correction and question.get("solution_brut", ""):
+                    jobs.append((question, "solution_brut", label))
         
         except Exception as e:
             logger.error(f"❌ Item {item_idx + 1}: Erreur traitement item: {e}")
             erreurs += 1
             # Continuer avec les autres items
     
+    semaphore = asyncio.Semaphore(AI_ENRICHMENT_CONCURRENCY)
+    
+    async def enrich_field(question: dict, field: str) -> str:
+        async with semaphore:
+            data = question.get("data", {})
+            if field == "enonce_brut":
+                return await enrich_statement(
+                    enonce_brut=question[field],
+                    data=data,
+                    niveau=niveau,
+                    style=None,
+                    db=db
+                )
+            return await enrich_correction(
+                solution_brut=question[field],
+                data=data,
+                niveau=niveau,
+                db=db
+            )
+    
+    results = await asyncio.gather(
+        *(enrich_field(question, field) for question, field, _ in jobs),
+        return_exceptions=True
+    )
+    
+    for (question, field, label), result in zip(jobs, results):
+        kind = "énoncé" if field == "enonce_brut" else "correction"
+        if isinstance(result, BaseException):
+            logger.error(f"  ❌ {label}: Erreur enrichissement {kind}: {result}")
+            erreurs += 1
+            # Conserver le texte brut (déjà en place)
+            continue
+        
+        logger.info(
+            f"  ✅ {label}: {kind.capitalize()} enrichi(e) "
+            f"({len(question[field])}→{len(result)} chars)"
+        )
+        question[field] = result
+        if field == "enonce_brut":
+            enonces_enrichis += 1
+        else:
+            corrections_enrichies += 1
+    
     # Log des statistiques finales
     logger.info("=" * 60)
     logger.info(f"✅ Enrichissement IA terminé:")
@@ -0,0 +1,287 @@
+"""
+Benchmark des générateurs enregistrés
+=====================================
+
+BaseGoldGenerator vérifie perf_budget_ms génération par génération
+(_check_perf_budget), mais rien ne mesurait systématiquement l'ensemble des
+générateurs ni ne suivait les résultats dans le temps.
+
+Ce module exécute chaque générateur de GeneratorFactory.list_all() pour
+chaque couple (difficulté × preset) sur une plage de seeds et mesure :
+- la latence p50 / p95 / p99 (ms), sans tracemalloc actif ;
+- le pic d'allocation (Ko), mesuré dans une passe séparée avec tracemalloc ;
+- la taille de la sortie sérialisée en JSON (octets).
+
+Le résultat est un baseline JSON (format BASELINE_FORMAT_VERSION) que
+scripts/run_generators_quality_gate.py compare au run courant : une
+métrique qui dépasse le baseline au-delà de la tolérance est une régression.
+
+Usage:
+    from backend.generators.benchmark import run_benchmark, compare_to_baseline
+
+    report = run_benchmark(seeds=range(50))
+    regressions = compare_to_baseline(report, baseline, tolerance=0.25)
+"""
+
+import gc
+import json
+import math
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from backend.generators.factory import GeneratorFactory
+
+
+BASELINE_FORMAT_VERSION = 1
+
+DEFAULT_SEEDS = range(50)
+# Les allocations varient peu d'un seed à l'autre et tracemalloc ralentit fortement
+# l'exécution : seuls les premiers seeds sont tracés
+DEFAULT_ALLOC_SEEDS = 5
+# Chaque seed est chronométré DEFAULT_REPEAT fois et on garde le minimum (comme
+# timeit) : les percentiles reflètent la variabilité entre seeds, pas l'ordonnanceur
+DEFAULT_REPEAT = 3
+
+DEFAULT_PRESET = "default"  # Cas "sans preset" : paramètres par défaut du schéma
+
+# Métriques comparées au baseline et marge absolue sous laquelle un écart est du bruit
+# (une génération de 0,2 ms qui passe à 0,3 ms n'est pas une régression)
+COMPARED_METRICS = {
+    "p50_ms": 0.5,
+    "p95_ms": 1.0,
+    "p99_ms": 2.0,
+    "alloc_peak_kb": 16.0,
+    "output_bytes": 256,
+}
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Percentile par rang le plus proche (pct entre 0 et 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+def case_id(key: str, difficulty: Optional[str], preset: str) -> str:
+    return f"{key}|{difficulty or '-'}|{preset}"
+
+
+def _difficulties(gen_class) -> List[Optional[str]]:
+    param = next((p for p in gen_class.get_schema() if p.name == "difficulty"), None)
+    if param is None:
+        return [None]
+    return list(param.options or []) or [param.default]
+
+
+def iter_cases(keys: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Matrice générateur × difficulté × preset.
+
+    Les paramètres d'un preset sont repris tels quels, sauf la difficulté
+    qui est imposée par le cas. Le preset DEFAULT_PRESET utilise les
+    valeurs par défaut du schéma.
+    """
+    selected = {k.upper() for k in keys} if keys else None
+    cases = []
+    for info in GeneratorFactory.list_all():
+        key = info["key"]
+        if selected is not None and key not in selected:
+            continue
+        gen_class = GeneratorFactory.get(key)
+        if gen_class is None:
+            continue
+        presets = [(DEFAULT_PRESET, {})] + [(p.key, p.params) for p in gen_class.get_presets()]
+        budget = getattr(gen_class.get_meta(), "perf_budget_ms", None)
+        for difficulty in _difficulties(gen_class):
+            for preset_key, preset_params in presets:
+                params = dict(preset_params)
+                if difficulty is not None:
+                    params["difficulty"] = difficulty
+                cases.append({
+                    "id": case_id(key, difficulty, preset_key),
+                    "generator": key,
+                    "difficulty": difficulty,
+                    "preset": preset_key,
+                    "params": params,
+                    "perf_budget_ms": budget,
+                })
+    return cases
+
+
+def _output_size(output: Dict[str, Any]) -> int:
+    return len(json.dumps(output, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def benchmark_case(
+    case: Dict[str, Any],
+    seeds: Sequence[int],
+    alloc_seeds: int = DEFAULT_ALLOC_SEEDS,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Any]:
+    """Mesure un cas sur tous les seeds ; les échecs de génération sont comptés, pas levés"""
+    durations: List[float] = []
+    sizes: List[int] = []
+    errors: Dict[str, int] = {}
+
+    # Comme timeit : pas de collecte du GC pendant la mesure (sinon une pause
+    # isolée fait passer p99 pour une régression)
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for seed in seeds:
+            best = None
+            try:
+                for _ in range(max(1, repeat)):
+                    start = time.perf_counter()
+                    output = GeneratorFactory.generate(case["generator"], exercise_params=case["params"], seed=seed)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    best = elapsed if best is None else min(best, elapsed)
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            durations.append(best)
+            sizes.append(_output_size(output))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peaks: List[int] = []
+    for seed in list(seeds)[:alloc_seeds]:
+        tracemalloc.start()
+        try:
+            GeneratorFactory.generate(case["generator"], exercise_params=case["params"], seed=seed)
+        except Exception:
+            continue
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        peaks.append(peak)
+
+    result = {
+        "runs": len(durations),
+        "errors": errors,
+        "p50_ms": round(percentile(durations, 50), 3),
+        "p95_ms": round(percentile(durations, 95), 3),
+        "p99_ms": round(percentile(durations, 99), 3),
+        "max_ms": round(max(durations), 3) if durations else 0.0,
+        "alloc_peak_kb": round(max(peaks) / 1024, 1) if peaks else 0.0,
+        "output_bytes": max(sizes) if sizes else 0,
+    }
+    budget = case.get("perf_budget_ms")
+    if budget is not None:
+        result["perf_budget_ms"] = budget
+        result["over_budget"] = result["p95_ms"] > budget
+    return result
+
+
+def run_benchmark(
+    keys: Optional[Iterable[str]] = None,
+    seeds: Iterable[int] = DEFAULT_SEEDS,
+    alloc_seeds: int = DEFAULT_ALLOC_SEEDS,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Any]:
+    """
+    Benchmark complet, au format baseline.
+
+    Returns:
+        {"format_version", "created_at", "environment", "seeds", "cases": {case_id: métriques}}
+    """
+    seeds = list(seeds)
+    # Une génération par générateur avant de mesurer (imports paresseux, caches)
+    for key in {case["generator"] for case in iter_cases(keys)}:
+        try:
+            GeneratorFactory.generate(key, seed=seeds[0] if seeds else 0)
+        except Exception:
+            pass
+
+    cases = {}
+    for case in iter_cases(keys):
+        metrics = benchmark_case(case, seeds, alloc_seeds, repeat)
+        metrics.update({"generator": case["generator"], "difficulty": case["difficulty"], "preset": case["preset"]})
+        cases[case["id"]] = metrics
+
+    return {
+        "format_version": BASELINE_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "seeds": len(seeds),
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+) -> List[Dict[str, Any]]:
+    """
+    Liste les régressions du run courant par rapport au baseline.
+
+    Une métrique régresse si elle dépasse baseline × (1 + tolerance) ET
+    baseline + marge absolue (COMPARED_METRICS). Un cas qui générait sans
+    erreur dans le baseline et échoue désormais est aussi une régression.
+    Les cas absents du baseline (nouveaux générateurs/presets) sont ignorés.
+
+    Raises:
+        ValueError: baseline d'un autre format ou mesuré sur un autre nombre de seeds
+    """
+    if baseline.get("format_version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(
+            f"Format de baseline non supporté: {baseline.get('format_version')} "
+            f"(attendu {BASELINE_FORMAT_VERSION})"
+        )
+    if baseline.get("seeds") != current.get("seeds"):
+        # Tailles de sortie et erreurs dépendent des seeds : la comparaison n'aurait pas de sens
+        raise ValueError(
+            f"Baseline mesuré sur {baseline.get('seeds')} seeds, run courant sur {current.get('seeds')}"
+        )
+
+    regressions = []
+    for cid, metrics in current.get("cases", {}).items():
+        reference = baseline["cases"].get(cid)
+        if reference is None:
+            continue
+        if metrics.get("errors") and not reference.get("errors"):
+            regressions.append({"case": cid, "metric": "errors", "baseline": 0, "current": sum(metrics["errors"].values())})
+        for metric, floor in COMPARED_METRICS.items():
+            before = reference.get(metric)
+            after = metrics.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > floor:
+                regressions.append({"case": cid, "metric": metric, "baseline": before, "current": after})
+    return regressions
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(report: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+__all__ = [
+    "BASELINE_FORMAT_VERSION",
+    "COMPARED_METRICS",
+    "percentile",
+    "iter_cases",
+    "benchmark_case",
+    "run_benchmark",
+    "compare_to_baseline",
+    "load_baseline",
+    "save_baseline",
+]
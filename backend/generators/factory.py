@@ -21,6 +21,7 @@ from backend.generators.base_generator import BaseGenerator, GeneratorMeta, Para
 from backend.observability import (
     get_logger as get_obs_logger,
     get_request_context,
+    stage,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,9 @@ class GeneratorFactory:
 
     _generators: Dict[str, Type[BaseGenerator]] = {}
 
+    # Incrémenté à chaque register() (invalidation de registry_snapshot)
+    _registry_version: int = 0
+
     # P0 Gold - Paramètres globaux acceptés pour tous les générateurs (exemptés de validation schema)
     _GLOBAL_PARAMS: set = {"seed"}
 
@@ -80,6 +84,7 @@ class GeneratorFactory:
         """
         meta = generator_class.get_meta()
         cls._generators[meta.key] = generator_class
+        cls._registry_version += 1
         return generator_class
     
     @classmethod
@@ -292,7 +297,7 @@ class GeneratorFactory:
         )
         
         # Log params (DEBUG uniquement si LOG_VERBOSE=1)
-        if exercise_params or overrides:
+        if (exercise_params or overrides) and obs_logger.is_enabled('DEBUG'):
             obs_logger.debug(
                 "event=params",
                 event="params",
@@ -352,7 +357,8 @@ class GeneratorFactory:
 
             # Génération avec effective_seed
             generator = gen_class(seed=effective_seed)
-            output = generator.generate(result)
+            with stage("generator"):
+                output = generator.generate(result)
             
             # Ajouter les métadonnées de génération
             meta = gen_class.get_meta()
@@ -372,10 +378,11 @@ class GeneratorFactory:
                 'pedagogy_mode': result.get('pedagogy_mode'),
             })
             logger.info(
-                f"[GENERATOR_OK] ✅ Génération réussie: generator={key}, "
-                f"duration_ms={gen_duration_ms}, variables={len(output.get('variables', {}))}, "
-                f"svg_enonce={output.get('figure_svg_enonce') is not None}, "
-                f"svg_solution={output.get('figure_svg_solution') is not None}"
+                "[GENERATOR_OK] ✅ Génération réussie: generator=%s, "
+                "duration_ms=%s, variables=%s, svg_enonce=%s, svg_solution=%s",
+                key, gen_duration_ms, len(output.get('variables', {})),
+                output.get('figure_svg_enonce') is not None,
+                output.get('figure_svg_solution') is not None,
             )
             obs_logger.info(
                 "event=generate_complete",
@@ -393,9 +400,9 @@ class GeneratorFactory:
         except Exception as e:
             gen_duration_ms = int((time.time() - gen_start) * 1000)
             logger.error(
-                f"[GENERATOR_FAIL] ❌ Génération échouée: generator={key}, "
-                f"duration_ms={gen_duration_ms}, exception={type(e).__name__}, "
-                f"message={str(e)[:200]}"
+                "[GENERATOR_FAIL] ❌ Génération échouée: generator=%s, "
+                "duration_ms=%s, exception=%s, message=%s",
+                key, gen_duration_ms, type(e).__name__, str(e)[:200],
             )
             obs_logger.error(
                 "event=generate_exception",
@@ -0,0 +1,206 @@
+"""
+Registry Snapshot - Vue figée du registry des générateurs
+==========================================================
+
+Les endpoints de listing (/generators, /generators/{key}/full-schema,
+/generators/{key}/ui-schema) appelaient get_meta(), get_schema(),
+get_presets() et to_dict() sur chaque générateur à chaque requête, puis
+enrichissaient les presets avec les templates par défaut.
+
+Le registry ne change pas après _register_all_generators() : ce module
+construit une seule fois les réponses de ces endpoints, déjà sérialisées en
+JSON (bytes) avec leur ETag. Le snapshot est reconstruit automatiquement si
+le registry change (register() ou DISABLED_GENERATORS).
+
+warm_up_generators() lance une génération par générateur (caches de
+templates, SVG, imports paresseux) avant que le worker ne soit déclaré prêt.
+
+Usage:
+    snapshot = get_registry_snapshot()
+    payload = snapshot.ui_schema("THALES_V2")   # SerializedPayload | None
+    Response(content=payload.body, headers={"ETag": payload.etag})
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from backend.generators.factory import GeneratorFactory
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = "2.0.0"
+
+# Templates par défaut ajoutés aux presets pour l'UI (full-schema / ui-schema)
+DEFAULT_PRESET_TEMPLATES = {
+    "enoncetemplate": "<p><strong>Énoncé à compléter</strong></p>",
+    "solutiontemplate": "<p>Solution à compléter</p>",
+}
+
+
+@dataclass(frozen=True)
+class SerializedPayload:
+    """Corps JSON pré-sérialisé d'une réponse et son ETag"""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: Any) -> "SerializedPayload":
+        # Même encodage que fastapi.responses.JSONResponse
+        body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True si l'en-tête If-None-Match du client contient cet ETag"""
+        if not if_none_match:
+            return False
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag in candidates or "*" in candidates
+
+
+def _with_default_templates(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    enriched = dict(params or {})
+    for name, template in DEFAULT_PRESET_TEMPLATES.items():
+        enriched.setdefault(name, template)
+    return enriched
+
+
+def _full_schema_content(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Réponse de /generators/{key}/full-schema (FactorySchemaResponse)"""
+    schema = copy.deepcopy(schema)
+    return {
+        "generatorkey": schema["generator_key"],
+        "meta": schema["meta"],
+        "defaults": schema["defaults"],
+        "schema": schema["schema"],
+        "presets": [
+            {**preset, "params": _with_default_templates(preset.get("params"))}
+            for preset in schema["presets"]
+        ],
+    }
+
+
+def _ui_schema_content(gen_class) -> Dict[str, Any]:
+    """Réponse de /generators/{key}/ui-schema (UISchemaResponse)"""
+    meta = gen_class.get_meta()
+    return {
+        "generatorkey": meta.key,
+        "label": meta.label,
+        "description": meta.description,
+        "version": meta.version,
+        "param_schema": [
+            {
+                "name": p.name,
+                "type": p.type.value if hasattr(p.type, "value") else str(p.type),
+                "label": getattr(p, "label", p.description),
+                "options": copy.deepcopy(p.options),
+                "required": p.required,
+                "default": copy.deepcopy(p.default),
+            }
+            for p in gen_class.get_schema()
+        ],
+        "defaults": copy.deepcopy(gen_class.get_defaults()),
+        "presets": [
+            {"id": p.key, "label": p.label, "params": _with_default_templates(copy.deepcopy(p.params))}
+            for p in gen_class.get_presets()
+        ],
+    }
+
+
+class GeneratorRegistrySnapshot:
+    """Réponses pré-sérialisées des endpoints de listing des générateurs (lecture seule)"""
+
+    def __init__(self, version: Tuple[Any, ...]):
+        self.version = version
+        self.built_at = time.time()
+
+        generators = GeneratorFactory.list_all()
+        self.generator_keys: Tuple[str, ...] = tuple(g["key"] for g in generators)
+        self.generators = SerializedPayload.from_content({
+            "generators": generators,
+            "count": len(generators),
+            "api_version": API_VERSION,
+        })
+
+        self._full_schemas: Dict[str, SerializedPayload] = {}
+        self._ui_schemas: Dict[str, SerializedPayload] = {}
+        for key in self.generator_keys:
+            gen_class = GeneratorFactory.get(key)
+            schema = GeneratorFactory.get_schema(key)
+            if not gen_class or not schema:
+                continue
+            self._full_schemas[key] = SerializedPayload.from_content(_full_schema_content(schema))
+            self._ui_schemas[key] = SerializedPayload.from_content(_ui_schema_content(gen_class))
+
+    @staticmethod
+    def _resolve(key: str) -> str:
+        normalized = key.upper()
+        return GeneratorFactory._ALIASES.get(normalized, normalized)
+
+    def full_schema(self, key: str) -> Optional[SerializedPayload]:
+        return self._full_schemas.get(self._resolve(key))
+
+    def ui_schema(self, key: str) -> Optional[SerializedPayload]:
+        return self._ui_schemas.get(self._resolve(key))
+
+
+_snapshot: Optional[GeneratorRegistrySnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def _registry_version() -> Tuple[Any, ...]:
+    return (GeneratorFactory._registry_version, tuple(GeneratorFactory.DISABLED_GENERATORS))
+
+
+def get_registry_snapshot() -> GeneratorRegistrySnapshot:
+    """Snapshot courant (construit au premier appel, reconstruit si le registry a changé)"""
+    global _snapshot
+    snapshot = _snapshot
+    version = _registry_version()
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version != version:
+            start = time.perf_counter()
+            _snapshot = GeneratorRegistrySnapshot(version)
+            logger.info(
+                f"[GENERATOR_SNAPSHOT] {len(_snapshot.generator_keys)} générateurs "
+                f"en {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+        return _snapshot
+
+
+def warm_up_generators(seed: int = 0) -> Dict[str, Any]:
+    """
+    Lance une génération (paramètres par défaut) par générateur actif.
+
+    Returns:
+        {"generated": [...], "failed": {key: erreur}, "duration_ms": float}
+    """
+    start = time.perf_counter()
+    report: Dict[str, Any] = {"generated": [], "failed": {}}
+    for key in get_registry_snapshot().generator_keys:
+        try:
+            GeneratorFactory.generate(key, seed=seed)
+            report["generated"].append(key)
+        except Exception as e:
+            report["failed"][key] = f"{type(e).__name__}: {str(e)[:200]}"
+    report["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    logger.info(
+        f"[GENERATOR_WARMUP] {len(report['generated'])} générateurs prêts, "
+        f"{len(report['failed'])} en échec, {report['duration_ms']} ms"
+    )
+    return report
+
+
+__all__ = [
+    "SerializedPayload",
+    "GeneratorRegistrySnapshot",
+    "get_registry_snapshot",
+    "warm_up_generators",
+]
@@ -4,15 +4,23 @@ Version améliorée avec rendu SVG de qualité MathALÉA
 """
 
 import json
+import os
 import re
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.figure import Figure
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 from io import StringIO, BytesIO
 import base64
 import logging
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable
 
 # Import du nouveau système SVG
 from backend.geometry_svg_renderer import geometry_svg_renderer
@@ -22,6 +30,123 @@ from backend.services.math_text_service import MathTextService
 
 logger = logging.getLogger(__name__)
 
+# Pattern to find geometric schema JSON embedded in exercise text
+SCHEMA_PATTERN = re.compile(r'\{\s*"type"\s*:\s*"schema_geometrique"[^}]*\}')
+
+# Incrémenter pour invalider le cache disque quand le rendu change
+RENDER_CACHE_VERSION = "1"
+RENDER_CACHE_SIZE = int(os.environ.get("GEOMETRY_RENDER_CACHE_SIZE", "256"))
+RENDER_CACHE_DIR = os.environ.get(
+    "GEOMETRY_RENDER_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "lemaitremot_cache", "geometry")
+)
+RENDER_WORKERS = int(os.environ.get("GEOMETRY_RENDER_WORKERS", "4"))
+
+
+def canonical_schema_key(schema_data: Dict[str, Any]) -> str:
+    """Clé canonique d'un schéma : JSON trié et compact (ordre des clés indifférent)"""
+    return json.dumps(schema_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+class GeometryRenderCache:
+    """
+    Cache des figures rendues, à deux niveaux :
+        - LRU borné en mémoire
+        - Fichiers sur disque (survie aux redémarrages, partagé entre workers)
+
+    Les clés sont (mode, JSON canonique du schéma). Seuls les rendus réussis
+    sont stockés : une erreur de rendu n'est jamais mise en cache.
+    """
+
+    def __init__(self, max_size: int = RENDER_CACHE_SIZE, cache_dir: Optional[str] = RENDER_CACHE_DIR):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_dir: Optional[Path] = None
+        if cache_dir:
+            try:
+                self.cache_dir = Path(cache_dir)
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Geometry render disk cache disabled ({cache_dir}): {e}")
+                self.cache_dir = None
+
+        # Métriques
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, mode: str, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(f"{RENDER_CACHE_VERSION}:{mode}:{key}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.{mode}"
+
+    def _remember(self, cache_key: Tuple[str, str], value: str) -> None:
+        with self._lock:
+            self._entries[cache_key] = value
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, mode: str, key: str) -> Optional[str]:
+        """Retourne le rendu en cache (mémoire puis disque), None si absent"""
+        cache_key = (mode, key)
+        with self._lock:
+            value = self._entries.get(cache_key)
+            if value is not None:
+                self._entries.move_to_end(cache_key)
+                self.memory_hits += 1
+                return value
+
+        path = self._disk_path(mode, key)
+        if path is not None and path.exists():
+            try:
+                value = path.read_text(encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"Geometry render disk cache read failed: {e}")
+            else:
+                self.disk_hits += 1
+                self._remember(cache_key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, mode: str, key: str, value: str) -> None:
+        """Stocke un rendu en mémoire et sur disque (écriture atomique)"""
+        self._remember((mode, key), value)
+
+        path = self._disk_path(mode, key)
+        if path is None:
+            return
+        try:
+            tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(value, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Geometry render disk cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Vide le niveau mémoire et remet les métriques à zéro"""
+        with self._lock:
+            self._entries.clear()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(hits / total * 100, 2) if total else 0.0,
+            "memory_size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
 
 class GeometryRenderer:
     """Converts structured geometric data to SVG figures"""
@@ -53,6 +178,10 @@ class GeometryRenderer:
             'cercle': self._render_circle,
             'parallelogramme': self._render_parallelogram
         }
+
+        self.render_cache = GeometryRenderCache()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
     
     def _get_smart_default_points(self, needed_count: int, figure_type: str = "") -> List[str]:
         """Generate intelligent default points - NEVER use A,B,C as first choice"""
@@ -85,7 +214,9 @@ class GeometryRenderer:
     
     def _create_figure(self, width: float = 8, height: float = 6) -> Tuple[plt.Figure, plt.Axes]:
         """Create a clean matplotlib figure for geometric rendering"""
-        fig, ax = plt.subplots(figsize=(width, height))
+        # API objet (sans pyplot) : les figures peuvent être rendues depuis plusieurs threads
+        fig = Figure(figsize=(width, height))
+        ax = fig.add_subplot(111)
         ax.set_aspect('equal')
         ax.axis('off')
         ax.grid(False)
@@ -408,37 +539,62 @@ class GeometryRenderer:
             logger.error(f"Error converting SVG to Base64: {e}")
             return ""
     
+    def _render_svg_figure(self, schema_data: Dict[str, Any]) -> str:
+        """Render a geometric figure as SVG without caching (raises on rendering errors)"""
+        figure_type = schema_data.get('figure', 'triangle')
+
+        # Nouveau système SVG pour une meilleure qualité
+        if figure_type == 'rectangle':
+            return geometry_svg_renderer.render_rectangle(schema_data)
+        elif figure_type == 'triangle_rectangle':
+            return geometry_svg_renderer.render_triangle_rectangle(schema_data)
+        elif figure_type == 'triangle':
+            return geometry_svg_renderer.render_triangle(schema_data)
+        elif figure_type == 'cercle':
+            return geometry_svg_renderer.render_cercle(schema_data)
+        elif figure_type == 'mediatrice' or figure_type == 'construction_mediatrice':
+            return geometry_svg_renderer.render_mediatrice_construction(schema_data)
+        elif figure_type in self.figure_renderers:
+            # Fallback vers l'ancien système pour les autres types
+            return self.figure_renderers[figure_type](schema_data)
+        else:
+            logger.warning(f"Unknown figure type: {figure_type}")
+            return f'<span style="color: orange; font-style: italic;">[Figure non supportée: {figure_type}]</span>'
+
     def render_geometric_figure(self, schema_data: Dict[str, Any]) -> str:
-        """Render a geometric figure from structured data as SVG (for PDF) - Version améliorée"""
+        """Render a geometric figure from structured data as SVG (for PDF) - Version améliorée (avec cache)"""
         figure_type = schema_data.get('figure', 'triangle')
-        
-        # Nouveau système SVG pour une meilleure qualité (avec cache)
+        key = canonical_schema_key(schema_data)
+
+        cached = self.render_cache.get("svg", key)
+        if cached is not None:
+            return cached
+
         try:
-            # Cache simple pour éviter les re-calculs identiques
-            cache_key = f"{figure_type}_{hash(str(sorted(schema_data.items())))}"
-            
-            if figure_type == 'rectangle':
-                return geometry_svg_renderer.render_rectangle(schema_data)
-            elif figure_type == 'triangle_rectangle':
-                return geometry_svg_renderer.render_triangle_rectangle(schema_data)
-            elif figure_type == 'triangle':
-                return geometry_svg_renderer.render_triangle(schema_data)
-            elif figure_type == 'cercle':
-                return geometry_svg_renderer.render_cercle(schema_data)
-            elif figure_type == 'mediatrice' or figure_type == 'construction_mediatrice':
-                return geometry_svg_renderer.render_mediatrice_construction(schema_data)
-            elif figure_type in self.figure_renderers:
-                # Fallback vers l'ancien système pour les autres types
-                return self.figure_renderers[figure_type](schema_data)
-            else:
-                logger.warning(f"Unknown figure type: {figure_type}")
-                return f'<span style="color: orange; font-style: italic;">[Figure non supportée: {figure_type}]</span>'
+            svg_content = self._render_svg_figure(schema_data)
         except Exception as e:
             logger.error(f"Error rendering {figure_type}: {e}")
             return f'<span style="color: red; font-style: italic;">[Erreur rendu figure: {figure_type}]</span>'
+
+        self.render_cache.set("svg", key, svg_content)
+        return svg_content
     
     def render_geometry_to_base64(self, schema_data: Dict[str, Any]) -> str:
-        """Render a geometric figure from structured data as Base64 PNG (for web display) - Version améliorée"""
+        """Render a geometric figure from structured data as Base64 PNG (for web display) - Version améliorée (avec cache)"""
+        key = canonical_schema_key(schema_data)
+
+        cached = self.render_cache.get("b64", key)
+        if cached is not None:
+            return cached
+
+        base64_content = self._render_base64_figure(schema_data)
+        # Une chaîne vide signale un échec de rendu : on ne la met pas en cache
+        if base64_content:
+            self.render_cache.set("b64", key, base64_content)
+        return base64_content
+
+    def _render_base64_figure(self, schema_data: Dict[str, Any]) -> str:
+        """Render a geometric figure as Base64 without caching"""
         figure_type = schema_data.get('figure', 'triangle')
         
         # Nouveau système SVG pour une meilleure qualité (converti en Base64)
@@ -593,9 +749,7 @@ class GeometryRenderer:
         if not text:
             return None
         
-        # Pattern to find geometric schema JSON
-        pattern = r'\{\s*"type"\s*:\s*"schema_geometrique"[^}]*\}'
-        match = re.search(pattern, text)
+        match = SCHEMA_PATTERN.search(text)
         
         if match:
             try:
@@ -613,71 +767,131 @@ class GeometryRenderer:
                 return None
         
         return None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=RENDER_WORKERS,
+                    thread_name_prefix="geometry-render"
+                )
+            return self._executor
+
+    def _render_distinct_schemas(self, texts: List[str],
+                                 render: Callable[[Dict[str, Any]], str]) -> Dict[str, Any]:
+        """
+        Rend une seule fois chaque schéma distinct présent dans les textes.
+
+        Les schémas sont dédupliqués sur leur JSON canonique ; quand plusieurs
+        schémas distincts sont à rendre, ils le sont en parallèle.
+
+        Returns:
+            Dict {JSON brut du schéma: rendu (str) ou exception levée}
+        """
+        # JSON brut -> JSON canonique (ou exception de parsing)
+        raw_to_key: Dict[str, Any] = {}
+        distinct: Dict[str, Dict[str, Any]] = {}
+        for text in texts:
+            if not text:
+                continue
+            for match in SCHEMA_PATTERN.finditer(text):
+                schema_json = match.group(0)
+                if schema_json in raw_to_key:
+                    continue
+                try:
+                    schema_data = json.loads(schema_json)
+                except json.JSONDecodeError as e:
+                    raw_to_key[schema_json] = e
+                    continue
+                if schema_data.get('type') != 'schema_geometrique':
+                    raw_to_key[schema_json] = None
+                    continue
+                key = canonical_schema_key(schema_data)
+                raw_to_key[schema_json] = key
+                distinct.setdefault(key, schema_data)
+
+        rendered: Dict[str, Any] = {}
+
+        def safe_render(schema_data: Dict[str, Any]) -> Any:
+            try:
+                return render(schema_data)
+            except Exception as e:
+                return e
+
+        if len(distinct) > 1 and RENDER_WORKERS > 1:
+            keys = list(distinct)
+            results = self._get_executor().map(lambda k: safe_render(distinct[k]), keys)
+            rendered = dict(zip(keys, results))
+        else:
+            rendered = {key: safe_render(schema_data) for key, schema_data in distinct.items()}
+
+        results_by_raw: Dict[str, Any] = {}
+        for schema_json, key in raw_to_key.items():
+            if isinstance(key, str):
+                results_by_raw[schema_json] = rendered[key]
+            else:
+                results_by_raw[schema_json] = key
+        return results_by_raw
+
+    def _web_figure_html(self, schema_json: str, outcome: Any) -> str:
+        if isinstance(outcome, json.JSONDecodeError):
+            logger.error(f"Invalid JSON in geometric schema: {outcome}")
+            return f'<span style="color: red; font-style: italic;">[Schéma géométrique invalide]</span>'
+        if isinstance(outcome, Exception):
+            logger.error(f"Error processing geometric schema for web: {outcome}")
+            return f'<span style="color: red; font-style: italic;">[Erreur schéma géométrique]</span>'
+        if outcome is None:
+            return schema_json  # Return original if no processing needed
+
+        if outcome:
+            return f'<div class="geometric-figure" style="text-align: center; margin: 15px 0;"><img src="data:image/png;base64,{outcome}" alt="Schéma géométrique" style="max-width: 400px; height: auto;"/></div>'
+
+        # Fallback to text description if Base64 generation fails
+        schema_data = json.loads(schema_json)
+        figure_name = schema_data.get('figure', 'figure')
+        points = ', '.join(schema_data.get('points', []))
+        return f'<div style="text-align: center; margin: 15px 0; padding: 10px; border: 1px dashed #ccc; font-style: italic;">[Schéma: {figure_name} avec points {points}]</div>'
+
+    def _pdf_figure_html(self, schema_json: str, outcome: Any) -> str:
+        if isinstance(outcome, json.JSONDecodeError):
+            logger.error(f"Invalid JSON in geometric schema: {outcome}")
+            return f'<span style="color: red; font-style: italic;">[Schéma géométrique invalide]</span>'
+        if isinstance(outcome, Exception):
+            logger.error(f"Error processing geometric schema: {outcome}")
+            return f'<span style="color: red; font-style: italic;">[Erreur schéma géométrique]</span>'
+        if outcome is None:
+            return schema_json  # Return original if no processing needed
+        return f'<div class="geometric-figure" style="text-align: center; margin: 15px 0;">{outcome}</div>'
+
+    def process_geometric_schemas_for_web_batch(self, texts: List[Optional[str]]) -> List[Optional[str]]:
+        """Process several texts at once, rendering each distinct schema only once (web display)"""
+        outcomes = self._render_distinct_schemas(texts, self.render_geometry_to_base64)
+        return [
+            SCHEMA_PATTERN.sub(lambda m: self._web_figure_html(m.group(0), outcomes[m.group(0)]), text)
+            if text else text
+            for text in texts
+        ]
+
+    def process_geometric_schemas_batch(self, texts: List[Optional[str]]) -> List[Optional[str]]:
+        """Process several texts at once, rendering each distinct schema only once (PDF)"""
+        outcomes = self._render_distinct_schemas(texts, self.render_geometric_figure)
+        return [
+            SCHEMA_PATTERN.sub(lambda m: self._pdf_figure_html(m.group(0), outcomes[m.group(0)]), text)
+            if text else text
+            for text in texts
+        ]
     
     def process_geometric_schemas_for_web(self, text: str) -> str:
         """Process text to replace geometric schemas with Base64 images for web display"""
         if not text:
             return text
-        
-        # Pattern to find geometric schema JSON
-        pattern = r'\{\s*"type"\s*:\s*"schema_geometrique"[^}]*\}'
-        
-        def replace_schema_with_base64(match):
-            try:
-                schema_json = match.group(0)
-                schema_data = json.loads(schema_json)
-                
-                if schema_data.get('type') == 'schema_geometrique':
-                    base64_image = self.render_geometry_to_base64(schema_data)
-                    
-                    if base64_image:
-                        return f'<div class="geometric-figure" style="text-align: center; margin: 15px 0;"><img src="data:image/png;base64,{base64_image}" alt="Schéma géométrique" style="max-width: 400px; height: auto;"/></div>'
-                    else:
-                        # Fallback to text description if Base64 generation fails
-                        figure_name = schema_data.get('figure', 'figure')
-                        points = ', '.join(schema_data.get('points', []))
-                        return f'<div style="text-align: center; margin: 15px 0; padding: 10px; border: 1px dashed #ccc; font-style: italic;">[Schéma: {figure_name} avec points {points}]</div>'
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in geometric schema: {e}")
-                return f'<span style="color: red; font-style: italic;">[Schéma géométrique invalide]</span>'
-            except Exception as e:
-                logger.error(f"Error processing geometric schema for web: {e}")
-                return f'<span style="color: red; font-style: italic;">[Erreur schéma géométrique]</span>'
-            
-            return match.group(0)  # Return original if no processing needed
-        
-        result = re.sub(pattern, replace_schema_with_base64, text)
-        return result
+        return self.process_geometric_schemas_for_web_batch([text])[0]
     
     def process_geometric_schemas(self, text: str) -> str:
         """Process text to find and render geometric schemas as SVG (for PDF)"""
         if not text:
             return text
-        
-        # Pattern to find geometric schema JSON
-        pattern = r'\{\s*"type"\s*:\s*"schema_geometrique"[^}]*\}'
-        
-        def replace_schema(match):
-            try:
-                schema_json = match.group(0)
-                schema_data = json.loads(schema_json)
-                
-                if schema_data.get('type') == 'schema_geometrique':
-                    svg_content = self.render_geometric_figure(schema_data)
-                    return f'<div class="geometric-figure" style="text-align: center; margin: 15px 0;">{svg_content}</div>'
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in geometric schema: {e}")
-                return f'<span style="color: red; font-style: italic;">[Schéma géométrique invalide]</span>'
-            except Exception as e:
-                logger.error(f"Error processing geometric schema: {e}")
-                return f'<span style="color: red; font-style: italic;">[Erreur schéma géométrique]</span>'
-            
-            return match.group(0)  # Return original if no processing needed
-        
-        result = re.sub(pattern, replace_schema, text)
-        return result
+        return self.process_geometric_schemas_batch([text])[0]
 
 
 # Global instance
@@ -3,7 +3,10 @@ Geometry SVG Renderer - Système de rendu géométrique moderne
 Inspiré de la qualité MathALÉA avec rendu SVG vectoriel pur
 """
 
+import hashlib
 import math
+import os
+import re
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
@@ -11,6 +14,61 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Sérialisation compacte (coordonnées à précision fixe, grille en un seul <path>,
+# attributs de style mutualisés en classes CSS). GEOMETRY_SVG_COMPACT=0 pour la désactiver.
+GEOMETRY_SVG_COMPACT = os.environ.get("GEOMETRY_SVG_COMPACT", "1") != "0"
+COORD_PRECISION = 2
+
+# Feuille de style intégrée à chaque SVG (sélecteur de classe -> propriétés)
+BASE_STYLES = {
+    'geometry-line': {'fill': 'none', 'stroke-width': '1.5px'},
+    'geometry-construction': {'fill': 'none', 'stroke-width': '2px', 'stroke': '#FF6600'},
+    'geometry-point': {'fill': '#000000'},
+    'geometry-text': {'font-family': 'Arial, sans-serif', 'font-size': '14px', 'fill': '#000000', 'font-weight': 'bold'},
+    'right-angle-mark': {'fill': 'none', 'stroke': '#000000', 'stroke-width': '1px'},
+}
+
+# Attributs de présentation (une règle CSS de classe l'emporte toujours sur eux)
+PRESENTATION_ATTRS = (
+    'fill', 'stroke', 'stroke-width', 'stroke-dasharray', 'opacity',
+    'font-family', 'font-size', 'font-weight', 'text-anchor',
+)
+# Attributs mutualisables en classe ; les couleurs restent sur l'élément
+# (les contrôles sujet/corrigé repèrent les tracés de construction à leur couleur)
+SHARED_STYLE_ATTRS = ('stroke-width', 'stroke-dasharray', 'opacity', 'font-family', 'font-size', 'font-weight', 'text-anchor')
+_LENGTH_PROPERTIES = ('stroke-width', 'font-size')
+
+COORD_ATTRS = ('x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'width', 'height')
+_NUMBER_RE = re.compile(r'-?\d+\.\d+(?:e-?\d+)?')
+
+
+def format_coord(value: float) -> str:
+    """Coordonnée à précision fixe, sans zéros inutiles (123.456789 -> "123.46", 40.0 -> "40")"""
+    text = f"{value:.{COORD_PRECISION}f}".rstrip('0').rstrip('.')
+    return "0" if text == "-0" else text
+
+
+def _stylesheet(rules: Dict[str, Dict[str, str]], compact: bool) -> str:
+    if compact:
+        return "".join(
+            f".{name}{{{';'.join(f'{prop}:{value}' for prop, value in props.items())}}}"
+            for name, props in rules.items()
+        )
+    lines = [
+        f".{name} {{ {' '.join(f'{prop}: {value};' for prop, value in props.items())} }}"
+        for name, props in rules.items()
+    ]
+    return "\n        " + "\n        ".join(lines) + "\n        "
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
 @dataclass
 class Point:
     """Représente un point géométrique avec label"""
@@ -73,10 +131,11 @@ class Line:
 class GeometrySVGRenderer:
     """Rendu géométrique SVG de qualité MathALÉA"""
     
-    def __init__(self, width: int = 400, height: int = 300):
+    def __init__(self, width: int = 400, height: int = 300, compact: Optional[bool] = None):
         self.width = width
         self.height = height
         self.margin = 40
+        self.compact = GEOMETRY_SVG_COMPACT if compact is None else compact
         self.style_config = {
             'line_color': '#000000',
             'line_width': 1.5,
@@ -100,16 +159,73 @@ class GeometrySVGRenderer:
         
         # Style CSS intégré
         style = ET.SubElement(svg, 'style')
-        style.text = """
-        .geometry-line { fill: none; stroke-width: 1.5px; }
-        .geometry-construction { fill: none; stroke-width: 2px; stroke: #FF6600; }
-        .geometry-point { fill: #000000; }
-        .geometry-text { font-family: Arial, sans-serif; font-size: 14px; fill: #000000; font-weight: bold; }
-        .right-angle-mark { fill: none; stroke: #000000; stroke-width: 1px; }
-        """
+        style.text = _stylesheet(BASE_STYLES, self.compact)
         
         return svg
     
+    def serialize(self, svg: ET.Element) -> str:
+        """Sérialise le SVG (compacté si le mode compact est actif)"""
+        if self.compact:
+            self._share_styles(svg)
+            self._round_coordinates(svg)
+        return ET.tostring(svg, encoding='unicode')
+    
+    def _round_coordinates(self, svg: ET.Element) -> None:
+        """Coordonnées à précision fixe (str(float) peut produire 17 chiffres)"""
+        for elem in svg.iter():
+            for attr in COORD_ATTRS:
+                value = elem.get(attr)
+                if value is not None:
+                    try:
+                        elem.set(attr, format_coord(float(value)))
+                    except ValueError:
+                        pass  # "100%", etc.
+            for attr in ('points', 'd'):
+                value = elem.get(attr)
+                if value:
+                    elem.set(attr, _NUMBER_RE.sub(lambda m: format_coord(float(m.group())), value))
+    
+    def _share_styles(self, svg: ET.Element) -> None:
+        """
+        Mutualise les attributs de style répétés dans des classes CSS.
+        
+        Les attributs de présentation déjà fixés par une règle de BASE_STYLES
+        (qui l'emporte sur eux) sont supprimés : le rendu est inchangé.
+        """
+        style = svg.find('style')
+        declarations = {}
+        for elem in svg.iter():
+            if elem is svg or elem is style:
+                continue
+            overridden = set()
+            for name in elem.get('class', '').split():
+                overridden.update(BASE_STYLES.get(name, {}))
+            for attr in PRESENTATION_ATTRS:
+                if attr in overridden and attr in elem.attrib:
+                    del elem.attrib[attr]
+            key = tuple((attr, elem.attrib[attr]) for attr in SHARED_STYLE_ATTRS if attr in elem.attrib)
+            if key:
+                declarations.setdefault(key, []).append(elem)
+        
+        rules = {}
+        for key, elems in declarations.items():
+            if len(elems) < 2:
+                continue  # Une classe pour un seul élément ne fait rien gagner
+            # Nom dérivé des déclarations : plusieurs SVG intégrés dans une même page HTML
+            # partagent leurs <style>, un même nom doit donc toujours désigner le même style
+            name = "s" + hashlib.md5(repr(key).encode()).hexdigest()[:6]
+            rules[name] = {
+                attr: f"{value}px" if attr in _LENGTH_PROPERTIES and _is_number(value) else value
+                for attr, value in key
+            }
+            for elem in elems:
+                for attr, _ in key:
+                    del elem.attrib[attr]
+                classes = elem.get('class')
+                elem.set('class', f"{classes} {name}" if classes else name)
+        if rules and style is not None:
+            style.text += _stylesheet(rules, compact=True)
+    
     def add_grid(self, svg: ET.Element, grid_size: int, cell_size: float, offset_x: float, offset_y: float):
         """
         Ajoute une grille de fond au SVG (quadrillage pédagogique)
@@ -124,6 +240,20 @@ class GeometrySVGRenderer:
         grid_color = "#E8E8E8"  # Gris très clair
         grid_width = 0.5
         
+        if self.compact:
+            # Toute la grille en un seul <path>
+            y_start, y_end = format_coord(offset_y), format_coord(self.height - offset_y)
+            x_start, x_end = format_coord(offset_x), format_coord(self.width - offset_x)
+            segments = [f"M{format_coord(offset_x + i * cell_size)} {y_start}V{y_end}" for i in range(grid_size + 1)]
+            segments += [f"M{x_start} {format_coord(offset_y + i * cell_size)}H{x_end}" for i in range(grid_size + 1)]
+            ET.SubElement(svg, 'path', {
+                'd': "".join(segments),
+                'stroke': grid_color,
+                'stroke-width': str(grid_width),
+                'class': 'grid-line'
+            })
+            return
+        
         # Lignes verticales
         for i in range(grid_size + 1):
             x = offset_x + i * cell_size
@@ -367,7 +497,7 @@ class GeometrySVGRenderer:
         })
         text_largeur.text = f"{largeur_math} cm"
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_triangle_rectangle(self, data: Dict[str, Any]) -> str:
         """Rendu d'un triangle rectangle de qualité MathALÉA"""
@@ -422,7 +552,7 @@ class GeometrySVGRenderer:
                         line = Line(point_map[p1_name], point_map[p2_name])
                         self.add_dimension_label(svg, line, f"{longueur} cm")
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_mediatrice_construction(self, data: Dict[str, Any]) -> str:
         """Rendu d'une construction de médiatrice comme MathALÉA"""
@@ -460,7 +590,7 @@ class GeometrySVGRenderer:
         # Marquer l'angle droit de la médiatrice
         self.add_right_angle_mark(svg, midpoint_jk, mediatrice.start, J, 8)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_triangle(self, data: Dict[str, Any]) -> str:
         """Rendu d'un triangle général de qualité MathALÉA"""
@@ -522,7 +652,7 @@ class GeometrySVGRenderer:
                         line = Line(point_map[p1_name], point_map[p2_name])
                         self.add_dimension_label(svg, line, f"{longueur}")
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_cercle(self, data: Dict[str, Any]) -> str:
         """Rendu d'un cercle de qualité MathALÉA - Optimisé pour mobile"""
@@ -599,7 +729,7 @@ class GeometrySVGRenderer:
         })
         text_label.text = f"r = {rayon_mathematique} cm"
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_thales(self, data: Dict[str, Any]) -> str:
         """Rendu d'une configuration de Thalès de qualité MathALÉA"""
@@ -699,7 +829,7 @@ class GeometrySVGRenderer:
                     line = Line(point_map[p1_name], point_map[p2_name])
                     self.add_dimension_label(svg, line, f"{longueur}")
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_symetrie_axiale_question_et_correction(self, data: Dict[str, Any]) -> tuple:
         """
@@ -943,7 +1073,7 @@ class GeometrySVGRenderer:
                 'fill': '#FF0000'
             })
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_symetrie_centrale_question_et_correction(self, data: Dict[str, Any]) -> tuple:
         """
@@ -1191,7 +1321,7 @@ class GeometrySVGRenderer:
                                    color="#666666", width=1, style="dashed")
                 self.add_line(svg, full_segment)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     # ============================================================================
     # MÉTHODES DE RENDU POUR LES FIGURES SPRINT
@@ -1321,7 +1451,7 @@ class GeometrySVGRenderer:
         for point in point_objects:
             self.add_point(svg, point, show_label=True)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_quadrilatere(self, data: Dict[str, Any]) -> str:
         """
@@ -1378,7 +1508,7 @@ class GeometrySVGRenderer:
         for point in point_objects:
             self.add_point(svg, point, show_label=True)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_segments(self, data: Dict[str, Any]) -> str:
         """
@@ -1441,7 +1571,7 @@ class GeometrySVGRenderer:
             self.add_point(svg, p1, show_label=True)
             self.add_point(svg, p2, show_label=True)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def render_grid_with_points(self, data: Dict[str, Any]) -> str:
         """
@@ -1462,7 +1592,7 @@ class GeometrySVGRenderer:
         
         # Si grille seule
         if data.get("grid_only", False):
-            return ET.tostring(svg, encoding='unicode')
+            return self.serialize(svg)
         
         # Points
         points_data = data.get("points", [])
@@ -1476,7 +1606,7 @@ class GeometrySVGRenderer:
             point = Point(x_svg, y_svg, point_info.get("name", ""))
             self.add_point(svg, point, show_label=True)
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
     
     def _add_grid(self, svg: ET.Element):
         """Ajoute une grille 10x10 au SVG"""
@@ -1484,6 +1614,22 @@ class GeometrySVGRenderer:
         cell_width = (self.width - 2 * self.margin) / grid_size
         cell_height = (self.height - 2 * self.margin) / grid_size
         
+        if self.compact:
+            # Un <path> pour les lignes fines, un pour les lignes tous les 5 carreaux
+            y_start, y_end = format_coord(self.margin), format_coord(self.height - self.margin)
+            x_start, x_end = format_coord(self.margin), format_coord(self.width - self.margin)
+            for major, stroke, stroke_width in ((False, '#CCCCCC', '0.5'), (True, '#999999', '1')):
+                indices = [i for i in range(grid_size + 1) if (i % 5 == 0) == major]
+                segments = [f"M{format_coord(self.margin + i * cell_width)} {y_start}V{y_end}" for i in indices]
+                segments += [f"M{x_start} {format_coord(self.margin + i * cell_height)}H{x_end}" for i in indices]
+                ET.SubElement(svg, 'path', {
+                    'd': "".join(segments),
+                    'fill': 'none',
+                    'stroke': stroke,
+                    'stroke-width': stroke_width
+                })
+            return
+        
         # Lignes verticales
         for i in range(grid_size + 1):
             x = self.margin + i * cell_width
@@ -1623,7 +1769,7 @@ class GeometrySVGRenderer:
                     'fill': '#FF0000'
                 }).text = point_name
         
-        return ET.tostring(svg, encoding='unicode')
+        return self.serialize(svg)
 
 # Instance globale
 geometry_svg_renderer = GeometrySVGRenderer()
@@ -0,0 +1,239 @@
+"""
+Cache des enrichissements IA (énoncés / corrections)
+
+Une même entrée (prompt système, prompt utilisateur construit à partir de
+enonce_brut/solution_brut, data et niveau, modèle) produit la même demande au
+LLM : on la met en cache pour ne pas la renvoyer à chaque export.
+
+- Niveau 1 : LRU en mémoire (par process)
+- Niveau 2 : collection ai_enrichment_cache de la base de l'application
+  (partagée, persistante, TTL) ; l'appelant passe son handle `db`, le cache
+  n'ouvre pas de client MongoDB
+- Les demandes identiques simultanées partagent un seul appel LLM
+- Seules les réponses valides sont stockées (jamais les fallbacks)
+
+Variables d'environnement:
+- AI_ENRICHMENT_CACHE_SIZE: taille du LRU mémoire (défaut 2048)
+- AI_ENRICHMENT_CACHE_TTL_DAYS: durée de vie en base (défaut 30)
+- AI_ENRICHMENT_CACHE_PERSIST: 0 pour désactiver le niveau MongoDB
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.constants.collections import AI_ENRICHMENT_CACHE_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+AI_ENRICHMENT_CACHE_SIZE = int(os.environ.get("AI_ENRICHMENT_CACHE_SIZE", "2048"))
+AI_ENRICHMENT_CACHE_TTL_DAYS = int(os.environ.get("AI_ENRICHMENT_CACHE_TTL_DAYS", "30"))
+AI_ENRICHMENT_CACHE_PERSIST = os.environ.get("AI_ENRICHMENT_CACHE_PERSIST", "1") == "1"
+
+# Après une erreur MongoDB, le niveau persistant est ignoré pendant ce délai
+STORE_RETRY_DELAY_SECONDS = 60
+
+
+def enrichment_cache_key(kind: str, model: str, system_prompt: str, user_prompt: str) -> str:
+    """Hash des entrées du prompt et du modèle"""
+    payload = json.dumps(
+        {"kind": kind, "model": model, "system": system_prompt, "user": user_prompt},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EnrichmentCache:
+    """Cache à deux niveaux (mémoire + MongoDB) avec métriques hit/miss"""
+
+    def __init__(
+        self,
+        max_size: int = AI_ENRICHMENT_CACHE_SIZE,
+        persist: bool = AI_ENRICHMENT_CACHE_PERSIST,
+        ttl_days: int = AI_ENRICHMENT_CACHE_TTL_DAYS,
+    ):
+        self.max_size = max_size
+        self.ttl_days = ttl_days
+        self.persist = persist
+        self._store_disabled_until = 0.0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        self._metrics = {
+            "memory_hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "inflight_joins": 0,
+            "llm_calls": 0,
+            "stored": 0,
+            "store_errors": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._metrics[name] += 1
+
+    # ------------------------------------------------------------------
+    # Niveau mémoire
+    # ------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            return value
+
+    def _memory_set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Niveau MongoDB
+    # ------------------------------------------------------------------
+
+    def _get_collection(self, db):
+        if db is None or not self.persist or time.monotonic() < self._store_disabled_until:
+            return None
+        return db[AI_ENRICHMENT_CACHE_COLLECTION]
+
+    def _store_failed(self, action: str, error: Exception) -> None:
+        self._count("store_errors")
+        self._store_disabled_until = time.monotonic() + STORE_RETRY_DELAY_SECONDS
+        logger.warning(f"[AI_CACHE] {action} impossible, cache persistant ignoré {STORE_RETRY_DELAY_SECONDS}s: {error}")
+
+    async def _store_get(self, key: str, db) -> Optional[str]:
+        collection = self._get_collection(db)
+        if collection is None:
+            return None
+        try:
+            doc = await collection.find_one(
+                {"key": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                {"_id": 0, "result": 1}
+            )
+        except Exception as e:
+            self._store_failed("Lecture", e)
+            return None
+        return doc["result"] if doc else None
+
+    async def _store_set(self, key: str, kind: str, model: str, value: str, db) -> None:
+        collection = self._get_collection(db)
+        if collection is None:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            await collection.update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "kind": kind,
+                    "model": model,
+                    "result": value,
+                    "created_at": now,
+                    "expires_at": now + timedelta(days=self.ttl_days),
+                }},
+                upsert=True
+            )
+            self._count("stored")
+        except Exception as e:
+            self._store_failed("Écriture", e)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    async def get_or_compute(
+        self,
+        kind: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        compute: Callable[[], Awaitable[Optional[str]]],
+        db: Any = None,
+    ) -> Optional[str]:
+        """
+        Résultat en cache, sinon compute() (appel LLM).
+
+        compute() retourne None pour une réponse invalide : rien n'est alors
+        mis en cache et l'appelant applique son fallback. Sans db, seul le
+        niveau mémoire est utilisé.
+        """
+        key = enrichment_cache_key(kind, model, system_prompt, user_prompt)
+
+        value = self._memory_get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count("inflight_joins")
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[Optional[str]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._store_get(key, db)
+            if value is not None:
+                self._count("store_hits")
+                self._memory_set(key, value)
+            else:
+                self._count("misses")
+                self._count("llm_calls")
+                value = await compute()
+                if value is not None:
+                    self._memory_set(key, value)
+                    await self._store_set(key, kind, model, value, db)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # L'exception est propagée à l'appelant ; évite "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["memory_size"] = len(self._memory)
+        hits = metrics["memory_hits"] + metrics["store_hits"] + metrics["inflight_joins"]
+        total = hits + metrics["misses"]
+        metrics["hit_rate"] = round(hits / total, 3) if total else 0.0
+        return metrics
+
+    def clear(self) -> None:
+        """Vide le niveau mémoire et remet les métriques à zéro"""
+        with self._lock:
+            self._memory.clear()
+            for name in self._metrics:
+                self._metrics[name] = 0
+
+
+# Instance globale
+enrichment_cache = EnrichmentCache()
+
+
+def get_enrichment_cache_metrics() -> Dict[str, Any]:
+    return enrichment_cache.get_metrics()
+
+
+__all__ = [
+    "EnrichmentCache",
+    "enrichment_cache",
+    "enrichment_cache_key",
+    "get_enrichment_cache_metrics",
+    "AI_ENRICHMENT_CACHE_COLLECTION",
+]
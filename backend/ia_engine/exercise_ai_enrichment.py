@@ -14,15 +14,86 @@ import json
 from typing import Dict, Any, Optional
 from backend.utils_legacy import get_emergent_key
 from backend.emergentintegrations.llm.chat import LlmChat, UserMessage
+from .enrichment_cache import enrichment_cache
 
 logger = logging.getLogger(__name__)
 
+AI_ENRICHMENT_PROVIDER = "openai"
+AI_ENRICHMENT_MODEL = "gpt-4o"
+
+# Réponses plus courtes considérées invalides (fallback sur le texte brut)
+MIN_ENRICHED_LENGTH = 10
+
+STATEMENT_SYSTEM_PROMPT = """Tu es un assistant pédagogique spécialisé en mathématiques.
+
+**TA MISSION** :
+Reformuler l'énoncé d'exercice pour le rendre plus clair, plus pédagogique et mieux contextualisé, SANS JAMAIS modifier les valeurs numériques.
+
+**RÈGLES ABSOLUES** :
+1. ❌ Ne JAMAIS changer les nombres, valeurs, ou résultats
+2. ❌ Ne JAMAIS modifier les noms de points géométriques
+3. ❌ Ne JAMAIS ajouter de nouvelles données mathématiques
+4. ✅ Rendre la formulation plus claire et pédagogique
+5. ✅ Ajouter un léger contexte si pertinent (sans changer les maths)
+6. ✅ Adapter le vocabulaire au niveau scolaire
+
+**FORMAT DE RÉPONSE** :
+Réponds UNIQUEMENT avec l'énoncé reformulé, sans aucun commentaire ni explication supplémentaire."""
+
+CORRECTION_SYSTEM_PROMPT = """Tu es un professeur de mathématiques expérimenté.
+
+**TA MISSION** :
+Développer et enrichir la correction d'un exercice en détaillant les étapes du raisonnement, SANS JAMAIS modifier les résultats numériques.
+
+**RÈGLES ABSOLUES** :
+1. ❌ Ne JAMAIS changer les résultats, calculs finaux, ou valeurs
+2. ❌ Ne JAMAIS modifier les données mathématiques
+3. ✅ Développer chaque étape du raisonnement
+4. ✅ Expliquer les concepts mathématiques utilisés
+5. ✅ Ajouter des conseils méthodologiques
+6. ✅ Rendre la correction plus pédagogique et compréhensible
+7. ✅ Utiliser des phrases complètes et structurées
+
+**FORMAT DE RÉPONSE** :
+Réponds UNIQUEMENT avec la correction enrichie, sans aucun commentaire ni explication supplémentaire."""
+
+
+async def _run_enrichment(kind: str, system_prompt: str, user_prompt: str, db: Any = None) -> Optional[str]:
+    """
+    Appel LLM mis en cache (clé = hash des prompts et du modèle).
+    db : base de l'application pour le cache persistant (optionnel)
+
+    Returns:
+        str: Texte enrichi, ou None si la réponse est invalide (non mise en cache)
+    """
+    async def call_llm() -> Optional[str]:
+        chat = LlmChat(
+            system_message=system_prompt,
+            emergent_key=get_emergent_key()
+        ).with_model(AI_ENRICHMENT_PROVIDER, AI_ENRICHMENT_MODEL)
+
+        response = await chat.run(UserMessage(content=user_prompt))
+        enriched = response.strip()
+        if not enriched or len(enriched) < MIN_ENRICHED_LENGTH:
+            return None
+        return enriched
+
+    return await enrichment_cache.get_or_compute(
+        kind,
+        f"{AI_ENRICHMENT_PROVIDER}/{AI_ENRICHMENT_MODEL}",
+        system_prompt,
+        user_prompt,
+        call_llm,
+        db=db
+    )
+
 
 async def enrich_statement(
     enonce_brut: str,
     data: Dict[str, Any],
     niveau: str,
-    style: Optional[str] = None
+    style: Optional[str] = None,
+    db: Any = None
 ) -> str:
     """
     Enrichit un énoncé d'exercice en le reformulant de manière pédagogique
@@ -38,6 +109,7 @@ async def enrich_statement(
         data: Données mathématiques (IMMUABLES)
         niveau: Niveau scolaire (ex: "6e", "5e")
         style: Style de formulation optionnel
+        db: Base de l'application (cache persistant des enrichissements)
         
     Returns:
         str: Énoncé enrichi ou énoncé brut si erreur
@@ -45,26 +117,6 @@ async def enrich_statement(
     try:
         logger.info(f"🎨 Enrichissement énoncé (niveau: {niveau})")
         
-        # Récupérer la clé Emergent
-        emergent_key = get_emergent_key()
-        
-        # Créer le prompt système
-        system_prompt = """Tu es un assistant pédagogique spécialisé en mathématiques.
-
-**TA MISSION** :
-Reformuler l'énoncé d'exercice pour le rendre plus clair, plus pédagogique et mieux contextualisé, SANS JAMAIS modifier les valeurs numériques.
-
-**RÈGLES ABSOLUES** :
-1. ❌ Ne JAMAIS changer les nombres, valeurs, ou résultats
-2. ❌ Ne JAMAIS modifier les noms de points géométriques
-3. ❌ Ne JAMAIS ajouter de nouvelles données mathématiques
-4. ✅ Rendre la formulation plus claire et pédagogique
-5. ✅ Ajouter un léger contexte si pertinent (sans changer les maths)
-6. ✅ Adapter le vocabulaire au niveau scolaire
-
-**FORMAT DE RÉPONSE** :
-Réponds UNIQUEMENT avec l'énoncé reformulé, sans aucun commentaire ni explication supplémentaire."""
-
         # Créer le prompt utilisateur
         user_prompt = f"""**Énoncé à reformuler** :
 {enonce_brut}
@@ -76,17 +128,11 @@ Réponds UNIQUEMENT avec l'énoncé reformulé, sans aucun commentaire ni explic
 
 Reformule l'énoncé de manière plus pédagogique et claire, en respectant TOUTES les valeurs numériques."""
 
-        # Appel IA
-        chat = LlmChat(
-            system_message=system_prompt,
-            emergent_key=emergent_key
-        ).with_model('openai', 'gpt-4o')
-        
-        response = await chat.run(UserMessage(content=user_prompt))
-        enriched = response.strip()
+        # Appel IA (ou cache)
+        enriched = await _run_enrichment("statement", STATEMENT_SYSTEM_PROMPT, user_prompt, db)
         
         # Validation basique: vérifier que l'énoncé n'est pas vide
-        if not enriched or len(enriched) < 10:
+        if enriched is None:
             logger.warning("⚠️ Énoncé enrichi trop court, utilisation de l'original")
             return enonce_brut
         
@@ -102,7 +148,8 @@ Reformule l'énoncé de manière plus pédagogique et claire, en respectant TOUT
 async def enrich_correction(
     solution_brut: str,
     data: Dict[str, Any],
-    niveau: str
+    niveau: str,
+    db: Any = None
 ) -> str:
     """
     Enrichit une correction en développant les explications et étapes
@@ -117,6 +164,7 @@ async def enrich_correction(
         solution_brut: Solution originale générée
         data: Données mathématiques (IMMUABLES)
         niveau: Niveau scolaire
+        db: Base de l'application (cache persistant des enrichissements)
         
     Returns:
         str: Solution enrichie ou solution brute si erreur
@@ -124,27 +172,6 @@ async def enrich_correction(
     try:
         logger.info(f"📚 Enrichissement correction (niveau: {niveau})")
         
-        # Récupérer la clé Emergent
-        emergent_key = get_emergent_key()
-        
-        # Créer le prompt système
-        system_prompt = """Tu es un professeur de mathématiques expérimenté.
-
-**TA MISSION** :
-Développer et enrichir la correction d'un exercice en détaillant les étapes du raisonnement, SANS JAMAIS modifier les résultats numériques.
-
-**RÈGLES ABSOLUES** :
-1. ❌ Ne JAMAIS changer les résultats, calculs finaux, ou valeurs
-2. ❌ Ne JAMAIS modifier les données mathématiques
-3. ✅ Développer chaque étape du raisonnement
-4. ✅ Expliquer les concepts mathématiques utilisés
-5. ✅ Ajouter des conseils méthodologiques
-6. ✅ Rendre la correction plus pédagogique et compréhensible
-7. ✅ Utiliser des phrases complètes et structurées
-
-**FORMAT DE RÉPONSE** :
-Réponds UNIQUEMENT avec la correction enrichie, sans aucun commentaire ni explication supplémentaire."""
-
         # Créer le prompt utilisateur
         user_prompt = f"""**Correction à enrichir** :
 {solution_brut}
@@ -156,17 +183,11 @@ Réponds UNIQUEMENT avec la correction enrichie, sans aucun commentaire ni expli
 
 Développe cette correction de manière plus pédagogique et détaillée, en respectant TOUS les résultats numériques."""
 
-        # Appel IA
-        chat = LlmChat(
-            system_message=system_prompt,
-            emergent_key=emergent_key
-        ).with_model('openai', 'gpt-4o')
-        
-        response = await chat.run(UserMessage(content=user_prompt))
-        enriched = response.strip()
+        # Appel IA (ou cache)
+        enriched = await _run_enrichment("correction", CORRECTION_SYSTEM_PROMPT, user_prompt, db)
         
         # Validation basique
-        if not enriched or len(enriched) < 10:
+        if enriched is None:
             logger.warning("⚠️ Correction enrichie trop courte, utilisation de l'originale")
             return solution_brut
         
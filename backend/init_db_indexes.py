@@ -2,10 +2,18 @@
 """
 Database initialization script for Le Maître Mot
 Creates necessary indexes to ensure data integrity and security
+
+Indexes are declared in backend/constants/indexes.py (also applied at server startup).
+
+Usage:
+    python backend/init_db_indexes.py           # create missing indexes + cleanup
+    python backend/init_db_indexes.py --check   # drift report only, exit 1 on drift
 """
 
+import argparse
 import asyncio
 import os
+import sys
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from pathlib import Path
@@ -13,8 +21,24 @@ from pathlib import Path
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
+sys.path.insert(0, str(ROOT_DIR.parent))
+
+from backend.services.index_manager import apply_index_registry, has_drift
+
+def print_index_report(report):
+    """Print created / missing / conflicting / unexpected indexes per collection"""
+    for collection_name, collection_report in report.items():
+        for name in collection_report["created"]:
+            print(f"✅ {collection_name}.{name} created")
+        for name in set(collection_report["missing"]) - set(collection_report["created"]):
+            print(f"❌ {collection_name}.{name} missing")
+        for name in collection_report["conflicts"]:
+            print(f"⚠️  {collection_name}.{name} differs from registry")
+        for name in collection_report["unexpected"]:
+            print(f"ℹ️  {collection_name}.{name} not in registry")
+
 
-async def init_database_indexes():
+async def init_database_indexes(check_only=False):
     """Initialize database indexes for security and performance"""
     try:
         # Connect to MongoDB
@@ -25,56 +49,22 @@ async def init_database_indexes():
         print("🔧 Initializing database indexes for Le Maître Mot...")
         
         # P1: Remove old unique constraint (allow multi-device)
-        print("Removing old unique constraint on login_sessions.user_email...")
-        try:
-            await db.login_sessions.drop_index("unique_user_session")
-            print("✅ Old unique constraint removed")
-        except Exception as e:
-            print(f"  Note: Index may not exist: {e}")
-        
-        # P1: Non-unique index on login_sessions.user_email (for multi-device support)
-        print("Creating non-unique index on login_sessions.user_email...")
-        await db.login_sessions.create_index(
-            "user_email",
-            unique=False,  # P1: Allow multiple sessions per user
-            name="user_email_index"
-        )
-        print("✅ User email index created (multi-device enabled)")
-        
-        # P1: Compound index for efficient sorting (user_email, created_at)
-        print("Creating compound index on login_sessions (user_email, created_at)...")
-        await db.login_sessions.create_index(
-            [("user_email", 1), ("created_at", 1)],
-            name="user_email_created_at_compound"
-        )
-        print("✅ Compound index created (for session ordering)")
-        
-        # 2. TTL index on login_sessions.expires_at (auto-cleanup expired sessions)
-        print("Creating TTL index on login_sessions.expires_at...")
-        await db.login_sessions.create_index(
-            "expires_at",
-            expireAfterSeconds=0,  # Expire at the specified date
-            name="session_expiry_ttl"
-        )
-        print("✅ Session expiry TTL index created")
-        
-        # 3. TTL index on magic_tokens.expires_at (auto-cleanup expired tokens)
-        print("Creating TTL index on magic_tokens.expires_at...")
-        await db.magic_tokens.create_index(
-            "expires_at",
-            expireAfterSeconds=0,  # Expire at the specified date
-            name="magic_token_ttl"
-        )
-        print("✅ Magic token TTL index created")
+        if not check_only:
+            print("Removing old unique constraint on login_sessions.user_email...")
+            try:
+                await db.login_sessions.drop_index("unique_user_session")
+                print("✅ Old unique constraint removed")
+            except Exception as e:
+                print(f"  Note: Index may not exist: {e}")
         
-        # 4. Index on pro_users.email for fast lookups
-        print("Creating index on pro_users.email...")
-        await db.pro_users.create_index(
-            "email",
-            unique=True,
-            name="unique_pro_user_email"
-        )
-        print("✅ Pro user unique email index created")
+        # Indexes declared in constants/indexes.py (sessions, tokens, pro users,
+        # exercises, curriculum, exports, quotas...) - created if missing
+        print("Applying index registry...")
+        report = await apply_index_registry(db, dry_run=check_only)
+        print_index_report(report)
+        if check_only:
+            client.close()
+            return not has_drift(report)
         
         # 5. Cleanup any duplicate sessions (in case they exist)
         print("Cleaning up any duplicate sessions...")
@@ -114,10 +104,15 @@ async def init_database_indexes():
         
         # Close connection
         client.close()
+        return True
         
     except Exception as e:
         print(f"❌ Error initializing database: {e}")
         raise
 
 if __name__ == "__main__":
-    asyncio.run(init_database_indexes())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create MongoDB indexes from the index registry")
+    parser.add_argument("--check", action="store_true", help="Report index drift without writing")
+    args = parser.parse_args()
+    ok = asyncio.run(init_database_indexes(check_only=args.check))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,106 @@
+"""
+LaTeX to MathML Converter - Convert math fragments in exercise text to MathML for PDF rendering
+"""
+
+import re
+import logging
+from functools import lru_cache
+
+import latex2mathml.converter
+
+logger = logging.getLogger(__name__)
+
+# Broken fraction formats, rewritten to LaTeX first
+DE_FRACTION_PATTERN = re.compile(r'(\d+)\s+de\s+(\d+)')
+PAR_FRACTION_PATTERN = re.compile(r'(\d+)\s+par\s+(\d+)')
+# Simple "X/Y" fractions (but preserve URLs)
+SLASH_FRACTION_PATTERN = re.compile(r'(?<!http:)(?<!https:)(\d+)/(\d+)')
+
+# Pattern for fractions: \frac{numerator}{denominator}
+FRAC_PATTERN = re.compile(r'\\frac\{([^}]+)\}\{([^}]+)\}')
+# Pattern for square roots: \sqrt{content}
+SQRT_PATTERN = re.compile(r'\\sqrt\{([^}]+)\}')
+# Pattern for powers: x^{exponent}
+POWER_PATTERN = re.compile(r'([a-zA-Z0-9]+)\^\{([^}]+)\}')
+
+# Superset of everything the patterns above can match: text without any of
+# these markers is returned untouched without running the conversion chain
+MATH_MARKER_PATTERN = re.compile(r'\d\s+(?:de|par)\s+\d|\d/\d|\\frac\{|\\sqrt\{|\^\{')
+
+FRAGMENT_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _convert_fragment(latex_expr: str) -> str:
+    """Memoized latex2mathml conversion (failures raise and are not cached)"""
+    return latex2mathml.converter.convert(latex_expr)
+
+
+class LaTeXToMathMLConverter:
+    """Converts fractions, square roots and powers in text to MathML"""
+
+    def _convert_frac(self, match: re.Match) -> str:
+        """Convert \\frac{a}{b} to MathML"""
+        numerator = match.group(1)
+        denominator = match.group(2)
+        try:
+            return _convert_fragment(f"\\frac{{{numerator}}}{{{denominator}}}")
+        except Exception as e:
+            logger.warning(f"Failed to convert fraction {match.group(0)}: {e}")
+            return f"{numerator}/{denominator}"  # Fallback
+
+    def _convert_sqrt(self, match: re.Match) -> str:
+        """Convert \\sqrt{content} to MathML"""
+        content = match.group(1)
+        try:
+            return _convert_fragment(f"\\sqrt{{{content}}}")
+        except Exception as e:
+            logger.warning(f"Failed to convert sqrt {match.group(0)}: {e}")
+            return f"√({content})"  # Fallback
+
+    def _convert_power(self, match: re.Match) -> str:
+        """Convert x^{exp} to MathML"""
+        base = match.group(1)
+        exponent = match.group(2)
+        try:
+            return _convert_fragment(f"{base}^{{{exponent}}}")
+        except Exception as e:
+            logger.warning(f"Failed to convert power {match.group(0)}: {e}")
+            return f"{base}^{exponent}"  # Fallback
+
+    def convert(self, text: str) -> str:
+        """Convert LaTeX mathematical expressions in text to MathML"""
+        if not text:
+            return text
+
+        # Fast path: no math marker, nothing to convert
+        if not MATH_MARKER_PATTERN.search(text):
+            return text
+
+        try:
+            # CRITICAL FIX: Convert broken fraction formats to LaTeX FIRST
+            text = DE_FRACTION_PATTERN.sub(r'\\frac{\1}{\2}', text)
+            text = PAR_FRACTION_PATTERN.sub(r'\\frac{\1}{\2}', text)
+            text = SLASH_FRACTION_PATTERN.sub(r'\\frac{\1}{\2}', text)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Fixed broken fraction formats in text: %s...", text[:100])
+
+            # Apply conversions
+            result = FRAC_PATTERN.sub(self._convert_frac, text)
+            result = SQRT_PATTERN.sub(self._convert_sqrt, result)
+            result = POWER_PATTERN.sub(self._convert_power, result)
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error processing math content for PDF: {e}")
+            return text  # Return original text on error
+
+    def cache_info(self):
+        """Statistics of the converted fragments cache"""
+        return _convert_fragment.cache_info()
+
+
+# Global instance for easy use
+mathml_converter = LaTeXToMathMLConverter()
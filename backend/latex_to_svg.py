@@ -8,9 +8,13 @@ import hashlib
 from typing import Dict, Any
 import matplotlib.pyplot as plt
 import matplotlib.mathtext as mathtext
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from io import BytesIO
 import logging
 
+from backend.observability.timing import timed_stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,8 +46,10 @@ class LaTeXToSVGRenderer:
     def _latex_to_svg(self, latex_code: str) -> str:
         """Convert LaTeX code to SVG string"""
         try:
-            # Create a figure with transparent background
-            fig, ax = plt.subplots(figsize=(0.1, 0.1))
+            # Create a figure with transparent background (object API: safe to call from worker threads)
+            fig = Figure(figsize=(0.1, 0.1))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(111)
             ax.axis('off')
             fig.patch.set_alpha(0)
             
@@ -66,14 +72,12 @@ class LaTeXToSVGRenderer:
             
             # Save to SVG
             svg_buffer = BytesIO()
-            plt.savefig(svg_buffer, format='svg', 
+            fig.savefig(svg_buffer, format='svg', 
                        bbox_inches='tight', 
                        pad_inches=0.02,
                        transparent=True,
                        dpi=300)
             
-            plt.close(fig)
-            
             # Get SVG content
             svg_content = svg_buffer.getvalue().decode('utf-8')
             
@@ -113,6 +117,7 @@ class LaTeXToSVGRenderer:
         """Alias for convert_text_with_latex for compatibility"""
         return self.convert_text_with_latex(text)
     
+    @timed_stage("latex")
     def convert_text_with_latex(self, text: str) -> str:
         """
         Convert text containing LaTeX expressions to HTML with embedded SVG
@@ -14,6 +14,8 @@ from functools import wraps
 import re
 from logging.handlers import RotatingFileHandler
 
+from backend.observability.logger import attach_async_handlers
+
 class SensitiveDataFilter:
     """Filter to remove sensitive data from logs"""
     
@@ -127,7 +129,6 @@ class AppLogger:
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
 
         # File handler with rotation
         log_dir = "logs"
@@ -140,7 +141,9 @@ class AppLogger:
             encoding="utf-8"
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        # Formatting and I/O happen on a background listener thread (LOG_ASYNC=0 to disable)
+        attach_async_handlers(logger, [console_handler, file_handler])
 
         # Prevent propagation to avoid duplicate logs
         logger.propagate = False
@@ -149,6 +152,9 @@ class AppLogger:
     
     def _create_log_record(self, level: str, message: str, **kwargs) -> None:
         """Create a log record with custom fields"""
+        if not self.logger.isEnabledFor(getattr(logging, level)):
+            return
+
         extra = {}
         
         # Handle exc_info separately (it's a special logging parameter)
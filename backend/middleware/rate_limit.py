@@ -0,0 +1,96 @@
+"""
+Rate limiting (slowapi + limits) partagé entre workers et pods.
+
+Avec le stockage en mémoire du process, N workers uvicorn (ou N pods)
+multipliaient chaque limite par N et la remettaient à zéro à chaque
+déploiement. Par défaut, dès que MONGO_URL est défini, le Limiter utilise
+SharedCounterStorage (middleware/rate_limit_storage) : décisions locales sans
+aller-retour MongoDB, compteurs de fenêtre synchronisés en tâche de fond par
+$inc atomiques dans la base de l'application.
+
+- RATE_LIMIT_STORAGE_URI : URI limits explicite. Par défaut "shared+" +
+  MONGO_URL, ou "memory://" sans MONGO_URL (tests, développement). Toute URI
+  limits reste possible ("memory://", "redis://...", "mongodb://..." : ce
+  dernier fait un aller-retour synchrone par requête).
+- RATE_LIMIT_STRATEGY : stratégie limits (défaut "sliding-window-counter")
+- RATE_LIMIT_SYNC_INTERVAL : secondes entre deux synchronisations du stockage
+  partagé (défaut 1). Borne le dépassement possible : pendant un intervalle,
+  chaque worker ne voit que ses propres hits.
+
+Usage:
+    limiter = create_limiter(key_func=get_remote_address)
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, Tuple
+
+from slowapi import Limiter
+
+from backend.constants.collections import (
+    RATE_LIMIT_COUNTERS_COLLECTION,
+    RATE_LIMIT_SHARED_COUNTERS_COLLECTION,
+    RATE_LIMIT_WINDOWS_COLLECTION,
+)
+from backend.middleware.rate_limit_storage import SHARED_SCHEME_PREFIX, SharedCounterStorage
+
+logger = logging.getLogger(__name__)
+
+MEMORY_STORAGE_URI = "memory://"
+
+RATE_LIMIT_STRATEGY = os.environ.get("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+
+def rate_limit_storage_config() -> Tuple[str, Dict[str, Any]]:
+    """URI et options du stockage à partir de l'environnement"""
+    uri = os.environ.get("RATE_LIMIT_STORAGE_URI")
+    if not uri:
+        mongo_url = os.environ.get("MONGO_URL")
+        uri = SHARED_SCHEME_PREFIX + mongo_url if mongo_url else MEMORY_STORAGE_URI
+
+    options: Dict[str, Any] = {}
+    scheme = uri.split("://", 1)[0]
+    if scheme.startswith(SHARED_SCHEME_PREFIX):
+        options = {
+            "database_name": os.environ.get("DB_NAME", "le_maitre_mot_db"),
+            "collection_name": RATE_LIMIT_SHARED_COUNTERS_COLLECTION,
+            "sync_interval": float(os.environ.get("RATE_LIMIT_SYNC_INTERVAL", "1")),
+            "serverSelectionTimeoutMS": 1000,
+        }
+    elif "mongodb" in scheme:
+        options = {
+            "database_name": os.environ.get("DB_NAME", "le_maitre_mot_db"),
+            "counter_collection_name": RATE_LIMIT_COUNTERS_COLLECTION,
+            "window_collection_name": RATE_LIMIT_WINDOWS_COLLECTION,
+            # Bascule rapide sur le fallback mémoire si MongoDB est injoignable
+            "serverSelectionTimeoutMS": 1000,
+        }
+    return uri, options
+
+
+def create_limiter(key_func: Callable[..., str], enabled: bool = True) -> Limiter:
+    """Limiter slowapi branché sur le stockage configuré"""
+    storage_uri, storage_options = rate_limit_storage_config()
+    logger.info(f"[RATE_LIMIT] Stockage: {storage_uri.split('://', 1)[0]}, stratégie: {RATE_LIMIT_STRATEGY}")
+    return Limiter(
+        key_func=key_func,
+        enabled=enabled,
+        strategy=RATE_LIMIT_STRATEGY,
+        storage_uri=storage_uri,
+        storage_options=storage_options,
+        in_memory_fallback_enabled=True,
+    )
+
+
+def close_limiter_storage(limiter: Limiter) -> None:
+    """Envoie les derniers hits locaux du stockage partagé (arrêt de l'application)"""
+    storage = getattr(limiter, "_storage", None)
+    if isinstance(storage, SharedCounterStorage):
+        storage.close()
+
+
+__all__ = [
+    "rate_limit_storage_config",
+    "create_limiter",
+    "close_limiter_storage",
+]
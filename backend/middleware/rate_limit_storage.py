@@ -0,0 +1,301 @@
+"""
+Stockage limits partagé entre workers, sans aller-retour MongoDB par requête.
+
+Chaque worker décide localement : compteur partagé (total MongoDB lu à la
+dernière synchronisation, tous workers confondus) + hits locaux pas encore
+envoyés. Un thread de fond synchronise toutes les RATE_LIMIT_SYNC_INTERVAL
+secondes :
+- $inc atomique (bulk_write) des hits locaux sur le compteur de chaque fenêtre
+- relecture des totaux de toutes les fenêtres suivies (find $in)
+
+Les fenêtres sont alignées sur l'horloge (clé "<limite>/<index de fenêtre>",
+comme les stockages limits) : tous les workers et pods incrémentent les mêmes
+documents, qui expirent via l'index TTL sur expires_at. La stratégie
+sliding-window-counter pondère la fenêtre précédente comme MemoryStorage.
+
+Borne : entre deux synchronisations, un worker ne voit pas les hits des
+autres. Sur N workers, au plus N × limite hits peuvent passer pendant un
+intervalle pour une même clé ; ensuite la limite est globale. Si MongoDB est
+injoignable, les décisions restent locales (limite par worker) et les hits
+sont envoyés à la reprise.
+
+Schémas : "shared+mongodb://..." et "shared+mongodb+srv://..." (l'URI MongoDB
+est celle qui suit "shared+").
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from math import floor
+from typing import Any, Dict, List, Optional, Tuple
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import PyMongoError
+
+from backend.constants.collections import RATE_LIMIT_SHARED_COUNTERS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+SHARED_SCHEME_PREFIX = "shared+"
+
+# Taille des lots de clés relues par find $in
+SYNC_READ_BATCH_SIZE = 1000
+
+
+class _WindowCounter:
+    """Compteur d'une fenêtre : total partagé connu + hits locaux non envoyés"""
+
+    __slots__ = ("shared", "pending", "expires_at")
+
+    def __init__(self, expires_at: float):
+        self.shared = 0
+        self.pending = 0
+        self.expires_at = expires_at
+
+    @property
+    def count(self) -> int:
+        return self.shared + self.pending
+
+
+class SharedCounterStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Compteurs par fenêtre décidés localement et synchronisés en tâche de fond"""
+
+    STORAGE_SCHEME = ["shared+mongodb", "shared+mongodb+srv"]
+
+    def __init__(
+        self,
+        uri: str,
+        database_name: str = "le_maitre_mot_db",
+        collection_name: str = RATE_LIMIT_SHARED_COUNTERS_COLLECTION,
+        sync_interval: float = 1.0,
+        collection: Any = None,
+        wrap_exceptions: bool = False,
+        **options: Any,
+    ):
+        """
+        Args:
+            uri: "shared+" suivi de l'URI MongoDB
+            sync_interval: Secondes entre deux synchronisations (0 : sync() manuel)
+            collection: Collection pymongo déjà ouverte (sinon créée depuis l'URI)
+            options: Options du MongoClient
+        """
+        super().__init__(uri, wrap_exceptions=wrap_exceptions)
+        self._mongo_uri = uri[len(SHARED_SCHEME_PREFIX):] if uri.startswith(SHARED_SCHEME_PREFIX) else uri
+        self._database_name = database_name
+        self._collection_name = collection_name
+        self._client_options = options
+        self._client: Optional[MongoClient] = None
+        self._collection = collection
+        self.sync_interval = float(sync_interval)
+
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._windows: Dict[str, _WindowCounter] = {}
+        # Clé fixed-window -> clé de sa fenêtre courante
+        self._fixed_windows: Dict[str, str] = {}
+        self._sync_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sync_failing = False
+
+    @property
+    def base_exceptions(self):
+        return PyMongoError
+
+    # ------------------------------------------------------------------
+    # Décisions locales
+    # ------------------------------------------------------------------
+
+    def _counter(self, key: str, now: float) -> Optional[_WindowCounter]:
+        counter = self._windows.get(key)
+        if counter is not None and counter.expires_at <= now:
+            del self._windows[key]
+            return None
+        return counter
+
+    def _count(self, key: str, now: float) -> int:
+        counter = self._counter(key, now)
+        return counter.count if counter else 0
+
+    def _add(self, key: str, amount: int, expires_at: float, now: float) -> int:
+        counter = self._counter(key, now)
+        if counter is None:
+            counter = self._windows[key] = _WindowCounter(expires_at)
+        counter.pending += amount
+        self._ensure_sync_thread()
+        return counter.count
+
+    def _sliding_window_info(self, key: str, expiry: int, now: float) -> Tuple[int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._count(previous_key, now)
+        current_count = self._count(current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._lock:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(key, expiry, now)
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            # La fenêtre courante sert encore de fenêtre précédente pendant `expiry`
+            _, current_key = self.sliding_window_keys(key, expiry, now)
+            self._add(current_key, amount, (int(now / expiry) + 2) * expiry, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        with self._lock:
+            return self._sliding_window_info(key, expiry, time.time())
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self._clear_windows(list(self.sliding_window_keys(key, expiry, time.time())))
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        window = int(now / expiry)
+        with self._lock:
+            window_key = self._fixed_windows[key] = f"{key}/{window}"
+            return self._add(window_key, amount, (window + 1) * expiry, now)
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            window_key = self._fixed_windows.get(key)
+            return self._count(window_key, time.time()) if window_key else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            window_key = self._fixed_windows.get(key)
+            counter = self._counter(window_key, now) if window_key else None
+            return counter.expires_at if counter else now
+
+    def check(self) -> bool:
+        # Les décisions ne dépendent pas de MongoDB (voir docstring du module)
+        return True
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            window_key = self._fixed_windows.pop(key, None)
+        self._clear_windows([window_key or key])
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            cleared = len(self._windows)
+            self._windows.clear()
+            self._fixed_windows.clear()
+        collection = self._get_collection()
+        if collection is not None:
+            collection.delete_many({})
+        return cleared
+
+    def _clear_windows(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._windows.pop(key, None)
+        collection = self._get_collection()
+        if collection is not None:
+            collection.delete_many({"_id": {"$in": keys}})
+
+    # ------------------------------------------------------------------
+    # Synchronisation MongoDB
+    # ------------------------------------------------------------------
+
+    def _get_collection(self):
+        if self._collection is None and self._mongo_uri:
+            self._client = MongoClient(self._mongo_uri, **self._client_options)
+            self._collection = self._client[self._database_name][self._collection_name]
+        return self._collection
+
+    def _ensure_sync_thread(self) -> None:
+        # Démarré au premier hit : après le démarrage des workers, jamais avant un fork
+        if self._sync_thread is None and self.sync_interval > 0:
+            self._sync_thread = threading.Thread(target=self._run_sync, name="rate-limit-sync", daemon=True)
+            self._sync_thread.start()
+
+    def _run_sync(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+
+    def sync(self) -> bool:
+        """
+        Envoie les hits locaux et relit les totaux partagés.
+
+        Returns:
+            True si la synchronisation a abouti
+        """
+        with self._sync_lock:
+            if not self._mongo_uri and self._collection is None:
+                return False
+            now = time.time()
+            with self._lock:
+                for key in [key for key, counter in self._windows.items() if counter.expires_at <= now]:
+                    del self._windows[key]
+                for key in [key for key, window_key in self._fixed_windows.items() if window_key not in self._windows]:
+                    del self._fixed_windows[key]
+                windows = dict(self._windows)
+                flushed = {key: counter.pending for key, counter in windows.items() if counter.pending}
+
+            try:
+                collection = self._get_collection()
+                if flushed:
+                    collection.bulk_write([
+                        UpdateOne(
+                            {"_id": key},
+                            {
+                                "$inc": {"count": amount},
+                                "$max": {"expires_at": datetime.fromtimestamp(windows[key].expires_at, timezone.utc)},
+                            },
+                            upsert=True,
+                        )
+                        for key, amount in flushed.items()
+                    ], ordered=False)
+                totals: Dict[str, int] = {}
+                keys = list(windows)
+                for start in range(0, len(keys), SYNC_READ_BATCH_SIZE):
+                    for doc in collection.find({"_id": {"$in": keys[start:start + SYNC_READ_BATCH_SIZE]}}, {"count": 1}):
+                        totals[doc["_id"]] = doc["count"]
+            except Exception as e:
+                # Hits conservés et renvoyés au prochain cycle (un lot en partie
+                # écrit est alors compté deux fois : plus strict, jamais plus laxiste)
+                if not self._sync_failing:
+                    logger.warning(f"[RATE_LIMIT] Synchronisation impossible, décisions locales: {e}")
+                self._sync_failing = True
+                return False
+
+            if self._sync_failing:
+                logger.info("[RATE_LIMIT] Synchronisation rétablie")
+                self._sync_failing = False
+            with self._lock:
+                for key, counter in windows.items():
+                    # Fenêtre effacée (clear/reset) pendant la synchronisation
+                    if self._windows.get(key) is not counter:
+                        continue
+                    counter.pending -= flushed.get(key, 0)
+                    counter.shared = totals.get(key, 0)
+            return True
+
+    def close(self) -> None:
+        """Arrête la synchronisation après un dernier envoi des hits locaux"""
+        self._stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=self.sync_interval + 1)
+        with self._lock:
+            pending = any(counter.pending for counter in self._windows.values())
+        if pending:
+            self.sync()
+        if self._client is not None:
+            self._client.close()
+
+
+__all__ = [
+    "SHARED_SCHEME_PREFIX",
+    "SharedCounterStorage",
+]
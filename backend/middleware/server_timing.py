@@ -0,0 +1,45 @@
+"""
+Middleware Server-Timing : durée cumulée par étape (mongo, generator, template,
+latex, svg, pdf) de chaque requête, en en-tête de réponse et en log structuré.
+
+Installé uniquement si SERVER_TIMING=1 (voir backend/observability/timing.py).
+"""
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from backend.observability import get_logger
+from backend.observability.timing import begin_request_timing, end_request_timing
+
+logger = get_logger('HTTP')
+
+
+class ServerTimingMiddleware(BaseHTTPMiddleware):
+    """
+    Installe un collecteur d'étapes pour la requête, puis ajoute l'en-tête
+    Server-Timing et une ligne event=server_timing avec les totaux.
+
+    Le collecteur est un objet mutable partagé par le handler (et les threads
+    qu'il lance avec copie du contexte) : les spans ouverts pendant call_next
+    y sont visibles au retour.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        timings, token = begin_request_timing()
+        try:
+            response = await call_next(request)
+        finally:
+            end_request_timing(token)
+
+        total_ms = timings.elapsed_ms()
+        response.headers["Server-Timing"] = timings.header(total_ms)
+        request_id = getattr(request.state, "request_id", None)
+        logger.info(
+            f"event=server_timing method={request.method} path={request.url.path} "
+            f"status={response.status_code} request_id={request_id}",
+            event="server_timing",
+            outcome="success" if response.status_code < 500 else "error",
+            duration_ms=round(total_ms, 1),
+            stages=timings.summary() or None,
+        )
+        return response
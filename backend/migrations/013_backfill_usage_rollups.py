@@ -0,0 +1,52 @@
+"""
+Migration 013 : Backfill des rollups d'usage quotidiens (analytics Pro)
+
+Reconstruit usage_daily_rollups à partir des collections documents et exports.
+Les nouvelles écritures sont ensuite comptées au fil de l'eau par
+record_document / record_export.
+
+Script idempotent : les compteurs sont écrits en valeur absolue.
+
+Usage:
+    python -m backend.migrations.013_backfill_usage_rollups
+"""
+
+import asyncio
+import os
+import sys
+
+# Ajouter le chemin du backend au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from backend.services.usage_rollup_service import backfill_usage_rollups
+
+load_dotenv()
+
+
+async def migrate():
+    """Exécuter la migration"""
+    print("🚀 Migration 013: Backfill usage_daily_rollups")
+
+    mongo_url = os.environ.get("MONGO_URL")
+    if not mongo_url:
+        raise ValueError("MONGO_URL environment variable is required")
+
+    client = AsyncIOMotorClient(mongo_url)
+    db = client[os.environ.get("DB_NAME", "le_maitre_mot_db")]
+
+    try:
+        written = await backfill_usage_rollups(db)
+        print(f"   ✅ {written} rollups (owner, jour) écrits")
+        print("\n✨ Migration 013 terminée avec succès!")
+    except Exception as e:
+        print(f"\n❌ Erreur lors de la migration: {e}")
+        raise
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -10,6 +10,14 @@ from backend.observability.logger import (
     ensure_request_id,
     safe_random_choice,
     safe_randrange,
+    get_event_metrics,
+    reset_event_metrics,
+)
+from backend.observability.timing import (
+    stage,
+    timed_stage,
+    record_stage,
+    get_stage_timings,
 )
 
 __all__ = [
@@ -20,6 +28,12 @@ __all__ = [
     'ensure_request_id',
     'safe_random_choice',
     'safe_randrange',
+    'get_event_metrics',
+    'reset_event_metrics',
+    'stage',
+    'timed_stage',
+    'record_stage',
+    'get_stage_timings',
 ]
 
 
@@ -9,16 +9,23 @@ Fonctionnalités:
 - Duration_ms et outcome sur événements clés
 - Prévention des doublons ERROR
 - Format key=value, 1 ligne, pas de PII, truncate listes >20
+- Pipeline non bloquant (QueueHandler/QueueListener) : formatage et I/O hors du chemin requête
+- Échantillonnage par événement (LOG_SAMPLING) + métriques compteurs/histogrammes par événement
 """
 
+import atexit
 import logging
 import json
 import os
+import queue
+import random
 import sys
+import threading
 import time
 import uuid
 from contextvars import ContextVar
-from typing import Any, Dict, Optional, List, Set
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, List, Set, Tuple
 from datetime import datetime
 from functools import wraps
 import re
@@ -31,6 +38,27 @@ LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
 LOG_VERBOSE = os.getenv('LOG_VERBOSE', '0') == '1'
 LOG_MODULES = set(os.getenv('LOG_MODULES', '').split(',')) if os.getenv('LOG_MODULES') else None
 LOG_AUDIT = os.getenv('LOG_AUDIT', '0') == '1'
+# Pipeline asynchrone (LOG_ASYNC=0 pour écrire directement depuis le thread appelant)
+LOG_ASYNC = os.getenv('LOG_ASYNC', '1') == '1'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+
+def _parse_sampling(raw: str) -> Dict[str, float]:
+    """Parse LOG_SAMPLING="generate_in=0.01,handler_in=0.1" -> {event: taux}"""
+    rates = {}
+    for item in raw.split(','):
+        if '=' not in item:
+            continue
+        event, rate = item.split('=', 1)
+        try:
+            rates[event.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+# Taux de conservation par événement (absent = 1.0, tout est loggé)
+LOG_SAMPLING = _parse_sampling(os.getenv('LOG_SAMPLING', ''))
 
 # Mapping des modules aux tags
 MODULE_TAGS = {
@@ -74,8 +102,10 @@ class ObservabilityFormatter(logging.Formatter):
         if tag:
             parts.append(tag)
         
-        # Contexte partagé
-        ctx = _request_context.get({})
+        # Contexte partagé (capturé à l'émission si le record passe par la file)
+        ctx = getattr(record, 'obs_context', None)
+        if ctx is None:
+            ctx = _request_context.get({})
         context_keys = [
             'request_id', 'correlation_id', 'chapter_code', 'code_officiel',
             'pipeline', 'difficulty', 'offer', 'seed', 'generator_key',
@@ -94,7 +124,7 @@ class ObservabilityFormatter(logging.Formatter):
             'generator_key', 'variant_id', 'pedagogy_mode', 'hint_level',
             'chapter_code', 'code_officiel', 'pipeline', 'difficulty', 'offer',
             'seed', 'exercise_id', 'admin_exercise_id', 'chapter_backend',
-            'exercise_type', 'cache_hit', 'cache_miss', 'db_count'
+            'exercise_type', 'cache_hit', 'cache_miss', 'db_count', 'stages'
         ]
         for key in custom_keys:
             if hasattr(record, key):
@@ -114,6 +144,139 @@ class ObservabilityFormatter(logging.Formatter):
         return " ".join(parts)
 
 
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler qui fige sur le record tout ce qui dépend du thread appelant
+    (contexte de requête, arguments du message) ; le formatage complet et
+    l'écriture se font dans le thread du QueueListener.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, 'obs_context'):
+            ctx = _request_context.get({})
+            record.obs_context = dict(ctx) if ctx else {}
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # File pleine : on perd le record plutôt que de bloquer la requête
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def attach_async_handlers(logger: logging.Logger, handlers: List[logging.Handler]) -> Optional[QueueListener]:
+    """
+    Branche les handlers sur le logger, derrière une file si LOG_ASYNC=1.
+
+    Returns:
+        Le QueueListener démarré (arrêté et vidé à la sortie du process), ou None en mode synchrone
+    """
+    if not LOG_ASYNC:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return None
+    
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(ContextQueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# ============================================================================
+# Métriques par événement (compteurs + histogramme des durées)
+# ============================================================================
+
+# Bornes supérieures (ms) des buckets de l'histogramme des durées
+DURATION_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+
+class EventMetrics:
+    """
+    Compteurs par (événement, outcome) et histogramme des duration_ms par
+    événement. Alimenté pour chaque événement, qu'il soit loggé, filtré par
+    niveau ou écarté par échantillonnage.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._durations: Dict[str, List[int]] = {}
+        self._duration_sums: Dict[str, float] = {}
+        self.sampled_out = 0
+    
+    def record(self, event: str, outcome: Optional[str], duration_ms: Optional[float]) -> None:
+        key = (event, outcome or '')
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if isinstance(duration_ms, (int, float)):
+                buckets = self._durations.get(event)
+                if buckets is None:
+                    buckets = self._durations[event] = [0] * len(DURATION_BUCKETS_MS)
+                    self._duration_sums[event] = 0.0
+                for index, upper in enumerate(DURATION_BUCKETS_MS):
+                    if duration_ms <= upper:
+                        buckets[index] += 1
+                        break
+                self._duration_sums[event] += duration_ms
+    
+    def record_sampled_out(self) -> None:
+        with self._lock:
+            self.sampled_out += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Copie des compteurs et histogrammes"""
+        with self._lock:
+            counters: Dict[str, Dict[str, int]] = {}
+            for (event, outcome), count in self._counts.items():
+                counters.setdefault(event, {})[outcome or 'none'] = count
+            histograms = {
+                event: {
+                    'buckets_ms': {
+                        ('+Inf' if upper == float('inf') else str(int(upper))): count
+                        for upper, count in zip(DURATION_BUCKETS_MS, buckets)
+                    },
+                    'count': sum(buckets),
+                    'sum_ms': round(self._duration_sums[event], 2),
+                }
+                for event, buckets in self._durations.items()
+            }
+            return {
+                'counters': counters,
+                'durations': histograms,
+                'sampled_out': self.sampled_out,
+            }
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._durations.clear()
+            self._duration_sums.clear()
+            self.sampled_out = 0
+
+
+_event_metrics = EventMetrics()
+# RNG dédié : l'échantillonnage ne doit pas consommer l'aléa global (générateurs seedés)
+_sampling_rng = random.Random()
+
+
+def get_event_metrics() -> Dict[str, Any]:
+    """Métriques par événement (compteurs, histogrammes de durées)"""
+    return _event_metrics.snapshot()
+
+
+def reset_event_metrics() -> None:
+    _event_metrics.reset()
+
+
 def configure_logging():
     """Configure le système de logging selon ENV"""
     logger = logging.getLogger('lemaitremot')
@@ -131,10 +294,10 @@ def configure_logging():
     # Formatter
     formatter = ObservabilityFormatter()
     
-    # Console handler
+    # Console handler (derrière la file si LOG_ASYNC=1)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    attach_async_handlers(logger, [console_handler])
     
     # Pas de propagation pour éviter doublons
     logger.propagate = False
@@ -170,11 +333,29 @@ class ObservabilityLogger:
         
         return True
     
-    def _create_record(self, level: str, message: str, **kwargs) -> None:
+    def is_enabled(self, level: str) -> bool:
+        """Permet d'éviter de construire des champs coûteux pour un niveau non loggé"""
+        return (
+            self._should_log(level, self.module)
+            and self.logger.isEnabledFor(getattr(logging, level))
+        )
+    
+    def _create_record(self, level: str, message: str, *args, **kwargs) -> None:
         """Crée un record de log avec contexte"""
-        if not self._should_log(level, self.module):
+        event = kwargs.get('event')
+        if event:
+            _event_metrics.record(event, kwargs.get('outcome'), kwargs.get('duration_ms'))
+        
+        if not self.is_enabled(level):
             return
         
+        # Échantillonnage par événement (les erreurs sont toujours conservées)
+        if event and level in ('DEBUG', 'INFO'):
+            rate = LOG_SAMPLING.get(event)
+            if rate is not None and _sampling_rng.random() >= rate:
+                _event_metrics.record_sampled_out()
+                return
+        
         # P0 - FIX : Dédoublonner les kwargs pour éviter "got multiple values for keyword argument"
         # Si un champ est passé explicitement ET dans **kwargs, on garde la valeur explicite
         # (déjà géré par Python, mais on nettoie quand même pour clarté)
@@ -193,28 +374,28 @@ class ObservabilityLogger:
         if exc_info:
             extra['log_exception'] = True
         
-        # Log
-        getattr(self.logger, level.lower())(message, extra=extra, exc_info=exc_info)
+        # Log (message formaté avec *args seulement s'il est émis)
+        getattr(self.logger, level.lower())(message, *args, extra=extra, exc_info=exc_info)
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """DEBUG: détails (pools, listes, keys manquantes) uniquement si LOG_VERBOSE=1"""
-        self._create_record('DEBUG', message, **kwargs)
+        self._create_record('DEBUG', message, *args, **kwargs)
     
-    def info(self, message: str, **kwargs):
+    def info(self, message: str, *args, **kwargs):
         """INFO: flux normal, décisions clés, variant"""
-        self._create_record('INFO', message, **kwargs)
+        self._create_record('INFO', message, *args, **kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """WARNING: fallback, incohérence, pool vide évité"""
-        self._create_record('WARNING', message, **kwargs)
+        self._create_record('WARNING', message, *args, **kwargs)
     
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """ERROR: exceptions/422 avec contexte complet"""
-        self._create_record('ERROR', message, **kwargs)
+        self._create_record('ERROR', message, *args, **kwargs)
     
-    def critical(self, message: str, **kwargs):
+    def critical(self, message: str, *args, **kwargs):
         """CRITICAL: erreurs système"""
-        self._create_record('CRITICAL', message, **kwargs)
+        self._create_record('CRITICAL', message, *args, **kwargs)
 
 
 def get_logger(module: Optional[str] = None) -> ObservabilityLogger:
@@ -0,0 +1,222 @@
+"""
+Timing par étape d'une requête (Server-Timing)
+==============================================
+
+Le request_id et le contexte de log suivent déjà la requête (contextvars),
+mais rien ne dit où une requête lente passe son temps. Ce module cumule, par
+requête, la durée de chaque étape marquée dans le code :
+
+    with stage("generator"):
+        output = gen.safe_generate(params)
+
+    @timed_stage("pdf")
+    async def _render_variant(...): ...
+
+Étapes utilisées : mongo (toutes les commandes, via un CommandListener
+pymongo), generator, template, latex, svg, pdf (mise en page WeasyPrint).
+
+Les totaux sont émis par ServerTimingMiddleware dans l'en-tête
+`Server-Timing` et dans une ligne de log event=server_timing. Les durées
+d'étapes concurrentes (asyncio.gather, variantes PDF en parallèle) sont
+additionnées : un total d'étape peut dépasser la durée de la requête.
+
+Configuration ENV:
+    SERVER_TIMING=1  active la mesure (défaut: 0). Désactivé, stage() retourne
+                     un context manager vide partagé et le middleware n'est pas
+                     installé. Lu à l'appel (server_timing_enabled) : ce module
+                     est importé avant le load_dotenv de server.py.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextvars import ContextVar, Token
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from pymongo import monitoring
+
+
+def server_timing_enabled() -> bool:
+    """SERVER_TIMING=1 (lu à chaque appel, après le chargement du .env)"""
+    return os.getenv('SERVER_TIMING', '0') == '1'
+
+
+class StageTimings:
+    """Durées cumulées (ms) et nombre de spans par étape pour une requête"""
+
+    __slots__ = ('_lock', '_stages', 'started_at')
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Spans possibles depuis le threadpool / l'executor Motor
+        self._stages: Dict[str, Tuple[float, int]] = {}
+        self.started_at = time.perf_counter()
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            total, count = self._stages.get(name, (0.0, 0))
+            self._stages[name] = (total + duration_ms, count + 1)
+
+    def totals(self) -> Dict[str, Tuple[float, int]]:
+        """{étape: (durée cumulée ms, nombre de spans)}"""
+        with self._lock:
+            return dict(self._stages)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def header(self, total_ms: Optional[float] = None) -> str:
+        """Valeur de l'en-tête Server-Timing (ex: mongo;dur=12.4;desc="3", total;dur=80.1)"""
+        parts = [
+            f'{name};dur={duration:.1f};desc="{count}"'
+            for name, (duration, count) in self.totals().items()
+        ]
+        parts.append(f"total;dur={self.elapsed_ms() if total_ms is None else total_ms:.1f}")
+        return ", ".join(parts)
+
+    def summary(self) -> str:
+        """Résumé pour les logs (ex: mongo=12.4ms/3 generator=5.0ms/1)"""
+        return " ".join(
+            f"{name}={duration:.1f}ms/{count}" for name, (duration, count) in self.totals().items()
+        )
+
+
+_stage_timings: ContextVar[Optional[StageTimings]] = ContextVar('stage_timings', default=None)
+
+
+def begin_request_timing() -> Tuple[StageTimings, Token]:
+    """Installe un collecteur pour la requête courante (appelé par le middleware)"""
+    timings = StageTimings()
+    return timings, _stage_timings.set(timings)
+
+
+def end_request_timing(token: Token) -> None:
+    _stage_timings.reset(token)
+
+
+def get_stage_timings() -> Optional[StageTimings]:
+    """Collecteur de la requête courante (None hors requête ou si désactivé)"""
+    return _stage_timings.get()
+
+
+def record_stage(name: str, duration_ms: float) -> None:
+    """Ajoute une durée mesurée ailleurs (ex: duration_micros d'une commande Mongo)"""
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings.add(name, duration_ms)
+
+
+class _Span:
+    __slots__ = ('name', 'timings', 'start')
+
+    def __init__(self, name: str, timings: StageTimings):
+        self.name = name
+        self.timings = timings
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings.add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def stage(name: str):
+    """
+    Context manager qui ajoute sa durée à l'étape `name` de la requête courante.
+
+    Hors requête mesurée, retourne un context manager vide partagé (un seul
+    ContextVar.get, pas d'horloge).
+    """
+    timings = _stage_timings.get()
+    if timings is None:
+        return _NULL_SPAN
+    return _Span(name, timings)
+
+
+def timed_stage(name: str) -> Callable:
+    """Décorateur équivalent à `with stage(name)` autour d'une fonction sync ou async"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class MongoStageListener(monitoring.CommandListener):
+    """
+    Cumule la durée serveur+réseau de chaque commande Mongo dans l'étape "mongo".
+
+    Motor exécute pymongo dans un executor avec une copie du contexte :
+    le collecteur de la requête est visible depuis ces callbacks.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_stage("mongo", event.duration_micros / 1000)
+
+    def failed(self, event):
+        record_stage("mongo", event.duration_micros / 1000)
+
+
+_mongo_listener_installed = False
+
+
+def install_mongo_stage_listener() -> bool:
+    """
+    Enregistre MongoStageListener globalement (clients créés après l'appel).
+
+    Appelé par server.py juste après load_dotenv, avant la création des
+    clients Motor (server.py, routes).
+
+    Returns:
+        True si le listener est (déjà) installé
+    """
+    global _mongo_listener_installed
+    if not server_timing_enabled():
+        return False
+    if not _mongo_listener_installed:
+        monitoring.register(MongoStageListener())
+        _mongo_listener_installed = True
+    return True
+
+
+__all__ = [
+    'server_timing_enabled',
+    'StageTimings',
+    'MongoStageListener',
+    'begin_request_timing',
+    'end_request_timing',
+    'get_stage_timings',
+    'record_stage',
+    'stage',
+    'timed_stage',
+    'install_mongo_stage_listener',
+]
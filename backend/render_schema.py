@@ -4,6 +4,7 @@ Schema Rendering Module - Convert JSON geometric schemas to SVG images
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from matplotlib.figure import Figure
 import numpy as np
 from io import StringIO
 import logging
@@ -86,7 +87,7 @@ class SchemaRenderer:
     
     def _render_cylindre(self, data: dict) -> str:
         """Render a cylinder with given radius and height"""
-        fig, ax = plt.subplots(figsize=(6, 8))
+        fig, ax = self._create_figure(figsize=(6, 8))
         
         rayon = data.get("rayon", 3)
         hauteur = data.get("hauteur", 5)
@@ -121,7 +122,7 @@ class SchemaRenderer:
     
     def _render_triangle(self, data: dict) -> str:
         """Render a triangle"""
-        fig, ax = plt.subplots(figsize=(6, 6))
+        fig, ax = self._create_figure(figsize=(6, 6))
         
         # Get points or use defaults
         points = data.get("points", ["A", "B", "C"])
@@ -230,7 +231,7 @@ class SchemaRenderer:
     
     def _render_triangle_rectangle(self, data: dict) -> str:
         """Render a right triangle with proper right angle marker"""
-        fig, ax = plt.subplots(figsize=(6, 6))
+        fig, ax = self._create_figure(figsize=(6, 6))
         
         # Get points or use defaults
         points = data.get("points", ["A", "B", "C"])
@@ -327,7 +328,7 @@ class SchemaRenderer:
     
     def _render_rectangle(self, data: dict) -> str:
         """Render a rectangle"""
-        fig, ax = plt.subplots(figsize=(6, 4))
+        fig, ax = self._create_figure(figsize=(6, 4))
         
         longueur = data.get("longueur", 6)
         largeur = data.get("largeur", 4)
@@ -351,7 +352,7 @@ class SchemaRenderer:
     
     def _render_carre(self, data: dict) -> str:
         """Render a square"""
-        fig, ax = plt.subplots(figsize=(5, 5))
+        fig, ax = self._create_figure(figsize=(5, 5))
         
         cote = data.get("cote", 4)
         
@@ -373,7 +374,7 @@ class SchemaRenderer:
     
     def _render_cercle(self, data: dict) -> str:
         """Render a circle"""
-        fig, ax = plt.subplots(figsize=(6, 6))
+        fig, ax = self._create_figure(figsize=(6, 6))
         
         rayon = data.get("rayon", 3)
         
@@ -400,7 +401,7 @@ class SchemaRenderer:
     
     def _render_pyramide(self, data: dict) -> str:
         """Render a pyramid"""
-        fig, ax = plt.subplots(figsize=(6, 6))
+        fig, ax = self._create_figure(figsize=(6, 6))
         
         base = data.get("base", "carre")
         hauteur = data.get("hauteur", 5)
@@ -435,6 +436,12 @@ class SchemaRenderer:
         
         return self._fig_to_svg(fig)
     
+    def _create_figure(self, figsize):
+        """Create a figure with the object API (no pyplot global state, thread-safe)"""
+        fig = Figure(figsize=figsize)
+        ax = fig.add_subplot(111)
+        return fig, ax
+    
     def _fig_to_svg(self, fig) -> str:
         """Convert matplotlib figure to SVG string"""
         svg_buffer = StringIO()
@@ -449,7 +456,7 @@ class SchemaRenderer:
     
     def _render_generic_polygon(self, data: dict) -> str:
         """Generic fallback renderer for unsupported schema types"""
-        fig, ax = plt.subplots(figsize=(6, 6))
+        fig, ax = self._create_figure(figsize=(6, 6))
         
         schema_type = data.get("type", "unknown")
         points = data.get("points", [])
@@ -15,7 +15,7 @@ from backend.services.exercise_persistence_service import (
     ExerciseResponse,
     get_exercise_persistence_service
 )
-from backend.services.curriculum_sync_service import get_curriculum_sync_service
+from backend.services.curriculum_sync_service import get_curriculum_sync_service, schedule_exercise_types_sync
 from backend.services.collection_guard_rails import check_collection_typos
 from backend.curriculum.loader import get_chapter_by_official_code
 from backend.logger import get_logger
@@ -565,15 +565,13 @@ async def import_exercises(
     except Exception as sync_error:
         logger.warning(f"[AUTO-SYNC] Échec sync curriculum après import {chapter_code}: {sync_error}")
     
+    # exercise_types : synchronisé en tâche de fond (l'import ne l'attend pas)
     try:
-        et_sync_result = await sync_service.sync_chapter_to_exercise_types(normalized_code)
-        logger.info(
-            f"[AUTO-SYNC] exercise_types synchronisé après import batch pour {normalized_code}: "
-            f"créés={et_sync_result['created']}, mis à jour={et_sync_result['updated']}"
-        )
+        schedule_exercise_types_sync(db, [normalized_code])
+        logger.info(f"[AUTO-SYNC] Sync exercise_types planifiée après import batch pour {normalized_code}")
     except Exception as et_sync_error:
         logger.warning(
-            f"[AUTO-SYNC] Échec sync exercise_types après import pour {normalized_code}: {et_sync_error}"
+            f"[AUTO-SYNC] Échec planification sync exercise_types après import pour {normalized_code}: {et_sync_error}"
         )
 
     # 8. Réponse
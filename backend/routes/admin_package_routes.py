@@ -18,6 +18,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from uuid import uuid4
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from backend.observability.logger import get_logger
 from backend.services.package_schema import (
@@ -32,6 +33,7 @@ from backend.constants.collections import (
     EXERCISES_COLLECTION
 )
 from backend.services.import_export_validator import validate_import_payload_v1
+from backend.services.curriculum_sync_service import schedule_exercise_types_sync
 from backend.tests.contracts.exercise_contract import assert_no_unresolved_placeholders
 
 router = APIRouter(prefix="/api/admin/package", tags=["admin-package"])
@@ -258,7 +260,8 @@ async def import_package(
         templates_inserted = 0
         
         try:
-            # 4.1. Créer/mettre à jour les chapitres
+            # 4.1. Créer/mettre à jour les chapitres (un seul bulk_write d'upserts)
+            chapter_operations = []
             for chapter in chapters:
                 code = chapter.get("code_officiel") or chapter.get("code")
                 if not code:
@@ -269,19 +272,15 @@ async def import_package(
                 if "code" in chapter:
                     chapter["code"] = normalized_code
                 
-                # Vérifier si le chapitre existe
-                existing = await chapters_collection.find_one({"code_officiel": normalized_code})
-                
-                if existing:
-                    # Mettre à jour
-                    await chapters_collection.update_one(
-                        {"code_officiel": normalized_code},
-                        {"$set": chapter}
-                    )
-                else:
-                    # Créer
-                    await chapters_collection.insert_one(chapter)
-                    chapters_created += 1
+                chapter_operations.append(UpdateOne(
+                    {"code_officiel": normalized_code},
+                    {"$set": chapter},
+                    upsert=True
+                ))
+            
+            if chapter_operations:
+                result = await chapters_collection.bulk_write(chapter_operations, ordered=False)
+                chapters_created = result.upserted_count
             
             # 4.2. Insérer les exercices (avec batch_id pour rollback)
             exercises_to_insert = []
@@ -318,6 +317,14 @@ async def import_package(
             except Exception as e:
                 logger.warning(f"[PACKAGE] Impossible d'insérer les templates: {e}")
             
+            # 4.4. Synchroniser exercise_types des chapitres importés en tâche de fond
+            synced_chapters = sorted({
+                exercise["chapter_code"] for exercise in exercises_to_insert
+                if exercise.get("chapter_code") and exercise.get("is_dynamic") and exercise.get("generator_key")
+            })
+            if synced_chapters:
+                schedule_exercise_types_sync(db, synced_chapters)
+            
             logger.info(
                 f"[PACKAGE] Import réussi (batch_id={batch_id}): "
                 f"{chapters_created} chapitres créés, {exercises_inserted} exercices, "
@@ -11,19 +11,19 @@ Endpoints:
 Version: 2.0.0 (Dynamic Factory v1)
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi import status
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
 
 # Import du nouveau système Factory
 from backend.generators.factory import (
-    get_generators_list,
     get_generator_schema as factory_get_schema,
     generate_exercise as factory_generate,
     validate_exercise_params
 )
+from backend.generators.registry_snapshot import SerializedPayload, get_registry_snapshot
 
 # Imports legacy pour compatibilité
 from backend.generators.generator_registry import (
@@ -77,6 +77,14 @@ def get_generator_schema(generator_key: str):
     return None
 
 
+def _snapshot_response(payload: SerializedPayload, request: Request) -> Response:
+    """Réponse pré-sérialisée du registry snapshot (304 si l'ETag du client est à jour)"""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
 def _normalize_figure_type(raw: Optional[str]) -> Optional[str]:
     """
     Normalise le type de figure pour les générateurs de géométrie (THALES_V1, ...).
@@ -311,71 +319,30 @@ class UISchemaResponse(BaseModel):
 
 
 @router.get("/generators/{generator_key}/ui-schema", response_model=UISchemaResponse, tags=["Factory", "Gold"])
-async def get_generator_ui_schema(generator_key: str):
+async def get_generator_ui_schema(generator_key: str, request: Request):
     """
     P0 Gold - Retourne le schéma UI complet d'un générateur (source de vérité pour UI).
 
     Ce endpoint est conçu pour que l'UI puisse construire dynamiquement les formulaires
     de configuration d'un générateur. Le schema retourné contient toutes les informations
-    nécessaires : paramètres avec types, defaults, et presets.
+    nécessaires : paramètres avec types, defaults, et presets (enrichis avec des templates
+    par défaut). Servi depuis le registry snapshot (pré-sérialisé, ETag).
     """
-    from backend.generators.factory import GeneratorFactory
-
-    normalized_key = generator_key.upper()
-    gen_class = GeneratorFactory.get(normalized_key)
+    snapshot = get_registry_snapshot()
+    payload = snapshot.ui_schema(generator_key)
 
-    if not gen_class:
-        available = GeneratorFactory.list_all()
+    if not payload:
         raise HTTPException(
             status_code=404,
             detail={
                 "error_code": "GENERATOR_NOT_FOUND",
                 "error": "generator_not_found",
                 "message": f"Générateur '{generator_key}' non trouvé",
-                "available_generators": [g["key"] for g in available]
+                "available_generators": list(snapshot.generator_keys)
             }
         )
 
-    meta = gen_class.get_meta()
-    schema = gen_class.get_schema()
-    defaults = gen_class.get_defaults()
-    presets = gen_class.get_presets()
-    
-    # Enrichir les presets avec des templates par défaut (UNIVERSEL - tous les générateurs)
-    for preset in presets:
-        if not hasattr(preset, 'params') or preset.params is None:
-            preset.params = {}
-        if "enoncetemplate" not in preset.params:
-            preset.params["enoncetemplate"] = "<p><strong>Énoncé à compléter</strong></p>"
-        if "solutiontemplate" not in preset.params:
-            preset.params["solutiontemplate"] = "<p>Solution à compléter</p>"
-
-    return UISchemaResponse(
-        generatorkey=meta.key,
-        label=meta.label,
-        description=meta.description,
-        version=meta.version,
-        param_schema=[
-            UISchemaParamResponse(
-                name=p.name,
-                type=p.type.value if hasattr(p.type, 'value') else str(p.type),
-                label=getattr(p, 'label', p.description) if hasattr(p, 'label') else p.description,
-                options=p.options,
-                required=p.required,
-                default=p.default,
-            )
-            for p in schema
-        ],
-        defaults=defaults,
-        presets=[
-            UISchemaPresetResponse(
-                id=p.key,
-                label=p.label,
-                params=p.params
-            )
-            for p in presets
-        ],
-    )
+    return _snapshot_response(payload, request)
 
 
 @router.post("/preview-dynamic", response_model=DynamicPreviewResponse, tags=["Generators"])
@@ -607,7 +574,7 @@ async def validate_template(template: str, generator_key: str):
 # =============================================================================
 
 @router.get("/generators", tags=["Factory"])
-async def list_all_generators():
+async def list_all_generators(request: Request):
     """
     Liste tous les générateurs disponibles (Dynamic Factory v1).
     
@@ -616,13 +583,10 @@ async def list_all_generators():
     - version, niveaux supportés
     - exercise_type, svg_mode
     - nombre de paramètres et presets
+    
+    Servi depuis le registry snapshot (pré-sérialisé, ETag).
     """
-    generators = get_generators_list()
-    return {
-        "generators": generators,
-        "count": len(generators),
-        "api_version": "2.0.0"
-    }
+    return _snapshot_response(get_registry_snapshot().generators, request)
 
 
 class FactorySchemaResponse(BaseModel):
@@ -635,7 +599,7 @@ class FactorySchemaResponse(BaseModel):
 
 
 @router.get("/generators/{generator_key}/full-schema", response_model=FactorySchemaResponse, tags=["Factory"])
-async def get_factory_schema(generator_key: str):
+async def get_factory_schema(generator_key: str, request: Request):
     """
     Récupère le schéma complet d'un générateur (Dynamic Factory v1).
     
@@ -643,56 +607,42 @@ async def get_factory_schema(generator_key: str):
     - meta: métadonnées du générateur
     - defaults: valeurs par défaut
     - schema: définition des paramètres avec types
-    - presets: configurations pédagogiques prédéfinies
+    - presets: configurations pédagogiques prédéfinies (enrichies avec des templates par défaut)
+    
+    Les générateurs Factory sont servis depuis le registry snapshot (pré-sérialisé, ETag).
     """
-    schema = factory_get_schema(generator_key.upper())
+    snapshot = get_registry_snapshot()
+    payload = snapshot.full_schema(generator_key)
+    if payload:
+        return _snapshot_response(payload, request)
     
-    if not schema:
-        # Fallback sur le système legacy
-        legacy = legacy_get_schema(generator_key.upper())
-        if legacy:
-            return FactorySchemaResponse(
-                generatorkey=generator_key.upper(),
-                meta={
-                    "key": generator_key.upper(),
-                    "label": legacy.label,
-                    "description": legacy.description,
-                    "version": "1.0.0",
-                    "niveaux": [legacy.niveau],
-                    "exercise_type": "DYNAMIC",
-                    "svg_mode": "AUTO"
-                },
-                defaults={},
-                schema=[v.to_dict() for v in legacy.variables],
-                presets=[]
-            )
-        
-        available = get_generators_list()
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "generator_not_found",
-                "message": f"Générateur '{generator_key}' non trouvé",
-                "available": [g["key"] for g in available]
-            }
+    # Fallback sur le système legacy
+    legacy = legacy_get_schema(generator_key.upper())
+    if legacy:
+        return FactorySchemaResponse(
+            generatorkey=generator_key.upper(),
+            meta={
+                "key": generator_key.upper(),
+                "label": legacy.label,
+                "description": legacy.description,
+                "version": "1.0.0",
+                "niveaux": [legacy.niveau],
+                "exercise_type": "DYNAMIC",
+                "svg_mode": "AUTO"
+            },
+            defaults={},
+            schema=[v.to_dict() for v in legacy.variables],
+            presets=[]
         )
     
-    # Convertir generator_key en generatorkey pour alignement Frontend
-    if isinstance(schema, dict) and "generator_key" in schema:
-        schema = dict(schema)
-        schema["generatorkey"] = schema.pop("generator_key")
-    
-    # Enrichir les presets avec des templates par défaut (UNIVERSEL - tous les générateurs)
-    if isinstance(schema, dict) and "presets" in schema:
-        for preset in schema["presets"]:
-            if "params" not in preset:
-                preset["params"] = {}
-            if "enoncetemplate" not in preset["params"]:
-                preset["params"]["enoncetemplate"] = "<p><strong>Énoncé à compléter</strong></p>"
-            if "solutiontemplate" not in preset["params"]:
-                preset["params"]["solutiontemplate"] = "<p>Solution à compléter</p>"
-    
-    return FactorySchemaResponse(**schema)
+    raise HTTPException(
+        status_code=404,
+        detail={
+            "error": "generator_not_found",
+            "message": f"Générateur '{generator_key}' non trouvé",
+            "available": list(snapshot.generator_keys)
+        }
+    )
 
 
 class FactoryGenerateRequest(BaseModel):
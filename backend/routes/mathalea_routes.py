@@ -5,7 +5,8 @@ CRUD pour Competence et ExerciseType
 Architecture non-destructive - N'affecte pas les routes existantes
 """
 
-from fastapi import APIRouter, HTTPException, Query, Header, File, UploadFile, Request
+from fastapi import APIRouter, HTTPException, Query, Header, File, UploadFile, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -46,6 +47,22 @@ from backend.constants.collections import (
     EXERCISE_SHEETS_COLLECTION,
     SHEET_ITEMS_COLLECTION
 )
+from backend.observability.timing import stage
+from backend.services.pdf_artifact_service import (
+    ARTIFACT_PENDING,
+    ARTIFACT_READY,
+    content_disposition,
+    create_export_job,
+    export_job_view,
+    find_artifact,
+    get_export_job,
+    is_export_job_owner,
+    iter_artifact_bytes,
+    iter_zip_bundle,
+    launch_export_job,
+    parse_range_header,
+    rendered,
+)
 
 # Router avec préfixe pour isoler du système existant
 router = APIRouter(prefix="/api/mathalea", tags=["MathALÉA System"])
@@ -169,6 +186,27 @@ async def store_pdf_in_cache(
         return False
 
 
+# ============================================================================
+# EXPORT PAR ARTEFACTS (PDFs binaires au lieu de base64 JSON)
+# ============================================================================
+
+# delivery=json (défaut, PDFs en base64) ou delivery=artifacts (job + téléchargements binaires)
+PDF_DELIVERY_MODES = ("json", "artifacts")
+
+
+def validate_pdf_delivery(delivery: str) -> None:
+    if delivery not in PDF_DELIVERY_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"delivery invalide: {delivery} (valeurs possibles: {', '.join(PDF_DELIVERY_MODES)})"
+        )
+
+
+def get_exports_db(request: Request):
+    """Base des jobs d'export (app.state.db si disponible, pour les tests)"""
+    return getattr(request.app.state, 'db', db)
+
+
 # ============================================================================
 # ENDPOINTS: Competence
 # ============================================================================
@@ -995,6 +1033,7 @@ async def generate_exercise_endpoint(request: GenerateExerciseRequest):
 async def generate_sheet_pdf(
     sheet_id: str,
     request: Request,
+    delivery: str = Query("json", description="json (PDFs en base64) ou artifacts (job + téléchargements binaires)"),
     x_session_token: Optional[str] = Header(None, alias="X-Session-Token")
 ):
     """
@@ -1004,7 +1043,8 @@ async def generate_sheet_pdf(
     1. Récupère la feuille et génère le preview
     2. Si IA activée: enrichit les énoncés/corrections
     3. Génère 3 PDFs: sujet, élève, corrigé
-    4. Retourne les PDFs en base64
+    4. Retourne les PDFs en base64 (delivery=json) ou les identifiants
+       des artefacts à télécharger (delivery=artifacts, voir /exports)
     
     PR7.1: Export PDF nécessite un compte (Free ou Pro)
     
@@ -1022,11 +1062,11 @@ async def generate_sheet_pdf(
     if x_session_token:
         user_email = await validate_session_token(x_session_token)
     assert_can_export_pdf(user_email)
+    validate_pdf_delivery(delivery)
     
     from engine.pdf_engine.mathalea_sheet_pdf_builder import (
-        build_sheet_subject_pdf,
-        build_sheet_student_pdf,
-        build_sheet_correction_pdf
+        build_sheet_variant_pdfs,
+        start_sheet_variant_renders
     )
     from engine.pdf_engine.sheet_ai_enrichment_helper import (
         apply_ai_enrichment_to_sheet_preview,
@@ -1103,29 +1143,41 @@ async def generate_sheet_pdf(
         # Vérifier si au moins un item a l'IA activée
         if check_if_ai_needed(preview):
             logger.info(f"🎨 IA activée pour la feuille {sheet_id}, enrichissement en cours...")
-            preview = await apply_ai_enrichment_to_sheet_preview(preview)
+            preview = await apply_ai_enrichment_to_sheet_preview(preview, db=db)
             logger.info(f"✅ IA: Enrichissement terminé")
         else:
             logger.info(f"⏭️  IA désactivée pour la feuille {sheet_id}, génération directe")
         
-        # 4. Générer les 3 PDFs
-        subject_pdf_bytes = build_sheet_subject_pdf(preview)
-        student_pdf_bytes = build_sheet_student_pdf(preview)
-        correction_pdf_bytes = build_sheet_correction_pdf(preview)
+        metadata = {
+            "sheet_id": sheet_id,
+            "titre": sheet["titre"],
+            "niveau": sheet["niveau"],
+            "nb_exercises": len(preview_items),
+            "ai_enrichment_applied": check_if_ai_needed(preview),
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+        
+        # 4bis. Mode artefacts : réponse immédiate, PDFs stockés dès qu'ils sont rendus
+        if delivery == "artifacts":
+            filename_base = f"LeMaitreMot_{sheet['titre'].replace(' ', '_')}"
+            exports_db = get_exports_db(request)
+            job = await create_export_job(exports_db, {
+                "subject": f"{filename_base}_Sujet.pdf",
+                "student": f"{filename_base}_Eleve.pdf",
+                "correction": f"{filename_base}_Corrige.pdf",
+            }, metadata, owner=user_email)
+            launch_export_job(exports_db, job, start_sheet_variant_renders(preview))
+            return export_job_view(job)
+        
+        # 4. Générer les 3 PDFs (préparation commune, rendus en parallèle)
+        pdfs = await build_sheet_variant_pdfs(preview)
         
         # 5. Encoder en base64
         response = {
-            "subject_pdf": base64.b64encode(subject_pdf_bytes).decode('utf-8'),
-            "student_pdf": base64.b64encode(student_pdf_bytes).decode('utf-8'),
-            "correction_pdf": base64.b64encode(correction_pdf_bytes).decode('utf-8'),
-            "metadata": {
-                "sheet_id": sheet_id,
-                "titre": sheet["titre"],
-                "niveau": sheet["niveau"],
-                "nb_exercises": len(preview_items),
-                "ai_enrichment_applied": check_if_ai_needed(preview),
-                "generated_at": datetime.now(timezone.utc).isoformat()
-            }
+            "subject_pdf": base64.b64encode(pdfs["subject"]).decode('utf-8'),
+            "student_pdf": base64.b64encode(pdfs["student"]).decode('utf-8'),
+            "correction_pdf": base64.b64encode(pdfs["correction"]).decode('utf-8'),
+            "metadata": metadata
         }
         
         return response
@@ -1145,11 +1197,15 @@ async def export_standard_pdf(
     sheet_id: str,
     request: Request,
     layout: str = "eco",  # Query param: "eco" ou "classic"
+    delivery: str = Query("json", description="json (PDFs en base64) ou artifacts (job + téléchargements binaires)"),
     x_session_token: Optional[str] = Header(None, alias="X-Session-Token")
 ):
     """
     Export Standard - Génère 2 PDFs simplifiés (Élève + Corrigé)
 
+    delivery=artifacts: retourne un job d'export (identifiants + URLs des PDFs
+    binaires) au lieu des PDFs en base64.
+
     P0 BUSINESS: Export PDF nécessite un compte (Free ou Pro)
 
     SPRINT FUSION PDF - Export standard simplifié:
@@ -1182,7 +1238,8 @@ async def export_standard_pdf(
     """
     from engine.pdf_engine.mathalea_sheet_pdf_builder import (
         build_sheet_student_pdf,
-        build_sheet_correction_pdf
+        build_sheet_correction_pdf,
+        start_sheet_variant_renders
     )
     from backend.server import validate_session_token, check_user_pro_status
 
@@ -1203,6 +1260,7 @@ async def export_standard_pdf(
     
     # PR7.1: Valider qu'un compte est requis pour exporter (retourne 401 avec code AUTH_REQUIRED_EXPORT)
     assert_can_export_pdf(user_email)
+    validate_pdf_delivery(delivery)
 
     # Vérifier le statut Pro
     is_pro_user, pro_user_doc = await check_user_pro_status(user_email)
@@ -1255,6 +1313,28 @@ async def export_standard_pdf(
         logger.info(
             f"[EXPORT_QUOTA] user_type=pro user_email={user_email} sheet_id={sheet_id} - pas de quota"
         )
+
+    async def record_free_export(from_cache: bool) -> None:
+        """P0: Enregistre l'export livré dans user_exports (pour quotas Free)"""
+        if is_pro_user:
+            return
+        try:
+            export_doc = {
+                "user_email": user_email,
+                "sheet_id": sheet_id,
+                "type": "sheet_export",
+                "layout": effective_layout,
+                "from_cache": from_cache,
+                "created_at": datetime.now(timezone.utc)
+            }
+            await db_to_use.user_exports.insert_one(export_doc)
+            logger.info(
+                f"[EXPORT_QUOTA] user_type=free user_email={user_email} sheet_id={sheet_id} "
+                f"- export enregistré ({exports_today + 1}/{max_exports_per_day})"
+            )
+        except Exception as e:
+            logger.error(f"[EXPORT_QUOTA] Erreur enregistrement export: {e}")
+            # Ne pas bloquer l'export si l'enregistrement échoue
     
     try:
         # 1. Vérifier que la feuille existe
@@ -1289,37 +1369,40 @@ async def export_standard_pdf(
             # Cache HIT - Retourner les PDFs du cache
             logger.info(f"[PDF_CACHE] Returning cached PDF for sheet_id={sheet_id}")
 
-            # Quand même enregistrer l'export pour les quotas (Free users)
-            if not is_pro_user:
-                try:
-                    export_doc = {
-                        "user_email": user_email,
-                        "sheet_id": sheet_id,
-                        "type": "sheet_export",
-                        "layout": effective_layout,
-                        "from_cache": True,
-                        "created_at": datetime.now(timezone.utc)
-                    }
-                    await db_to_use.user_exports.insert_one(export_doc)
-                except Exception as e:
-                    logger.error(f"[EXPORT_QUOTA] Erreur enregistrement export (cache): {e}")
+            filename_base = f"LeMaitreMot_{sheet['titre'].replace(' ', '_')}"
+            metadata = {
+                "sheet_id": sheet_id,
+                "titre": sheet["titre"],
+                "niveau": sheet["niveau"],
+                "nb_exercises": len(items),
+                "generated_at": cached_pdf.get("created_at", datetime.now(timezone.utc)).isoformat(),
+                "from_cache": True,
+                "user_type": user_type,
+                "user_email": user_email,
+                "exports_today": exports_today + 1 if not is_pro_user else None,
+                "exports_remaining": max_exports_per_day - exports_today - 1 if not is_pro_user else None
+            }
 
+            # Quand même enregistrer l'export pour les quotas (Free users), une
+            # fois les PDFs effectivement livrés
+            if delivery == "artifacts":
+                exports_db = get_exports_db(request)
+                job = await create_export_job(exports_db, {
+                    "student": f"{filename_base}_Eleve.pdf",
+                    "correction": f"{filename_base}_Corrige.pdf",
+                }, metadata, owner=user_email)
+                launch_export_job(exports_db, job, {
+                    "student": rendered(base64.b64decode(cached_pdf["student_pdf"])),
+                    "correction": rendered(base64.b64decode(cached_pdf["correction_pdf"])),
+                }, on_success=lambda: record_free_export(True))
+                return {**export_job_view(job), "filename_base": filename_base}
+
+            await record_free_export(True)
             return {
                 "student_pdf": cached_pdf["student_pdf"],
                 "correction_pdf": cached_pdf["correction_pdf"],
-                "filename_base": f"LeMaitreMot_{sheet['titre'].replace(' ', '_')}",
-                "metadata": {
-                    "sheet_id": sheet_id,
-                    "titre": sheet["titre"],
-                    "niveau": sheet["niveau"],
-                    "nb_exercises": len(items),
-                    "generated_at": cached_pdf.get("created_at", datetime.now(timezone.utc)).isoformat(),
-                    "from_cache": True,
-                    "user_type": user_type,
-                    "user_email": user_email,
-                    "exports_today": exports_today + 1 if not is_pro_user else None,
-                    "exports_remaining": max_exports_per_day - exports_today - 1 if not is_pro_user else None
-                }
+                "filename_base": filename_base,
+                "metadata": metadata
             }
 
         # Cache MISS - Continuer avec la génération
@@ -1389,16 +1472,23 @@ async def export_standard_pdf(
         # Si utilisateur Pro, peut choisir classic, sinon default eco
         # Note: effective_layout already computed above (eco forced for free users)
 
-        # 4. Générer les 2 PDFs uniquement
-        logger.info(f"📄 Génération export standard pour la feuille {sheet_id} (layout={effective_layout})")
-        student_pdf_bytes = build_sheet_student_pdf(preview, layout=effective_layout)
-        correction_pdf_bytes = build_sheet_correction_pdf(preview, layout=effective_layout)
-
-        # 5. Encoder en base64
-        student_pdf_b64 = base64.b64encode(student_pdf_bytes).decode('utf-8')
-        correction_pdf_b64 = base64.b64encode(correction_pdf_bytes).decode('utf-8')
+        # 4. Créer le nom de fichier base
+        filename_base = f"LeMaitreMot_{sheet['titre'].replace(' ', '_')}"
+        metadata = {
+            "sheet_id": sheet_id,
+            "titre": sheet["titre"],
+            "niveau": sheet["niveau"],
+            "nb_exercises": len(preview_items),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "from_cache": False,
+            "user_type": user_type,
+            "user_email": user_email,
+            "exports_today": exports_today + 1 if not is_pro_user else None,
+            "exports_remaining": max_exports_per_day - exports_today - 1 if not is_pro_user else None
+        }
 
-        # 6. Stocker dans le cache
+        # 5. Générer les 2 PDFs uniquement
+        logger.info(f"📄 Génération export standard pour la feuille {sheet_id} (layout={effective_layout})")
         cache_metadata = {
             "sheet_id": sheet_id,
             "titre": sheet["titre"],
@@ -1406,54 +1496,59 @@ async def export_standard_pdf(
             "nb_exercises": len(preview_items),
             "layout": effective_layout
         }
-        await store_pdf_in_cache(
-            db_to_use,
-            cache_key,
-            student_pdf_b64,
-            correction_pdf_b64,
-            cache_metadata
-        )
-
-        # 7. Créer le nom de fichier base
-        filename_base = f"LeMaitreMot_{sheet['titre'].replace(' ', '_')}"
+        if delivery == "artifacts":
+            # Mode artefacts : rendus en tâche de fond, sans copie base64 dans la
+            # réponse ; quota et cache PDF mis à jour seulement une fois les 2 PDFs
+            # stockés (rien n'est consommé ni mis en cache si le rendu échoue)
+            renders = start_sheet_variant_renders(
+                preview, ("student", "correction"), layout=effective_layout
+            )
 
-        # 8. P0: Enregistrer l'export dans user_exports (pour quotas Free)
-        if not is_pro_user:
-            try:
-                export_doc = {
-                    "user_email": user_email,
-                    "sheet_id": sheet_id,
-                    "type": "sheet_export",
-                    "layout": effective_layout,
-                    "from_cache": False,
-                    "created_at": datetime.now(timezone.utc)
-                }
-                await db_to_use.user_exports.insert_one(export_doc)
-                logger.info(
-                    f"[EXPORT_QUOTA] user_type=free user_email={user_email} sheet_id={sheet_id} "
-                    f"- export enregistré ({exports_today + 1}/{max_exports_per_day})"
+            async def on_artifacts_stored() -> None:
+                await record_free_export(False)
+                await store_pdf_in_cache(
+                    db_to_use,
+                    cache_key,
+                    base64.b64encode(renders["student"].result()).decode('utf-8'),
+                    base64.b64encode(renders["correction"].result()).decode('utf-8'),
+                    cache_metadata
                 )
-            except Exception as e:
-                logger.error(f"[EXPORT_QUOTA] Erreur enregistrement export: {e}")
-                # Ne pas bloquer l'export si l'enregistrement échoue
+
+            exports_db = get_exports_db(request)
+            job = await create_export_job(exports_db, {
+                "student": f"{filename_base}_Eleve.pdf",
+                "correction": f"{filename_base}_Corrige.pdf",
+            }, metadata, owner=user_email)
+            launch_export_job(exports_db, job, renders, on_success=on_artifacts_stored)
+        else:
+            student_pdf_bytes = build_sheet_student_pdf(preview, layout=effective_layout)
+            correction_pdf_bytes = build_sheet_correction_pdf(preview, layout=effective_layout)
+
+            # 6. Encoder en base64
+            student_pdf_b64 = base64.b64encode(student_pdf_bytes).decode('utf-8')
+            correction_pdf_b64 = base64.b64encode(correction_pdf_bytes).decode('utf-8')
+
+            # 7. Stocker dans le cache
+            await store_pdf_in_cache(
+                db_to_use,
+                cache_key,
+                student_pdf_b64,
+                correction_pdf_b64,
+                cache_metadata
+            )
 
         # 9. Retourner la réponse
+        if delivery == "artifacts":
+            return {**export_job_view(job), "filename_base": filename_base}
+
+        # 8. P0: Enregistrer l'export dans user_exports (pour quotas Free)
+        await record_free_export(False)
+
         response = {
             "student_pdf": student_pdf_b64,
             "correction_pdf": correction_pdf_b64,
             "filename_base": filename_base,
-            "metadata": {
-                "sheet_id": sheet_id,
-                "titre": sheet["titre"],
-                "niveau": sheet["niveau"],
-                "nb_exercises": len(preview_items),
-                "generated_at": datetime.now(timezone.utc).isoformat(),
-                "from_cache": False,
-                "user_type": user_type,
-                "user_email": user_email,
-                "exports_today": exports_today + 1 if not is_pro_user else None,
-                "exports_remaining": max_exports_per_day - exports_today - 1 if not is_pro_user else None
-            }
+            "metadata": metadata
         }
 
         logger.info(f"✅ Export standard généré: 2 PDFs pour la feuille {sheet_id} (user_type={user_type})")
@@ -1473,6 +1568,8 @@ async def export_standard_pdf(
 async def generate_pro_pdf(
     sheet_id: str,
     request: ProPdfRequest,
+    http_request: Request,
+    delivery: str = Query("json", description="json (PDFs en base64) ou artifacts (job + téléchargements binaires)"),
     x_session_token: str = Header(None, alias="X-Session-Token")
 ):
     """
@@ -1494,6 +1591,7 @@ async def generate_pro_pdf(
             "pro_pdf": "base64...",
             "filename": "LeMaitreMot_Pro_NomFiche.pdf"
         }
+        ou, avec delivery=artifacts, le job d'export (identifiants + URLs des PDFs binaires)
     
     Raises:
         403: Si l'utilisateur n'est pas Pro
@@ -1502,6 +1600,7 @@ async def generate_pro_pdf(
     """
     template = request.template
     logger.info(f"📝 Demande de génération PDF Pro pour la fiche {sheet_id} (template: {template})")
+    validate_pdf_delivery(delivery)
     
     # VÉRIFICATION PRO - Validation stricte du token et statut Pro
     if not x_session_token:
@@ -1657,16 +1756,17 @@ async def generate_pro_pdf(
             try:
                 # Exécuter WeasyPrint dans un thread pool avec timeout
                 loop = asyncio.get_event_loop()
-                pdf_bytes = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        lambda: weasyprint.HTML(
-                            string=html_content,
-                            base_url=str(Path("/app/backend").resolve())
-                        ).write_pdf()
-                    ),
-                    timeout=timeout_seconds
-                )
+                with stage("pdf"):
+                    pdf_bytes = await asyncio.wait_for(
+                        loop.run_in_executor(
+                            None,
+                            lambda: weasyprint.HTML(
+                                string=html_content,
+                                base_url=str(Path("/app/backend").resolve())
+                            ).write_pdf()
+                        ),
+                        timeout=timeout_seconds
+                    )
                 logger.info(f"✅ PDF {pdf_name} généré avec succès ({len(pdf_bytes)} bytes)")
                 return pdf_bytes
             except asyncio.TimeoutError:
@@ -1694,7 +1794,6 @@ async def generate_pro_pdf(
             document_data=document_data,
             template_config=template_config
         )
-        pro_subject_pdf_bytes = await generate_pdf_with_timeout(html_sujet, "sujet", timeout_seconds=30)
         
         # Générer le Corrigé Pro (énoncés + solutions)
         html_corrige = render_pro_corrige(
@@ -1702,6 +1801,33 @@ async def generate_pro_pdf(
             document_data=document_data,
             template_config=template_config
         )
+        
+        # Créer le nom de fichier base
+        base_filename = f"LeMaitreMot_{sheet.get('titre', 'Fiche').replace(' ', '_')}_Pro"
+        pro_metadata = {
+            "base_filename": base_filename,
+            "template": template,
+            "etablissement": template_config.get("school_name"),
+            "professeur": template_config.get("professor_name"),
+            "school_year": template_config.get("school_year"),
+            "footer_text": template_config.get("footer_text"),
+            "logo_url": template_config.get("logo_url")
+        }
+        
+        # Mode artefacts : rendus en tâche de fond, PDFs servis en binaire
+        if delivery == "artifacts":
+            exports_db = get_exports_db(http_request)
+            job = await create_export_job(exports_db, {
+                "pro_subject": f"{base_filename}_Sujet.pdf",
+                "pro_correction": f"{base_filename}_Corrige.pdf",
+            }, {"sheet_id": sheet_id, **pro_metadata}, owner=user_email)
+            launch_export_job(exports_db, job, {
+                "pro_subject": generate_pdf_with_timeout(html_sujet, "sujet", timeout_seconds=30),
+                "pro_correction": generate_pdf_with_timeout(html_corrige, "corrigé", timeout_seconds=30),
+            })
+            return {**export_job_view(job), **pro_metadata}
+        
+        pro_subject_pdf_bytes = await generate_pdf_with_timeout(html_sujet, "sujet", timeout_seconds=30)
         pro_correction_pdf_bytes = await generate_pdf_with_timeout(html_corrige, "corrigé", timeout_seconds=30)
         
         # 7. Encoder les 2 PDFs en base64
@@ -1709,21 +1835,12 @@ async def generate_pro_pdf(
         pro_subject_pdf_b64 = base64.b64encode(pro_subject_pdf_bytes).decode('utf-8')
         pro_correction_pdf_b64 = base64.b64encode(pro_correction_pdf_bytes).decode('utf-8')
         
-        # 8. Créer le nom de fichier base
-        base_filename = f"LeMaitreMot_{sheet.get('titre', 'Fiche').replace(' ', '_')}_Pro"
-        
         logger.info(f"✅ 2 PDFs Pro générés avec succès pour la fiche {sheet_id} (template: {template})")
         
         return {
             "pro_subject_pdf": pro_subject_pdf_b64,
             "pro_correction_pdf": pro_correction_pdf_b64,
-            "base_filename": base_filename,
-            "template": template,
-            "etablissement": template_config.get("school_name"),
-            "professeur": template_config.get("professor_name"),
-            "school_year": template_config.get("school_year"),
-            "footer_text": template_config.get("footer_text"),
-            "logo_url": template_config.get("logo_url")
+            **pro_metadata
         }
         
     except HTTPException:
@@ -1737,6 +1854,142 @@ async def generate_pro_pdf(
 
 
 
+# ============================================================================
+# ENDPOINTS: Téléchargement des exports par artefacts
+# ============================================================================
+
+async def _get_export_job_or_404(request: Request, job_id: str, x_session_token: Optional[str]) -> Dict[str, Any]:
+    """
+    Job d'export du compte connecté. Un job d'un autre compte (ou demandé
+    sans session valide) répond 404, comme un job inexistant.
+    """
+    from backend.server import validate_session_token
+
+    user_email = await validate_session_token(x_session_token) if x_session_token else None
+    job = await get_export_job(get_exports_db(request), job_id)
+    if not job or not is_export_job_owner(job, user_email):
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "EXPORT_JOB_NOT_FOUND", "message": "Export introuvable ou expiré"}
+        )
+    return job
+
+
+def _raise_if_not_ready(artifacts: List[Dict[str, Any]]) -> None:
+    for artifact in artifacts:
+        if artifact["status"] == ARTIFACT_PENDING:
+            raise HTTPException(
+                status_code=409,
+                detail={"error": "EXPORT_PENDING", "message": "PDF en cours de génération"},
+                headers={"Retry-After": "1"}
+            )
+        if artifact["status"] != ARTIFACT_READY:
+            raise HTTPException(
+                status_code=500,
+                detail={"error": "EXPORT_FAILED", "message": artifact.get("error", "Génération du PDF échouée")}
+            )
+
+
+@router.get("/exports/{job_id}")
+async def get_export_job_status(
+    job_id: str,
+    request: Request,
+    x_session_token: Optional[str] = Header(None, alias="X-Session-Token")
+):
+    """Statut d'un export par artefacts (identifiants, statuts, URLs de téléchargement)"""
+    return export_job_view(await _get_export_job_or_404(request, job_id, x_session_token))
+
+
+@router.get("/exports/{job_id}/artifacts/{artifact_id}")
+async def download_export_artifact(
+    job_id: str,
+    artifact_id: str,
+    request: Request,
+    x_session_token: Optional[str] = Header(None, alias="X-Session-Token")
+):
+    """
+    Télécharge un PDF d'un export en binaire (application/pdf), par morceaux.
+
+    - ETag / If-None-Match : 304 si le client a déjà ce PDF
+    - Range (un intervalle) : 206 Partial Content, If-Range respecté
+    - 409 + Retry-After tant que le PDF est en cours de génération
+    """
+    job = await _get_export_job_or_404(request, job_id, x_session_token)
+    artifact = find_artifact(job, artifact_id)
+    if not artifact:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "EXPORT_ARTIFACT_NOT_FOUND", "message": "PDF introuvable"}
+        )
+    _raise_if_not_ready([artifact])
+
+    size = artifact["size"]
+    etag = f'"{artifact["etag"]}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=3600",
+        "Content-Disposition": content_disposition(artifact["filename"]),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range_header(range_header, size)
+    except ValueError:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    exports_db = get_exports_db(request)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(
+            iter_artifact_bytes(exports_db, artifact_id),
+            media_type="application/pdf",
+            headers=headers
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_artifact_bytes(exports_db, artifact_id, start, end),
+        status_code=206,
+        media_type="application/pdf",
+        headers=headers
+    )
+
+
+@router.get("/exports/{job_id}/bundle.zip")
+async def download_export_bundle(
+    job_id: str,
+    request: Request,
+    x_session_token: Optional[str] = Header(None, alias="X-Session-Token")
+):
+    """Tous les PDFs d'un export dans un ZIP construit en streaming"""
+    job = await _get_export_job_or_404(request, job_id, x_session_token)
+    _raise_if_not_ready(job["artifacts"])
+
+    metadata = job.get("metadata", {})
+    if metadata.get("base_filename"):
+        filename_base = metadata["base_filename"]
+    elif metadata.get("titre"):
+        filename_base = f"LeMaitreMot_{metadata['titre'].replace(' ', '_')}"
+    else:
+        filename_base = f"LeMaitreMot_{job_id[:8]}"
+    return StreamingResponse(
+        iter_zip_bundle(get_exports_db(request), job["artifacts"]),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(f"{filename_base}.zip")}
+    )
+
+
 # ============================================================================
 # ENDPOINTS: Pro User Config
 # ============================================================================
@@ -22,6 +22,7 @@ import io
 import asyncio
 from pathlib import Path
 
+from backend.observability.timing import stage
 from backend.server import db, validate_session_token
 
 logger = logging.getLogger(__name__)
@@ -736,16 +737,17 @@ async def export_sheet_pdf(
         import weasyprint
         
         loop = asyncio.get_event_loop()
-        pdf_bytes = await asyncio.wait_for(
-            loop.run_in_executor(
-                None,
-                lambda: weasyprint.HTML(
-                    string=html_content,
-                    base_url=str(Path("/app/backend").resolve())
-                ).write_pdf()
-            ),
-            timeout=30
-        )
+        with stage("pdf"):
+            pdf_bytes = await asyncio.wait_for(
+                loop.run_in_executor(
+                    None,
+                    lambda: weasyprint.HTML(
+                        string=html_content,
+                        base_url=str(Path("/app/backend").resolve())
+                    ).write_pdf()
+                ),
+                timeout=30
+            )
         
         # P0 Gold - Suffixe pour différencier sujet/corrigé
         filename_suffix = "_sujet_corrige" if include_solutions else "_sujet"
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la préparation des exercices avant export PDF.
+
+Compare, pour un document de N exercices (LaTeX rendu par matplotlib) :
+- inline : préparation directement dans la boucle asyncio (avant le pool)
+- pool=1 / pool=N : prepare_exercises_concurrently sur le pool de threads
+
+Deux mesures par mode :
+- durée murale de la préparation du document
+- retard maximal de la boucle asyncio (un ticker de 1 ms tourne pendant la
+  préparation) : c'est la latence subie par les autres requêtes du worker
+
+Usage:
+    python backend/scripts/benchmark_export_preparation.py
+    python backend/scripts/benchmark_export_preparation.py --exercises 20 --workers 4 --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+# Ajouter le répertoire racine au path
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from backend.latex_to_svg import latex_renderer
+from backend.services import export_preparation_service
+from backend.services.export_preparation_service import ExportStageTimings, prepare_exercises_concurrently
+
+
+def make_exercises(count: int, round_index: int) -> List[Dict[str, str]]:
+    """Exercices distincts à chaque tour (le cache SVG du renderer ne sert pas)"""
+    return [
+        {
+            "enonce": (
+                f"Calcule \\(\\frac{{{index + 1}}}{{{round_index + 7}}} + \\frac{{3}}{{4}}\\) "
+                f"puis $$\\sqrt{{{index + 2}x^2 + {round_index}}}$$ et \\(x^{{{index % 5 + 2}}}\\)."
+            ),
+        }
+        for index in range(count)
+    ]
+
+
+def prepare_exercise(exercise: Dict[str, str], timings: ExportStageTimings) -> None:
+    with timings.stage("latex"):
+        exercise["enonce"] = latex_renderer.convert_latex_to_svg(exercise["enonce"])
+
+
+async def measure(prepare: Callable[[], Awaitable[None]]) -> Tuple[float, float]:
+    """(durée murale ms, retard max de la boucle ms)"""
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        while running:
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, (time.perf_counter() - expected) * 1000)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await prepare()
+    duration = (time.perf_counter() - start) * 1000
+    running = False
+    await ticker_task
+    return duration, max_lag
+
+
+async def run(exercise_count: int, workers: int, rounds: int) -> None:
+    # Warm-up : imports matplotlib, polices
+    prepare_exercise(make_exercises(1, -1)[0], ExportStageTimings())
+
+    async def inline(exercises):
+        timings = ExportStageTimings()
+        for exercise in exercises:
+            prepare_exercise(exercise, timings)
+
+    def pooled(pool_workers):
+        async def prepare(exercises):
+            export_preparation_service._executor = None
+            export_preparation_service.EXPORT_PREPARATION_WORKERS = pool_workers
+            await prepare_exercises_concurrently(exercises, prepare_exercise)
+        return prepare
+
+    modes = [("inline", inline), ("pool=1", pooled(1)), (f"pool={workers}", pooled(workers))]
+    results: Dict[str, List[Tuple[float, float]]] = {name: [] for name, _ in modes}
+    for round_index in range(rounds):
+        for name, mode in modes:
+            latex_renderer.svg_cache.clear()
+            exercises = make_exercises(exercise_count, round_index)
+            results[name].append(await measure(lambda: mode(exercises)))
+
+    print(f"{exercise_count} exercices, {rounds} tours (médianes)")
+    print(f"{'mode':<10} {'durée ms':>10} {'retard boucle max ms':>22}")
+    for name, samples in results.items():
+        durations = [duration for duration, _ in samples]
+        lags = [lag for _, lag in samples]
+        print(f"{name:<10} {statistics.median(durations):>10.1f} {statistics.median(lags):>22.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.exercises, args.workers, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
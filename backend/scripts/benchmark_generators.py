@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark des générateurs dynamiques (générateur × difficulté × preset × seeds)
+
+Mesure p50/p95/p99, pic d'allocation et taille de sortie de chaque cas, écrit
+le rapport JSON et le compare éventuellement à un baseline (code de sortie 1
+en cas de régression au-delà de la tolérance).
+
+Usage:
+    # Créer / mettre à jour le baseline
+    python backend/scripts/benchmark_generators.py --output docs/generators_perf_baseline.json
+
+    # Comparer au baseline (tolérance 25 %)
+    python backend/scripts/benchmark_generators.py --baseline docs/generators_perf_baseline.json
+
+    # Un seul générateur, plus de seeds
+    python backend/scripts/benchmark_generators.py --generator THALES_V2 --seeds 200
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire racine au path
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from backend.generators.benchmark import compare_to_baseline, load_baseline, run_benchmark, save_baseline
+
+logging.basicConfig(level=logging.WARNING)  # Réduire le bruit des logs (une ligne par génération sinon)
+
+
+def print_report(report: dict) -> None:
+    print(f"{'Cas':<58} {'p50':>7} {'p95':>7} {'p99':>7} {'alloc Ko':>9} {'octets':>7}", file=sys.stderr)
+    for cid, m in sorted(report["cases"].items()):
+        flags = ""
+        if m.get("errors"):
+            flags += f"  erreurs: {m['errors']}"
+        if m.get("over_budget"):
+            flags += f"  > budget {m['perf_budget_ms']} ms"
+        print(
+            f"{cid:<58} {m['p50_ms']:7.2f} {m['p95_ms']:7.2f} {m['p99_ms']:7.2f} "
+            f"{m['alloc_peak_kb']:9.1f} {m['output_bytes']:7d}{flags}",
+            file=sys.stderr
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des générateurs dynamiques")
+    parser.add_argument("--generator", action="append", help="Clé de générateur (répétable, défaut: tous)")
+    parser.add_argument("--seeds", type=int, default=50, help="Nombre de seeds par cas")
+    parser.add_argument("--alloc-seeds", type=int, default=5, help="Seeds tracés par tracemalloc par cas")
+    parser.add_argument("--repeat", type=int, default=3, help="Mesures par seed (on garde la meilleure)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON du rapport (format baseline)")
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Dégradation tolérée (0.25 = +25 %%)")
+    parser.add_argument("--quiet", action="store_true", help="Ne pas afficher le détail par cas")
+    args = parser.parse_args()
+
+    report = run_benchmark(keys=args.generator, seeds=range(args.seeds), alloc_seeds=args.alloc_seeds, repeat=args.repeat)
+    print(f"📊 {len(report['cases'])} cas × {report['seeds']} seeds", file=sys.stderr)
+    if not args.quiet:
+        print_report(report)
+
+    if args.output:
+        save_baseline(report, args.output)
+        print(f"✅ Rapport écrit ({args.output})", file=sys.stderr)
+
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"❌ Baseline introuvable: {args.baseline}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            regressions = compare_to_baseline(report, load_baseline(args.baseline), tolerance=args.tolerance)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        if regressions:
+            print(f"❌ {len(regressions)} régression(s) au-delà de {args.tolerance:.0%}:", file=sys.stderr)
+            for r in regressions:
+                print(f"   {r['case']} {r['metric']}: {r['baseline']} -> {r['current']}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Aucune régression par rapport au baseline (tolérance {args.tolerance:.0%})", file=sys.stderr)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark du surcoût par requête du rate limiting (stockages limits).
+
+Mesure le temps moyen d'un hit (stratégie sliding-window-counter) selon le
+stockage :
+- memory : mémoire du process (non partagé)
+- shared : SharedCounterStorage (défaut en production), décision locale ;
+  la synchronisation de fond est mesurée à part (durée d'un cycle sync())
+- mongodb : stockage MongoDB de limits (aller-retour par hit)
+
+Sans --mongo-url, le stockage partagé se synchronise avec une collection
+en mémoire (stand-in local) : seul le coût de la décision est représentatif.
+
+Usage:
+    # Stockages locaux uniquement
+    python backend/scripts/benchmark_rate_limiter.py
+
+    # Avec MongoDB (stockage partagé réel + stockage MongoDB de limits)
+    python backend/scripts/benchmark_rate_limiter.py --mongo-url mongodb://localhost:27017
+
+    # Limite et nombre de hits
+    python backend/scripts/benchmark_rate_limiter.py --limit "60/15minutes" --hits 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Tuple
+
+# Ajouter le répertoire racine au path
+ROOT_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from backend.middleware.rate_limit_storage import SharedCounterStorage
+
+
+class LocalCountersCollection:
+    """Stand-in en mémoire de la collection des compteurs partagés"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            key = op._filter["_id"]
+            self.counts[key] = self.counts.get(key, 0) + op._doc["$inc"]["count"]
+
+    def find(self, query, projection=None):
+        return [{"_id": key, "count": self.counts[key]} for key in query["_id"]["$in"] if key in self.counts]
+
+    def delete_many(self, query):
+        self.counts.clear()
+
+
+def run_benchmark(storage_uri: str, limit: str, hits: int, keys: int, **options) -> Tuple[List[float], int, object]:
+    """Exécute `hits` hits répartis sur `keys` clés ; retourne (durées µs, hits acceptés, stockage)"""
+    storage = storage_from_string(storage_uri, **options)
+    return run_hits(storage, limit, hits, keys)
+
+
+def run_hits(storage, limit: str, hits: int, keys: int) -> Tuple[List[float], int, object]:
+    limiter = STRATEGIES["sliding-window-counter"](storage)
+    item = parse(limit)
+    run_id = uuid.uuid4().hex[:8]
+
+    durations = []
+    accepted = 0
+    for i in range(hits):
+        key = f"bench-{run_id}-{i % keys}"
+        start = time.perf_counter()
+        if limiter.hit(item, key, "/api/bench"):
+            accepted += 1
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return durations, accepted, storage
+
+
+def print_result(name: str, durations: List[float], accepted: int, storage) -> None:
+    ordered = sorted(durations)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<28} moyenne: {statistics.mean(durations):8.1f} µs  "
+        f"p95: {p95:8.1f} µs  acceptés: {accepted}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du surcoût du rate limiting par requête")
+    parser.add_argument("--limit", default="60/15minutes", help="Limite testée (syntaxe limits)")
+    parser.add_argument("--hits", type=int, default=1000, help="Nombre de hits")
+    parser.add_argument("--keys", type=int, default=20, help="Nombre de clés (adresses IP) distinctes")
+    parser.add_argument("--mongo-url", default=None, help="MongoDB à utiliser pour le stockage partagé")
+    args = parser.parse_args()
+
+    print(f"📊 Rate limiting: {args.hits} hits, {args.keys} clés, limite {args.limit}\n")
+
+    durations, accepted, storage = run_benchmark("memory://", args.limit, args.hits, args.keys)
+    print_result("memory", durations, accepted, storage)
+
+    # Stockage partagé : synchronisation manuelle (sync_interval=0) pour la mesurer
+    mongo_options = {"database_name": "rate_limit_benchmark", "serverSelectionTimeoutMS": 2000}
+    if args.mongo_url:
+        shared = SharedCounterStorage("shared+" + args.mongo_url, sync_interval=0, **mongo_options)
+        shared_name = "shared (mongodb)"
+    else:
+        shared = SharedCounterStorage("shared+", sync_interval=0, collection=LocalCountersCollection())
+        shared_name = "shared (stand-in local)"
+    durations, accepted, _ = run_hits(shared, args.limit, args.hits, args.keys)
+    print_result(shared_name, durations, accepted, shared)
+    start = time.perf_counter()
+    shared.sync()
+    first_sync = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    shared.sync()
+    idle_sync = (time.perf_counter() - start) * 1000
+    print(
+        f"{'':<28} sync() : {first_sync:.1f} ms ({args.keys} fenêtres modifiées), "
+        f"{idle_sync:.1f} ms (relecture seule) — hors requêtes, thread de fond"
+    )
+    shared.reset()
+    shared.close()
+
+    if args.mongo_url:
+        durations, accepted, storage = run_benchmark(args.mongo_url, args.limit, args.hits, args.keys, **mongo_options)
+        print_result("mongodb (limits)", durations, accepted, storage)
+        storage.reset()
+
+
+if __name__ == "__main__":
+    main()
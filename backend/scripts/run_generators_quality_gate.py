@@ -10,6 +10,10 @@ Usage:
     
     # Mode check (vérifie sans modifier)
     python backend/scripts/run_generators_quality_gate.py --check
+
+    # Gate de performance (régressions p50/p95/p99, allocations, taille de sortie)
+    python backend/scripts/run_generators_quality_gate.py --check --perf
+    python backend/scripts/run_generators_quality_gate.py --perf-only --update-perf-baseline
 """
 
 import sys
@@ -34,6 +38,9 @@ CLASSIFY_SCRIPT = ROOT_DIR / "backend" / "scripts" / "classify_generators.py"
 TEST_RESULTS_FILE = ROOT_DIR / "test_results.json"
 CLASSIFICATION_FILE = ROOT_DIR / "docs" / "CLASSIFICATION_GENERATEURS.md"
 FACTORY_FILE = ROOT_DIR / "backend" / "generators" / "factory.py"
+BENCHMARK_SCRIPT = ROOT_DIR / "backend" / "scripts" / "benchmark_generators.py"
+PERF_BASELINE_FILE = ROOT_DIR / "docs" / "generators_perf_baseline.json"
+PERF_TOLERANCE = 0.25
 
 
 # =============================================================================
@@ -190,6 +197,28 @@ def update_factory_disabled_generators(factory_file: Path, disabled_generators:
     return False
 
 
+def run_perf_gate(baseline: Path, tolerance: float, seeds: int, update: bool) -> bool:
+    """
+    Benchmark des générateurs comparé au baseline (ou réécriture du baseline).
+
+    Returns:
+        True si aucune régression (ou baseline mis à jour), False sinon
+    """
+    cmd = [sys.executable, str(BENCHMARK_SCRIPT), "--seeds", str(seeds), "--quiet"]
+    if update:
+        cmd += ["--output", str(baseline)]
+    else:
+        if not baseline.exists():
+            print(f"❌ Baseline de performance introuvable: {baseline}", file=sys.stderr)
+            print("   Le créer avec --update-perf-baseline", file=sys.stderr)
+            return False
+        cmd += ["--baseline", str(baseline), "--tolerance", str(tolerance)]
+
+    exit_code, stdout, stderr = run_command(cmd)
+    print(stderr, file=sys.stderr)
+    return exit_code == 0
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -201,7 +230,31 @@ def main():
         action="store_true",
         help="Mode check : vérifie sans modifier les fichiers"
     )
+    parser.add_argument(
+        "--perf",
+        action="store_true",
+        help="Ajoute le gate de performance (benchmark comparé au baseline)"
+    )
+    parser.add_argument(
+        "--perf-only",
+        action="store_true",
+        help="Exécute uniquement le gate de performance"
+    )
+    parser.add_argument(
+        "--update-perf-baseline",
+        action="store_true",
+        help="Réécrit le baseline de performance au lieu de le comparer"
+    )
+    parser.add_argument("--perf-baseline", type=Path, default=PERF_BASELINE_FILE, help="Fichier baseline")
+    parser.add_argument("--perf-tolerance", type=float, default=PERF_TOLERANCE, help="Dégradation tolérée (0.25 = +25 %%)")
+    parser.add_argument("--perf-seeds", type=int, default=50, help="Nombre de seeds par cas")
     args = parser.parse_args()
+
+    if args.perf_only:
+        print("🚀 Quality Gate - Performance des générateurs", file=sys.stderr)
+        print("=" * 60, file=sys.stderr)
+        ok = run_perf_gate(args.perf_baseline, args.perf_tolerance, args.perf_seeds, args.update_perf_baseline)
+        sys.exit(0 if ok else 1)
     
     print("🚀 Quality Gate - Générateurs dynamiques", file=sys.stderr)
     print("=" * 60, file=sys.stderr)
@@ -279,6 +332,13 @@ def main():
             else:
                 print(f"⚠️  Aucune modification nécessaire", file=sys.stderr)
     
+    # Étape 5 (optionnelle): Gate de performance
+    if args.perf or args.update_perf_baseline:
+        print("\n⏱️  Étape 5: Benchmark des générateurs...", file=sys.stderr)
+        if not run_perf_gate(args.perf_baseline, args.perf_tolerance, args.perf_seeds, args.update_perf_baseline):
+            print("❌ Régression de performance détectée", file=sys.stderr)
+            sys.exit(1)
+    
     print("\n" + "=" * 60, file=sys.stderr)
     print("✅ Quality Gate terminé avec succès", file=sys.stderr)
     sys.exit(0)
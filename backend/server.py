@@ -7,6 +7,7 @@ from starlette.requests import Request as StarletteRequest
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -25,6 +26,36 @@ from jinja2 import Template
 from backend.latex_to_svg import latex_renderer
 from backend.geometry_renderer import geometry_renderer
 from backend.render_schema import schema_renderer
+from backend.services.export_preparation_service import (
+    ExportStageTimings,
+    prepare_exercises_concurrently,
+    run_in_preparation_pool
+)
+from backend.services.usage_rollup_service import (
+    days_ago,
+    get_usage_rollups,
+    record_document,
+    record_export,
+    rollup_day,
+    summarize_rollups
+)
+from backend.services.index_manager import apply_index_registry_safely
+from backend.generators.registry_snapshot import get_registry_snapshot, warm_up_generators
+from backend.services.document_listing_service import (
+    DEFAULT_PAGE_SIZE,
+    DOCUMENT_CONTENT_VERSION,
+    InvalidCursorError,
+    get_document_detail,
+    list_documents
+)
+from backend.services.quota_ledger_service import (
+    FREE_DAILY_EXPORT_QUOTA,
+    GUEST_EXPORT_QUOTA,
+    get_quota_status,
+    record_quota_usage,
+    release_quota,
+    reserve_quota
+)
 import sys
 import subprocess
 # Nouveaux imports pour l'architecture mathématique structurée (réorganisés)
@@ -34,10 +65,12 @@ from backend.routes.math_routes import generate_math_exercises_new_architecture
 import requests
 import latex2mathml.converter
 from backend.logger import get_logger, log_execution_time, log_ai_generation, log_schema_processing, log_user_context, log_quota_check
+from backend.observability.timing import install_mongo_stage_listener, server_timing_enabled, stage
 # P0 - Rate limiting
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from backend.middleware.rate_limit import close_limiter_storage, create_limiter
 from backend.curriculum_data import (
     CURRICULUM_DATA, 
     get_available_subjects, 
@@ -58,7 +91,7 @@ from backend.curriculum_complete import (
     log_feature_flag_access,
     process_math_content_for_pdf
 )
-from backend.document_search import search_educational_document
+from backend.document_search import search_educational_document, document_searcher
 
 # ============================================================================
 # SYSTEM DEPENDENCIES INITIALIZATION
@@ -134,6 +167,10 @@ ROOT_DIR = Path(__file__).parent
 TEMPLATES_DIR = ROOT_DIR / 'templates'
 load_dotenv(ROOT_DIR / '.env')
 
+# Listener Mongo du Server-Timing : après le .env (SERVER_TIMING) et avant la
+# création des clients Motor (ci-dessous et à l'import des routes)
+install_mongo_stage_listener()
+
 # Template loading function
 def load_template(template_name: str) -> str:
     """Load HTML template from templates directory"""
@@ -427,6 +464,156 @@ def process_exercise_content(content: str) -> str:
     
     return content
 
+def prepare_exercise_for_pdf_export(exercise: dict, timings: ExportStageTimings, doc_id: Optional[str] = None) -> None:
+    """
+    Prepares one exercise in place for the standard PDF export
+    (geometric schemas, LaTeX, schema SVG, geographic document checks).
+    Runs in the export preparation pool, one call per exercise.
+    """
+    logger = get_logger()
+    
+    if 'enonce' in exercise and exercise['enonce']:
+        with timings.stage("content"):
+            exercise['enonce'] = process_exercise_content(exercise['enonce'])
+        # Convert LaTeX math to MathML for PDF rendering
+        with timings.stage("math"):
+            exercise['enonce'] = process_math_content_for_pdf(exercise['enonce'])
+    
+    # 🔧 FIX CRITIQUE : Copier figure_svg → schema_svg pour templates PDF
+    if exercise.get('figure_svg'):
+        exercise['schema_svg'] = exercise['figure_svg']
+        logger.info(
+            "✅ SVG figure copié vers schema_svg pour PDF",
+            module_name="export",
+            func_name="copy_figure_svg",
+            doc_id=doc_id,
+            svg_length=len(exercise['figure_svg'])
+        )
+    
+    # NEW: Generate SVG for schema if present in donnees
+    if exercise.get('donnees') and isinstance(exercise['donnees'], dict):
+        schema_data = exercise['donnees'].get('schema')
+        if schema_data:
+            schema_type = schema_data.get('type', 'unknown')
+            logger.info(
+                "Generating SVG for PDF schema",
+                module_name="export",
+                func_name="generate_svg",
+                doc_id=doc_id,
+                schema_type=schema_type
+            )
+            
+            with timings.stage("schema_svg"):
+                svg_content = schema_renderer.render_to_svg(schema_data)
+            if svg_content:
+                exercise['schema_svg'] = svg_content
+                logger.info(
+                    "SVG generated successfully for PDF",
+                    module_name="export",
+                    func_name="generate_svg",
+                    doc_id=doc_id,
+                    schema_type=schema_type,
+                    svg_length=len(svg_content),
+                    status="success"
+                )
+                log_schema_processing(schema_type, True, doc_id=doc_id)
+            else:
+                logger.warning(
+                    "Failed to generate SVG for PDF schema",
+                    module_name="export",
+                    func_name="generate_svg",
+                    doc_id=doc_id,
+                    schema_type=schema_type,
+                    status="failed"
+                )
+                log_schema_processing(schema_type, False, doc_id=doc_id)
+                exercise['schema_svg'] = ""
+        else:
+            exercise['schema_svg'] = ""
+    else:
+        exercise['schema_svg'] = ""
+    
+    # NOUVEAU: Process geographic document if present
+    if exercise.get('document'):
+        doc_data = exercise['document']
+        logger.info(
+            "🗺️ Processing geographic document for PDF export",
+            module_name="export",
+            func_name="process_geographic_document",
+            doc_id=doc_id,
+            exercise_id=exercise.get('id', 'unknown'),
+            document_title=doc_data.get('titre', 'Unknown'),
+            document_type=doc_data.get('type', 'Unknown'),
+            has_image=bool(doc_data.get('url_fichier_direct')),
+            image_url=doc_data.get('url_fichier_direct', 'No URL')[:100] if doc_data.get('url_fichier_direct') else None,
+            licence_type=doc_data.get('licence', {}).get('type', 'Unknown'),
+            licence_attribution=doc_data.get('licence', {}).get('notice_attribution', 'No attribution')[:50] if doc_data.get('licence', {}).get('notice_attribution') else None
+        )
+        
+        # Validate document data for PDF rendering
+        if not doc_data.get('url_fichier_direct'):
+            logger.warning(
+                "⚠️ Geographic document missing image URL",
+                module_name="export",
+                func_name="document_validation",
+                doc_id=doc_id,
+                document_title=doc_data.get('titre', 'Unknown')
+            )
+        
+        if not doc_data.get('licence', {}).get('notice_attribution'):
+            logger.warning(
+                "⚠️ Geographic document missing attribution",
+                module_name="export",
+                func_name="document_validation",
+                doc_id=doc_id,
+                document_title=doc_data.get('titre', 'Unknown')
+            )
+    else:
+        logger.debug(
+            "No geographic document for exercise",
+            module_name="export",
+            func_name="process_geographic_document",
+            exercise_id=exercise.get('id', 'unknown')
+        )
+    
+    # Process solution if it exists
+    if exercise.get('solution'):
+        with timings.stage("content"):
+            if exercise['solution'].get('resultat'):
+                exercise['solution']['resultat'] = process_exercise_content(exercise['solution']['resultat'])
+                
+            if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
+                exercise['solution']['etapes'] = [
+                    process_exercise_content(step) for step in exercise['solution']['etapes']
+                ]
+
+
+def prepare_exercise_for_advanced_export(exercise: dict, timings: ExportStageTimings) -> None:
+    """Prepares one exercise in place for the advanced (Pro) PDF export"""
+    if 'enonce' in exercise and exercise['enonce']:
+        with timings.stage("content"):
+            exercise['enonce'] = process_exercise_content(exercise['enonce'])
+    
+    # Process solution if it exists
+    if exercise.get('solution'):
+        if exercise['solution'].get('resultat'):
+            with timings.stage("content"):
+                exercise['solution']['resultat'] = process_exercise_content(exercise['solution']['resultat'])
+            # Convert LaTeX math to MathML for PDF rendering
+            with timings.stage("math"):
+                exercise['solution']['resultat'] = process_math_content_for_pdf(exercise['solution']['resultat'])
+            
+        if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
+            processed_steps = []
+            for step in exercise['solution']['etapes']:
+                with timings.stage("content"):
+                    processed_step = process_exercise_content(step)
+                # Convert LaTeX math to MathML for PDF rendering
+                with timings.stage("math"):
+                    processed_step = process_math_content_for_pdf(processed_step)
+                processed_steps.append(processed_step)
+            exercise['solution']['etapes'] = processed_steps
+
 # MongoDB connection - avec validation des variables d'environnement
 def validate_env():
     """Valide les variables d'environnement critiques au démarrage"""
@@ -489,7 +676,8 @@ APP_BUILD_ID = os.environ.get("APP_BUILD_ID", _compute_build_id())
 # P0-A2: Rate limiter with dev bypass option
 # Set DISABLE_RATE_LIMIT=true in env to disable rate limiting in development
 _rate_limit_disabled = os.environ.get("DISABLE_RATE_LIMIT", "").lower() in ("true", "1", "yes")
-limiter = Limiter(
+# Storage shared across workers by default (see backend/middleware/rate_limit.py)
+limiter = create_limiter(
     key_func=get_remote_address,
     enabled=not _rate_limit_disabled  # P0-A2: Disable in dev if env var set
 )
@@ -1188,13 +1376,10 @@ async def check_guest_quota(guest_id: str):
     )
     
     try:
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        export_count = await db.exports.count_documents({
-            "guest_id": guest_id,
-            "created_at": {"$gte": thirty_days_ago}
-        })
-        
-        remaining = max(0, 3 - export_count)
+        # Lecture seule du compteur du ledger (pas de scan de db.exports)
+        status = await get_quota_status(db, GUEST_EXPORT_QUOTA, guest_id)
+        export_count = status["used"]
+        remaining = status["remaining"]
         
         # Log quota check result
         log_quota_check("guest", export_count, 3, guest_id=guest_id[:8] + "..." if guest_id and len(guest_id) > 8 else guest_id)
@@ -3268,7 +3453,8 @@ async def generate_advanced_pdf(document: dict, content: str, export_type: str,
     
     # Generate PDF (import lazy)
     import weasyprint
-    pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+    with stage("pdf"):
+        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
     return pdf_bytes
 
 # API Routes
@@ -3278,7 +3464,8 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "le-maitre-mot-api",
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "password_hasher": get_password_hasher_stats()
     }
 
 @api_router.get("/")
@@ -3440,54 +3627,25 @@ async def get_analytics_overview(request: Request):
         user_email = await require_pro_user(request)
         logger.info(f"Analytics overview requested by Pro user: {user_email}")
         
-        # Get user's documents count
-        user_documents = await db.documents.count_documents({"user_id": user_email})
-        guest_documents = await db.documents.count_documents({"guest_id": {"$regex": f".*{user_email.split('@')[0]}.*"}})
-        
-        # Get user's exports count
-        user_exports = await db.exports.count_documents({"user_email": user_email})
-        
-        # Get recent activity (last 30 days)
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        recent_documents = await db.documents.count_documents({
-            "$or": [{"user_id": user_email}, {"guest_id": {"$regex": f".*{user_email.split('@')[0]}.*"}}],
-            "created_at": {"$gte": thirty_days_ago}
-        })
-        
-        recent_exports = await db.exports.count_documents({
-            "user_email": user_email,
-            "created_at": {"$gte": thirty_days_ago}
-        })
-        
-        # Get subject distribution
-        subject_pipeline = [
-            {"$match": {"$or": [{"user_id": user_email}, {"guest_id": {"$regex": f".*{user_email.split('@')[0]}.*"}}]}},
-            {"$group": {"_id": "$matiere", "count": {"$sum": 1}}}
-        ]
-        subject_stats = await db.documents.aggregate(subject_pipeline).to_list(None)
-        
-        # Get template usage stats
-        template_pipeline = [
-            {"$match": {"user_email": user_email}},
-            {"$group": {"_id": "$template_used", "count": {"$sum": 1}}}
-        ]
-        template_stats = await db.exports.aggregate(template_pipeline).to_list(None)
+        # Lecture unique des rollups quotidiens (index owner + day)
+        rollups = await get_usage_rollups(db, user_email)
+        usage = summarize_rollups(rollups, recent_since_day=days_ago(30))
         
         return {
             "user_analytics": {
-                "total_documents": user_documents + guest_documents,
-                "total_exports": user_exports,
+                "total_documents": usage["documents"],
+                "total_exports": usage["exports"],
                 "recent_activity": {
-                    "documents_last_30_days": recent_documents,
-                    "exports_last_30_days": recent_exports
+                    "documents_last_30_days": usage["recent_documents"],
+                    "exports_last_30_days": usage["recent_exports"]
                 },
                 "subject_distribution": [
-                    {"subject": stat["_id"], "count": stat["count"]} 
-                    for stat in subject_stats
+                    {"subject": subject, "count": count} 
+                    for subject, count in usage["subjects"].items()
                 ],
                 "template_usage": [
-                    {"template": stat["_id"] or "standard", "count": stat["count"]} 
-                    for stat in template_stats
+                    {"template": template, "count": count} 
+                    for template, count in usage["templates"].items()
                 ],
                 "subscription_info": {
                     "type": "Pro",
@@ -3513,62 +3671,8 @@ async def get_usage_analytics(request: Request, days: int = 30):
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=days)
         
-        # Daily document generation
-        daily_docs_pipeline = [
-            {
-                "$match": {
-                    "$or": [{"user_id": user_email}, {"guest_id": {"$regex": f".*{user_email.split('@')[0]}.*"}}],
-                    "created_at": {"$gte": start_date, "$lte": end_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
-                    "documents": {"$sum": 1}
-                }
-            },
-            {"$sort": {"_id": 1}}
-        ]
-        daily_docs = await db.documents.aggregate(daily_docs_pipeline).to_list(None)
-        
-        # Daily exports
-        daily_exports_pipeline = [
-            {
-                "$match": {
-                    "user_email": user_email,
-                    "created_at": {"$gte": start_date, "$lte": end_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
-                    "exports": {"$sum": 1}
-                }
-            },
-            {"$sort": {"_id": 1}}
-        ]
-        daily_exports = await db.exports.aggregate(daily_exports_pipeline).to_list(None)
-        
-        # Subject popularity over time
-        subject_timeline_pipeline = [
-            {
-                "$match": {
-                    "$or": [{"user_id": user_email}, {"guest_id": {"$regex": f".*{user_email.split('@')[0]}.*"}}],
-                    "created_at": {"$gte": start_date, "$lte": end_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
-                        "subject": "$matiere"
-                    },
-                    "count": {"$sum": 1}
-                }
-            },
-            {"$sort": {"_id.date": 1}}
-        ]
-        subject_timeline = await db.documents.aggregate(subject_timeline_pipeline).to_list(None)
+        # Lecture unique des rollups quotidiens sur la période (index owner + day)
+        rollups = await get_usage_rollups(db, user_email, start_day=rollup_day(start_date), end_day=rollup_day(end_date))
         
         return {
             "usage_analytics": {
@@ -3579,21 +3683,22 @@ async def get_usage_analytics(request: Request, days: int = 30):
                 },
                 "daily_activity": {
                     "documents": [
-                        {"date": doc["_id"], "count": doc["documents"]} 
-                        for doc in daily_docs
+                        {"date": rollup["day"], "count": rollup["documents"]} 
+                        for rollup in rollups if rollup.get("documents")
                     ],
                     "exports": [
-                        {"date": exp["_id"], "count": exp["exports"]} 
-                        for exp in daily_exports
+                        {"date": rollup["day"], "count": rollup["exports"]} 
+                        for rollup in rollups if rollup.get("exports")
                     ]
                 },
                 "subject_timeline": [
                     {
-                        "date": item["_id"]["date"], 
-                        "subject": item["_id"]["subject"], 
-                        "count": item["count"]
+                        "date": rollup["day"], 
+                        "subject": subject, 
+                        "count": count
                     }
-                    for item in subject_timeline
+                    for rollup in rollups
+                    for subject, count in (rollup.get("subjects") or {}).items()
                 ]
             }
         }
@@ -3727,7 +3832,10 @@ async def generate_document(request: GenerateRequest):
         doc_dict = document.dict()
         # Convert datetime for MongoDB
         doc_dict['created_at'] = doc_dict['created_at'].isoformat()
+        # Contenu déjà traité par generate_exercises_with_ai (rendu stocké tel quel)
+        doc_dict['content_version'] = DOCUMENT_CONTENT_VERSION
         await db.documents.insert_one(doc_dict)
+        await record_document(db, doc_dict)
         
         # Return the document (already processed during generation)
         return {"document": document}
@@ -4775,7 +4883,7 @@ async def set_password(request_body: SetPasswordRequest, request: Request):
         
         # P0: Hash password - ensure we hash ONLY the string password
         password_str = str(request_body.password)  # Ensure it's a string
-        password_hash = hash_password(password_str)
+        password_hash = await hash_password_async(password_str)
         
         # Update user in database
         await db.pro_users.update_one(
@@ -4806,6 +4914,12 @@ async def set_password(request_body: SetPasswordRequest, request: Request):
         
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Service d'authentification surchargé, veuillez réessayer dans quelques secondes",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         logger.error(f"Error setting password: {e}")
         raise HTTPException(
@@ -4883,7 +4997,7 @@ async def register_free_user(request_body: RegisterFreeRequest, response: Respon
         # P0: Hash password - ensure we hash ONLY the string password, not the whole request
         try:
             password_str = str(request_body.password)  # Ensure it's a string
-            password_hash = hash_password(password_str)
+            password_hash = await hash_password_async(password_str)
         except ValueError as e:
             # Handle password validation errors from hash_password
             error_msg = str(e)
@@ -4961,6 +5075,12 @@ async def register_free_user(request_body: RegisterFreeRequest, response: Respon
 
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Service d'authentification surchargé, veuillez réessayer dans quelques secondes",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         logger.error(f"Error registering free user: {e}")
         raise HTTPException(
@@ -5019,8 +5139,9 @@ async def login_password(request_body: LoginPasswordRequest, response: Response,
                 detail="Aucun mot de passe défini pour ce compte. Utilisez le lien magique pour vous connecter."
             )
 
-        # Verify password
-        if not verify_password(request_body.password, password_hash):
+        # Verify password (bcrypt runs in the hashing pool, not on the event loop)
+        is_valid, new_password_hash = await verify_and_update_password_async(request_body.password, password_hash)
+        if not is_valid:
             await auth_service.log_auth_attempt(
                 email=request_body.email,
                 action="login_password",
@@ -5033,6 +5154,14 @@ async def login_password(request_body: LoginPasswordRequest, response: Response,
                 detail="Email ou mot de passe incorrect"
             )
 
+        # Transparent rehash when BCRYPT_ROUNDS changed since the hash was created
+        if new_password_hash:
+            users_collection = db.pro_users if is_pro_user else db.free_users
+            await users_collection.update_one(
+                {"email": request_body.email, "password_hash": password_hash},
+                {"$set": {"password_hash": new_password_hash}}
+            )
+
         # P0: Only check Pro status if user is from pro_users (Free users can always login)
         if is_pro_user:
             is_pro, _ = await check_user_pro_status(request_body.email)
@@ -5093,6 +5222,12 @@ async def login_password(request_body: LoginPasswordRequest, response: Response,
         
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Service d'authentification surchargé, veuillez réessayer dans quelques secondes",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         logger.error(f"Error in password login: {e}")
         raise HTTPException(
@@ -5248,7 +5383,7 @@ async def reset_password_confirm(request_body: ResetPasswordConfirmRequest, requ
         
         # P0: Hash new password - ensure we hash ONLY the string password
         password_str = str(request_body.new_password)  # Ensure it's a string
-        password_hash = hash_password(password_str)
+        password_hash = await hash_password_async(password_str)
         
         # Mark token as used (prevents replay attacks)
         token_hash = auth_service.hash_token(request_body.token)
@@ -5281,6 +5416,12 @@ async def reset_password_confirm(request_body: ResetPasswordConfirmRequest, requ
         
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Service d'authentification surchargé, veuillez réessayer dans quelques secondes",
+            headers={"Retry-After": "2"}
+        )
     except Exception as e:
         logger.error(f"Error in reset password confirm: {e}")
         raise HTTPException(
@@ -5430,120 +5571,15 @@ async def export_pdf(request: ExportRequest, http_request: Request):
             raise HTTPException(status_code=404, detail="Document non trouvé")
         
         # CRITICAL: Process geometric schemas and LaTeX before PDF generation
-        
+        # (per-exercise work fanned out to the preparation pool, order preserved)
+        preparation_timings = ExportStageTimings()
         if 'exercises' in doc:
-            for exercise in doc['exercises']:
-                if 'enonce' in exercise and exercise['enonce']:
-                    exercise['enonce'] = process_exercise_content(exercise['enonce'])
-                    # Convert LaTeX math to MathML for PDF rendering
-                    exercise['enonce'] = process_math_content_for_pdf(exercise['enonce'])
-                
-                # 🔧 FIX CRITIQUE : Copier figure_svg → schema_svg pour templates PDF
-                if exercise.get('figure_svg'):
-                    exercise['schema_svg'] = exercise['figure_svg']
-                    logger.info(
-                        "✅ SVG figure copié vers schema_svg pour PDF",
-                        module_name="export",
-                        func_name="copy_figure_svg",
-                        doc_id=request.document_id,
-                        svg_length=len(exercise['figure_svg'])
-                    )
-                
-                # NEW: Generate SVG for schema if present in donnees
-                if exercise.get('donnees') and isinstance(exercise['donnees'], dict):
-                    schema_data = exercise['donnees'].get('schema')
-                    if schema_data:
-                        schema_type = schema_data.get('type', 'unknown')
-                        logger.info(
-                            "Generating SVG for PDF schema",
-                            module_name="export",
-                            func_name="generate_svg",
-                            doc_id=request.document_id,
-                            schema_type=schema_type
-                        )
-                        
-                        svg_content = schema_renderer.render_to_svg(schema_data)
-                        if svg_content:
-                            exercise['schema_svg'] = svg_content
-                            logger.info(
-                                "SVG generated successfully for PDF",
-                                module_name="export",
-                                func_name="generate_svg",
-                                doc_id=request.document_id,
-                                schema_type=schema_type,
-                                svg_length=len(svg_content),
-                                status="success"
-                            )
-                            log_schema_processing(schema_type, True, doc_id=request.document_id)
-                        else:
-                            logger.warning(
-                                "Failed to generate SVG for PDF schema",
-                                module_name="export",
-                                func_name="generate_svg",
-                                doc_id=request.document_id,
-                                schema_type=schema_type,
-                                status="failed"
-                            )
-                            log_schema_processing(schema_type, False, doc_id=request.document_id)
-                            exercise['schema_svg'] = ""
-                    else:
-                        exercise['schema_svg'] = ""
-                else:
-                    exercise['schema_svg'] = ""
-                
-                # NOUVEAU: Process geographic document if present
-                if exercise.get('document'):
-                    doc_data = exercise['document']
-                    logger.info(
-                        "🗺️ Processing geographic document for PDF export",
-                        module_name="export",
-                        func_name="process_geographic_document",
-                        doc_id=request.document_id,
-                        exercise_id=exercise.get('id', 'unknown'),
-                        document_title=doc_data.get('titre', 'Unknown'),
-                        document_type=doc_data.get('type', 'Unknown'),
-                        has_image=bool(doc_data.get('url_fichier_direct')),
-                        image_url=doc_data.get('url_fichier_direct', 'No URL')[:100] if doc_data.get('url_fichier_direct') else None,
-                        licence_type=doc_data.get('licence', {}).get('type', 'Unknown'),
-                        licence_attribution=doc_data.get('licence', {}).get('notice_attribution', 'No attribution')[:50] if doc_data.get('licence', {}).get('notice_attribution') else None
-                    )
-                    
-                    # Validate document data for PDF rendering
-                    if not doc_data.get('url_fichier_direct'):
-                        logger.warning(
-                            "⚠️ Geographic document missing image URL",
-                            module_name="export",
-                            func_name="document_validation",
-                            doc_id=request.document_id,
-                            document_title=doc_data.get('titre', 'Unknown')
-                        )
-                    
-                    if not doc_data.get('licence', {}).get('notice_attribution'):
-                        logger.warning(
-                            "⚠️ Geographic document missing attribution",
-                            module_name="export",
-                            func_name="document_validation",
-                            doc_id=request.document_id,
-                            document_title=doc_data.get('titre', 'Unknown')
-                        )
-                else:
-                    logger.debug(
-                        "No geographic document for exercise",
-                        module_name="export",
-                        func_name="process_geographic_document",
-                        exercise_id=exercise.get('id', 'unknown')
-                    )
-                
-                # Process solution if it exists
-                if exercise.get('solution'):
-                    if exercise['solution'].get('resultat'):
-                        exercise['solution']['resultat'] = process_exercise_content(exercise['solution']['resultat'])
-                        
-                    if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
-                        exercise['solution']['etapes'] = [
-                            process_exercise_content(step) for step in exercise['solution']['etapes']
-                        ]
-            
+            doc['exercises'] = await prepare_exercises_concurrently(
+                doc['exercises'],
+                lambda exercise, timings: prepare_exercise_for_pdf_export(exercise, timings, request.document_id),
+                timings=preparation_timings,
+                doc_id=request.document_id
+            )
 
         # Convert to Document object
         if isinstance(doc.get('created_at'), str):
@@ -5623,42 +5659,41 @@ async def export_pdf(request: ExportRequest, http_request: Request):
         
         # Process each exercise and convert LaTeX to SVG
         try:
+            # Collect every text field of the document: (container, key) pairs
+            text_slots = []
             for exercise in document_dict.get('exercises', []):
-                # Process exercise statement
+                # Exercise statement
                 if 'enonce' in exercise and exercise['enonce']:
-                    # First process geometric schemas, then LaTeX
-                    exercise['enonce'] = geometry_renderer.process_geometric_schemas(exercise['enonce'])
-                    exercise['enonce'] = latex_renderer.convert_latex_to_svg(exercise['enonce'])
+                    text_slots.append((exercise, 'enonce'))
                 
-                # Process QCM options if they exist
+                # QCM options if they exist
                 if (exercise.get('type') == 'qcm' and 
                     exercise.get('donnees') and 
                     exercise['donnees'].get('options')):
-                    exercise['donnees']['options'] = [
-                        latex_renderer.convert_latex_to_svg(
-                            geometry_renderer.process_geometric_schemas(option)
-                        )
-                        for option in exercise['donnees']['options']
-                    ]
+                    options = exercise['donnees']['options']
+                    text_slots.extend((options, idx) for idx in range(len(options)))
                 
-                # Process solution if it exists
+                # Solution if it exists
                 if exercise.get('solution'):
-                    # Process result
                     if exercise['solution'].get('resultat'):
-                        processed_result = geometry_renderer.process_geometric_schemas(
-                            exercise['solution']['resultat']
-                        )
-                        exercise['solution']['resultat'] = latex_renderer.convert_latex_to_svg(
-                            processed_result
-                        )
-                    # Process steps
+                        text_slots.append((exercise['solution'], 'resultat'))
                     if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
-                        exercise['solution']['etapes'] = [
-                            latex_renderer.convert_latex_to_svg(
-                                geometry_renderer.process_geometric_schemas(step)
-                            )
-                            for step in exercise['solution']['etapes']
-                        ]
+                        etapes = exercise['solution']['etapes']
+                        text_slots.extend((etapes, idx) for idx in range(len(etapes)))
+            
+            # First process geometric schemas (each distinct schema rendered once
+            # for the whole document), then LaTeX - off the event loop
+            def render_text_slots():
+                with preparation_timings.stage("geometry_schemas"):
+                    processed_texts = geometry_renderer.process_geometric_schemas_batch(
+                        [container[key] for container, key in text_slots]
+                    )
+                with preparation_timings.stage("latex_svg"):
+                    return [latex_renderer.convert_latex_to_svg(processed) for processed in processed_texts]
+            
+            rendered_texts = await run_in_preparation_pool(render_text_slots)
+            for (container, key), rendered in zip(text_slots, rendered_texts):
+                container[key] = rendered
         
         except Exception as e:
             logger.error(f"Error during LaTeX to SVG conversion: {e}")
@@ -5707,7 +5742,8 @@ async def export_pdf(request: ExportRequest, http_request: Request):
         
         # Generate PDF with WeasyPrint (import lazy)
         import weasyprint
-        pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
+        with stage("pdf"):
+            pdf_bytes = weasyprint.HTML(string=html_content).write_pdf()
         
         # Create temporary file
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
@@ -5724,9 +5760,13 @@ async def export_pdf(request: ExportRequest, http_request: Request):
                 "user_email": user_email,
                 "is_pro": is_pro_user,
                 "template_used": template_config.get('template_style') if template_config else 'standard',
+                "preparation": preparation_timings.as_dict(),
                 "created_at": datetime.now(timezone.utc)
             }
+            # Ledger avant l'historique (un compteur initialisé depuis db.exports ne compte pas l'export deux fois)
+            await record_quota_usage(db, GUEST_EXPORT_QUOTA, request.guest_id)
             await db.exports.insert_one(export_record)
+            await record_export(db, export_record)
         
         logger.info(f"✅ PDF generated successfully: {filename}")
         
@@ -5777,26 +5817,14 @@ async def export_pdf_advanced(request: EnhancedExportRequest, http_request: Requ
             raise HTTPException(status_code=404, detail="Document non trouvé")
         
         # CRITICAL: Process geometric schemas and LaTeX before PDF generation
+        preparation_timings = ExportStageTimings()
         if 'exercises' in document:
-            for exercise in document['exercises']:
-                if 'enonce' in exercise and exercise['enonce']:
-                    exercise['enonce'] = process_exercise_content(exercise['enonce'])
-                
-                # Process solution if it exists
-                if exercise.get('solution'):
-                    if exercise['solution'].get('resultat'):
-                        exercise['solution']['resultat'] = process_exercise_content(exercise['solution']['resultat'])
-                        # Convert LaTeX math to MathML for PDF rendering
-                        exercise['solution']['resultat'] = process_math_content_for_pdf(exercise['solution']['resultat'])
-                        
-                    if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
-                        processed_steps = []
-                        for step in exercise['solution']['etapes']:
-                            processed_step = process_exercise_content(step)
-                            # Convert LaTeX math to MathML for PDF rendering
-                            processed_step = process_math_content_for_pdf(processed_step)
-                            processed_steps.append(processed_step)
-                        exercise['solution']['etapes'] = processed_steps
+            document['exercises'] = await prepare_exercises_concurrently(
+                document['exercises'],
+                prepare_exercise_for_advanced_export,
+                timings=preparation_timings,
+                doc_id=request.document_id
+            )
         
         # Load user template configuration
         template_config = {}
@@ -5845,9 +5873,11 @@ async def export_pdf_advanced(request: EnhancedExportRequest, http_request: Requ
             "is_pro": True,
             "template_used": template_config.get('template_style', 'minimaliste'),
             "advanced_options": advanced_opts.dict(),
+            "preparation": preparation_timings.as_dict(),
             "created_at": datetime.now(timezone.utc)
         }
         await db.exports.insert_one(export_record)
+        await record_export(db, export_record)
         
         logger.info(f"✅ Advanced PDF generated successfully: {filename}")
         
@@ -6713,8 +6743,13 @@ async def delete_user_exercise(
 
 @api_router.get("/documents")
 @log_execution_time("get_documents")
-async def get_documents(guest_id: str = None):
-    """Get user documents"""
+async def get_documents(guest_id: str = None, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None):
+    """
+    Get user documents (summaries only, most recent first).
+    
+    Paginated by cursor: pass back `next_cursor` to get the next page.
+    Full documents (exercises, schemas) are served by GET /documents/{document_id}.
+    """
     logger = get_logger()
     user_type = "guest" if guest_id else "unknown"
     
@@ -6726,57 +6761,35 @@ async def get_documents(guest_id: str = None):
         guest_id=guest_id[:8] + "..." if guest_id and len(guest_id) > 8 else guest_id
     )
     
+    if not guest_id:
+        return {"documents": [], "next_cursor": None}
+    
     try:
-        if guest_id:
-            # Get documents for guest user
-            documents = await db.documents.find({"guest_id": guest_id}).sort("created_at", -1).limit(20).to_list(length=20)
-        else:
-            return {"documents": []}
-        
-        for doc in documents:
-            if isinstance(doc.get('created_at'), str):
-                doc['created_at'] = datetime.fromisoformat(doc['created_at'])
-            
-            # Apply professional content processing to ensure consistency
-            # Process all content systematically to handle both old and new documents
-            if 'exercises' in doc:
-                for exercise in doc['exercises']:
-                    if 'enonce' in exercise and exercise['enonce']:
-                        exercise['enonce'] = process_exercise_content(exercise['enonce'])
-                    
-                    # schema_img is now generated during exercise creation, no need to process again
-                    if exercise.get('schema_img'):
-                        logger.debug(
-                            "Schema image already present from generation",
-                            module_name="documents",
-                            func_name="check_schemas",
-                            doc_id=str(doc.get('id', 'unknown'))[:8],
-                            has_schema_img=bool(exercise.get('schema_img'))
-                        )
-
-                    # Process solution if it exists
-                    if exercise.get('solution'):
-                        if exercise['solution'].get('resultat'):
-                            exercise['solution']['resultat'] = process_exercise_content(exercise['solution']['resultat'])
-                                
-                        if exercise['solution'].get('etapes') and isinstance(exercise['solution']['etapes'], list):
-                            exercise['solution']['etapes'] = [
-                                process_exercise_content(step) for step in exercise['solution']['etapes']
-                            ]
-        
-        # Clean up MongoDB-specific fields that can't be JSON serialized
-        for doc in documents:
-            # Remove MongoDB ObjectId fields that cause serialization issues
-            if '_id' in doc:
-                del doc['_id']
-        
-        # Return raw documents to preserve dynamic fields like schema_img
-        # Don't use Pydantic models here as they filter out dynamic fields
-        return {"documents": documents}
-        
+        return await list_documents(db, {"guest_id": guest_id}, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting documents: {e}")
-        return {"documents": []}
+        return {"documents": [], "next_cursor": None}
+
+@api_router.get("/documents/{document_id}")
+async def get_document(document_id: str, guest_id: str = None):
+    """Get one full document (exercises with processed content and schema_img)"""
+    if not guest_id:
+        raise HTTPException(status_code=404, detail="Document non trouvé")
+    
+    try:
+        # Raw dict to preserve dynamic fields like schema_img (no Pydantic filtering)
+        document = await get_document_detail(
+            db, {"id": document_id, "guest_id": guest_id}, process_exercise_content
+        )
+    except Exception as e:
+        logger.error(f"Error getting document {document_id}: {e}")
+        raise HTTPException(status_code=500, detail="Erreur lors du chargement du document")
+    
+    if not document:
+        raise HTTPException(status_code=404, detail="Document non trouvé")
+    return {"document": document}
 
 @api_router.post("/documents/{document_id}/vary/{exercise_index}")
 async def vary_exercise(document_id: str, exercise_index: int):
@@ -6848,6 +6861,7 @@ async def export_selection_pdf(
     Returns PDF binary (Content-Type: application/pdf).
     """
     logger = get_logger()
+    reservation = None
     
     try:
         # PR7.1: Validate session token and check export permission
@@ -6876,36 +6890,31 @@ async def export_selection_pdf(
         from backend.services.access_control import assert_can_use_layout
         assert_can_use_layout(user_email, is_pro, layout)
         
-        # P0: Check quota for Free users
+        # Validate exercises
+        if not request_body.exercises or len(request_body.exercises) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="Aucun exercice fourni"
+            )
+        
+        # P0: Reserve quota for Free users (3 exports/day), atomically before preparing
+        # the PDF; the reservation is released if the export fails (see except below)
         if not is_pro:
-            # Check Free user quota (3 exports/day)
-            today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-            export_count = await db.exports.count_documents({
-                "user_email": user_email,
-                "created_at": {"$gte": today}
-            })
-
-            if export_count >= 3:
+            reservation = await reserve_quota(db, FREE_DAILY_EXPORT_QUOTA, user_email)
+            if not reservation.granted:
                 raise HTTPException(
                     status_code=429,
                     detail={
                         "error": "FREE_DAILY_EXPORT_LIMIT",
                         "code": "FREE_DAILY_EXPORT_LIMIT",
                         "message": "Quota d'exports quotidien atteint (3/jour). Passez en Pro pour des exports illimités.",
-                        "exports_today": export_count,
+                        "exports_today": reservation.used,
                         "exports_remaining": 0,
-                        "max_exports_per_day": 3,
-                        "resets_at": (today + timedelta(days=1)).isoformat()
+                        "max_exports_per_day": FREE_DAILY_EXPORT_QUOTA.limit,
+                        "resets_at": reservation.window_end.isoformat() if reservation.window_end else None
                     }
                 )
         
-        # Validate exercises
-        if not request_body.exercises or len(request_body.exercises) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Aucun exercice fourni"
-            )
-        
         # P0: Map layout "standard" -> "classic"
         layout = request_body.layout
         if layout == "standard":
@@ -7003,7 +7012,7 @@ async def export_selection_pdf(
             # Generate student PDF (without solutions)
             pdf_bytes = build_sheet_student_pdf(sheet_preview, layout=layout)
         
-        # Track export for quota (Free users only)
+        # Track export history (Free users only; the quota itself is in the ledger)
         if not is_pro:
             export_record = {
                 "id": str(uuid.uuid4()),
@@ -7014,6 +7023,7 @@ async def export_selection_pdf(
                 "created_at": datetime.now(timezone.utc)
             }
             await db.exports.insert_one(export_record)
+            await record_export(db, export_record)
         
         logger.info(
             f"✅ PDF export-selection généré pour {user_email} "
@@ -7027,9 +7037,12 @@ async def export_selection_pdf(
         
         return Response(content=pdf_bytes, media_type="application/pdf")
         
-    except HTTPException:
-        raise
-    except Exception as e:
+    except BaseException as e:
+        # Export non livré : la réservation de quota est rendue (sans effet si refusée)
+        if reservation:
+            await release_quota(db, reservation)
+        if isinstance(e, HTTPException) or not isinstance(e, Exception):
+            raise
         logger.error(f"Erreur lors de l'export PDF selection: {e}")
         raise HTTPException(
             status_code=500,
@@ -7101,8 +7114,10 @@ from backend.services.secure_auth_service import SecureAuthService
 
 # P2 - Import password auth service
 from backend.services.auth_password_service import (
-    hash_password,
-    verify_password,
+    PasswordHasherBusy,
+    get_password_hasher_stats,
+    hash_password_async,
+    verify_and_update_password_async,
     validate_password_strength
 )
 
@@ -7110,6 +7125,12 @@ from backend.services.auth_password_service import (
 from backend.middleware.request_id import RequestIDMiddleware
 app.add_middleware(RequestIDMiddleware)
 
+# Timing par étape (Server-Timing), uniquement si SERVER_TIMING=1 : ajouté
+# après RequestIDMiddleware, il l'englobe et voit donc request.state.request_id
+if server_timing_enabled():
+    from backend.middleware.server_timing import ServerTimingMiddleware
+    app.add_middleware(ServerTimingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -7125,6 +7146,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def open_document_search_session():
+    await document_searcher.open()
+
+# Registre d'index (constants/indexes.py) appliqué une fois, en tâche de fond,
+# plutôt qu'au premier accès de chaque worker sur le chemin des requêtes
+_index_registry_task = None
+
+@app.on_event("startup")
+async def apply_db_index_registry():
+    global _index_registry_task
+    _index_registry_task = asyncio.create_task(apply_index_registry_safely(db))
+
+# Snapshot du registry des générateurs (réponses /generators pré-sérialisées)
+# + warm-up optionnel : une génération par générateur avant d'accepter le trafic
+GENERATOR_WARMUP = os.environ.get("GENERATOR_WARMUP", "0") == "1"
+
+@app.on_event("startup")
+async def prepare_generator_registry():
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, get_registry_snapshot)
+    if GENERATOR_WARMUP:
+        await loop.run_in_executor(None, warm_up_generators)
+
+@app.on_event("shutdown")
+async def cancel_db_index_registry():
+    if _index_registry_task and not _index_registry_task.done():
+        _index_registry_task.cancel()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+
+@app.on_event("shutdown")
+async def flush_rate_limit_counters():
+    # Dernier envoi des hits locaux du rate limiting partagé (pymongo synchrone)
+    await asyncio.get_running_loop().run_in_executor(None, close_limiter_storage, limiter)
+
+@app.on_event("shutdown")
+async def shutdown_sheet_render_pool():
+    # Les routes importent le builder en engine.* et server.py en backend.engine.* :
+    # un pool par module chargé. sys.modules évite d'importer WeasyPrint à l'arrêt
+    for module_name in (
+        "backend.engine.pdf_engine.mathalea_sheet_pdf_builder",
+        "engine.pdf_engine.mathalea_sheet_pdf_builder",
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            module.shutdown_render_pool()
+
+@app.on_event("shutdown")
+async def close_document_search_session():
+    await document_searcher.close()
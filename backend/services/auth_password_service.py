@@ -1,17 +1,128 @@
 """
 Password Authentication Service
 Handles password hashing, verification, and strength validation for hybrid auth (P2).
+
+bcrypt is CPU-bound (~250 ms per hash at 12 rounds). Async handlers must use
+the *_async functions: they run in a dedicated, size-limited thread pool so a
+login burst does not block the event loop (and unrelated requests).
+
+Usage:
+    password_hash = await hash_password_async(password)
+    valid, new_hash = await verify_and_update_password_async(password, password_hash)
+    if valid and new_hash:
+        # BCRYPT_ROUNDS changed since this hash was created: store the rehash
+        await db.pro_users.update_one({"email": email}, {"$set": {"password_hash": new_hash}})
 """
 
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
-from typing import Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# P2: bcrypt rounds >= 12 for security (higher = more secure but slower).
+# Changing BCRYPT_ROUNDS rehashes existing passwords transparently on next login.
+BCRYPT_ROUNDS = max(12, int(os.environ.get("BCRYPT_ROUNDS", "12")))
+
+# Dedicated hashing pool: bounded workers and bounded queue
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "64"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Too many hash/verify operations pending (the caller should answer 503)"""
+
+
+class _PasswordHasherStats:
+    """Queue-depth counters of the hashing pool (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.max_pending_seen = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def try_enter(self, max_pending: int) -> bool:
+        with self._lock:
+            if self.pending >= max_pending:
+                self.rejected += 1
+                return False
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+            return True
+
+    def start(self) -> None:
+        with self._lock:
+            self.running += 1
+
+    def stop(self) -> None:
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+
+    def leave(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": PASSWORD_HASH_WORKERS,
+                "max_pending": PASSWORD_HASH_MAX_PENDING,
+                "pending": self.pending,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+_stats = _PasswordHasherStats()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+        return _executor
+
+
+async def _run_in_hash_pool(func: Callable[..., Any], *args: Any) -> Any:
+    if not _stats.try_enter(PASSWORD_HASH_MAX_PENDING):
+        logger.warning(f"[PASSWORD] Hashing pool saturated ({PASSWORD_HASH_MAX_PENDING} pending)")
+        raise PasswordHasherBusy("Password hashing queue is full")
+
+    def _run():
+        _stats.start()
+        try:
+            return func(*args)
+        finally:
+            _stats.stop()
+
+    # The done callback also fires when a queued call is cancelled
+    future = _get_executor().submit(_run)
+    future.add_done_callback(lambda _: _stats.leave())
+    return await asyncio.wrap_future(future)
 
-# P2: Initialize password context with bcrypt (rounds >= 12 for security)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Configure bcrypt rounds (minimum 12 for security, default is 12)
-# Higher rounds = more secure but slower (12 is good balance)
-pwd_context.bcrypt_rounds = 12
+def get_password_hasher_stats() -> Dict[str, int]:
+    """Queue-depth metrics of the hashing pool (exposed on /api/health)"""
+    return _stats.as_dict()
 
 
 def hash_password(password: str) -> str:
@@ -58,6 +169,35 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a new hash if the stored one uses outdated settings.
+    
+    Returns:
+        (is_valid, new_hash) - new_hash is None unless the hash must be replaced
+    """
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except Exception:
+        # Invalid hash format or other error
+        return False, None
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password in the hashing pool (raises ValueError, PasswordHasherBusy)"""
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the hashing pool (raises PasswordHasherBusy)"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password in the hashing pool (raises PasswordHasherBusy)"""
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+
 def validate_password_strength(password: str) -> Tuple[bool, str]:
     """
     Validate password strength requirements.
@@ -88,10 +228,3 @@ def validate_password_strength(password: str) -> Tuple[bool, str]:
     #     return False, "Au moins 1 caractère spécial requis"
     
     return True, ""
-
-
-
-
-
-
-
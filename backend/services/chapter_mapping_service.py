@@ -2,14 +2,112 @@
 Service de mapping entre chapitre_id (legacy) et chapter_code (MathALÉA)
 
 Ce service aide à gérer la transition douce entre les deux systèmes de référencement des chapitres.
+
+Les résolutions (legacy_code, code, recherche dans les titres) sont servies
+par un index en mémoire, par process, de la collection chapters : petite et
+rarement modifiée, elle était interrogée jusqu'à trois fois par ExerciseType
+(dont un $regex non ancré qui parcourait toute la collection) dans les
+chemins de synchronisation et de génération.
+
+L'index est chargé au premier appel, invalidé par ChapterService lors d'une
+écriture (invalidate_chapter_resolution_index) et rechargé au plus tard
+après CHAPTER_INDEX_TTL_SECONDS (écritures faites par un autre process).
 """
 
+import asyncio
 import logging
-from typing import Optional
+import os
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 logger = logging.getLogger(__name__)
 
+CHAPTER_INDEX_TTL_SECONDS = float(os.environ.get("CHAPTER_INDEX_TTL_SECONDS", "300"))
+
+
+def normalize_title(text: str) -> str:
+    """Minuscules, sans accents, espaces simplifiés (recherche dans les titres)"""
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+class ChapterResolutionIndex:
+    """
+    Vue en mémoire de la collection chapters.
+
+    - by_code / by_legacy_code : résolution exacte en O(1)
+    - titles_by_niveau : (titre normalisé, chapitre) dans l'ordre de la
+      collection, pour la recherche de sous-chaîne sans $regex
+    """
+
+    def __init__(self, chapters: List[dict]):
+        self.by_code: Dict[str, dict] = {}
+        self.by_legacy_code: Dict[str, dict] = {}
+        self.titles_by_niveau: Dict[str, List[Tuple[str, dict]]] = {}
+        for chapter in chapters:
+            code = chapter.get("code")
+            if code is not None:
+                self.by_code.setdefault(code, chapter)
+            legacy_code = chapter.get("legacy_code")
+            if legacy_code:
+                self.by_legacy_code.setdefault(legacy_code, chapter)
+            if chapter.get("titre"):
+                self.titles_by_niveau.setdefault(chapter.get("niveau"), []).append(
+                    (normalize_title(chapter["titre"]), chapter)
+                )
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.by_code)
+
+    def search_titles(self, niveau: Optional[str], text: str, limit: Optional[int] = None) -> List[dict]:
+        """Chapitres du niveau dont le titre contient `text` (casse et accents ignorés)"""
+        needle = normalize_title(text)
+        if not needle:
+            return []
+        matches = []
+        for title, chapter in self.titles_by_niveau.get(niveau, []):
+            if needle in title:
+                matches.append(chapter)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+
+# Index par nom de base (partagé par tous les handles d'une même base) et
+# verrous de chargement (un seul find concurrent)
+_resolution_indexes: Dict[str, ChapterResolutionIndex] = {}
+_load_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def get_chapter_resolution_index(db: AsyncIOMotorDatabase) -> ChapterResolutionIndex:
+    """Index de résolution de la base, chargé (une requête) s'il est absent ou expiré"""
+    key = db.name
+    index = _resolution_indexes.get(key)
+    if index is not None and time.monotonic() - index.loaded_at < CHAPTER_INDEX_TTL_SECONDS:
+        return index
+
+    lock = _load_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        index = _resolution_indexes.get(key)
+        if index is None or time.monotonic() - index.loaded_at >= CHAPTER_INDEX_TTL_SECONDS:
+            chapters = await db.chapters.find({}, {"_id": 0}).to_list(length=None)
+            index = ChapterResolutionIndex(chapters)
+            _resolution_indexes[key] = index
+            logger.debug(f"[CHAPTER_INDEX] {len(index)} chapitres chargés")
+    return index
+
+
+def invalidate_chapter_resolution_index(db: Optional[AsyncIOMotorDatabase] = None) -> None:
+    """Force le rechargement au prochain appel (pour une base, ou toutes)"""
+    if db is None:
+        _resolution_indexes.clear()
+    else:
+        _resolution_indexes.pop(db.name, None)
+
 
 class ChapterMappingService:
     """Service pour gérer le mapping chapitre_id ↔ chapter_code"""
@@ -56,36 +154,23 @@ class ChapterMappingService:
             return None
         
         try:
+            index = await get_chapter_resolution_index(self.db)
+
             # Stratégie 1 : Par legacy_code
-            chapter = await self.chapters_collection.find_one(
-                {"legacy_code": chapitre_id},
-                {"_id": 0, "code": 1}
-            )
-            
+            chapter = index.by_legacy_code.get(chapitre_id)
             if chapter:
                 return chapter["code"]
             
             # Stratégie 2 : Par code directement
-            chapter = await self.chapters_collection.find_one(
-                {"code": chapitre_id},
-                {"_id": 0, "code": 1}
-            )
-            
+            chapter = index.by_code.get(chapitre_id)
             if chapter:
                 return chapter["code"]
             
             # Stratégie 3 : Par titre + niveau
             if niveau:
-                chapter = await self.chapters_collection.find_one(
-                    {
-                        "niveau": niveau,
-                        "titre": {"$regex": f".*{chapitre_id}.*", "$options": "i"}
-                    },
-                    {"_id": 0, "code": 1}
-                )
-                
-                if chapter:
-                    return chapter["code"]
+                matches = index.search_titles(niveau, chapitre_id, limit=1)
+                if matches:
+                    return matches[0]["code"]
             
             # Aucune correspondance trouvée
             logger.debug(f"Aucun chapter_code trouvé pour chapitre_id='{chapitre_id}', niveau='{niveau}'")
@@ -112,10 +197,7 @@ class ChapterMappingService:
         mais elle peut être utile pour la rétrocompatibilité.
         """
         try:
-            chapter = await self.chapters_collection.find_one(
-                {"code": chapter_code},
-                {"_id": 0, "legacy_code": 1, "titre": 1}
-            )
+            chapter = (await get_chapter_resolution_index(self.db)).by_code.get(chapter_code)
             
             if not chapter:
                 return None
@@ -142,11 +224,9 @@ class ChapterMappingService:
             Dictionnaire avec les infos du chapitre, ou None
         """
         try:
-            chapter = await self.chapters_collection.find_one(
-                {"code": chapter_code},
-                {"_id": 0}
-            )
-            return chapter
+            chapter = (await get_chapter_resolution_index(self.db)).by_code.get(chapter_code)
+            # Copie : l'index est partagé par toutes les requêtes du process
+            return dict(chapter) if chapter else None
         except Exception as e:
             logger.error(f"Erreur lors de la récupération du chapitre {chapter_code}: {e}")
             return None
@@ -178,21 +258,13 @@ class ChapterMappingService:
         possible_chapters = []
         
         try:
+            index = await get_chapter_resolution_index(self.db)
+
             # Recherche par niveau et similarité de titre
             if niveau:
-                cursor = self.chapters_collection.find(
-                    {
-                        "niveau": niveau,
-                        "titre": {"$regex": f".*{chapitre_id}.*", "$options": "i"}
-                    },
-                    {"_id": 0}
-                ).limit(max_results)
-                
-                chapters = await cursor.to_list(max_results)
-                
-                for chapter in chapters:
+                for chapter in index.search_titles(niveau, chapitre_id, limit=max_results):
                     possible_chapters.append({
-                        "chapter": chapter,
+                        "chapter": dict(chapter),
                         "match_type": "titre_exact",
                         "confidence": "high"
                     })
@@ -204,21 +276,14 @@ class ChapterMappingService:
                 
                 for keyword in keywords:
                     if len(keyword) > 3:  # Ignorer les mots trop courts
-                        cursor = self.chapters_collection.find(
-                            {
-                                "niveau": niveau,
-                                "titre": {"$regex": f".*{keyword}.*", "$options": "i"}
-                            },
-                            {"_id": 0}
-                        ).limit(max_results - len(possible_chapters))
-                        
-                        chapters = await cursor.to_list(max_results - len(possible_chapters))
-                        
-                        for chapter in chapters:
+                        remaining = max_results - len(possible_chapters)
+                        if remaining <= 0:
+                            break
+                        for chapter in index.search_titles(niveau, keyword, limit=remaining):
                             # Éviter les doublons
                             if not any(p["chapter"]["code"] == chapter["code"] for p in possible_chapters):
                                 possible_chapters.append({
-                                    "chapter": chapter,
+                                    "chapter": dict(chapter),
                                     "match_type": "keyword",
                                     "confidence": "medium"
                                 })
@@ -230,4 +295,10 @@ class ChapterMappingService:
             return []
 
 
-__all__ = ["ChapterMappingService"]
+__all__ = [
+    "ChapterMappingService",
+    "ChapterResolutionIndex",
+    "get_chapter_resolution_index",
+    "invalidate_chapter_resolution_index",
+    "normalize_title",
+]
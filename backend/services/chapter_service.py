@@ -6,6 +6,8 @@ import logging
 from typing import List, Dict, Any, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from backend.models.chapter_model import Chapter, ChapterCreate, get_domaine_legacy
+from backend.services.chapter_mapping_service import invalidate_chapter_resolution_index
+from backend.services.index_manager import apply_index_registry
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -19,14 +21,9 @@ class ChapterService:
         self.collection = db.chapters
     
     async def initialize_indexes(self):
-        """Créer les index nécessaires"""
+        """Créer les index nécessaires (déclarés dans constants/indexes.py)"""
         try:
-            # Index unique sur le code
-            await self.collection.create_index("code", unique=True)
-            # Index sur niveau et domaine pour les recherches
-            await self.collection.create_index([("niveau", 1), ("domaine", 1)])
-            # Index sur legacy_code pour la migration
-            await self.collection.create_index("legacy_code", sparse=True)
+            await apply_index_registry(self.db, collections=[self.collection.name])
             logger.info("✅ Index créés pour la collection chapters")
         except Exception as e:
             logger.error(f"❌ Erreur lors de la création des index: {e}")
@@ -60,6 +57,7 @@ class ChapterService:
                 },
                 upsert=True
             )
+            invalidate_chapter_resolution_index(self.db)
             
             # Récupérer le document
             chapter = await self.collection.find_one({"code": code}, {"_id": 0})
@@ -0,0 +1,238 @@
+"""
+Bibliothèque de composants SVG d'horloge analogique.
+
+Les horloges de svg_render_service et de durees_premium_generator
+reconstruisaient tout le cadran à chaque appel (60 graduations, 12 chiffres,
+concaténation de chaînes), et l'horloge double re-découpait deux SVG finis
+avec find/rfind.
+
+Ici :
+- le cadran (fond, graduations, chiffres) est construit une fois par
+  (style, taille) : les 60 graduations tiennent en deux <path> ;
+- seules les aiguilles dépendent de l'heure : 12 × 60 = 720 états possibles,
+  mémoïsés par (style, taille, heure % 12, minute) ;
+- un SVG à plusieurs horloges définit le cadran une seule fois dans <defs>
+  et le réutilise via <use>.
+
+Usage:
+    from backend.services.clock_svg_library import CLASSIC_CLOCK, render_clock_svg
+
+    svg = render_clock_svg(CLASSIC_CLOCK, 200, hour=12, minute=15)
+    svg = render_clock_group_svg(PREMIUM_CLOCK, 160, [ClockPlacement(10, 10, 8, 30), ...], 400, 220)
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+
+@dataclass(frozen=True)
+class ClockStyle:
+    """Apparence d'une horloge (les longueurs sont relatives au rayon du cadran)"""
+    name: str
+    margin: int
+    face_fill: str
+    face_stroke: str
+    face_stroke_width: float
+    major_tick: tuple  # (rayon intérieur, rayon extérieur, épaisseur, couleur) en retrait du rayon
+    minor_tick: tuple
+    number_inset: int
+    number_attrs: str
+    hour_hand: tuple  # (longueur relative, couleur, épaisseur)
+    minute_hand: tuple
+    center: str  # gabarit du centre ({cx}, {cy})
+    inner_ring_stroke: Optional[str] = None
+    gradient: Optional[str] = None  # <radialGradient> (id="clockFace")
+
+
+# Horloge des figures pédagogiques (svg_render_service)
+CLASSIC_CLOCK = ClockStyle(
+    name="classic",
+    margin=20,
+    face_fill="#fefefe",
+    face_stroke="#333",
+    face_stroke_width=3,
+    major_tick=(10, 3, 2, "#666"),
+    minor_tick=(5, 3, 1, "#666"),
+    number_inset=15,
+    number_attrs='text-anchor="middle" font-size="14" font-weight="500" fill="#333"',
+    hour_hand=(0.5625, "#1a1a1a", 5),
+    minute_hand=(0.8125, "#333", 3),
+    center='<circle cx="{cx}" cy="{cy}" r="5" fill="#333"/>',
+)
+
+# Horloge premium (durees_premium_generator)
+PREMIUM_CLOCK = ClockStyle(
+    name="premium",
+    margin=15,
+    face_fill="url(#clockFace)",
+    face_stroke="#2c3e50",
+    face_stroke_width=3,
+    major_tick=(15, 5, 2.5, "#2c3e50"),
+    minor_tick=(10, 5, 1, "#7f8c8d"),
+    number_inset=28,
+    number_attrs='text-anchor="middle" font-family="Georgia, serif" font-size="14" font-weight="bold" fill="#2c3e50"',
+    hour_hand=(0.5, "#2c3e50", 6),
+    minute_hand=(0.75, "#34495e", 4),
+    center='<circle cx="{cx}" cy="{cy}" r="6" fill="#2c3e50"/><circle cx="{cx}" cy="{cy}" r="3" fill="#ecf0f1"/>',
+    inner_ring_stroke="#95a5a6",
+    gradient=(
+        '<radialGradient id="clockFace" cx="50%" cy="50%" r="50%">'
+        '<stop offset="0%" style="stop-color:#ffffff"/><stop offset="100%" style="stop-color:#f5f5f5"/>'
+        '</radialGradient>'
+    ),
+)
+
+
+@dataclass(frozen=True)
+class ClockPlacement:
+    """Une horloge d'un SVG groupé : position, heure (None = sans aiguilles) et annotations"""
+    x: float
+    y: float
+    hour: Optional[int] = None
+    minute: int = 0
+    extra: str = ""
+
+
+def _geometry(size: int, style: ClockStyle):
+    center = size // 2
+    return center, center, center - style.margin
+
+
+def _point(cx: float, cy: float, length: float, angle_deg: float) -> str:
+    angle = math.radians(angle_deg)
+    return f"{cx + length * math.cos(angle):.1f} {cy + length * math.sin(angle):.1f}"
+
+
+def _ticks_path(cx: int, cy: int, radius: int, tick: tuple, major: bool) -> str:
+    inner, outer, width, color = tick
+    segments = [
+        f"M{_point(cx, cy, radius - inner, i * 6 - 90)}L{_point(cx, cy, radius - outer, i * 6 - 90)}"
+        for i in range(60) if (i % 5 == 0) == major
+    ]
+    return f'<path d="{"".join(segments)}" stroke="{color}" stroke-width="{width}"/>'
+
+
+@lru_cache(maxsize=32)
+def clock_face(style: ClockStyle, size: int) -> str:
+    """Cadran statique (fond, graduations, chiffres), construit une fois par (style, taille)"""
+    cx, cy, radius = _geometry(size, style)
+    parts = [
+        f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{style.face_fill}" '
+        f'stroke="{style.face_stroke}" stroke-width="{style.face_stroke_width}"/>'
+    ]
+    if style.inner_ring_stroke:
+        parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius - 3}" fill="none" stroke="{style.inner_ring_stroke}" stroke-width="1"/>')
+    parts.append(_ticks_path(cx, cy, radius, style.minor_tick, major=False))
+    parts.append(_ticks_path(cx, cy, radius, style.major_tick, major=True))
+
+    number_radius = radius - style.number_inset
+    numbers = []
+    for i in range(1, 13):
+        angle = math.radians(i * 30 - 90)
+        numbers.append(
+            f'<text x="{cx + number_radius * math.cos(angle):.1f}" '
+            f'y="{cy + number_radius * math.sin(angle) + 5:.1f}">{i}</text>'
+        )
+    parts.append(f'<g {style.number_attrs}>{"".join(numbers)}</g>')
+    return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def clock_center(style: ClockStyle, size: int) -> str:
+    cx, cy, _ = _geometry(size, style)
+    return style.center.format(cx=cx, cy=cy)
+
+
+@lru_cache(maxsize=4096)
+def _hands(style: ClockStyle, size: int, hour12: int, minute: int) -> str:
+    cx, cy, radius = _geometry(size, style)
+    # 0° = 12h, sens horaire ; l'aiguille des heures avance avec les minutes
+    hour_angle = hour12 * 30 + minute * 0.5 - 90
+    minute_angle = minute * 6 - 90
+    hands = []
+    for (ratio, color, width), angle in ((style.hour_hand, hour_angle), (style.minute_hand, minute_angle)):
+        x2, y2 = _point(cx, cy, radius * ratio, angle).split(" ")
+        hands.append(
+            f'<line x1="{cx}" y1="{cy}" x2="{x2}" y2="{y2}" stroke="{color}" '
+            f'stroke-width="{width}" stroke-linecap="round"/>'
+        )
+    return "".join(hands)
+
+
+def clock_hands(style: ClockStyle, size: int, hour: int, minute: int) -> str:
+    """Aiguilles des heures et des minutes (mémoïsées : 720 états par style et taille)"""
+    return _hands(style, size, hour % 12, minute)
+
+
+def _defs(style: ClockStyle, content: str = "") -> str:
+    if not style.gradient and not content:
+        return ""
+    return f"<defs>{style.gradient or ''}{content}</defs>"
+
+
+def render_clock_svg(
+    style: ClockStyle,
+    size: int,
+    hour: Optional[int] = None,
+    minute: int = 0,
+    height: Optional[int] = None,
+    svg_attrs: str = "",
+    extra: str = "",
+) -> str:
+    """
+    SVG d'une horloge.
+
+    Args:
+        hour: Heure affichée (None = cadran sans aiguilles)
+        height: Hauteur du SVG (défaut: size, plus grand pour une légende)
+        svg_attrs: Attributs supplémentaires de la balise <svg>
+        extra: Balisage ajouté après l'horloge (légendes)
+    """
+    height = height or size
+    hands = clock_hands(style, size, hour, minute) if hour is not None else ""
+    attrs = f" {svg_attrs}" if svg_attrs else ""
+    return (
+        f'<svg xmlns="{SVG_NS}" viewBox="0 0 {size} {height}" width="{size}" height="{height}"{attrs}>'
+        f"{_defs(style)}{clock_face(style, size)}{hands}{clock_center(style, size)}{extra}</svg>"
+    )
+
+
+def render_clock_group_svg(
+    style: ClockStyle,
+    size: int,
+    clocks: Sequence[ClockPlacement],
+    width: int,
+    height: int,
+    extra: str = "",
+) -> str:
+    """SVG de plusieurs horloges partageant un seul cadran (<defs> + <use>)"""
+    face_id = f"clock-face-{style.name}-{size}"
+    face_def = f'<g id="{face_id}">{clock_face(style, size)}</g>'
+    groups = []
+    for clock in clocks:
+        hands = clock_hands(style, size, clock.hour, clock.minute) if clock.hour is not None else ""
+        groups.append(
+            f'<g transform="translate({clock.x}, {clock.y})"><use href="#{face_id}"/>'
+            f"{hands}{clock_center(style, size)}{clock.extra}</g>"
+        )
+    return (
+        f'<svg xmlns="{SVG_NS}" viewBox="0 0 {width} {height}" width="{width}" height="{height}">'
+        f"{_defs(style, face_def)}{''.join(groups)}{extra}</svg>"
+    )
+
+
+__all__ = [
+    "ClockStyle",
+    "ClockPlacement",
+    "CLASSIC_CLOCK",
+    "PREMIUM_CLOCK",
+    "clock_face",
+    "clock_hands",
+    "clock_center",
+    "render_clock_svg",
+    "render_clock_group_svg",
+]
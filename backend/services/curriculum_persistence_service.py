@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
 
+from backend.constants.indexes import CASE_INSENSITIVE_COLLATION
+
 logger = logging.getLogger(__name__)
 
 # Chemin vers le fichier JSON du curriculum
@@ -162,14 +164,7 @@ class CurriculumPersistenceService:
             logger.info("Initialisation de la collection curriculum depuis le fichier JSON")
             await self._load_from_json()
         
-        # Créer les index
-        await self.collection.create_index("code_officiel", unique=True)
-        await self.collection.create_index("niveau")
-        await self.collection.create_index("domaine")
-        await self.collection.create_index("statut")
-        # P4.2: Index pour la recherche par matière et niveau
-        await self.collection.create_index([("subject", 1), ("niveau", 1), ("code_officiel", 1)])
-        await self.collection.create_index("subject")
+        # Les index sont gérés par le registre (constants/indexes.py), appliqué au démarrage
         
         self._initialized = True
         logger.info(f"Curriculum persistence service initialisé avec {count} chapitres")
@@ -219,6 +214,12 @@ class CurriculumPersistenceService:
         
         logger.info(f"Fichier JSON synchronisé avec {len(chapters)} chapitres")
     
+    async def _find_by_code(self, code_officiel: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+        """Lookup par code officiel, insensible à la casse, via l'index code_officiel_ci"""
+        return await self.collection.find_one(
+            {"code_officiel": code_officiel.strip()}, projection, collation=CASE_INSENSITIVE_COLLATION
+        )
+
     async def get_all_chapters(self, niveau: str = "6e") -> List[Dict[str, Any]]:
         """Récupère tous les chapitres d'un niveau"""
         await self.initialize()
@@ -231,23 +232,14 @@ class CurriculumPersistenceService:
         return chapters
     
     async def get_chapter_by_code(self, code_officiel: str) -> Optional[Dict[str, Any]]:
-        """Récupère un chapitre par son code officiel"""
+        """Récupère un chapitre par son code officiel (insensible à la casse)"""
         await self.initialize()
 
-        # P0_FIX : Lookup case-insensitive avec regex
-        # Échapper les caractères spéciaux regex dans le code
-        escaped_code = re.escape(code_officiel)
+        logger.info(f"[P0_FIX] get_chapter_by_code() appelé avec code_officiel='{code_officiel}'")
 
-        logger.info(
-            f"[P0_FIX] get_chapter_by_code() appelé avec code_officiel='{code_officiel}' "
-            f"(regex: ^{escaped_code}$, options: i)"
-        )
-
-        # P0_FIX : Recherche case-insensitive
-        chapter = await self.collection.find_one(
-            {"code_officiel": {"$regex": f"^{escaped_code}$", "$options": "i"}},
-            {"_id": 0}
-        )
+        # P0_FIX : Recherche case-insensitive, servie par l'index code_officiel_ci
+        # (même collation que l'index ; un $regex /i parcourait la collection)
+        chapter = await self._find_by_code(code_officiel, {"_id": 0})
 
         if chapter:
             # P0_FIX : Defaults pour chapitres incomplets
@@ -267,7 +259,7 @@ class CurriculumPersistenceService:
         else:
             logger.warning(
                 f"[P0_FIX] ❌ Chapitre NON TROUVÉ avec code_officiel='{code_officiel}' "
-                f"(regex case-insensitive). Vérifier que le code existe en DB."
+                f"(insensible à la casse). Vérifier que le code existe en DB."
             )
 
         return chapter
@@ -288,7 +280,7 @@ class CurriculumPersistenceService:
         await self.initialize()
         
         # Vérifier l'unicité du code
-        existing = await self.collection.find_one({"code_officiel": request.code_officiel})
+        existing = await self._find_by_code(request.code_officiel, {"_id": 1})
         if existing:
             raise ValueError(f"Le code officiel '{request.code_officiel}' existe déjà")
         
@@ -388,7 +380,7 @@ class CurriculumPersistenceService:
         await self.initialize()
         
         # Vérifier l'existence
-        existing = await self.collection.find_one({"code_officiel": code_officiel})
+        existing = await self._find_by_code(code_officiel)
         if not existing:
             raise ValueError(f"Le code officiel '{code_officiel}' n'existe pas")
         
@@ -464,7 +456,7 @@ class CurriculumPersistenceService:
         update_data["updated_at"] = datetime.now(timezone.utc)
         
         await self.collection.update_one(
-            {"code_officiel": code_officiel},
+            {"_id": existing["_id"]},
             {"$set": update_data}
         )
         
@@ -478,7 +470,7 @@ class CurriculumPersistenceService:
         
         # Récupérer le chapitre mis à jour
         updated = await self.collection.find_one(
-            {"code_officiel": code_officiel},
+            {"_id": existing["_id"]},
             {"_id": 0}
         )
         
@@ -500,11 +492,11 @@ class CurriculumPersistenceService:
         await self.initialize()
         
         # Vérifier l'existence
-        existing = await self.collection.find_one({"code_officiel": code_officiel})
+        existing = await self._find_by_code(code_officiel, {"_id": 1})
         if not existing:
             raise ValueError(f"Le code officiel '{code_officiel}' n'existe pas")
         
-        result = await self.collection.delete_one({"code_officiel": code_officiel})
+        result = await self.collection.delete_one({"_id": existing["_id"]})
         
         if result.deleted_count > 0:
             # Synchroniser avec le fichier JSON
@@ -7,11 +7,14 @@ Quand un exercice est créé/modifié via l'admin :
 - Les exercices dynamiques sont synchronisés vers exercise_types (pour endpoint mathalea)
 """
 
+import asyncio
 import logging
+import os
 import uuid
-from typing import Set, Optional, Dict, Any
+from typing import Set, Optional, Dict, Any, Iterable, List
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
 
 from backend.services.curriculum_persistence_service import (
     CurriculumPersistenceService,
@@ -21,6 +24,9 @@ from backend.services.curriculum_persistence_service import (
 
 logger = logging.getLogger(__name__)
 
+# Délai avant la synchronisation en tâche de fond (regroupe les rafales d'imports)
+EXERCISE_TYPES_SYNC_DELAY_SECONDS = float(os.environ.get("EXERCISE_TYPES_SYNC_DELAY_SECONDS", "0.5"))
+
 def _get_exercise_type_from_generator(generator_key: str) -> Optional[str]:
     """
     Source unique: utilise GeneratorFactory.get_exercise_type (alias + meta).
@@ -393,126 +399,25 @@ class CurriculumSyncService:
             # 4. Extraire le domaine depuis chapter_code
             domaine = self._infer_domain_from_chapter(chapter_upper)
             
-            # 5. Synchroniser chaque generator_key vers exercise_types
-            for gen_key, gen_data in generators_map.items():
-                
-                # Obtenir exercise_type depuis GeneratorFactory
-                exercise_type = _get_exercise_type_from_generator(gen_key)
-                if not exercise_type:
-                    # Fallback: utiliser le champ exercise_type de l'exercice
-                    exercise_type = gen_data.get('exercise_type') or gen_key
-                    logger.warning(
-                        f"[EXERCISE_TYPES_SYNC] Pas de mapping Factory pour {gen_key}, "
-                        f"fallback: {exercise_type}"
-                    )
-                
-                # Construire l'identifiant unique pour exercise_type
-                # Format: chapter_code + generator_key (déterministe, pas de uuid)
-                exercise_type_id = f"{chapter_upper}_{gen_key}"
-                
-                # Vérifier si l'exercise_type existe déjà
-                existing = await exercise_types_collection.find_one({
-                    "code_ref": gen_key,
-                    "chapter_code": chapter_upper
-                })
-                
-                # Document exercise_type à créer/mettre à jour
-                exercise_type_doc = {
-                    "id": exercise_type_id,
-                    "code_ref": gen_key,
-                    "chapter_code": chapter_upper,
-                    "chapitre_id": chapter_upper,  # Legacy fallback
-                    "niveau": niveau,
-                    "domaine": domaine,
-                    "titre": gen_data.get('title') or f"Exercice {exercise_type}",
-                    "description": f"Exercice dynamique généré par {gen_key}",
-                    "generator_kind": "DYNAMIC",
-                    "difficulty_levels": sorted(list(gen_data['difficulties'])) or ["facile", "moyen", "difficile"],
-                    "available_offers": sorted(list(gen_data['offers'])) or ["free"],
-                    "min_questions": 1,
-                    "max_questions": 10,
-                    "default_questions": 5,
-                    "requires_svg": gen_data.get('needs_svg', False),
-                    "supports_seed": True,
-                    "supports_ai_enonce": False,
-                    "supports_ai_correction": False,
-                    "competences_ids": [],
-                    "question_kinds": {},
-                    "random_config": {},
-                    "updated_at": datetime.now(timezone.utc),
-                    "source": "admin_exercises_auto_sync"
-                }
-                
-                if existing and not force_recreate:
-                    # Mise à jour (seulement les champs qui peuvent changer)
-                    update_fields = {
-                        "difficulty_levels": exercise_type_doc["difficulty_levels"],
-                        "available_offers": exercise_type_doc["available_offers"],
-                        "requires_svg": exercise_type_doc["requires_svg"],
-                        "updated_at": exercise_type_doc["updated_at"],
-                        "titre": exercise_type_doc["titre"]
-                    }
-                    
-                    await exercise_types_collection.update_one(
-                        {"_id": existing["_id"]},
-                        {"$set": update_fields}
-                    )
-                    
-                    logger.info(
-                        f"[EXERCISE_TYPES_SYNC] ✅ Mis à jour: {exercise_type_id} "
-                        f"(generator: {gen_key})"
-                    )
-                    stats['updated'] += 1
-                    
-                elif existing and force_recreate:
-                    # Suppression puis recréation
-                    await exercise_types_collection.delete_one({"_id": existing["_id"]})
-                    
-                    exercise_type_doc["created_at"] = datetime.now(timezone.utc)
-                    await exercise_types_collection.insert_one(exercise_type_doc)
-                    
-                    logger.info(
-                        f"[EXERCISE_TYPES_SYNC] ✅ Recréé (force): {exercise_type_id} "
-                        f"(generator: {gen_key})"
-                    )
-                    stats['deleted'] += 1
-                    stats['created'] += 1
-                    
-                else:
-                    # Création
-                    exercise_type_doc["created_at"] = datetime.now(timezone.utc)
-                    await exercise_types_collection.insert_one(exercise_type_doc)
-                    
-                    logger.info(
-                        f"[EXERCISE_TYPES_SYNC] ✅ Créé: {exercise_type_id} "
-                        f"(generator: {gen_key})"
-                    )
-                    stats['created'] += 1
-                
-                stats['generator_keys'].append(gen_key)
+            # 5. Lire en une seule requête les exercise_types existants du chapitre
+            existing_docs = await exercise_types_collection.find(
+                {"chapter_code": chapter_upper},
+                {"code_ref": 1, "generator_kind": 1, "source": 1}
+            ).to_list(None)
             
-            # 6. Nettoyer les exercise_types orphelins (optionnel - sécurité)
-            # Si un exercise_type existe pour ce chapitre mais n'a plus d'exercice admin correspondant
-            all_gen_keys = set(generators_map.keys())
-            existing_exercise_types = await exercise_types_collection.find(
-                {
-                    "chapter_code": chapter_upper,
-                    "generator_kind": "DYNAMIC",
-                    "source": "admin_exercises_auto_sync"
-                },
-                {"code_ref": 1}
-            ).to_list(1000)
+            # 6. Calculer le diff complet, puis l'appliquer en un seul bulk_write
+            operations = plan_exercise_types_sync(
+                chapter_upper, niveau, domaine, generators_map, existing_docs,
+                force_recreate=force_recreate, stats=stats
+            )
             
-            for et in existing_exercise_types:
-                gen_key = et.get("code_ref")
-                if gen_key and gen_key not in all_gen_keys:
-                    # Cet exercise_type n'a plus d'exercice admin correspondant
-                    await exercise_types_collection.delete_one({"_id": et["_id"]})
-                    logger.info(
-                        f"[EXERCISE_TYPES_SYNC] 🗑️  Supprimé orphelin: {gen_key} "
-                        f"(plus d'exercice admin)"
-                    )
-                    stats['deleted'] += 1
+            if operations:
+                result = await exercise_types_collection.bulk_write(operations, ordered=False)
+                logger.info(
+                    f"[EXERCISE_TYPES_SYNC] bulk_write {chapter_upper}: {len(operations)} opérations "
+                    f"(insérés={result.inserted_count}, modifiés={result.modified_count}, "
+                    f"supprimés={result.deleted_count})"
+                )
             
             logger.info(
                 f"[EXERCISE_TYPES_SYNC] Terminé pour {chapter_upper}: "
@@ -568,6 +473,184 @@ class CurriculumSyncService:
         return "Espace et géométrie"
 
 
+def plan_exercise_types_sync(
+    chapter_code: str,
+    niveau: str,
+    domaine: str,
+    generators_map: Dict[str, Dict[str, Any]],
+    existing_docs: List[Dict[str, Any]],
+    force_recreate: bool = False,
+    stats: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """
+    Calcule les opérations bulk_write qui alignent exercise_types sur les
+    exercices dynamiques d'un chapitre (une opération par generator_key,
+    plus la suppression des orphelins auto-synchronisés).
+    
+    Args:
+        generators_map: generator_key -> {exercise_type, difficulties, offers, needs_svg, title}
+        existing_docs: exercise_types du chapitre ({_id, code_ref, generator_kind, source})
+        stats: Compteurs created/updated/deleted/generator_keys mis à jour sur place
+    
+    Returns:
+        Liste d'opérations pymongo (InsertOne / UpdateOne / ReplaceOne / DeleteOne)
+    """
+    if stats is None:
+        stats = {'created': 0, 'updated': 0, 'deleted': 0, 'skipped': 0, 'generator_keys': []}
+    
+    # Premier document par code_ref (même choix que l'ancien find_one)
+    existing_by_key: Dict[str, Dict[str, Any]] = {}
+    for doc in existing_docs:
+        if doc.get("code_ref"):
+            existing_by_key.setdefault(doc["code_ref"], doc)
+    
+    now = datetime.now(timezone.utc)
+    operations: List[Any] = []
+    
+    for gen_key, gen_data in generators_map.items():
+        exercise_type = _get_exercise_type_from_generator(gen_key) or gen_data.get('exercise_type') or gen_key
+        
+        # Format: chapter_code + generator_key (déterministe, pas de uuid)
+        exercise_type_id = f"{chapter_code}_{gen_key}"
+        exercise_type_doc = {
+            "id": exercise_type_id,
+            "code_ref": gen_key,
+            "chapter_code": chapter_code,
+            "chapitre_id": chapter_code,  # Legacy fallback
+            "niveau": niveau,
+            "domaine": domaine,
+            "titre": gen_data.get('title') or f"Exercice {exercise_type}",
+            "description": f"Exercice dynamique généré par {gen_key}",
+            "generator_kind": "DYNAMIC",
+            "difficulty_levels": sorted(gen_data['difficulties']) or ["facile", "moyen", "difficile"],
+            "available_offers": sorted(gen_data['offers']) or ["free"],
+            "min_questions": 1,
+            "max_questions": 10,
+            "default_questions": 5,
+            "requires_svg": gen_data.get('needs_svg', False),
+            "supports_seed": True,
+            "supports_ai_enonce": False,
+            "supports_ai_correction": False,
+            "competences_ids": [],
+            "question_kinds": {},
+            "random_config": {},
+            "updated_at": now,
+            "source": "admin_exercises_auto_sync"
+        }
+        
+        existing = existing_by_key.get(gen_key)
+        if existing and not force_recreate:
+            # Mise à jour (seulement les champs qui peuvent changer)
+            operations.append(UpdateOne({"_id": existing["_id"]}, {"$set": {
+                "difficulty_levels": exercise_type_doc["difficulty_levels"],
+                "available_offers": exercise_type_doc["available_offers"],
+                "requires_svg": exercise_type_doc["requires_svg"],
+                "updated_at": now,
+                "titre": exercise_type_doc["titre"]
+            }}))
+            stats['updated'] += 1
+        elif existing:
+            # Recréation (force) : remplacement complet, sans fenêtre où code_ref (unique) serait dupliqué
+            exercise_type_doc["created_at"] = now
+            operations.append(ReplaceOne({"_id": existing["_id"]}, exercise_type_doc))
+            stats['deleted'] += 1
+            stats['created'] += 1
+        else:
+            exercise_type_doc["created_at"] = now
+            operations.append(InsertOne(exercise_type_doc))
+            stats['created'] += 1
+        
+        stats['generator_keys'].append(gen_key)
+    
+    # Orphelins : exercise_types auto-synchronisés sans exercice admin correspondant
+    for doc in existing_docs:
+        gen_key = doc.get("code_ref")
+        if (
+            gen_key and gen_key not in generators_map
+            and doc.get("generator_kind") == "DYNAMIC"
+            and doc.get("source") == "admin_exercises_auto_sync"
+        ):
+            operations.append(DeleteOne({"_id": doc["_id"]}))
+            logger.info(f"[EXERCISE_TYPES_SYNC] 🗑️  Orphelin à supprimer: {gen_key} ({chapter_code})")
+            stats['deleted'] += 1
+    
+    return operations
+
+
+class ExerciseTypesSyncJob:
+    """
+    Synchronisation exercise_types en tâche de fond, regroupée par chapitre.
+    
+    Utilisée par les imports en masse : les chapitres demandés s'accumulent
+    dans un ensemble et une seule tâche les synchronise un par un. Un chapitre
+    demandé plusieurs fois avant son tour n'est synchronisé qu'une fois ; s'il
+    est redemandé pendant sa synchronisation, il est repris ensuite.
+    """
+    
+    def __init__(self, db: AsyncIOMotorDatabase, delay_seconds: float = EXERCISE_TYPES_SYNC_DELAY_SECONDS):
+        self.db = db
+        self.delay_seconds = delay_seconds
+        self._pending: Dict[str, bool] = {}  # chapter_code -> force_recreate
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'scheduled': 0, 'coalesced': 0, 'synced': 0, 'failed': 0}
+    
+    @property
+    def pending(self) -> List[str]:
+        return list(self._pending)
+    
+    def schedule(self, chapter_codes: Iterable[str], force_recreate: bool = False) -> asyncio.Task:
+        """Ajoute des chapitres à synchroniser et démarre la tâche si besoin"""
+        for chapter_code in chapter_codes:
+            if not chapter_code:
+                continue
+            normalized = chapter_code.upper().replace("-", "_")
+            self.stats['scheduled'] += 1
+            if normalized in self._pending:
+                self.stats['coalesced'] += 1
+            self._pending[normalized] = self._pending.get(normalized, False) or force_recreate
+        
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+    
+    async def _run(self) -> None:
+        # Court délai : regroupe les demandes d'une même rafale d'imports
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        
+        sync_service = CurriculumSyncService(self.db)
+        while self._pending:
+            chapter_code = next(iter(self._pending))
+            force_recreate = self._pending.pop(chapter_code)
+            try:
+                result = await sync_service.sync_chapter_to_exercise_types(chapter_code, force_recreate=force_recreate)
+                self.stats['synced'] += 1
+                logger.info(
+                    f"[EXERCISE_TYPES_SYNC] (tâche de fond) {chapter_code}: créés={result['created']}, "
+                    f"mis à jour={result['updated']}, supprimés={result['deleted']}"
+                )
+            except Exception as e:
+                self.stats['failed'] += 1
+                logger.warning(f"[EXERCISE_TYPES_SYNC] (tâche de fond) Échec pour {chapter_code}: {e}")
+
+
+# Une tâche par nom de base (les routes passent des handles différents)
+_sync_jobs: Dict[str, ExerciseTypesSyncJob] = {}
+
+
+def schedule_exercise_types_sync(
+    db: AsyncIOMotorDatabase,
+    chapter_codes: Iterable[str],
+    force_recreate: bool = False
+) -> ExerciseTypesSyncJob:
+    """Planifie la synchronisation exercise_types de chapitres en tâche de fond (imports en masse)"""
+    job = _sync_jobs.get(db.name)
+    if job is None:
+        job = _sync_jobs[db.name] = ExerciseTypesSyncJob(db)
+    job.schedule(chapter_codes, force_recreate=force_recreate)
+    return job
+
+
 def get_curriculum_sync_service(db: AsyncIOMotorDatabase) -> CurriculumSyncService:
     """Factory pour obtenir une instance du service de synchronisation"""
     return CurriculumSyncService(db)
@@ -0,0 +1,156 @@
+"""
+Service de listing des documents générés (tableau de bord).
+
+GET /api/documents chargeait les 20 derniers documents complets (exercices,
+schema_img en base64...) et relançait process_exercise_content sur chaque
+énoncé, résultat et étape à chaque visite.
+
+Ici :
+- le contenu est traité une fois à l'écriture (generate_exercises_with_ai)
+  et le document est marqué content_version = DOCUMENT_CONTENT_VERSION ;
+- le listing ne lit qu'une projection légère (métadonnées), paginée par
+  curseur sur (created_at, id), servie par l'index (guest_id, created_at, id) ;
+- le détail (GET /api/documents/{id}) renvoie le document complet et migre
+  paresseusement les documents plus anciens (content_version absent ou
+  inférieur) en réécrivant leur rendu traité.
+
+Usage:
+    page = await list_documents(db, {"guest_id": guest_id}, limit=20, cursor=None)
+    document = await get_document_detail(db, {"id": document_id, "guest_id": guest_id}, process_exercise_content)
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand le traitement du contenu (LaTeX, schémas) change
+DOCUMENT_CONTENT_VERSION = 1
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+DOCUMENT_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "matiere": 1,
+    "niveau": 1,
+    "chapitre": 1,
+    "type_doc": 1,
+    "difficulte": 1,
+    "nb_exercices": 1,
+    "export_count": 1,
+    "created_at": 1,
+}
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible"""
+
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    payload = json.dumps({"created_at": document["created_at"], "id": document["id"]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, str]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return {"created_at": payload["created_at"], "id": payload["id"]}
+    except Exception as e:
+        raise InvalidCursorError(f"Curseur invalide: {cursor}") from e
+
+
+def process_document_content(document: Dict[str, Any], process_content: Callable[[str], str]) -> Dict[str, Any]:
+    """Applique process_content aux énoncés et solutions (en place) et marque la version"""
+    for exercise in document.get("exercises") or []:
+        if exercise.get("enonce"):
+            exercise["enonce"] = process_content(exercise["enonce"])
+        solution = exercise.get("solution")
+        if solution:
+            if solution.get("resultat"):
+                solution["resultat"] = process_content(solution["resultat"])
+            if isinstance(solution.get("etapes"), list):
+                solution["etapes"] = [process_content(step) for step in solution["etapes"]]
+    document["content_version"] = DOCUMENT_CONTENT_VERSION
+    return document
+
+
+def _as_datetime(value: Any) -> Any:
+    """created_at est stocké en ISO dans documents"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+async def list_documents(
+    db_instance,
+    owner_query: Dict[str, Any],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page de résumés de documents, du plus récent au plus ancien.
+
+    Returns:
+        {"documents": [...], "next_cursor": str | None}
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = dict(owner_query)
+    if cursor:
+        position = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": position["created_at"]}},
+            {"created_at": position["created_at"], "id": {"$lt": position["id"]}},
+        ]
+
+    # limit + 1 pour savoir s'il existe une page suivante sans count_documents
+    documents: List[Dict[str, Any]] = await db_instance.documents.find(
+        query, DOCUMENT_SUMMARY_PROJECTION
+    ).sort([("created_at", -1), ("id", -1)]).limit(limit + 1).to_list(length=limit + 1)
+
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    documents = documents[:limit]
+    for document in documents:
+        document["created_at"] = _as_datetime(document.get("created_at"))
+    return {"documents": documents, "next_cursor": next_cursor}
+
+
+async def get_document_detail(
+    db_instance,
+    query: Dict[str, Any],
+    process_content: Callable[[str], str],
+) -> Optional[Dict[str, Any]]:
+    """Document complet ; migre le rendu traité des documents antérieurs à DOCUMENT_CONTENT_VERSION"""
+    document = await db_instance.documents.find_one(query, {"_id": 0})
+    if not document:
+        return None
+
+    if document.get("content_version", 0) < DOCUMENT_CONTENT_VERSION:
+        process_document_content(document, process_content)
+        try:
+            await db_instance.documents.update_one(
+                {"id": document["id"]},
+                {"$set": {"exercises": document.get("exercises") or [], "content_version": DOCUMENT_CONTENT_VERSION}}
+            )
+        except Exception as e:
+            # Le rendu reste correct pour cette réponse ; migration retentée à la prochaine lecture
+            logger.warning(f"[DOCUMENTS] Migration du contenu impossible ({document['id']}): {e}")
+
+    document["created_at"] = _as_datetime(document.get("created_at"))
+    return document
+
+
+__all__ = [
+    "DOCUMENT_CONTENT_VERSION",
+    "DOCUMENT_SUMMARY_PROJECTION",
+    "InvalidCursorError",
+    "encode_cursor",
+    "decode_cursor",
+    "process_document_content",
+    "list_documents",
+    "get_document_detail",
+]
@@ -18,7 +18,6 @@ Chaque exercice inclut :
 """
 
 import random
-import math
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
@@ -28,6 +27,12 @@ from backend.observability import (
     safe_randrange,
     get_request_context,
 )
+from backend.services.clock_svg_library import (
+    PREMIUM_CLOCK,
+    ClockPlacement,
+    render_clock_group_svg,
+    render_clock_svg,
+)
 
 obs_logger = get_obs_logger('GENERATOR')
 
@@ -171,108 +176,34 @@ class DureesPremiumGenerator:
         Génère une horloge analogique SVG de qualité premium.
         
         Features:
-        - Cadran élégant avec graduations
-        - Aiguilles proportionnelles et lisibles
-        - Chiffres romains ou arabes
+        - Cadran élégant avec graduations (construit une fois, voir clock_svg_library)
+        - Aiguilles proportionnelles et lisibles (mémoïsées par heure/minute)
         - Label optionnel
         """
-        cx, cy = size // 2, size // 2
-        radius = size // 2 - 15
-        
-        # Convertir en format 12h
-        h12 = hours % 12
-        
-        # Calculer les angles (0° = 12h, sens horaire)
-        hour_angle = (h12 * 30) + (minutes * 0.5) - 90
-        minute_angle = (minutes * 6) - 90
-        
-        hour_rad = math.radians(hour_angle)
-        minute_rad = math.radians(minute_angle)
-        
-        # Longueurs des aiguilles
-        hour_length = radius * 0.5
-        minute_length = radius * 0.75
-        
-        # Coordonnées des extrémités
-        hour_x = cx + hour_length * math.cos(hour_rad)
-        hour_y = cy + hour_length * math.sin(hour_rad)
-        minute_x = cx + minute_length * math.cos(minute_rad)
-        minute_y = cy + minute_length * math.sin(minute_rad)
-        
         svg_height = size + (35 if label or show_time else 0)
-        
-        svg = f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {svg_height}" width="{size}" height="{svg_height}">
-  <!-- Fond du cadran avec dégradé subtil -->
-  <defs>
-    <radialGradient id="clockFace" cx="50%" cy="50%" r="50%">
-      <stop offset="0%" style="stop-color:#ffffff"/>
-      <stop offset="100%" style="stop-color:#f5f5f5"/>
-    </radialGradient>
-  </defs>
-  
-  <!-- Cadran principal -->
-  <circle cx="{cx}" cy="{cy}" r="{radius}" fill="url(#clockFace)" stroke="#2c3e50" stroke-width="3"/>
-  <circle cx="{cx}" cy="{cy}" r="{radius-3}" fill="none" stroke="#95a5a6" stroke-width="1"/>
-'''
-        
-        # Graduations (60 pour les minutes, 12 grandes pour les heures)
-        for i in range(60):
-            angle = math.radians(i * 6 - 90)
-            if i % 5 == 0:
-                # Grande graduation (heures)
-                inner_r = radius - 15
-                outer_r = radius - 5
-                stroke_width = 2.5
-                color = "#2c3e50"
-            else:
-                # Petite graduation (minutes)
-                inner_r = radius - 10
-                outer_r = radius - 5
-                stroke_width = 1
-                color = "#7f8c8d"
-            
-            x1 = cx + inner_r * math.cos(angle)
-            y1 = cy + inner_r * math.sin(angle)
-            x2 = cx + outer_r * math.cos(angle)
-            y2 = cy + outer_r * math.sin(angle)
-            
-            svg += f'  <line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="{color}" stroke-width="{stroke_width}"/>\n'
-        
-        # Chiffres des heures
-        number_radius = radius - 28
-        for i in range(1, 13):
-            angle = math.radians(i * 30 - 90)
-            num_x = cx + number_radius * math.cos(angle)
-            num_y = cy + number_radius * math.sin(angle) + 5
-            svg += f'  <text x="{num_x:.1f}" y="{num_y:.1f}" text-anchor="middle" font-family="Georgia, serif" font-size="14" font-weight="bold" fill="#2c3e50">{i}</text>\n'
-        
-        # Aiguille des heures (épaisse, avec extrémité arrondie)
-        svg += f'''  <!-- Aiguille des heures -->
-  <line x1="{cx}" y1="{cy}" x2="{hour_x:.1f}" y2="{hour_y:.1f}" stroke="#2c3e50" stroke-width="6" stroke-linecap="round"/>
-'''
-        
-        # Aiguille des minutes (plus fine)
-        svg += f'''  <!-- Aiguille des minutes -->
-  <line x1="{cx}" y1="{cy}" x2="{minute_x:.1f}" y2="{minute_y:.1f}" stroke="#34495e" stroke-width="4" stroke-linecap="round"/>
-'''
-        
-        # Centre de l'horloge (point décoratif)
-        svg += f'''  <!-- Centre -->
-  <circle cx="{cx}" cy="{cy}" r="6" fill="#2c3e50"/>
-  <circle cx="{cx}" cy="{cy}" r="3" fill="#ecf0f1"/>
-'''
-        
-        # Label ou heure affichée
-        if label or show_time:
-            text_y = size + 20
-            if label:
-                svg += f'  <text x="{cx}" y="{text_y}" text-anchor="middle" font-family="Arial, sans-serif" font-size="12" fill="#7f8c8d">{label}</text>\n'
-            if show_time:
-                time_str = f"{hours:02d}h{minutes:02d}"
-                svg += f'  <text x="{cx}" y="{text_y + (15 if label else 0)}" text-anchor="middle" font-family="Arial, sans-serif" font-size="11" fill="#95a5a6">{time_str}</text>\n'
-        
-        svg += '</svg>'
-        return svg
+        return render_clock_svg(
+            PREMIUM_CLOCK, size, hour=hours, minute=minutes, height=svg_height,
+            extra=self._clock_caption(hours, minutes, size, label, show_time)
+        )
+    
+    @staticmethod
+    def _clock_caption(
+        hours: int,
+        minutes: int,
+        size: int,
+        label: Optional[str],
+        show_time: bool = False
+    ) -> str:
+        """Label et/ou heure affichés sous le cadran"""
+        caption = ""
+        cx = size // 2
+        text_y = size + 20
+        if label:
+            caption += f'<text x="{cx}" y="{text_y}" text-anchor="middle" font-family="Arial, sans-serif" font-size="12" fill="#7f8c8d">{label}</text>'
+        if show_time:
+            time_str = f"{hours:02d}h{minutes:02d}"
+            caption += f'<text x="{cx}" y="{text_y + (15 if label else 0)}" text-anchor="middle" font-family="Arial, sans-serif" font-size="11" fill="#95a5a6">{time_str}</text>'
+        return caption
     
     def _generate_dual_clock_svg(
         self,
@@ -281,29 +212,18 @@ class DureesPremiumGenerator:
         label1: str = "Début",
         label2: str = "Fin"
     ) -> str:
-        """Génère deux horloges côte à côte avec une flèche."""
-        clock1 = self._generate_clock_svg(h1, m1, size=160, label=label1)
-        clock2 = self._generate_clock_svg(h2, m2, size=160, label=label2)
-        
-        # Extraire le contenu interne des SVG
-        def extract_content(svg: str) -> str:
-            start = svg.find('>') + 1
-            end = svg.rfind('</svg>')
-            return svg[start:end]
-        
-        content1 = extract_content(clock1)
-        content2 = extract_content(clock2)
-        
-        return f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 220" width="400" height="220">
-  <g transform="translate(10, 10)">
-    {content1}
-  </g>
-  <g transform="translate(220, 10)">
-    {content2}
-  </g>
-  <!-- Flèche de transition -->
-  <path d="M 175 100 L 205 100 L 195 90 M 205 100 L 195 110" fill="none" stroke="#3498db" stroke-width="3" stroke-linecap="round" stroke-linejoin="round"/>
-</svg>'''
+        """Génère deux horloges côte à côte avec une flèche (un seul cadran partagé)."""
+        size = 160
+        return render_clock_group_svg(
+            PREMIUM_CLOCK, size,
+            [
+                ClockPlacement(10, 10, h1, m1, extra=self._clock_caption(h1, m1, size, label1)),
+                ClockPlacement(220, 10, h2, m2, extra=self._clock_caption(h2, m2, size, label2)),
+            ],
+            width=400, height=220,
+            # Flèche de transition
+            extra='<path d="M 175 100 L 205 100 L 195 90 M 205 100 L 195 110" fill="none" stroke="#3498db" stroke-width="3" stroke-linecap="round" stroke-linejoin="round"/>'
+        )
     
     # =========================================================================
     # FAMILLE 1: LECTURE D'HORLOGE
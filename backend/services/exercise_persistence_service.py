@@ -264,15 +264,7 @@ class ExercisePersistenceService:
         if count == 0:
             logger.info(f"[P0] Aucun exercice en DB pour {chapter_upper}. DB est la source unique (legacy désactivé).")
         
-        # Créer les index (idempotent, mais coûteux → éviter si possible)
-        try:
-            await self.collection.create_index([("chapter_code", 1), ("id", 1)], unique=True)
-            await self.collection.create_index("chapter_code")
-            await self.collection.create_index("difficulty")
-            await self.collection.create_index("offer")
-        except Exception as e:
-            # Index peut déjà exister → OK
-            logger.debug(f"Index peut déjà exister pour {chapter_upper}: {e}")
+        # Les index sont gérés par le registre (constants/indexes.py), appliqué au démarrage
         
         self._initialized[chapter_upper] = True
         logger.info(f"Exercices service initialisé pour {chapter_upper} avec {count} exercices")
@@ -377,7 +369,14 @@ IMPORTANT: Tout le contenu est en HTML PUR.
 """
 
 from typing import List, Dict, Any, Optional
-import random
+from backend.data.static_pool import StaticExercisePool
+from backend.observability import (
+    get_logger as get_obs_logger,
+    safe_random_choice,
+    get_request_context,
+)
+
+obs_logger = get_obs_logger('PIPELINE')
 
 
 # =============================================================================
@@ -422,6 +421,10 @@ import random
         
         # Ajouter les fonctions utilitaires
         header += f'''
+# Index (offre, difficulté) construit une fois au chargement du module
+_POOL = StaticExercisePool({var_name})
+
+
 def get_{code.lower()}_exercises(
     offer: Optional[str] = None,
     difficulty: Optional[str] = None
@@ -436,25 +439,7 @@ def get_{code.lower()}_exercises(
     Returns:
         Liste d'exercices filtrés
     """
-    exercises = {var_name}
-    
-    # Filtrer par offer
-    if offer:
-        offer = offer.lower()
-        if offer == "free":
-            exercises = [ex for ex in exercises if ex["offer"] == "free"]
-        elif offer == "pro":
-            pass  # PRO voit tout
-    else:
-        # Par défaut, FREE ne voit que free
-        exercises = [ex for ex in exercises if ex["offer"] == "free"]
-    
-    # Filtrer par difficulté
-    if difficulty:
-        difficulty = difficulty.lower()
-        exercises = [ex for ex in exercises if ex["difficulty"] == difficulty]
-    
-    return exercises
+    return list(_POOL.get(offer, difficulty))
 
 
 def get_random_{code.lower()}_exercise(
@@ -473,15 +458,16 @@ def get_random_{code.lower()}_exercise(
     Returns:
         Un exercice aléatoire ou None si aucun disponible
     """
-    available = get_{code.lower()}_exercises(offer=offer, difficulty=difficulty)
+    available = _POOL.get(offer, difficulty)
     
     if not available:
         return None
     
     if seed is not None:
-        random.seed(seed)
+        return _POOL.pick(offer, difficulty, seed)
     
-    return random.choice(available)
+    ctx = get_request_context()
+    return safe_random_choice(available, ctx, obs_logger)
 
 
 def get_{code.lower()}_batch(
@@ -502,8 +488,7 @@ def get_{code.lower()}_batch(
     Returns:
         Tuple (exercices: List, batch_metadata: Dict)
     """
-    available = get_{code.lower()}_exercises(offer=offer, difficulty=difficulty)
-    pool_size = len(available)
+    pool_size = len(_POOL.get(offer, difficulty))
     
     batch_meta = {{
         "requested": count,
@@ -519,16 +504,9 @@ def get_{code.lower()}_batch(
         batch_meta["warning"] = f"Aucun exercice disponible pour les filtres sélectionnés."
         return [], batch_meta
     
-    # Mélanger avec seed pour reproductibilité
-    if seed is not None:
-        random.seed(seed)
-    
-    shuffled = available.copy()
-    random.shuffle(shuffled)
-    
-    # Prendre au maximum ce qui est disponible
-    actual_count = min(count, pool_size)
-    selected = shuffled[:actual_count]
+    # Tirage sans doublons, reproductible avec seed
+    selected = _POOL.sample(offer, difficulty, count, seed)
+    actual_count = len(selected)
     
     batch_meta["returned"] = actual_count
     
@@ -546,18 +524,7 @@ def get_exercise_by_seed_index(
     """
     Sélectionne UN exercice de manière déterministe.
     """
-    available = get_{code.lower()}_exercises(offer=offer, difficulty=difficulty)
-    
-    if not available:
-        return None
-    
-    if seed is not None:
-        random.seed(seed)
-        index = random.randint(0, len(available) - 1)
-    else:
-        index = random.randint(0, len(available) - 1)
-    
-    return available[index]
+    return _POOL.pick(offer, difficulty, seed)
 
 
 def get_{code.lower()}_stats() -> Dict[str, Any]:
@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 # Import du service de génération mathématique (SPRINT generators)
 from backend.services.math_generation_service import MathGenerationService
+from backend.services.chapter_mapping_service import get_chapter_resolution_index
 
 
 class ExerciseTemplateService:
@@ -118,11 +119,9 @@ class ExerciseTemplateService:
             # Utiliser math_generation_service pour les générateurs spécifiques par chapitre
             math_gen_service = MathGenerationService()
             
-            # Récupérer le chapitre depuis MongoDB
-            chapter = await self.db.chapters.find_one(
-                {"code": exercise_type.chapter_code},
-                {"_id": 0, "titre": 1}
-            )
+            # Récupérer le chapitre (index en mémoire de la collection chapters)
+            chapter_index = await get_chapter_resolution_index(self.db)
+            chapter = chapter_index.by_code.get(exercise_type.chapter_code)
             
             if chapter:
                 chapter_title = chapter["titre"]
@@ -0,0 +1,175 @@
+"""
+Service de préparation des documents avant export PDF.
+
+Avant le rendu WeasyPrint, chaque exercice passe par plusieurs étapes CPU
+(schémas géométriques, LaTeX → SVG/MathML, schémas donnees → SVG). Ce service
+exécute ces traitements par exercice sur un pool de threads, hors de la boucle
+asyncio.
+
+Le pool ne parallélise pas le calcul (matplotlib et les regex gardent le GIL) :
+il évite que la préparation bloque les autres requêtes du worker. Mesure
+(backend/scripts/benchmark_export_preparation.py, 20 exercices LaTeX) :
+
+    mode      durée ms   retard max de la boucle ms
+    inline      1910       1911
+    pool=1      2380         93
+    pool=4      2587        106
+
+Un pool de process ne convient pas ici : les fonctions de préparation sont
+des closures sur l'état de la requête (timings, doc_id), non picklables.
+
+- l'ordre des exercices est conservé (gather ordonné)
+- un exercice en échec retombe sur sa version d'origine (fallback par exercice)
+- la durée de chaque étape est cumulée pour être stockée dans l'enregistrement d'export
+- chaque tâche s'exécute dans une copie du contexte de la requête (contextvars) :
+  request_id des logs et étapes Server-Timing (latex, svg...) restent attribués
+
+Usage:
+    from backend.services.export_preparation_service import (
+        ExportStageTimings, prepare_exercises_concurrently
+    )
+
+    timings = ExportStageTimings()
+    doc['exercises'] = await prepare_exercises_concurrently(
+        doc['exercises'], prepare_one, timings=timings
+    )
+    export_record["preparation"] = timings.as_dict()
+"""
+
+import asyncio
+import contextvars
+import copy
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PREPARATION_WORKERS = int(os.environ.get("EXPORT_PREPARATION_WORKERS", "4"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EXPORT_PREPARATION_WORKERS,
+                thread_name_prefix="export-prep"
+            )
+        return _executor
+
+
+class ExportStageTimings:
+    """
+    Cumul des durées par étape de préparation (en ms), partagé entre threads.
+
+    total_ms est le temps mural de la préparation par exercice. Les durées d'une
+    étape sont additionnées sur tous les exercices : avec des workers
+    parallèles, la somme des étapes peut dépasser total_ms.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages_ms: Dict[str, float] = {}
+        self.total_ms = 0.0
+        self.exercises = 0
+        self.fallbacks = 0
+
+    def add(self, stage: str, duration_ms: float) -> None:
+        with self._lock:
+            self._stages_ms[stage] = self._stages_ms.get(stage, 0.0) + duration_ms
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Mesure la durée du bloc et l'ajoute à l'étape"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: round(ms, 2) for name, ms in self._stages_ms.items()}
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "stages_ms": stages,
+            "exercises": self.exercises,
+            "fallbacks": self.fallbacks,
+        }
+
+
+async def run_in_preparation_pool(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Exécute une fonction CPU dans le pool de préparation, avec une copie du
+    contexte courant (run_in_executor ne propage pas les contextvars)
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_get_executor(), functools.partial(context.run, func, *args))
+
+
+async def prepare_exercises_concurrently(
+    exercises: List[Dict[str, Any]],
+    prepare_exercise: Callable[[Dict[str, Any], ExportStageTimings], None],
+    timings: Optional[ExportStageTimings] = None,
+    doc_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Prépare tous les exercices d'un document en parallèle.
+
+    Args:
+        exercises: Exercices du document (non modifiés)
+        prepare_exercise: Fonction qui modifie en place une copie de l'exercice
+            et enregistre ses étapes via timings.stage(...)
+        timings: Accumulateur des durées (créé si absent)
+        doc_id: Identifiant du document (logs)
+
+    Returns:
+        Liste des exercices préparés, dans l'ordre d'origine. Un exercice dont
+        la préparation échoue est renvoyé tel quel.
+    """
+    if timings is None:
+        timings = ExportStageTimings()
+
+    def prepare_copy(exercise: Dict[str, Any]) -> Dict[str, Any]:
+        working = copy.deepcopy(exercise)
+        prepare_exercise(working, timings)
+        return working
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_in_preparation_pool(prepare_copy, exercise) for exercise in exercises),
+        return_exceptions=True
+    )
+
+    prepared: List[Dict[str, Any]] = []
+    for index, (exercise, result) in enumerate(zip(exercises, results), start=1):
+        if isinstance(result, BaseException):
+            timings.fallbacks += 1
+            logger.warning(
+                f"[EXPORT][PREP] Exercice {index} préparé sans rendu (doc_id={doc_id}): {result}"
+            )
+            prepared.append(exercise)
+        else:
+            prepared.append(result)
+
+    timings.exercises += len(exercises)
+    timings.total_ms += (time.perf_counter() - start) * 1000
+    return prepared
+
+
+__all__ = [
+    "ExportStageTimings",
+    "prepare_exercises_concurrently",
+    "run_in_preparation_pool",
+    "EXPORT_PREPARATION_WORKERS",
+]
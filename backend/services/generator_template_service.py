@@ -3,8 +3,17 @@ Service de gestion des templates éditables de générateurs
 
 Permet aux admins de créer, modifier, et valider les templates
 de rédaction (énoncés/solutions) sans toucher au code.
+
+get_best_template est sur le chemin de génération (un appel par exercice) :
+les templates d'un générateur sont chargés en une requête puis gardés en
+cache par nom de base et generator_key (les services sont créés par requête,
+sur des handles de base différents). create/update/delete invalident le cache ;
+GENERATOR_TEMPLATE_CACHE_TTL_SECONDS (défaut 300) borne la durée de vie
+d'une entrée (écritures faites par un autre process).
 """
-from typing import Optional, List, Dict, Any
+import os
+import time
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
@@ -30,6 +39,43 @@ from backend.logger import get_logger
 
 logger = get_logger()
 
+GENERATOR_TEMPLATE_CACHE_TTL_SECONDS = float(os.environ.get("GENERATOR_TEMPLATE_CACHE_TTL_SECONDS", "300"))
+
+# (nom de la base, generator_key) -> (chargé à, templates du générateur dans l'ordre naturel)
+_template_sets: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def invalidate_template_cache(db: Optional[AsyncIOMotorDatabase] = None, generator_key: Optional[str] = None) -> None:
+    """Force le rechargement des templates (d'un générateur, d'une base, ou tous)"""
+    if db is None:
+        _template_sets.clear()
+    elif generator_key is not None:
+        _template_sets.pop((db.name, generator_key), None)
+    else:
+        for key in [key for key in _template_sets if key[0] == db.name]:
+            del _template_sets[key]
+
+
+def _template_priorities(
+    variant_id: str,
+    grade: Optional[str],
+    difficulty: Optional[str]
+) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """Critères (variant_id, grade, difficulty) du plus spécifique au plus général"""
+    priorities = []
+    # 1. Exact match
+    if grade and difficulty:
+        priorities.append((variant_id, grade, difficulty))
+    # 2. Sans difficulty
+    if grade:
+        priorities.append((variant_id, grade, None))
+    # 3. Sans grade
+    priorities.append((variant_id, None, None))
+    # 4. Default variant
+    if variant_id != "default":
+        priorities.append(("default", None, None))
+    return priorities
+
 
 class GeneratorTemplateService:
     """Service de gestion des templates de générateurs"""
@@ -46,6 +92,7 @@ class GeneratorTemplateService:
         
         result = await self.collection.insert_one(template_dict)
         template_dict["_id"] = str(result.inserted_id)
+        invalidate_template_cache(self.db, template_data.generator_key)
         
         logger.info(
             f"Template créé: generator={template_data.generator_key}, "
@@ -110,6 +157,8 @@ class GeneratorTemplateService:
             )
             
             if result:
+                # variant/grade/difficulty ont pu changer : tout le cache de la base
+                invalidate_template_cache(self.db)
                 result["_id"] = str(result["_id"])
                 logger.info(f"Template mis à jour: id={template_id}")
                 return GeneratorTemplate(**result)
@@ -123,6 +172,7 @@ class GeneratorTemplateService:
         try:
             result = await self.collection.delete_one({"_id": ObjectId(template_id)})
             if result.deleted_count > 0:
+                invalidate_template_cache(self.db)
                 logger.info(f"Template supprimé: id={template_id}")
                 return True
         except Exception as e:
@@ -143,61 +193,47 @@ class GeneratorTemplateService:
         2. Sans difficulty (generator + variant + grade)
         3. Sans grade (generator + variant)
         4. Default (generator + "default")
+
+        Une seule requête par générateur (mise en cache), la priorité est
+        résolue en mémoire. Comme les anciens find_one({"grade": None}),
+        un champ absent vaut None.
         """
-        queries = []
-        
-        # 1. Exact match
-        if grade and difficulty:
-            queries.append({
-                "generator_key": generator_key,
-                "variant_id": variant_id,
-                "grade": grade,
-                "difficulty": difficulty
-            })
-        
-        # 2. Sans difficulty
-        if grade:
-            queries.append({
-                "generator_key": generator_key,
-                "variant_id": variant_id,
-                "grade": grade,
-                "difficulty": None
-            })
-        
-        # 3. Sans grade
-        queries.append({
-            "generator_key": generator_key,
-            "variant_id": variant_id,
-            "grade": None,
-            "difficulty": None
-        })
+        templates = await self._get_generator_templates(generator_key)
         
-        # 4. Default variant
-        if variant_id != "default":
-            queries.append({
-                "generator_key": generator_key,
-                "variant_id": "default",
-                "grade": None,
-                "difficulty": None
-            })
-        
-        # Tester chaque query par priorité
-        for query in queries:
-            template_dict = await self.collection.find_one(query)
-            if template_dict:
-                template_dict["_id"] = str(template_dict["_id"])
-                logger.info(
-                    f"Template trouvé (priorité): generator={generator_key}, "
-                    f"query={query}"
-                )
-                return GeneratorTemplate(**template_dict)
+        for criteria in _template_priorities(variant_id, grade, difficulty):
+            for template_dict in templates:
+                if (
+                    template_dict.get("variant_id"),
+                    template_dict.get("grade"),
+                    template_dict.get("difficulty"),
+                ) == criteria:
+                    logger.debug(
+                        f"Template trouvé (priorité): generator={generator_key}, "
+                        f"variant/grade/difficulty={criteria}"
+                    )
+                    return GeneratorTemplate(**template_dict)
         
-        logger.info(
+        logger.debug(
             f"Aucun template trouvé pour generator={generator_key}, "
             f"variant={variant_id}, grade={grade}, difficulty={difficulty}"
         )
         return None
     
+    async def _get_generator_templates(self, generator_key: str) -> List[Dict[str, Any]]:
+        """Templates du générateur (une requête, puis cache jusqu'à invalidation ou TTL)"""
+        key = (self.db.name, generator_key)
+        cached = _template_sets.get(key)
+        if cached is not None and time.monotonic() - cached[0] < GENERATOR_TEMPLATE_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        templates = []
+        async for template_dict in self.collection.find({"generator_key": generator_key}):
+            template_dict["_id"] = str(template_dict["_id"])
+            templates.append(template_dict)
+        _template_sets[key] = (time.monotonic(), templates)
+        logger.debug(f"Templates chargés: generator={generator_key}, count={len(templates)}")
+        return templates
+    
     async def validate_template(
         self,
         request: GeneratorTemplateValidateRequest
@@ -14,6 +14,7 @@ import logging
 from typing import Dict, Any, Optional, List
 from backend.models.math_models import GeometricFigure
 from backend.geometry_svg_renderer import GeometrySVGRenderer
+from backend.observability.timing import timed_stage
 from backend.pedagogie_rules import determine_elements_to_hide_in_question as determine_hiding_rules
 
 logger = logging.getLogger(__name__)
@@ -132,6 +133,7 @@ class GeometryRenderService:
     def __init__(self):
         self.renderer = GeometrySVGRenderer(width=400, height=300)
     
+    @timed_stage("svg")
     def render_figure_to_svg(self, figure: GeometricFigure):
         """
         Convertit une GeometricFigure en SVG
@@ -13,7 +13,8 @@ Logique métier:
 - PRO: voit tous les exercices (free + pro)
 - La difficulté filtre réellement les exercices disponibles
 - Génération de lots SANS DOUBLONS (tant que possible)
-- Déterminisme: seed fixe => même exercice (random.Random(seed))
+- Déterminisme: seed fixe => même exercice (random.Random(seed)) ; lots tirés
+  par seeded_sample
 """
 
 import random
@@ -21,6 +22,7 @@ import time
 import logging
 from typing import Dict, Any, Optional, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from backend.data.static_pool import seeded_sample
 from backend.services.static_exercise_repository import StaticExerciseRepository
 from backend.services.svg_render_service import generate_exercise_svgs
 
@@ -194,18 +196,10 @@ async def generate_gm08_batch(
         logger.warning(f"[GM08] {batch_meta['warning']}")
         return [], batch_meta
     
-    # Mélanger le pool avec seed pour reproductibilité
-    if seed is not None:
-        rng = random.Random(seed)
-    else:
-        rng = random.Random()
-    
-    pool_copy = pool.copy()
-    rng.shuffle(pool_copy)
-    
-    # Prendre au maximum ce qui est disponible (sans doublons)
-    actual_count = min(count, pool_size)
-    selected = pool_copy[:actual_count]
+    # Tirage sans doublons en O(count), reproductible avec seed
+    # (au maximum ce qui est disponible)
+    selected = seeded_sample(pool, count, seed)
+    actual_count = len(selected)
     
     batch_meta["returned"] = actual_count
     
@@ -0,0 +1,143 @@
+"""
+Application du registre d'index (constants/indexes.py) et détection de dérive.
+
+Pour chaque collection du registre, compare les index existants (list_indexes)
+aux spécifications :
+- missing : index absent -> créé (sauf dry_run)
+- conflicts : même nom mais clés/options différentes -> signalé, jamais modifié
+- unexpected : index présent en base mais absent du registre -> signalé
+
+Appelé une fois au démarrage (tâche de fond, hors chemin des requêtes) et par
+init_db_indexes.py (--check pour un rapport sans écriture).
+
+Usage:
+    report = await apply_index_registry(db)
+    report = await apply_index_registry(db, dry_run=True)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.constants.indexes import INDEX_REGISTRY, IndexSpec
+
+logger = logging.getLogger(__name__)
+
+# Options d'index comparées pour la détection de dérive
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds")
+
+
+def _collation_signature(collation: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """locale et strength seulement : MongoDB complète la collation avec ses valeurs par défaut"""
+    if not collation:
+        return None
+    return {"locale": collation.get("locale"), "strength": collation.get("strength", 3)}
+
+
+def _spec_signature(spec: IndexSpec) -> Dict[str, Any]:
+    options = spec.create_kwargs()
+    return {
+        "key": [list(key) for key in spec.keys],
+        **{option: options.get(option) for option in _COMPARED_OPTIONS},
+        "collation": _collation_signature(spec.collation),
+    }
+
+
+def _existing_signature(index_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "key": [[field, int(direction)] for field, direction in index_info["key"].items()],
+        **{option: index_info.get(option) or None for option in _COMPARED_OPTIONS},
+        "collation": _collation_signature(index_info.get("collation")),
+    }
+
+
+def _normalize(signature: Dict[str, Any]) -> Dict[str, Any]:
+    """unique/sparse False et absents sont équivalents"""
+    return {key: value for key, value in signature.items() if value not in (None, False)}
+
+
+async def diff_collection_indexes(collection, specs: List[IndexSpec]) -> Dict[str, List[str]]:
+    """Compare les index d'une collection à ses spécifications"""
+    existing = {index_info["name"]: index_info async for index_info in collection.list_indexes()}
+    report: Dict[str, List[str]] = {"missing": [], "conflicts": [], "unexpected": []}
+
+    declared = set()
+    for spec in specs:
+        name = spec.index_name
+        declared.add(name)
+        if name not in existing:
+            report["missing"].append(name)
+        elif _normalize(_existing_signature(existing[name])) != _normalize(_spec_signature(spec)):
+            report["conflicts"].append(name)
+
+    report["unexpected"] = sorted(name for name in existing if name != "_id_" and name not in declared)
+    return report
+
+
+async def apply_index_registry(
+    db_instance,
+    collections: Optional[Iterable[str]] = None,
+    dry_run: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Crée les index manquants du registre et retourne le rapport de dérive.
+
+    Args:
+        db_instance: Base MongoDB
+        collections: Restreindre à certaines collections (défaut : tout le registre)
+        dry_run: Rapport uniquement, aucune création
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+    for collection_name in collections or INDEX_REGISTRY:
+        specs = INDEX_REGISTRY[collection_name]
+        collection = db_instance[collection_name]
+        collection_report = await diff_collection_indexes(collection, specs)
+
+        created = []
+        if not dry_run:
+            for spec in specs:
+                if spec.index_name not in collection_report["missing"]:
+                    continue
+                try:
+                    await collection.create_index(list(spec.keys), **spec.create_kwargs())
+                    created.append(spec.index_name)
+                except Exception as e:
+                    logger.error(f"[INDEX] Création impossible {collection_name}.{spec.index_name}: {e}")
+        collection_report["created"] = created
+
+        if collection_report["conflicts"]:
+            logger.warning(f"[INDEX] Dérive {collection_name}: index en conflit {collection_report['conflicts']}")
+        if collection_report["unexpected"]:
+            logger.info(f"[INDEX] {collection_name}: index hors registre {collection_report['unexpected']}")
+        if created:
+            logger.info(f"[INDEX] {collection_name}: index créés {created}")
+        report[collection_name] = collection_report
+    return report
+
+
+def has_drift(report: Dict[str, Dict[str, List[str]]]) -> bool:
+    """Vrai si un index manque ou est en conflit"""
+    return any(
+        set(collection_report["missing"]) - set(collection_report.get("created", []))
+        or collection_report["conflicts"]
+        for collection_report in report.values()
+    )
+
+
+async def apply_index_registry_safely(db_instance) -> None:
+    """Variante du démarrage : ne lève jamais (MongoDB indisponible, droits insuffisants...)"""
+    try:
+        await db_instance.command("ping")
+        await apply_index_registry(db_instance)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"[INDEX] Registre d'index non appliqué au démarrage: {e}")
+
+
+__all__ = [
+    "apply_index_registry",
+    "apply_index_registry_safely",
+    "diff_collection_indexes",
+    "has_drift",
+]
@@ -0,0 +1,439 @@
+"""
+Service d'export PDF par artefacts (mode "export job").
+
+Au lieu de renvoyer tous les PDFs encodés en base64 dans une réponse JSON,
+l'endpoint d'export crée un job et retourne immédiatement les identifiants
+des artefacts. Chaque PDF est stocké dans GridFS dès que son rendu est
+terminé, puis servi en binaire (application/pdf) par morceaux :
+- pas de copie base64 (+33%) ni de JSON géant en mémoire
+- le client télécharge chaque variante dès qu'elle est prête
+- support Range (reprise, lecture partielle) et ETag / If-None-Match
+- bundle ZIP construit à la volée, sans assembler l'archive en mémoire
+
+Les identifiants d'artefacts sont aléatoires (uuid4) et expirent après
+PDF_ARTIFACT_TTL_HOURS. Un job appartient au compte qui l'a créé (owner) :
+seul ce compte peut le consulter ou le télécharger.
+
+Les rendus tournent en tâche de fond dans le process qui a créé le job : un
+artefact encore "pending" après PDF_EXPORT_JOB_TIMEOUT_SECONDS (redémarrage,
+worker tué) est marqué "failed" à la lecture du job.
+
+Usage:
+    job = await create_export_job(db, {"student": "Fiche_Eleve.pdf"}, metadata, owner=user_email)
+    launch_export_job(db, job, {"student": render_student_coroutine}, on_success=record_export)
+    return export_job_view(job)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+from backend.constants.collections import PDF_ARTIFACTS_BUCKET, PDF_EXPORT_JOBS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+PDF_ARTIFACT_TTL_HOURS = int(os.environ.get("PDF_ARTIFACT_TTL_HOURS", "24"))
+PDF_EXPORT_JOB_TIMEOUT_SECONDS = int(os.environ.get("PDF_EXPORT_JOB_TIMEOUT_SECONDS", "600"))
+STREAM_CHUNK_SIZE = 256 * 1024
+EXPORTS_URL_PREFIX = "/api/mathalea/exports"
+
+ARTIFACT_PENDING = "pending"
+ARTIFACT_READY = "ready"
+ARTIFACT_FAILED = "failed"
+
+STALE_ARTIFACT_ERROR = "Génération du PDF interrompue, relancez l'export"
+
+# Métadonnées exposées par export_job_view (ni email, ni quotas, ni
+# informations d'établissement)
+PUBLIC_METADATA_KEYS = (
+    "sheet_id",
+    "titre",
+    "niveau",
+    "nb_exercises",
+    "generated_at",
+    "from_cache",
+    "ai_enrichment_applied",
+    "base_filename",
+    "template",
+)
+
+# Références fortes vers les jobs en cours (sinon asyncio peut les collecter)
+_running_jobs: Set[asyncio.Task] = set()
+
+
+def _bucket(db_instance) -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(db_instance, bucket_name=PDF_ARTIFACTS_BUCKET)
+
+
+async def create_export_job(
+    db_instance,
+    filenames: Dict[str, str],
+    metadata: Optional[Dict[str, Any]] = None,
+    owner: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Enregistre un job d'export avec un artefact "pending" par variante.
+
+    Args:
+        db_instance: Base MongoDB
+        filenames: Variante -> nom de fichier PDF proposé au téléchargement
+        metadata: Métadonnées du job (sheet_id, titre...), filtrées par export_job_view
+        owner: Email du compte propriétaire (seul autorisé à lire le job)
+    """
+    await purge_expired_exports(db_instance)
+
+    now = datetime.now(timezone.utc)
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "artifacts": [
+            {
+                "artifact_id": uuid.uuid4().hex,
+                "variant": variant,
+                "filename": filename,
+                "status": ARTIFACT_PENDING,
+            }
+            for variant, filename in filenames.items()
+        ],
+        "metadata": metadata or {},
+        "owner": owner,
+        "created_at": now,
+        "expires_at": now + timedelta(hours=PDF_ARTIFACT_TTL_HOURS),
+    }
+    await db_instance[PDF_EXPORT_JOBS_COLLECTION].insert_one(dict(job))
+    return job
+
+
+async def _store_artifact(db_instance, job_id: str, artifact: Dict[str, Any], render: Awaitable[bytes]) -> bool:
+    artifact_id = artifact["artifact_id"]
+    start = time.perf_counter()
+    try:
+        pdf_bytes = await render
+        etag = hashlib.sha256(pdf_bytes).hexdigest()
+        await _bucket(db_instance).upload_from_stream_with_id(
+            artifact_id,
+            artifact["filename"],
+            pdf_bytes,
+            metadata={"job_id": job_id, "variant": artifact["variant"], "etag": etag},
+        )
+        update = {
+            "artifacts.$.status": ARTIFACT_READY,
+            "artifacts.$.size": len(pdf_bytes),
+            "artifacts.$.etag": etag,
+            "artifacts.$.render_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        logger.info(
+            f"[PDF_ARTIFACT] READY job_id={job_id} variant={artifact['variant']} size={len(pdf_bytes)}"
+        )
+        ready = True
+    except Exception as e:
+        update = {
+            "artifacts.$.status": ARTIFACT_FAILED,
+            "artifacts.$.error": str(getattr(e, "detail", e))[:500],
+        }
+        logger.error(f"[PDF_ARTIFACT] FAILED job_id={job_id} variant={artifact['variant']}: {e}")
+        ready = False
+
+    await db_instance[PDF_EXPORT_JOBS_COLLECTION].update_one(
+        {"job_id": job_id, "artifacts.artifact_id": artifact_id},
+        {"$set": update}
+    )
+    return ready
+
+
+async def run_export_job(
+    db_instance,
+    job: Dict[str, Any],
+    renders: Dict[str, Awaitable[bytes]],
+    on_success: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> bool:
+    """
+    Stocke chaque variante dès que son rendu est terminé.
+
+    on_success (enregistrement de l'export pour les quotas...) n'est appelé
+    que si tous les artefacts sont prêts.
+
+    Returns:
+        True si tous les artefacts sont prêts
+    """
+    results = await asyncio.gather(*(
+        _store_artifact(db_instance, job["job_id"], artifact, renders[artifact["variant"]])
+        for artifact in job["artifacts"]
+    ))
+    succeeded = all(results)
+    if succeeded and on_success is not None:
+        try:
+            await on_success()
+        except Exception as e:
+            logger.error(f"[PDF_ARTIFACT] on_success en échec job_id={job['job_id']}: {e}")
+    return succeeded
+
+
+def launch_export_job(
+    db_instance,
+    job: Dict[str, Any],
+    renders: Dict[str, Awaitable[bytes]],
+    on_success: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> asyncio.Task:
+    """Exécute le job en tâche de fond (la requête d'export répond sans attendre)"""
+    task = asyncio.ensure_future(run_export_job(db_instance, job, renders, on_success))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    return task
+
+
+async def rendered(pdf_bytes: bytes) -> bytes:
+    """Adapte un PDF déjà disponible (cache) au format des rendus attendus par le job"""
+    return pdf_bytes
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+async def get_export_job(db_instance, job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Job non expiré, ou None.
+
+    Les artefacts restés "pending" au-delà de PDF_EXPORT_JOB_TIMEOUT_SECONDS
+    (rendu perdu avec le process qui l'exécutait) sont marqués "failed".
+    """
+    job = await db_instance[PDF_EXPORT_JOBS_COLLECTION].find_one({"job_id": job_id}, {"_id": 0})
+    if not job:
+        return None
+    now = datetime.now(timezone.utc)
+    expires_at = _as_utc(job.get("expires_at"))
+    if expires_at and expires_at <= now:
+        return None
+
+    created_at = _as_utc(job.get("created_at"))
+    stale = [artifact for artifact in job["artifacts"] if artifact["status"] == ARTIFACT_PENDING]
+    if stale and created_at and created_at <= now - timedelta(seconds=PDF_EXPORT_JOB_TIMEOUT_SECONDS):
+        for artifact in stale:
+            artifact["status"] = ARTIFACT_FAILED
+            artifact["error"] = STALE_ARTIFACT_ERROR
+        await db_instance[PDF_EXPORT_JOBS_COLLECTION].update_one(
+            {"job_id": job_id},
+            {"$set": {
+                "artifacts.$[stale].status": ARTIFACT_FAILED,
+                "artifacts.$[stale].error": STALE_ARTIFACT_ERROR,
+            }},
+            array_filters=[{"stale.status": ARTIFACT_PENDING}]
+        )
+        logger.warning(f"[PDF_ARTIFACT] STALE job_id={job_id} artifacts={len(stale)} marqués failed")
+    return job
+
+
+def is_export_job_owner(job: Dict[str, Any], user_email: Optional[str]) -> bool:
+    """Le compte user_email peut-il lire ce job ?"""
+    return bool(user_email) and job.get("owner") == user_email
+
+
+def find_artifact(job: Dict[str, Any], artifact_id: str) -> Optional[Dict[str, Any]]:
+    for artifact in job.get("artifacts", []):
+        if artifact["artifact_id"] == artifact_id:
+            return artifact
+    return None
+
+
+def export_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Représentation publique d'un job : identifiants, statuts et URLs de téléchargement"""
+    job_id = job["job_id"]
+    artifacts = []
+    for artifact in job["artifacts"]:
+        view = {
+            "artifact_id": artifact["artifact_id"],
+            "variant": artifact["variant"],
+            "filename": artifact["filename"],
+            "status": artifact["status"],
+            "url": f"{EXPORTS_URL_PREFIX}/{job_id}/artifacts/{artifact['artifact_id']}",
+        }
+        for key in ("size", "etag", "error"):
+            if key in artifact:
+                view[key] = artifact[key]
+        artifacts.append(view)
+
+    expires_at = job.get("expires_at")
+    return {
+        "job_id": job_id,
+        "status": _job_status(job),
+        "artifacts": artifacts,
+        "bundle_url": f"{EXPORTS_URL_PREFIX}/{job_id}/bundle.zip",
+        "expires_at": expires_at.isoformat() if expires_at else None,
+        "metadata": {
+            key: value for key, value in job.get("metadata", {}).items() if key in PUBLIC_METADATA_KEYS
+        },
+    }
+
+
+def _job_status(job: Dict[str, Any]) -> str:
+    statuses = {artifact["status"] for artifact in job["artifacts"]}
+    if ARTIFACT_FAILED in statuses:
+        return ARTIFACT_FAILED
+    if ARTIFACT_PENDING in statuses:
+        return ARTIFACT_PENDING
+    return ARTIFACT_READY
+
+
+# ============================================================================
+# Téléchargement (Range / ETag / ZIP)
+# ============================================================================
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interprète un en-tête Range à un seul intervalle ("bytes=0-99", "bytes=100-", "bytes=-50").
+
+    Returns:
+        (début, fin incluse), ou None si l'en-tête est absent ou ignoré (multi-intervalles)
+
+    Raises:
+        ValueError: Intervalle non satisfaisable (réponse 416)
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec:
+        return None
+
+    start_str, _, end_str = spec.partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else:
+            suffix = int(end_str)
+            if suffix <= 0:
+                raise ValueError(range_header)
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError:
+        raise ValueError(f"Range invalide: {range_header}")
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Range non satisfaisable: {range_header}")
+    return start, end
+
+
+def content_disposition(filename: str) -> str:
+    """Content-Disposition compatible avec les titres accentués (RFC 6266)"""
+    ascii_name = filename.encode("ascii", "ignore").decode("ascii").replace('"', "") or "export.pdf"
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+
+async def iter_artifact_bytes(db_instance, artifact_id: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Lit un artefact GridFS par morceaux, de start à end inclus"""
+    grid_out = await _bucket(db_instance).open_download_stream(artifact_id)
+    try:
+        if start:
+            grid_out.seek(start)
+        remaining = (end if end is not None else grid_out.length - 1) - start + 1
+        while remaining > 0:
+            chunk = await grid_out.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        grid_out.close()
+
+
+class _ZipStreamBuffer:
+    """Sortie non seekable pour zipfile : les octets écrits sont récupérés au fil de l'eau"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def iter_zip_bundle(db_instance, artifacts: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Construit le ZIP des artefacts en streaming (PDFs stockés sans recompression :
+    ils sont déjà compressés).
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for artifact in artifacts:
+            with archive.open(artifact["filename"], mode="w") as entry:
+                async for chunk in iter_artifact_bytes(db_instance, artifact["artifact_id"]):
+                    entry.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+# ============================================================================
+# Expiration
+# ============================================================================
+
+async def purge_expired_exports(db_instance, limit: int = 50) -> int:
+    """Supprime les jobs expirés et leurs fichiers GridFS (appelé à chaque nouvel export)"""
+    jobs_collection = db_instance[PDF_EXPORT_JOBS_COLLECTION]
+    now = datetime.now(timezone.utc)
+    purged = 0
+    try:
+        cursor = jobs_collection.find({"expires_at": {"$lte": now}}, {"_id": 0, "job_id": 1, "artifacts": 1}).limit(limit)
+        async for job in cursor:
+            for artifact in job.get("artifacts", []):
+                if artifact.get("status") == ARTIFACT_READY:
+                    try:
+                        await _bucket(db_instance).delete(artifact["artifact_id"])
+                    except Exception as e:
+                        logger.warning(f"[PDF_ARTIFACT] Suppression impossible {artifact['artifact_id']}: {e}")
+            await jobs_collection.delete_one({"job_id": job["job_id"]})
+            purged += 1
+    except Exception as e:
+        logger.warning(f"[PDF_ARTIFACT] Purge des exports expirés impossible: {e}")
+    return purged
+
+
+__all__ = [
+    "create_export_job",
+    "launch_export_job",
+    "run_export_job",
+    "rendered",
+    "get_export_job",
+    "is_export_job_owner",
+    "find_artifact",
+    "export_job_view",
+    "parse_range_header",
+    "content_disposition",
+    "iter_artifact_bytes",
+    "iter_zip_bundle",
+    "purge_expired_exports",
+    "ARTIFACT_PENDING",
+    "ARTIFACT_READY",
+    "ARTIFACT_FAILED",
+]
@@ -0,0 +1,401 @@
+"""
+Ledger des quotas d'export (compteurs atomiques par identité et par fenêtre).
+
+Les quotas étaient vérifiés en comptant l'historique db.exports sur la fenêtre
+(count_documents à chaque vérification), sans réservation : deux exports
+simultanés pouvaient tous deux passer sous la limite.
+
+Ici, chaque (quota, identité) a un document compteur dans quota_counters.
+
+Fenêtre calendaire (comptes Free, 3 exports/jour) :
+
+    {"key": "free_daily_export:prof@ecole.fr", "used": 2,
+     "window_start": ..., "window_end": ...}
+
+Fenêtre glissante (invités, 3 exports sur les 30 derniers jours, comme
+l'ancien comptage) : le compteur garde les dates des `limit` derniers exports
+
+    {"key": "guest_export:guest_abc", "events": [...], "window_end": ...}
+
+- reserve_quota() : mise à jour conditionnelle (used < limit) -> atomique, O(1)
+- release_quota() : rend la réservation si l'export échoue
+- get_quota_status() : lecture seule (fast path de /quota/check)
+
+Compteur absent (premier export depuis le déploiement du ledger, ou compteur
+purgé) : il est initialisé à partir de db.exports sur la fenêtre, une seule
+fois ; get_quota_status lit alors l'historique sans rien écrire.
+
+Index (constants/indexes.py) : unique sur key, TTL sur window_end.
+
+Usage:
+    reservation = await reserve_quota(db, FREE_DAILY_EXPORT_QUOTA, user_email)
+    if not reservation.granted:
+        raise HTTPException(status_code=429, ...)
+    try:
+        pdf_bytes = render()
+    except BaseException:
+        await release_quota(db, reservation)
+        raise
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from backend.constants.collections import QUOTA_COUNTERS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+WINDOW_CALENDAR_DAY = "calendar_day"
+WINDOW_ROLLING = "rolling"
+
+# Historique des exports (source des compteurs absents)
+EXPORTS_HISTORY_COLLECTION = "exports"
+
+# Une fenêtre peut expirer entre deux étapes de reserve_quota : on recommence
+MAX_RESERVE_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class QuotaPolicy:
+    """
+    Politique de quota.
+
+    window:
+        - "calendar_day" : remise à zéro à minuit UTC
+        - "rolling" : exports des window_days derniers jours
+    history_field: champ de db.exports qui porte l'identité
+    """
+    scope: str
+    limit: int
+    history_field: str
+    window: str = WINDOW_CALENDAR_DAY
+    window_days: int = 1
+
+    def key(self, identity: str) -> str:
+        return f"{self.scope}:{identity}"
+
+    def window_bounds(self, now: datetime) -> Tuple[datetime, datetime]:
+        """Fenêtre calendaire contenant now"""
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start, start + timedelta(days=self.window_days)
+
+    @property
+    def window_length(self) -> timedelta:
+        return timedelta(days=self.window_days)
+
+
+# Invités : 3 exports sur 30 jours glissants
+GUEST_EXPORT_QUOTA = QuotaPolicy(
+    "guest_export", limit=3, history_field="guest_id", window=WINDOW_ROLLING, window_days=30
+)
+# Comptes Free : 3 exports par jour
+FREE_DAILY_EXPORT_QUOTA = QuotaPolicy("free_daily_export", limit=3, history_field="user_email")
+
+
+@dataclass
+class QuotaReservation:
+    policy: QuotaPolicy
+    identity: str
+    granted: bool
+    used: int
+    window_start: Optional[datetime]
+    window_end: Optional[datetime]
+    # Fenêtre glissante : date de l'export réservé (retirée par release_quota)
+    event_at: Optional[datetime] = None
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.policy.limit - self.used)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Motor renvoie des dates naïves (UTC)"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _to_millis(value: datetime) -> datetime:
+    """MongoDB stocke les dates à la milliseconde"""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _collection(db_instance):
+    return db_instance[QUOTA_COUNTERS_COLLECTION]
+
+
+async def _history_events(db_instance, policy: QuotaPolicy, identity: str, since: datetime, now: datetime) -> List[datetime]:
+    """Dates des exports de db.exports dans la fenêtre (au plus limit, les plus récents)"""
+    cursor = db_instance[EXPORTS_HISTORY_COLLECTION].find(
+        {policy.history_field: identity, "created_at": {"$gte": since, "$lte": now}},
+        {"_id": 0, "created_at": 1}
+    ).sort("created_at", -1).limit(policy.limit)
+    events = [_to_millis(_aware(doc["created_at"])) async for doc in cursor]
+    return sorted(events)
+
+
+def _reservation(policy: QuotaPolicy, identity: str, doc: Dict[str, Any], granted: bool) -> QuotaReservation:
+    return QuotaReservation(
+        policy=policy,
+        identity=identity,
+        granted=granted,
+        used=doc.get("used", 0),
+        window_start=doc.get("window_start"),
+        window_end=_aware(doc.get("window_end")),
+    )
+
+
+def _rolling_reservation(
+    policy: QuotaPolicy,
+    identity: str,
+    events: List[datetime],
+    now: datetime,
+    granted: bool,
+    event_at: Optional[datetime] = None,
+) -> QuotaReservation:
+    """used = exports encore dans la fenêtre ; window_end = libération de la plus ancienne place"""
+    events = sorted(event for event in (_aware(e) for e in events) if event >= now - policy.window_length)
+    oldest = events[0] if events else None
+    return QuotaReservation(
+        policy=policy,
+        identity=identity,
+        granted=granted,
+        used=len(events),
+        window_start=oldest,
+        window_end=oldest + policy.window_length if oldest else None,
+        event_at=event_at,
+    )
+
+
+async def _consume_calendar(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: datetime,
+    enforce: bool,
+) -> QuotaReservation:
+    collection = _collection(db_instance)
+    key = policy.key(identity)
+
+    for _ in range(MAX_RESERVE_ATTEMPTS):
+        # 1. Fenêtre en cours, sous la limite : incrément conditionnel
+        active_query: Dict[str, Any] = {"key": key, "window_end": {"$gt": now}}
+        if enforce:
+            active_query["used"] = {"$lt": policy.limit}
+        doc = await collection.find_one_and_update(
+            active_query, {"$inc": {"used": 1}}, return_document=ReturnDocument.AFTER
+        )
+        if doc:
+            return _reservation(policy, identity, doc, granted=True)
+
+        # 2. Fenêtre expirée (pas encore purgée par le TTL) : nouvelle fenêtre
+        window_start, window_end = policy.window_bounds(now)
+        doc = await collection.find_one_and_update(
+            {"key": key, "window_end": {"$lte": now}},
+            {"$set": {"used": 1, "window_start": window_start, "window_end": window_end}},
+            return_document=ReturnDocument.AFTER
+        )
+        if doc:
+            return _reservation(policy, identity, doc, granted=True)
+
+        # 3. Pas de compteur : création à partir de l'historique (l'index unique arbitre les courses)
+        used = len(await _history_events(db_instance, policy, identity, window_start, now))
+        granted = not enforce or used < policy.limit
+        doc = {
+            "key": key,
+            "scope": policy.scope,
+            "identity": identity,
+            "used": used + 1 if granted else used,
+            "window_start": window_start,
+            "window_end": window_end,
+        }
+        try:
+            await collection.insert_one(doc)
+            return _reservation(policy, identity, doc, granted=granted)
+        except DuplicateKeyError:
+            pass
+
+        # 4. Le compteur existe (créé entre-temps ou fenêtre pleine) : refus si plein, sinon on recommence
+        doc = await collection.find_one({"key": key, "window_end": {"$gt": now}})
+        if doc and enforce and doc.get("used", 0) >= policy.limit:
+            return _reservation(policy, identity, doc, granted=False)
+
+    logger.warning(f"[QUOTA] Réservation {key} non résolue après {MAX_RESERVE_ATTEMPTS} tentatives")
+    return QuotaReservation(policy, identity, granted=False, used=policy.limit, window_start=None, window_end=None)
+
+
+async def _consume_rolling(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: datetime,
+    enforce: bool,
+) -> QuotaReservation:
+    collection = _collection(db_instance)
+    key = policy.key(identity)
+    now = _to_millis(now)
+    cutoff = now - policy.window_length
+
+    for _ in range(MAX_RESERVE_ATTEMPTS):
+        # 1. Retrait des exports sortis de la fenêtre glissante
+        doc = await collection.find_one_and_update(
+            {"key": key},
+            {"$pull": {"events": {"$lt": cutoff}}},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if doc:
+            # 2. Ajout conditionnel (moins de limit exports dans la fenêtre) ;
+            # sans limite, seuls les limit derniers exports sont conservés
+            push_query: Dict[str, Any] = {"key": key}
+            if enforce:
+                push_query[f"events.{policy.limit - 1}"] = {"$exists": False}
+            pushed = await collection.find_one_and_update(
+                push_query,
+                {
+                    "$push": {"events": {"$each": [now], "$slice": -policy.limit}},
+                    "$set": {"window_end": now + policy.window_length},
+                },
+                return_document=ReturnDocument.AFTER
+            )
+            if pushed:
+                return _rolling_reservation(policy, identity, pushed["events"], now, granted=True, event_at=now)
+            return _rolling_reservation(policy, identity, doc.get("events", []), now, granted=False)
+
+        # 3. Pas de compteur : création à partir de l'historique (l'index unique arbitre les courses)
+        events = await _history_events(db_instance, policy, identity, cutoff, now)
+        granted = not enforce or len(events) < policy.limit
+        if granted:
+            events = (events + [now])[-policy.limit:]
+        doc = {
+            "key": key,
+            "scope": policy.scope,
+            "identity": identity,
+            "events": events,
+            "window_end": max(events) + policy.window_length if events else now,
+        }
+        try:
+            await collection.insert_one(doc)
+            return _rolling_reservation(
+                policy, identity, events, now, granted=granted, event_at=now if granted else None
+            )
+        except DuplicateKeyError:
+            pass
+
+    logger.warning(f"[QUOTA] Réservation {key} non résolue après {MAX_RESERVE_ATTEMPTS} tentatives")
+    return QuotaReservation(policy, identity, granted=False, used=policy.limit, window_start=None, window_end=None)
+
+
+async def _consume(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: Optional[datetime],
+    enforce: bool,
+) -> QuotaReservation:
+    now = now or datetime.now(timezone.utc)
+    if policy.window == WINDOW_ROLLING:
+        return await _consume_rolling(db_instance, policy, identity, now, enforce)
+    return await _consume_calendar(db_instance, policy, identity, now, enforce)
+
+
+async def reserve_quota(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: Optional[datetime] = None,
+) -> QuotaReservation:
+    """Réserve une unité de quota (granted=False si la limite est atteinte)"""
+    return await _consume(db_instance, policy, identity, now, enforce=True)
+
+
+async def record_quota_usage(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: Optional[datetime] = None,
+) -> QuotaReservation:
+    """
+    Comptabilise une unité sans appliquer la limite (exports non bloqués côté serveur).
+
+    À appeler avant l'écriture de l'export dans db.exports (sinon un compteur
+    initialisé depuis l'historique compterait cet export deux fois).
+    """
+    return await _consume(db_instance, policy, identity, now, enforce=False)
+
+
+async def release_quota(db_instance, reservation: QuotaReservation) -> None:
+    """Annule une réservation (export échoué), uniquement dans la même fenêtre"""
+    if not reservation.granted:
+        return
+    key = reservation.policy.key(reservation.identity)
+    try:
+        if reservation.event_at is not None:
+            await _collection(db_instance).update_one(
+                {"key": key},
+                {"$pull": {"events": reservation.event_at}}
+            )
+            return
+        await _collection(db_instance).update_one(
+            {
+                "key": key,
+                "window_start": reservation.window_start,
+                "used": {"$gt": 0},
+            },
+            {"$inc": {"used": -1}}
+        )
+    except Exception as e:
+        logger.warning(f"[QUOTA] Annulation de réservation impossible ({reservation.identity}): {e}")
+
+
+async def get_quota_status(
+    db_instance,
+    policy: QuotaPolicy,
+    identity: str,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Lecture seule du compteur (aucune écriture ; historique lu si le compteur est absent)"""
+    now = now or datetime.now(timezone.utc)
+    if policy.window == WINDOW_ROLLING:
+        doc = await _collection(db_instance).find_one({"key": policy.key(identity)}, {"_id": 0, "events": 1})
+        if doc:
+            events = doc.get("events", [])
+        else:
+            events = await _history_events(db_instance, policy, identity, now - policy.window_length, now)
+        reservation = _rolling_reservation(policy, identity, events, now, granted=False)
+        used, resets_at = reservation.used, reservation.window_end
+    else:
+        doc = await _collection(db_instance).find_one(
+            {"key": policy.key(identity), "window_end": {"$gt": now}},
+            {"_id": 0, "used": 1, "window_end": 1}
+        )
+        if doc:
+            used, resets_at = doc["used"], _aware(doc["window_end"])
+        else:
+            window_start, window_end = policy.window_bounds(now)
+            used = len(await _history_events(db_instance, policy, identity, window_start, now))
+            resets_at = window_end if used else None
+    return {
+        "used": used,
+        "remaining": max(0, policy.limit - used),
+        "limit": policy.limit,
+        "resets_at": resets_at,
+        "exceeded": used >= policy.limit,
+    }
+
+
+__all__ = [
+    "QuotaPolicy",
+    "QuotaReservation",
+    "GUEST_EXPORT_QUOTA",
+    "FREE_DAILY_EXPORT_QUOTA",
+    "reserve_quota",
+    "record_quota_usage",
+    "release_quota",
+    "get_quota_status",
+]
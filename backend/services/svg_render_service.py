@@ -10,9 +10,12 @@ Usage:
     svg = render_svg_from_brief("horloge montrant 12h15", hour=12, minute=15)
 """
 
-import math
 from typing import Optional
 
+from backend.services.clock_svg_library import CLASSIC_CLOCK, render_clock_svg
+
+CLOCK_SVG_ATTRS = 'style="max-width: 100%; height: auto;"'
+
 
 def render_svg_from_brief(
     brief: str,
@@ -57,92 +60,15 @@ def _render_clock_svg(hour: int, minute: int) -> str:
     Génère un SVG d'horloge analogique.
     
     L'horloge affiche l'heure spécifiée avec :
-    - Un cadran avec les 12 chiffres
+    - Un cadran avec les 12 chiffres (construit une fois, voir clock_svg_library)
     - Une aiguille des heures (courte, épaisse)
     - Une aiguille des minutes (longue, fine)
     """
-    # Normaliser l'heure (format 12h)
-    hour = hour % 12
-    
-    # Calcul des angles (0° = 12h, sens horaire)
-    # L'aiguille des heures avance aussi en fonction des minutes
-    hour_angle = (hour + minute / 60) * 30 - 90  # 30° par heure
-    minute_angle = minute * 6 - 90  # 6° par minute
-    
-    # Conversion en radians
-    hour_rad = math.radians(hour_angle)
-    minute_rad = math.radians(minute_angle)
-    
-    # Centre et rayons
-    cx, cy = 100, 100
-    radius = 80
-    
-    # Position des aiguilles
-    hour_length = 45
-    minute_length = 65
-    
-    hour_x = cx + hour_length * math.cos(hour_rad)
-    hour_y = cy + hour_length * math.sin(hour_rad)
-    
-    minute_x = cx + minute_length * math.cos(minute_rad)
-    minute_y = cy + minute_length * math.sin(minute_rad)
-    
-    # Générer les chiffres du cadran
-    numbers_svg = ""
-    for i in range(1, 13):
-        angle = math.radians(i * 30 - 90)
-        num_x = cx + (radius - 15) * math.cos(angle)
-        num_y = cy + (radius - 15) * math.sin(angle) + 5
-        numbers_svg += f'    <text x="{num_x:.1f}" y="{num_y:.1f}" text-anchor="middle" font-size="14" font-weight="500" fill="#333">{i}</text>\n'
-    
-    # Générer les graduations
-    ticks_svg = ""
-    for i in range(60):
-        angle = math.radians(i * 6 - 90)
-        if i % 5 == 0:
-            # Grande graduation (heures)
-            inner_r = radius - 10
-            outer_r = radius - 3
-            stroke_width = 2
-        else:
-            # Petite graduation (minutes)
-            inner_r = radius - 5
-            outer_r = radius - 3
-            stroke_width = 1
-        
-        x1 = cx + inner_r * math.cos(angle)
-        y1 = cy + inner_r * math.sin(angle)
-        x2 = cx + outer_r * math.cos(angle)
-        y2 = cy + outer_r * math.sin(angle)
-        
-        ticks_svg += f'    <line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="#666" stroke-width="{stroke_width}"/>\n'
-    
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 200" width="200" height="200" style="max-width: 100%; height: auto;">
-  <!-- Fond du cadran -->
-  <circle cx="{cx}" cy="{cy}" r="{radius}" fill="#fefefe" stroke="#333" stroke-width="3"/>
-  
-  <!-- Graduations -->
-{ticks_svg}
-  <!-- Chiffres -->
-{numbers_svg}
-  <!-- Aiguille des heures (courte, épaisse) -->
-  <line x1="{cx}" y1="{cy}" x2="{hour_x:.1f}" y2="{hour_y:.1f}" 
-        stroke="#1a1a1a" stroke-width="5" stroke-linecap="round"/>
-  
-  <!-- Aiguille des minutes (longue, fine) -->
-  <line x1="{cx}" y1="{cy}" x2="{minute_x:.1f}" y2="{minute_y:.1f}" 
-        stroke="#333" stroke-width="3" stroke-linecap="round"/>
-  
-  <!-- Centre -->
-  <circle cx="{cx}" cy="{cy}" r="5" fill="#333"/>
-  
-  <!-- Légende -->
-  <text x="{cx}" y="190" text-anchor="middle" font-size="10" fill="#666">
-    Figure : Horloge analogique
-  </text>
-</svg>'''
-    
-    return svg
+    return render_clock_svg(
+        CLASSIC_CLOCK, 200, hour=hour, minute=minute,
+        svg_attrs=CLOCK_SVG_ATTRS,
+        extra='<text x="100" y="190" text-anchor="middle" font-size="10" fill="#666">Figure : Horloge analogique</text>'
+    )
 
 
 def _render_timeline_svg(**kwargs) -> str:
@@ -295,55 +221,14 @@ def _render_clock_empty_svg() -> str:
     Génère un SVG d'horloge VIDE (sans aiguilles).
     Pour les exercices de type PLACER_AIGUILLES.
     """
-    cx, cy = 100, 100
-    radius = 80
-    
-    # Générer les chiffres du cadran
-    numbers_svg = ""
-    for i in range(1, 13):
-        angle = math.radians(i * 30 - 90)
-        num_x = cx + (radius - 15) * math.cos(angle)
-        num_y = cy + (radius - 15) * math.sin(angle) + 5
-        numbers_svg += f'    <text x="{num_x:.1f}" y="{num_y:.1f}" text-anchor="middle" font-size="14" font-weight="500" fill="#333">{i}</text>\n'
-    
-    # Générer les graduations
-    ticks_svg = ""
-    for i in range(60):
-        angle = math.radians(i * 6 - 90)
-        if i % 5 == 0:
-            inner_r = radius - 10
-            outer_r = radius - 3
-            stroke_width = 2
-        else:
-            inner_r = radius - 5
-            outer_r = radius - 3
-            stroke_width = 1
-        
-        x1 = cx + inner_r * math.cos(angle)
-        y1 = cy + inner_r * math.sin(angle)
-        x2 = cx + outer_r * math.cos(angle)
-        y2 = cy + outer_r * math.sin(angle)
-        
-        ticks_svg += f'    <line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="#666" stroke-width="{stroke_width}"/>\n'
-    
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 200" width="200" height="200" style="max-width: 100%; height: auto;">
-  <!-- Fond du cadran -->
-  <circle cx="{cx}" cy="{cy}" r="{radius}" fill="#fefefe" stroke="#333" stroke-width="3"/>
-  
-  <!-- Graduations -->
-{ticks_svg}
-  <!-- Chiffres -->
-{numbers_svg}
-  <!-- Centre (sans aiguilles) -->
-  <circle cx="{cx}" cy="{cy}" r="5" fill="#333"/>
-  
-  <!-- Instruction -->
-  <text x="{cx}" y="190" text-anchor="middle" font-size="9" fill="#666" font-style="italic">
-    Place les aiguilles pour indiquer l'heure
-  </text>
-</svg>'''
-    
-    return svg
+    return render_clock_svg(
+        CLASSIC_CLOCK, 200,
+        svg_attrs=CLOCK_SVG_ATTRS,
+        extra=(
+            '<text x="100" y="190" text-anchor="middle" font-size="9" fill="#666" font-style="italic">'
+            "Place les aiguilles pour indiquer l'heure</text>"
+        )
+    )
 
 
 def render_clock_for_exercise(exercise: dict) -> Optional[str]:
@@ -13,7 +13,10 @@ Usage:
 import re
 from typing import Dict, Any, Optional
 
+from backend.observability.timing import timed_stage
 
+
+@timed_stage("template")
 def render_template(template: str, variables: Dict[str, Any]) -> str:
     """
     Remplace les placeholders {{var}} et {{{var}}} par leurs valeurs.
@@ -1,12 +1,54 @@
 """
 Service de normalisation et sécurisation des textes générés par l'IA
 Garantit la cohérence des notations mathématiques et géométriques
+
+Les règles sont compilées une fois à l'import. Les règles indépendantes sont
+fusionnées en une alternance (remplacement par callback) ; l'ordre des passes
+est celui de l'ancienne chaîne de re.sub, car une règle peut dépendre du
+résultat d'une précédente (ex: "3^2x4" -> "3² × 4", "10 degenviron" -> "10°≈").
+Sortie identique octet par octet (tests/test_text_normalizer_golden.py).
 """
 import re
 from typing import Dict, List, Set
 from backend.constants import MATH_SYMBOLS
 
 
+# Multiplication : "*" (et espaces autour) ou "x" entre deux nombres
+_MULTIPLICATION_RE = re.compile(r'(\s*\*\s*)|(\d+)\s*x\s*(\d+)')
+# Puissances ^2 / ^3 (pas ^23...) et approximations ("≈" reste "≈")
+_POWER_APPROX_RE = re.compile(r'\^([23])(?!\d)|~=|environ')
+_POWERS = {'2': '²', '3': '³'}
+# Degrés : après l'approximation (le \b dépend de son résultat)
+_DEGREES_RE = re.compile(r'(\d+)\s*deg\b')
+
+_GEOMETRY_POINT_RE = re.compile(r'\b([A-Z])\b')
+
+# Prénoms courants à détecter (à compléter si nécessaire)
+COMMON_NAMES = [
+    'Chaima', 'Pierre', 'Marie', 'Jean', 'Sophie', 'Lucas',
+    'Emma', 'Louis', 'Léa', 'Hugo', 'Chloé', 'Gabriel'
+]
+_PERSONAL_NAMES_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(name) for name in COMMON_NAMES) + r')\b',
+    re.IGNORECASE
+)
+
+# \frac{a}{b} -> a/b, puis suppression des \( \) (y compris ceux issus d'un \frac)
+_LATEX_FRAC_RE = re.compile(r'\\frac\s*{([^}]+)}\s*{([^}]+)}')
+_LATEX_INLINE_DELIMITERS_RE = re.compile(r'\\\(|\\\)')
+
+
+def _replace_multiplication(match: re.Match) -> str:
+    if match.group(1) is not None:
+        return ' × '
+    return f'{match.group(2)} × {match.group(3)}'
+
+
+def _replace_power_or_approx(match: re.Match) -> str:
+    power = match.group(1)
+    return _POWERS[power] if power else '≈'
+
+
 class TextNormalizer:
     """Normalise et sécurise les textes d'exercices"""
     
@@ -24,18 +66,13 @@ class TextNormalizer:
         - deg ou ° manquants
         """
         # Multiplication
-        text = re.sub(r'\s*\*\s*', ' × ', text)
-        text = re.sub(r'(\d+)\s*x\s*(\d+)', r'\1 × \2', text)
-        
-        # Puissances
-        text = re.sub(r'\^2(?!\d)', '²', text)
-        text = re.sub(r'\^3(?!\d)', '³', text)
+        text = _MULTIPLICATION_RE.sub(_replace_multiplication, text)
         
-        # Approximation
-        text = re.sub(r'≈|~=|environ', '≈', text)
+        # Puissances et approximation
+        text = _POWER_APPROX_RE.sub(_replace_power_or_approx, text)
         
         # Degrés
-        text = re.sub(r'(\d+)\s*deg\b', r'\1°', text)
+        text = _DEGREES_RE.sub(r'\1°', text)
         
         return text
     
@@ -61,7 +98,7 @@ class TextNormalizer:
             }
         """
         # Extraire tous les points (lettres majuscules isolées)
-        found_points = set(re.findall(r'\b([A-Z])\b', text))
+        found_points = set(_GEOMETRY_POINT_RE.findall(text))
         expected_set = set(expected_points)
         
         unexpected = found_points - expected_set
@@ -120,29 +157,23 @@ class TextNormalizer:
         
         Garde uniquement les points géométriques A-Z
         """
-        # Liste de prénoms courants à détecter (à compléter si nécessaire)
-        common_names = [
-            'Chaima', 'Pierre', 'Marie', 'Jean', 'Sophie', 'Lucas',
-            'Emma', 'Louis', 'Léa', 'Hugo', 'Chloé', 'Gabriel'
-        ]
-        
-        for name in common_names:
-            # Remplacer le prénom par un point géométrique générique
-            text = re.sub(rf'\b{name}\b', '[point]', text, flags=re.IGNORECASE)
-        
-        return text
+        # Remplacer le prénom par un point géométrique générique (une seule passe)
+        return _PERSONAL_NAMES_RE.sub('[point]', text)
     
     def clean_latex_symbols(self, text: str) -> str:
         """
         Nettoie les symboles LaTeX mal formés
         """
+        # Sans antislash, aucune des deux règles ne peut s'appliquer
+        if '\\' not in text:
+            return text
+        
         # Remplacer \frac mal formé
-        text = re.sub(r'\\frac\s*{([^}]+)}\s*{([^}]+)}', r'\1/\2', text)
+        if '\\frac' in text:
+            text = _LATEX_FRAC_RE.sub(r'\1/\2', text)
         
         # Supprimer les \( \) isolés
-        text = re.sub(r'\\\(|\\\)', '', text)
-        
-        return text
+        return _LATEX_INLINE_DELIMITERS_RE.sub('', text)
 
 
 # Instance globale
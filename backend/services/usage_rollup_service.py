@@ -0,0 +1,222 @@
+"""
+Service de rollups d'usage quotidiens (analytics Pro).
+
+Les endpoints /api/analytics/* comptaient les documents et exports à chaque
+requête (count_documents + aggregate, dont un $regex non ancré sur guest_id)
+et parcouraient donc toute la collection documents.
+
+Ici, chaque écriture de document ou d'export incrémente un compteur dans
+usage_daily_rollups, un document par (owner, day) :
+
+    {
+        "owner": "prof@ecole.fr",      # user_id / guest_id (documents), user_email (exports)
+        "day": "2025-01-15",           # jour UTC
+        "documents": 3,
+        "exports": 2,
+        "subjects": {"Mathématiques": 3},
+        "templates": {"minimaliste": 2},
+    }
+
+Les analytics deviennent une seule lecture indexée (owner, day).
+backfill_usage_rollups() reconstruit les compteurs depuis documents/exports
+(à lancer au déploiement, puis ponctuellement pour corriger une dérive).
+
+Usage:
+    await record_document(db, doc_dict)
+    await record_export(db, export_record)
+    rollups = await get_usage_rollups(db, user_email, start_day="2025-01-01")
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pymongo import ASCENDING, UpdateOne
+
+from backend.constants.collections import USAGE_DAILY_ROLLUPS_COLLECTION
+from backend.services.index_manager import apply_index_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE = "standard"
+UNKNOWN_SUBJECT = "inconnu"
+BACKFILL_BATCH_SIZE = 500
+
+
+def rollup_day(created_at: Union[datetime, str, None]) -> str:
+    """Jour UTC (YYYY-MM-DD) d'un created_at datetime ou ISO (documents.created_at est stocké en ISO)"""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    elif isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).strftime("%Y-%m-%d")
+
+
+def days_ago(days: int, now: Optional[datetime] = None) -> str:
+    """Jour UTC situé `days` jours avant maintenant"""
+    return rollup_day((now or datetime.now(timezone.utc)) - timedelta(days=days))
+
+
+def _counter_key(value: Optional[str], default: str) -> str:
+    """Clé de compteur utilisable comme nom de champ MongoDB (pas de '.' ni de '$' initial)"""
+    key = str(value) if value else default
+    return key.replace(".", "_").lstrip("$") or default
+
+
+def _document_owner(document: Dict[str, Any]) -> Optional[str]:
+    return document.get("user_id") or document.get("guest_id")
+
+
+def _collection(db_instance):
+    return db_instance[USAGE_DAILY_ROLLUPS_COLLECTION]
+
+
+async def _increment(db_instance, owner: str, day: str, inc: Dict[str, int]) -> None:
+    try:
+        await _collection(db_instance).update_one(
+            {"owner": owner, "day": day},
+            {"$inc": inc, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    except Exception as e:
+        # Les analytics ne doivent jamais faire échouer une génération ou un export
+        logger.warning(f"[USAGE_ROLLUP] Incrément impossible ({owner}, {day}): {e}")
+
+
+async def record_document(db_instance, document: Dict[str, Any]) -> None:
+    """À appeler après l'insertion d'un document dans db.documents"""
+    owner = _document_owner(document)
+    if not owner:
+        return
+    subject = _counter_key(document.get("matiere"), UNKNOWN_SUBJECT)
+    await _increment(
+        db_instance, owner, rollup_day(document.get("created_at")),
+        {"documents": 1, f"subjects.{subject}": 1}
+    )
+
+
+async def record_export(db_instance, export_record: Dict[str, Any]) -> None:
+    """À appeler après l'insertion d'un export dans db.exports"""
+    owner = export_record.get("user_email")
+    if not owner:
+        return
+    template = _counter_key(export_record.get("template_used"), DEFAULT_TEMPLATE)
+    await _increment(
+        db_instance, owner, rollup_day(export_record.get("created_at")),
+        {"exports": 1, f"templates.{template}": 1}
+    )
+
+
+async def get_usage_rollups(
+    db_instance,
+    owner: str,
+    start_day: Optional[str] = None,
+    end_day: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Rollups d'un utilisateur, triés par jour (bornes incluses)"""
+    query: Dict[str, Any] = {"owner": owner}
+    day_range = {}
+    if start_day:
+        day_range["$gte"] = start_day
+    if end_day:
+        day_range["$lte"] = end_day
+    if day_range:
+        query["day"] = day_range
+    cursor = _collection(db_instance).find(
+        query, {"_id": 0, "day": 1, "documents": 1, "exports": 1, "subjects": 1, "templates": 1}
+    ).sort("day", ASCENDING)
+    return await cursor.to_list(length=None)
+
+
+def summarize_rollups(rollups: Iterable[Dict[str, Any]], recent_since_day: str) -> Dict[str, Any]:
+    """Totaux, activité récente et répartitions matières / templates"""
+    totals = {"documents": 0, "exports": 0, "recent_documents": 0, "recent_exports": 0}
+    subjects: Dict[str, int] = defaultdict(int)
+    templates: Dict[str, int] = defaultdict(int)
+
+    for rollup in rollups:
+        documents = rollup.get("documents", 0)
+        exports = rollup.get("exports", 0)
+        totals["documents"] += documents
+        totals["exports"] += exports
+        if rollup["day"] >= recent_since_day:
+            totals["recent_documents"] += documents
+            totals["recent_exports"] += exports
+        for subject, count in (rollup.get("subjects") or {}).items():
+            subjects[subject] += count
+        for template, count in (rollup.get("templates") or {}).items():
+            templates[template] += count
+
+    totals["subjects"] = dict(subjects)
+    totals["templates"] = dict(templates)
+    return totals
+
+
+async def backfill_usage_rollups(db_instance, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Reconstruit usage_daily_rollups depuis documents et exports.
+
+    Les compteurs sont écrits en valeur absolue ($set) : relancer le backfill
+    est idempotent. Les incréments reçus pendant l'exécution peuvent être
+    écrasés ; le lancer hors trafic ou le relancer ensuite.
+
+    Returns:
+        Nombre de rollups (owner, day) écrits
+    """
+    rollups: Dict[tuple, Dict[str, Any]] = defaultdict(
+        lambda: {"documents": 0, "exports": 0, "subjects": defaultdict(int), "templates": defaultdict(int)}
+    )
+
+    async for document in db_instance.documents.find(
+        {}, {"_id": 0, "user_id": 1, "guest_id": 1, "matiere": 1, "created_at": 1}
+    ):
+        owner = _document_owner(document)
+        if not owner:
+            continue
+        rollup = rollups[(owner, rollup_day(document.get("created_at")))]
+        rollup["documents"] += 1
+        rollup["subjects"][_counter_key(document.get("matiere"), UNKNOWN_SUBJECT)] += 1
+
+    async for export_record in db_instance.exports.find(
+        {"user_email": {"$ne": None}}, {"_id": 0, "user_email": 1, "template_used": 1, "created_at": 1}
+    ):
+        rollup = rollups[(export_record["user_email"], rollup_day(export_record.get("created_at")))]
+        rollup["exports"] += 1
+        rollup["templates"][_counter_key(export_record.get("template_used"), DEFAULT_TEMPLATE)] += 1
+
+    # Index unique (owner, day) requis par les upserts
+    await apply_index_registry(db_instance, collections=[USAGE_DAILY_ROLLUPS_COLLECTION])
+    now = datetime.now(timezone.utc)
+    operations = [
+        UpdateOne(
+            {"owner": owner, "day": day},
+            {"$set": {
+                "documents": rollup["documents"],
+                "exports": rollup["exports"],
+                "subjects": dict(rollup["subjects"]),
+                "templates": dict(rollup["templates"]),
+                "updated_at": now,
+            }},
+            upsert=True
+        )
+        for (owner, day), rollup in rollups.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        await _collection(db_instance).bulk_write(operations[start:start + batch_size], ordered=False)
+
+    logger.info(f"[USAGE_ROLLUP] Backfill terminé: {len(operations)} rollups")
+    return len(operations)
+
+
+__all__ = [
+    "rollup_day",
+    "days_ago",
+    "record_document",
+    "record_export",
+    "get_usage_rollups",
+    "summarize_rollups",
+    "backfill_usage_rollups",
+]
@@ -9,6 +9,7 @@ from fastapi.testclient import TestClient
 os.environ.setdefault('LM_TESTING', '1')
 os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
 os.environ.setdefault('DB_NAME', 'test_db')
+os.environ.setdefault('RATE_LIMIT_STORAGE_URI', 'memory://')  # Rate limiting local en mode test
 os.environ.setdefault('ENABLE_PY_EXPORT', 'false')  # Désactiver l'export Python en mode test
 
 from backend.server import app
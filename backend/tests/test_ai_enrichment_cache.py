@@ -0,0 +1,172 @@
+"""
+Tests du cache d'enrichissement IA et de l'enrichissement concurrent des fiches
+
+Utilise le stub local LlmChat (emergentintegrations) : aucun appel réseau.
+
+Run with: python -m pytest backend/tests/test_ai_enrichment_cache.py -v
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ia_engine import exercise_ai_enrichment
+from ia_engine.enrichment_cache import AI_ENRICHMENT_CACHE_COLLECTION, EnrichmentCache
+from backend.emergentintegrations.llm.chat import LlmChat
+
+
+class FakeCollection:
+    """Collection MongoDB minimale en mémoire (find_one / update_one)"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query, projection=None):
+        doc = self.docs.get(query["key"])
+        if doc and doc["expires_at"] > query["expires_at"]["$gt"]:
+            return {"result": doc["result"]}
+        return None
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs[query["key"]] = update["$set"]
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    """Compte les appels au stub LlmChat"""
+    calls = []
+    original_run = LlmChat.run
+
+    async def counting_run(self, message):
+        calls.append(message.content)
+        await asyncio.sleep(0.01)
+        return await original_run(self, message)
+
+    monkeypatch.setattr(LlmChat, "run", counting_run)
+    monkeypatch.setenv("EMERGENT_LLM_KEY", "test-key")
+    return calls
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = EnrichmentCache(max_size=64, persist=False)
+    monkeypatch.setattr(exercise_ai_enrichment, "enrichment_cache", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_identical_inputs_hit_cache(llm_calls, cache):
+    first = await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2, "b": 3}, "6e")
+    second = await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2, "b": 3}, "6e")
+
+    assert first == second
+    assert len(llm_calls) == 1
+    metrics = cache.get_metrics()
+    assert metrics["misses"] == 1
+    assert metrics["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_key_depends_on_data_niveau_and_kind(llm_calls, cache):
+    await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2, "b": 3}, "6e")
+    await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2, "b": 4}, "6e")
+    await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2, "b": 3}, "5e")
+    await exercise_ai_enrichment.enrich_correction("Calculer 2 + 3", {"a": 2, "b": 3}, "6e")
+    assert len(llm_calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call(llm_calls, cache):
+    results = await asyncio.gather(*(
+        exercise_ai_enrichment.enrich_correction("Résultat: 5", {"a": 2}, "6e") for _ in range(5)
+    ))
+    assert len(set(results)) == 1
+    assert len(llm_calls) == 1
+    assert cache.get_metrics()["inflight_joins"] == 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_response_not_cached(monkeypatch, cache):
+    monkeypatch.setenv("EMERGENT_LLM_KEY", "test-key")
+
+    async def short_run(self, message):
+        return "ok"
+
+    monkeypatch.setattr(LlmChat, "run", short_run)
+    result = await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {}, "6e")
+    assert result == "Calculer 2 + 3"
+    assert cache.get_metrics()["memory_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_survives_new_process(llm_calls, monkeypatch):
+    # Handle de la base de l'application (db[collection])
+    db = {AI_ENRICHMENT_CACHE_COLLECTION: FakeCollection()}
+    monkeypatch.setattr(exercise_ai_enrichment, "enrichment_cache", EnrichmentCache(persist=True))
+    await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2}, "6e", db=db)
+
+    # Nouveau cache mémoire vide, même collection (redémarrage / autre worker)
+    fresh = EnrichmentCache(persist=True)
+    monkeypatch.setattr(exercise_ai_enrichment, "enrichment_cache", fresh)
+    await exercise_ai_enrichment.enrich_statement("Calculer 2 + 3", {"a": 2}, "6e", db=db)
+
+    assert len(llm_calls) == 1
+    assert fresh.get_metrics()["store_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sheet_enrichment_uses_application_db(llm_calls, monkeypatch):
+    from engine.pdf_engine.sheet_ai_enrichment_helper import apply_ai_enrichment_to_sheet_preview
+
+    collection = FakeCollection()
+    cache = EnrichmentCache(persist=True)
+    monkeypatch.setattr(exercise_ai_enrichment, "enrichment_cache", cache)
+    preview = {
+        "niveau": "6e",
+        "items": [{
+            "config": {"ai_enonce": True},
+            "generated": {"questions": [{"enonce_brut": "Calculer 4 + 1", "data": {"a": 4}}]},
+        }],
+    }
+
+    await apply_ai_enrichment_to_sheet_preview(preview, db={AI_ENRICHMENT_CACHE_COLLECTION: collection})
+    assert len(collection.docs) == 1
+    assert cache.get_metrics()["stored"] == 1
+
+    # Sans handle : niveau mémoire seulement
+    await apply_ai_enrichment_to_sheet_preview(dict(preview, niveau="5e"))
+    assert len(collection.docs) == 1
+
+
+@pytest.mark.asyncio
+async def test_sheet_enrichment_runs_concurrently_and_keeps_original(llm_calls, cache):
+    from engine.pdf_engine.sheet_ai_enrichment_helper import apply_ai_enrichment_to_sheet_preview
+
+    questions = [
+        {"id": f"q{i}", "enonce_brut": f"Calculer {i} + 1", "data": {"a": i}, "solution_brut": f"Résultat: {i + 1}"}
+        for i in range(10)
+    ]
+    preview = {
+        "niveau": "6e",
+        "items": [{"config": {"ai_enonce": True, "ai_correction": True}, "generated": {"questions": questions}}],
+    }
+
+    start = asyncio.get_running_loop().time()
+    enriched = await apply_ai_enrichment_to_sheet_preview(preview)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert len(llm_calls) == 20
+    # 20 appels de 10 ms, au plus 8 simultanés : bien moins que 200 ms en séquentiel
+    assert elapsed < 0.15
+    assert preview["items"][0]["generated"]["questions"][0]["enonce_brut"] == "Calculer 0 + 1"
+    enriched_questions = enriched["items"][0]["generated"]["questions"]
+    assert all(q["enonce_brut"] != f"Calculer {i} + 1" for i, q in enumerate(enriched_questions))
+    assert enriched_questions[3]["data"] == {"a": 3}
+
+    # Ré-export : tout vient du cache
+    await apply_ai_enrichment_to_sheet_preview(preview)
+    assert len(llm_calls) == 20
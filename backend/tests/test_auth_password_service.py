@@ -0,0 +1,75 @@
+"""
+Tests du hachage de mots de passe hors boucle asyncio (pool borné + rehash)
+
+Run with: python -m pytest backend/tests/test_auth_password_service.py -v
+"""
+
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from backend.services import auth_password_service as service
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify_run_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+    original_hash = service.hash_password
+
+    def tracking_hash(password):
+        threads.append(threading.get_ident())
+        return original_hash(password)
+
+    monkeypatch.setattr(service, "hash_password", tracking_hash)
+    password_hash = await service.hash_password_async("Motdepasse1")
+
+    assert threads and threads[0] != loop_thread
+    assert await service.verify_password_async("Motdepasse1", password_hash)
+    assert not await service.verify_password_async("Mauvais1", password_hash)
+    assert not await service.verify_password_async("Motdepasse1", "pas-un-hash")
+
+    stats = service.get_password_hasher_stats()
+    assert stats["pending"] == 0
+    assert stats["completed"] >= 4
+
+
+@pytest.mark.asyncio
+async def test_hash_validation_errors_propagate():
+    with pytest.raises(ValueError):
+        await service.hash_password_async("é" * 40)
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_is_rejected(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(service, "PASSWORD_HASH_MAX_PENDING", 2)
+
+    blocked = [
+        asyncio.ensure_future(service._run_in_hash_pool(release.wait, 5))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.05)
+    rejected_before = service.get_password_hasher_stats()["rejected"]
+
+    with pytest.raises(service.PasswordHasherBusy):
+        await service.verify_password_async("Motdepasse1", "x")
+    assert service.get_password_hasher_stats()["rejected"] == rejected_before + 1
+
+    release.set()
+    await asyncio.gather(*blocked)
+    assert service.get_password_hasher_stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_outdated_cost_is_rehashed_on_verify():
+    weak_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("Motdepasse1")
+
+    is_valid, new_hash = await service.verify_and_update_password_async("Motdepasse1", weak_hash)
+    assert is_valid
+    assert new_hash and new_hash.startswith(f"$2b${service.BCRYPT_ROUNDS:02d}$")
+
+    is_valid, new_hash = await service.verify_and_update_password_async("Mauvais1", weak_hash)
+    assert (is_valid, new_hash) == (False, None)
@@ -0,0 +1,139 @@
+"""
+Tests de l'index de résolution des chapitres en mémoire (ChapterMappingService)
+
+Run with: python -m pytest backend/tests/test_chapter_resolution_index.py -v
+"""
+
+import pytest
+
+from backend.services import chapter_mapping_service
+from backend.services.chapter_mapping_service import (
+    ChapterMappingService,
+    get_chapter_resolution_index,
+    invalidate_chapter_resolution_index,
+    normalize_title,
+)
+from backend.services.chapter_service import ChapterService
+
+CHAPTERS = [
+    {"code": "6e_N01", "legacy_code": "Nombres entiers", "titre": "Lire et écrire les nombres entiers", "niveau": "6e"},
+    {"code": "6e_G04", "titre": "Symétrie axiale", "niveau": "6e"},
+    {"code": "6e_G05", "titre": "Figures symétriques", "niveau": "6e"},
+    {"code": "5e_G02", "titre": "Symétrie centrale", "niveau": "5e"},
+]
+
+
+class FakeCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeCollection:
+    """Seul find existe : un find_one (ancien chemin) échouerait"""
+
+    name = "chapters"
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = 0
+
+    def find(self, query, projection=None):
+        self.finds += 1
+        return FakeCursor([dict(d) for d in self.docs])
+
+    async def update_one(self, query, update, upsert=False):
+        class Result:
+            upserted_id = None
+        return Result()
+
+
+class FakeDb:
+
+    def __init__(self, docs, name="test_lemaitremot"):
+        self.name = name
+        self.chapters = FakeCollection(docs)
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(chapter_mapping_service, "_resolution_indexes", {})
+    monkeypatch.setattr(chapter_mapping_service, "_load_locks", {})
+
+
+def test_normalize_title():
+    assert normalize_title("  Symétrie   AXIALE ") == "symetrie axiale"
+
+
+@pytest.mark.asyncio
+async def test_all_lookups_served_by_one_load():
+    db = FakeDb(CHAPTERS)
+    service = ChapterMappingService(db)
+
+    assert await service.get_chapter_code_for_exercise_type({"chapter_code": "6e_G04"}) == "6e_G04"
+    assert await service.get_chapter_code_for_exercise_type({"chapitre_id": "Nombres entiers", "niveau": "6e"}) == "6e_N01"
+    assert await service.get_chapter_code_for_exercise_type({"chapitre_id": "5e_G02"}) == "5e_G02"
+    # Recherche dans les titres : sous-chaîne, casse et accents ignorés, limitée au niveau
+    assert await service.get_chapter_code_for_exercise_type({"chapitre_id": "SYMETRIE", "niveau": "6e"}) == "6e_G04"
+    assert await service.get_chapter_code_for_exercise_type({"chapitre_id": "centrale", "niveau": "6e"}) is None
+
+    assert await service.get_chapitre_id_for_chapter_code("6e_N01") == "Nombres entiers"
+    assert await service.get_chapitre_id_for_chapter_code("6e_G04") == "Symétrie axiale"
+    info = await service.get_chapter_info("6e_G05")
+    assert info["titre"] == "Figures symétriques"
+    info["titre"] = "modifié"
+    assert (await service.get_chapter_info("6e_G05"))["titre"] == "Figures symétriques"
+
+    suggestions = await service.find_possible_chapters_for_exercise_type(
+        {"chapitre_id": "symétrie des figures", "niveau": "6e", "domaine": "Géométrie"}
+    )
+    assert [s["chapter"]["code"] for s in suggestions] == ["6e_G04", "6e_G05"]
+    assert {s["match_type"] for s in suggestions} == {"keyword"}
+
+    assert db.chapters.finds == 1
+
+
+@pytest.mark.asyncio
+async def test_index_is_reloaded_after_invalidation_and_ttl(monkeypatch):
+    db = FakeDb(CHAPTERS)
+    first = await get_chapter_resolution_index(db)
+    assert await get_chapter_resolution_index(db) is first
+
+    db.chapters.docs = CHAPTERS + [{"code": "6e_G06", "titre": "Cercles", "niveau": "6e"}]
+    invalidate_chapter_resolution_index(db)
+    assert "6e_G06" in (await get_chapter_resolution_index(db)).by_code
+    assert db.chapters.finds == 2
+
+    monkeypatch.setattr(chapter_mapping_service, "CHAPTER_INDEX_TTL_SECONDS", 0)
+    await get_chapter_resolution_index(db)
+    assert db.chapters.finds == 3
+
+
+@pytest.mark.asyncio
+async def test_chapter_upsert_invalidates_index():
+    db = FakeDb(CHAPTERS)
+    await get_chapter_resolution_index(db)
+
+    async def find_one(query, projection=None):
+        return {"code": query["code"]}
+    db.chapters.find_one = find_one  # upsert_chapter relit le document
+
+    await ChapterService(db).upsert_chapter({"code": "6e_G04", "titre": "Symétrie axiale"})
+    await get_chapter_resolution_index(db)
+    assert db.chapters.finds == 2
+
+
+@pytest.mark.asyncio
+async def test_index_shared_by_database_name():
+    """Chaque route crée son handle : l'index est partagé par nom de base"""
+    first = await get_chapter_resolution_index(FakeDb(CHAPTERS))
+    other_handle = FakeDb(CHAPTERS)
+    assert await get_chapter_resolution_index(other_handle) is first
+    assert other_handle.chapters.finds == 0
+
+    other_db = FakeDb(CHAPTERS, name="autre_base")
+    assert await get_chapter_resolution_index(other_db) is not first
+    assert other_db.chapters.finds == 1
@@ -0,0 +1,79 @@
+"""
+Tests de la bibliothèque de composants SVG d'horloge (cadran mémoïsé + aiguilles)
+
+Run with: python -m pytest backend/tests/test_clock_svg_library.py -v
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+from backend.services.clock_svg_library import (
+    CLASSIC_CLOCK,
+    PREMIUM_CLOCK,
+    ClockPlacement,
+    clock_face,
+    clock_hands,
+    render_clock_group_svg,
+    render_clock_svg,
+)
+from backend.services.durees_premium_generator import DureesPremiumGenerator
+from backend.services.svg_render_service import _render_clock_empty_svg, _render_clock_svg
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _hand_ends(svg: str):
+    return re.findall(r'<line x1="[\d.]+" y1="[\d.]+" x2="([-\d.]+)" y2="([-\d.]+)"', svg)
+
+
+def test_hands_geometry():
+    # 3h00 : aiguille des heures vers la droite, des minutes vers le haut
+    assert _hand_ends(clock_hands(CLASSIC_CLOCK, 200, 3, 0)) == [("145.0", "100.0"), ("100.0", "35.0")]
+    # 6h30 : l'aiguille des heures avance avec les minutes (entre 6 et 7)
+    (hour_x, hour_y), (minute_x, minute_y) = _hand_ends(clock_hands(PREMIUM_CLOCK, 200, 18, 30))
+    assert float(hour_x) < 100 and float(hour_y) > 140
+    assert (minute_x, minute_y) == ("100.0", "163.8")
+
+
+def test_face_and_hands_are_memoized():
+    face = clock_face(PREMIUM_CLOCK, 200)
+    assert clock_face(PREMIUM_CLOCK, 200) is face
+    assert clock_hands(CLASSIC_CLOCK, 200, 14, 25) is clock_hands(CLASSIC_CLOCK, 200, 2, 25)
+    # 60 graduations regroupées en deux chemins, 12 chiffres
+    assert face.count("<path") == 2
+    assert len(re.findall(r">\d+</text>", face)) == 12
+
+
+def test_rendered_clocks_are_well_formed():
+    svgs = [
+        _render_clock_svg(12, 15),
+        _render_clock_empty_svg(),
+        render_clock_svg(PREMIUM_CLOCK, 200, hour=8, minute=5, height=235, extra='<text x="100" y="220">08h05</text>'),
+    ]
+    for svg in svgs:
+        root = ET.fromstring(svg)
+        assert root.tag == f"{SVG}svg"
+    assert len(_hand_ends(svgs[0])) == 2
+    assert _hand_ends(svgs[1]) == []
+
+
+def test_group_svg_shares_a_single_face():
+    svg = render_clock_group_svg(
+        PREMIUM_CLOCK, 160,
+        [ClockPlacement(10, 10, 8, 15), ClockPlacement(220, 10, 9, 40), ClockPlacement(430, 10)],
+        width=620, height=220
+    )
+    root = ET.fromstring(svg)
+    assert len(root.findall(f"{SVG}defs/{SVG}g")) == 1
+    assert svg.count('id="clockFace"') == 1
+    assert len(root.findall(f".//{SVG}use")) == 3
+    assert len(_hand_ends(svg)) == 4
+
+
+def test_durees_dual_clock_uses_shared_face():
+    generator = DureesPremiumGenerator()
+    svg = generator._generate_dual_clock_svg(8, 15, 9, 40)
+    ET.fromstring(svg)
+    assert svg.count("<use") == 2
+    assert "Début" in svg and "Fin" in svg
+    assert len(svg) < 2 * len(generator._generate_clock_svg(8, 15, size=160, label="Début"))
@@ -0,0 +1,103 @@
+"""
+Tests des lookups par code officiel de CurriculumPersistenceService :
+égalité + collation insensible à la casse (index code_officiel_ci), plus
+aucun $regex
+
+Le harnais explain() sur un mongod local est dans test_index_registry.py.
+
+Run with: python -m pytest backend/tests/test_curriculum_chapter_code_lookup.py -v
+"""
+
+import pytest
+
+from backend.constants.indexes import CASE_INSENSITIVE_COLLATION, INDEX_REGISTRY
+from backend.constants.collections import CURRICULUM_CHAPTERS_COLLECTION
+from backend.services.curriculum_persistence_service import ChapterCreateRequest, CurriculumPersistenceService
+
+
+class FakeCollection:
+    """Émule la collation strength 2 (casse ignorée) ; refuse les $regex"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def _match(self, query, collation):
+        for doc in self.docs:
+            if all(self._equal(doc.get(field), value, collation) for field, value in query.items()):
+                yield doc
+
+    @staticmethod
+    def _equal(actual, expected, collation):
+        assert not isinstance(expected, dict), f"opérateur inattendu: {expected}"
+        if collation == CASE_INSENSITIVE_COLLATION and isinstance(actual, str):
+            return actual.casefold() == expected.casefold()
+        return actual == expected
+
+    async def find_one(self, query, projection=None, collation=None):
+        self.queries.append((query, collation))
+        doc = next(self._match(query, collation), None)
+        if doc is None:
+            return None
+        if projection and projection.get("_id") == 0:
+            return {k: v for k, v in doc.items() if k != "_id"}
+        return dict(doc)
+
+    async def delete_one(self, query):
+        self.queries.append((query, None))
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if doc["_id"] != query["_id"]]
+
+        class Result:
+            deleted_count = before - len(self.docs)
+        return Result()
+
+    async def insert_one(self, doc):
+        doc["_id"] = len(self.docs) + 1
+        self.docs.append(doc)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    db = {CURRICULUM_CHAPTERS_COLLECTION: FakeCollection([
+        {"_id": 1, "code_officiel": "6e_N08", "niveau": "6e", "libelle": "Fractions"},
+        {"_id": 2, "code_officiel": "6e_G01", "niveau": "6e", "libelle": "Droites"},
+    ])}
+    service = CurriculumPersistenceService(db)
+    service._initialized = True
+
+    async def noop(*args, **kwargs):
+        return None
+    monkeypatch.setattr(service, "_sync_to_json", noop)
+    monkeypatch.setattr(service, "_reload_curriculum_index", noop)
+    return service
+
+
+def test_registry_declares_case_insensitive_code_index():
+    specs = {spec.index_name: spec for spec in INDEX_REGISTRY[CURRICULUM_CHAPTERS_COLLECTION]}
+    assert specs["code_officiel_ci"].keys == (("code_officiel", 1),)
+    assert specs["code_officiel_ci"].collation == CASE_INSENSITIVE_COLLATION
+
+
+@pytest.mark.asyncio
+async def test_get_chapter_by_code_is_case_insensitive_equality(service):
+    chapter = await service.get_chapter_by_code("6E_n08")
+    assert chapter["libelle"] == "Fractions"
+    assert chapter["enabled_generators"] == []
+    assert "_id" not in chapter
+    assert service.collection.queries == [({"code_officiel": "6E_n08"}, CASE_INSENSITIVE_COLLATION)]
+
+    assert await service.get_chapter_by_code("6e_N99") is None
+
+
+@pytest.mark.asyncio
+async def test_create_and_delete_use_the_same_lookup(service):
+    with pytest.raises(ValueError, match="existe déjà"):
+        await service.create_chapter(ChapterCreateRequest(code_officiel="6E_g01", libelle="Droites", domaine="Géométrie"))
+
+    assert await service.delete_chapter("6E_G01") is True
+    assert [doc["code_officiel"] for doc in service.collection.docs] == ["6e_N08"]
+    assert all(
+        collation == CASE_INSENSITIVE_COLLATION or set(query) == {"_id"}
+        for query, collation in service.collection.queries
+    )
@@ -0,0 +1,137 @@
+"""
+Tests du listing paginé des documents (projection + curseur + migration paresseuse)
+
+Run with: python -m pytest backend/tests/test_document_listing_service.py -v
+"""
+
+from datetime import datetime
+
+import pytest
+
+from backend.services import document_listing_service as service
+
+
+class FakeCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not doc.get(field) < condition["$lt"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeDocuments:
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.updates = []
+
+    def find(self, query, projection):
+        fields = [field for field, included in projection.items() if included]
+        return FakeCursor([
+            {field: doc[field] for field in fields if field in doc}
+            for doc in self.docs if _matches(doc, query)
+        ])
+
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if _matches(doc, query):
+                return {key: value for key, value in doc.items() if key != "_id"}
+        return None
+
+    async def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+class FakeDb:
+
+    def __init__(self, docs):
+        self.documents = FakeDocuments(docs)
+
+
+def _document(index, **extra):
+    return {
+        "_id": f"oid{index}",
+        "id": f"doc-{index:02d}",
+        "guest_id": "guest_abc",
+        "matiere": "Mathématiques",
+        "niveau": "6e",
+        "chapitre": "Fractions",
+        "type_doc": "exercices",
+        "difficulte": "facile",
+        "nb_exercices": 1,
+        # Deux documents par seconde : départage par id
+        "created_at": f"2025-01-15T10:00:{index // 2:02d}+00:00",
+        "exercises": [{"enonce": "x", "schema_img": "data:image/png;base64,AAAA"}],
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_listing_is_projected_and_paginated_by_cursor():
+    db = FakeDb([_document(i) for i in range(7)] + [_document(99, guest_id="other")])
+
+    page = await service.list_documents(db, {"guest_id": "guest_abc"}, limit=3)
+    ids = [doc["id"] for doc in page["documents"]]
+    assert ids == ["doc-06", "doc-05", "doc-04"]
+    assert "exercises" not in page["documents"][0]
+    assert isinstance(page["documents"][0]["created_at"], datetime)
+
+    while page["next_cursor"]:
+        page = await service.list_documents(db, {"guest_id": "guest_abc"}, limit=3, cursor=page["next_cursor"])
+        ids += [doc["id"] for doc in page["documents"]]
+    assert ids == [f"doc-{i:02d}" for i in range(6, -1, -1)]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected():
+    with pytest.raises(service.InvalidCursorError):
+        await service.list_documents(FakeDb([]), {"guest_id": "guest_abc"}, cursor="pas-un-curseur")
+
+
+@pytest.mark.asyncio
+async def test_detail_migrates_old_documents_once():
+    current = _document(1, id="current", content_version=service.DOCUMENT_CONTENT_VERSION)
+    old = _document(2, id="old")
+    old["exercises"][0]["solution"] = {"resultat": "r", "etapes": ["a", "b"]}
+    db = FakeDb([current, old])
+
+    def process(content):
+        return f"<{content}>"
+
+    document = await service.get_document_detail(db, {"id": "current"}, process)
+    assert document["exercises"][0]["enonce"] == "x"
+    assert db.documents.updates == []
+
+    document = await service.get_document_detail(db, {"id": "old"}, process)
+    exercise = document["exercises"][0]
+    assert exercise["enonce"] == "<x>"
+    assert exercise["solution"] == {"resultat": "<r>", "etapes": ["<a>", "<b>"]}
+    assert exercise["schema_img"].startswith("data:image/png")
+    query, update = db.documents.updates[0]
+    assert query == {"id": "old"}
+    assert update["$set"]["content_version"] == service.DOCUMENT_CONTENT_VERSION
+
+    assert await service.get_document_detail(db, {"id": "missing"}, process) is None
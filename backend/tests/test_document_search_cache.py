@@ -0,0 +1,112 @@
+"""
+Tests for DocumentSearcher shared session and TTL caches, against a local
+stand-in for the Wikimedia Commons API
+
+Run with: python -m pytest backend/tests/test_document_search_cache.py -v
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from backend.document_search import DocumentSearcher
+
+
+class FakeCommons:
+    """Minimal stand-in for the Commons search/imageinfo API"""
+
+    def __init__(self):
+        self.search_calls = 0
+        self.metadata_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        params = request.query
+        if params.get("list") == "search":
+            self.search_calls += 1
+            return web.json_response({"query": {"search": [
+                {"title": f"File:Map_{i}.svg"} for i in range(5)
+            ]}})
+
+        self.metadata_calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        title = params["titles"]
+        return web.json_response({"query": {"pages": {"1": {"imageinfo": [{
+            "url": f"https://upload.example/{title}",
+            "width": 1200 if title.endswith("3.svg") else 400,
+            "height": 600,
+            "mime": "image/svg+xml",
+            "size": 1000,
+            "commonsmeta": {"LicenseShortName": "Public domain"},
+        }]}}}})
+
+
+@pytest_asyncio.fixture
+async def fake_commons():
+    fake = FakeCommons()
+    app = web.Application()
+    app.router.add_get("/w/api.php", fake.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield fake, f"http://127.0.0.1:{port}/w/api.php"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_search_results_cached_and_metadata_fetched_concurrently(fake_commons):
+    fake, api_base = fake_commons
+    searcher = DocumentSearcher(wikimedia_api_base=api_base)
+    try:
+        results = await searcher._search_wikimedia_commons("carte_thematique", ["fleuves"], "français")
+        assert len(results) == 5
+        assert results[3]["largeur_px"] == 1200
+        assert results[0]["licence"]["type"] == "PD"
+        assert fake.max_in_flight > 1
+
+        again = await searcher._search_wikimedia_commons("carte_thematique", ["fleuves"], "français")
+        assert again == results
+        assert fake.search_calls == 1
+        assert fake.metadata_calls == 5
+
+        # Autre clé (langue différente) : nouvelle recherche, métadonnées en cache
+        await searcher._search_wikimedia_commons("carte_thematique", ["fleuves"], "anglais")
+        assert fake.search_calls == 2
+        assert fake.metadata_calls == 5
+    finally:
+        await searcher.close()
+
+
+@pytest.mark.asyncio
+async def test_session_reused_across_calls(fake_commons):
+    fake, api_base = fake_commons
+    searcher = DocumentSearcher(wikimedia_api_base=api_base)
+    await searcher.open()
+    session = searcher._session
+    try:
+        await searcher._get_file_metadata("File:Map_1.svg")
+        await searcher._get_file_metadata("File:Map_2.svg")
+        assert searcher._session is session
+    finally:
+        await searcher.close()
+    assert searcher._session is None
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_after_ttl(fake_commons):
+    fake, api_base = fake_commons
+    searcher = DocumentSearcher(wikimedia_api_base=api_base, cache_ttl=0)
+    try:
+        await searcher._get_file_metadata("File:Map_1.svg")
+        await searcher._get_file_metadata("File:Map_1.svg")
+        assert fake.metadata_calls == 2
+    finally:
+        await searcher.close()
@@ -0,0 +1,160 @@
+"""
+Tests de la synchronisation exercise_types par diff + bulk_write et de la
+tâche de fond regroupée (imports en masse)
+
+Run with: python -m pytest backend/tests/test_exercise_types_bulk_sync.py -v
+"""
+
+import asyncio
+
+import pytest
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+
+from backend.constants.collections import EXERCISES_COLLECTION
+from backend.services import curriculum_sync_service
+from backend.services.curriculum_sync_service import (
+    CurriculumSyncService,
+    ExerciseTypesSyncJob,
+    plan_exercise_types_sync,
+)
+
+
+class FakeCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeCollection:
+    """Seules find et bulk_write existent : tout find_one/update_one/insert_one échouerait"""
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.finds = []
+        self.bulk_writes = []
+
+    def find(self, query, projection=None):
+        self.finds.append(query)
+        return FakeCursor(list(self.docs))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_writes.append((operations, ordered))
+
+        class Result:
+            inserted_count = sum(isinstance(op, InsertOne) for op in operations)
+            modified_count = sum(isinstance(op, (UpdateOne, ReplaceOne)) for op in operations)
+            deleted_count = sum(isinstance(op, DeleteOne) for op in operations)
+        return Result()
+
+
+class FakeDb:
+
+    def __init__(self, exercises, exercise_types, name="test_lemaitremot"):
+        self.name = name
+        self.collections = {EXERCISES_COLLECTION: FakeCollection(exercises), "exercise_types": FakeCollection(exercise_types)}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def _generators(*keys):
+    return {
+        key: {"generator_key": key, "exercise_type": None, "difficulties": {"facile"}, "offers": {"pro"}, "needs_svg": False, "title": None}
+        for key in keys
+    }
+
+
+EXISTING = [
+    {"_id": 1, "code_ref": "THALES_V2", "generator_kind": "DYNAMIC", "source": "admin_exercises_auto_sync"},
+    {"_id": 2, "code_ref": "OLD_GEN_V1", "generator_kind": "DYNAMIC", "source": "admin_exercises_auto_sync"},
+    {"_id": 3, "code_ref": "MANUEL_V1", "generator_kind": "DYNAMIC", "source": "seed"},
+]
+
+
+def test_plan_computes_full_diff():
+    stats = {"created": 0, "updated": 0, "deleted": 0, "skipped": 0, "generator_keys": []}
+    operations = plan_exercise_types_sync("6E_G10", "6E", "Espace et géométrie", _generators("THALES_V2", "NEW_GEN_V1"), EXISTING, stats=stats)
+
+    by_type = {type(op).__name__: op for op in operations}
+    assert sorted(by_type) == ["DeleteOne", "InsertOne", "UpdateOne"]
+    assert by_type["UpdateOne"]._filter == {"_id": 1}
+    assert by_type["UpdateOne"]._doc["$set"]["difficulty_levels"] == ["facile"]
+    assert by_type["InsertOne"]._doc["id"] == "6E_G10_NEW_GEN_V1"
+    assert "created_at" in by_type["InsertOne"]._doc
+    # Seuls les orphelins auto-synchronisés sont supprimés
+    assert by_type["DeleteOne"]._filter == {"_id": 2}
+    assert stats == {"created": 1, "updated": 1, "deleted": 1, "skipped": 0, "generator_keys": ["THALES_V2", "NEW_GEN_V1"]}
+
+
+def test_plan_force_recreate_replaces_in_place():
+    operations = plan_exercise_types_sync("6E_G10", "6E", "Espace et géométrie", _generators("THALES_V2"), EXISTING[:1], force_recreate=True)
+    assert len(operations) == 1
+    assert isinstance(operations[0], ReplaceOne)
+    assert operations[0]._filter == {"_id": 1}
+    assert operations[0]._doc["code_ref"] == "THALES_V2"
+
+
+@pytest.mark.asyncio
+async def test_sync_uses_one_read_and_one_unordered_bulk_write():
+    exercises = [
+        {"generator_key": "THALES_V2", "difficulty": "facile", "offer": "free"},
+        {"generator_key": "THALES_V2", "difficulty": "difficile", "offer": "pro"},
+        {"generator_key": "NEW_GEN_V1", "difficulty": "moyen"},
+    ]
+    db = FakeDb(exercises, EXISTING)
+    stats = await CurriculumSyncService(db).sync_chapter_to_exercise_types("6e-g10")
+
+    exercise_types = db["exercise_types"]
+    assert exercise_types.finds == [{"chapter_code": "6E_G10"}]
+    assert len(exercise_types.bulk_writes) == 1
+    operations, ordered = exercise_types.bulk_writes[0]
+    assert ordered is False
+    assert len(operations) == 3
+    assert (stats["created"], stats["updated"], stats["deleted"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_background_job_coalesces_chapters(monkeypatch):
+    calls = []
+    release = asyncio.Event()
+
+    async def fake_sync(self, chapter_code, force_recreate=False):
+        calls.append(chapter_code)
+        await release.wait()
+        return {"created": 0, "updated": 0, "deleted": 0}
+
+    monkeypatch.setattr(CurriculumSyncService, "sync_chapter_to_exercise_types", fake_sync)
+    job = ExerciseTypesSyncJob(FakeDb([], []), delay_seconds=0)
+
+    task = job.schedule(["6e_G10", "6E_G10", "6E-N01"])
+    assert job.schedule(["6E_N01"]) is task
+    await asyncio.sleep(0)
+    # Redemandé pendant sa synchronisation : repris ensuite, une seule fois
+    job.schedule(["6E_G10", "6E_G10"])
+    release.set()
+    await task
+
+    assert calls == ["6E_G10", "6E_N01", "6E_G10"]
+    assert job.pending == []
+    assert job.stats == {"scheduled": 6, "coalesced": 3, "synced": 3, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_schedule_reuses_job_per_db(monkeypatch):
+    async def fake_sync(self, chapter_code, force_recreate=False):
+        return {"created": 0, "updated": 0, "deleted": 0}
+
+    monkeypatch.setattr(CurriculumSyncService, "sync_chapter_to_exercise_types", fake_sync)
+    monkeypatch.setattr(curriculum_sync_service, "_sync_jobs", {})
+    db = FakeDb([], [])
+    job = curriculum_sync_service.schedule_exercise_types_sync(db, ["6E_G10"])
+    assert curriculum_sync_service.schedule_exercise_types_sync(db, ["6E_N01"]) is job
+    # Autre handle sur la même base : même tâche ; autre base : tâche distincte
+    assert curriculum_sync_service.schedule_exercise_types_sync(FakeDb([], []), ["6E_N02"]) is job
+    other = curriculum_sync_service.schedule_exercise_types_sync(FakeDb([], [], name="autre_base"), ["6E_G10"])
+    assert other is not job
+    await job._task
+    await other._task
@@ -0,0 +1,90 @@
+"""
+Tests for the concurrent export preparation stage
+
+Run with: python -m pytest backend/tests/test_export_preparation_service.py -v
+"""
+
+import contextvars
+import threading
+
+import pytest
+from backend.observability.timing import begin_request_timing, end_request_timing, stage
+from backend.services.export_preparation_service import (
+    ExportStageTimings,
+    prepare_exercises_concurrently,
+    run_in_preparation_pool,
+)
+
+request_label = contextvars.ContextVar("request_label", default=None)
+
+
+@pytest.mark.asyncio
+async def test_order_preserved_and_originals_untouched():
+    exercises = [{"id": i, "enonce": f"Exercice {i}"} for i in range(20)]
+
+    def prepare(exercise, timings):
+        with timings.stage("content"):
+            exercise["enonce"] = exercise["enonce"].upper()
+
+    timings = ExportStageTimings()
+    prepared = await prepare_exercises_concurrently(exercises, prepare, timings=timings)
+
+    assert [ex["id"] for ex in prepared] == list(range(20))
+    assert prepared[3]["enonce"] == "EXERCICE 3"
+    assert exercises[3]["enonce"] == "Exercice 3"
+
+    report = timings.as_dict()
+    assert report["exercises"] == 20
+    assert report["fallbacks"] == 0
+    assert "content" in report["stages_ms"]
+    assert report["total_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_failing_exercise_falls_back_to_original():
+    exercises = [{"id": 1, "enonce": "ok"}, {"id": 2, "enonce": "boom"}, {"id": 3, "enonce": "ok"}]
+
+    def prepare(exercise, timings):
+        exercise["prepared"] = True
+        if exercise["enonce"] == "boom":
+            raise ValueError("rendu impossible")
+
+    timings = ExportStageTimings()
+    prepared = await prepare_exercises_concurrently(exercises, prepare, timings=timings)
+
+    assert [ex.get("prepared") for ex in prepared] == [True, None, True]
+    assert prepared[1] is exercises[1]
+    assert timings.as_dict()["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_work_runs_off_event_loop_thread():
+    loop_thread = threading.get_ident()
+    seen = []
+
+    def prepare(exercise, timings):
+        seen.append(threading.get_ident())
+
+    await prepare_exercises_concurrently([{"id": 1}, {"id": 2}], prepare)
+    assert seen and loop_thread not in seen
+
+
+@pytest.mark.asyncio
+async def test_workers_see_request_context():
+    token = request_label.set("req-42")
+    timings, timing_token = begin_request_timing()
+    try:
+        def prepare(exercise, prep_timings):
+            exercise["label"] = request_label.get()
+            with stage("latex"):
+                pass
+
+        prepared = await prepare_exercises_concurrently([{"id": 1}, {"id": 2}], prepare)
+        assert await run_in_preparation_pool(request_label.get) == "req-42"
+    finally:
+        end_request_timing(timing_token)
+        request_label.reset(token)
+
+    assert [ex["label"] for ex in prepared] == ["req-42", "req-42"]
+    # Étapes Server-Timing mesurées dans les threads attribuées à la requête
+    assert timings.totals()["latex"][1] == 2
@@ -0,0 +1,113 @@
+"""
+Tests du registry snapshot (réponses /generators pré-sérialisées + ETag) et du warm-up
+
+Run with: python -m pytest backend/tests/test_generator_registry_snapshot.py -v
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.generators.base_generator import BaseGenerator, GeneratorMeta, ParamSchema, ParamType, Preset
+from backend.generators.factory import GeneratorFactory
+from backend.generators.registry_snapshot import get_registry_snapshot, warm_up_generators
+from backend.routes.generators_routes import router
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/exercises")
+    return TestClient(app)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Registry isolé (les générateurs enregistrés par le test ne fuient pas)"""
+    monkeypatch.setattr(GeneratorFactory, "_generators", dict(GeneratorFactory._generators))
+    monkeypatch.setattr(GeneratorFactory, "_registry_version", GeneratorFactory._registry_version)
+    return GeneratorFactory
+
+
+def test_snapshot_matches_factory_and_is_reused():
+    snapshot = get_registry_snapshot()
+    assert get_registry_snapshot() is snapshot
+
+    listing = json.loads(snapshot.generators.body)
+    assert listing["generators"] == GeneratorFactory.list_all()
+    assert listing["count"] == len(snapshot.generator_keys)
+
+    for key in snapshot.generator_keys:
+        full_schema = json.loads(snapshot.full_schema(key).body)
+        assert full_schema["generatorkey"] == key
+        assert all("enoncetemplate" in preset["params"] for preset in full_schema["presets"])
+        ui_schema = json.loads(snapshot.ui_schema(key.lower()).body)
+        assert [p["name"] for p in ui_schema["param_schema"]] == [p.name for p in GeneratorFactory.get(key).get_schema()]
+
+
+def test_snapshot_resolves_aliases():
+    snapshot = get_registry_snapshot()
+    if "THALES_V2" not in snapshot.generator_keys:
+        pytest.skip("THALES_V2 non enregistré")
+    assert snapshot.full_schema("thales") is snapshot.full_schema("THALES_V2")
+
+
+def test_endpoints_serve_snapshot_with_etag(client):
+    response = client.get("/api/v1/exercises/generators")
+    assert response.status_code == 200
+    assert response.json()["api_version"] == "2.0.0"
+    etag = response.headers["etag"]
+
+    not_modified = client.get("/api/v1/exercises/generators", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    key = get_registry_snapshot().generator_keys[0]
+    for path in (f"/api/v1/exercises/generators/{key}/full-schema", f"/api/v1/exercises/generators/{key}/ui-schema"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.json()["generatorkey"] == key
+        assert client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+    assert client.get("/api/v1/exercises/generators/INCONNU_V9/ui-schema").status_code == 404
+
+
+def test_snapshot_is_rebuilt_when_registry_changes(registry):
+    before = get_registry_snapshot()
+
+    @registry.register
+    class SnapshotProbeGenerator(BaseGenerator):
+
+        @classmethod
+        def get_meta(cls):
+            return GeneratorMeta(
+                key="SNAPSHOT_PROBE_V1", label="Probe", description="Test", version="1.0.0",
+                niveaux=["6e"], exercise_type="PROBE"
+            )
+
+        @classmethod
+        def get_schema(cls):
+            return [ParamSchema(name="n", type=ParamType.INT, description="n", default=2)]
+
+        @classmethod
+        def get_presets(cls):
+            return [Preset(key="simple", label="Simple", description="", niveau="6e", params={"n": 2})]
+
+        def generate(self, params):
+            return {"variables": {"n": params["n"]}}
+
+    after = get_registry_snapshot()
+    assert after is not before
+    assert "SNAPSHOT_PROBE_V1" in after.generator_keys
+    presets = json.loads(after.ui_schema("SNAPSHOT_PROBE_V1").body)["presets"]
+    assert presets[0]["params"]["enoncetemplate"]
+    # Les presets du générateur ne sont pas modifiés par l'enrichissement
+    assert SnapshotProbeGenerator.get_presets()[0].params == {"n": 2}
+
+
+def test_warm_up_generates_every_active_generator():
+    report = warm_up_generators(seed=1)
+    assert set(report["generated"]) | set(report["failed"]) == set(get_registry_snapshot().generator_keys)
+    assert report["failed"] == {}
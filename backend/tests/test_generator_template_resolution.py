@@ -0,0 +1,156 @@
+"""
+Tests de la résolution des templates de générateurs (get_best_template) :
+une requête par générateur, priorité résolue en mémoire, cache invalidé par
+create/update/delete
+
+Run with: python -m pytest backend/tests/test_generator_template_resolution.py -v
+"""
+
+import pytest
+from bson import ObjectId
+
+from backend.models.generator_template import GeneratorTemplateCreate, GeneratorTemplateUpdate
+from backend.services import generator_template_service
+from backend.services.generator_template_service import GeneratorTemplateService
+
+KEY = "RAISONNEMENT_MULTIPLICATIF_V1"
+
+
+class FakeCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+    """find / insert / update / delete ; find_one absent (ancien chemin par priorité)"""
+
+    def __init__(self):
+        self.docs = []
+        self.finds = 0
+
+    def find(self, query):
+        self.finds += 1
+        return FakeCursor([dict(d) for d in self.docs if all(d.get(k) == v for k, v in query.items())])
+
+    async def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.docs.append(dict(doc))
+
+        class Result:
+            inserted_id = doc["_id"]
+        return Result()
+
+    async def find_one_and_update(self, query, update, return_document=True):
+        for doc in self.docs:
+            if doc["_id"] == query["_id"]:
+                doc.update(update["$set"])
+                return dict(doc)
+        return None
+
+    async def delete_one(self, query):
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if d["_id"] != query["_id"]]
+
+        class Result:
+            deleted_count = before - len(self.docs)
+        return Result()
+
+
+class FakeDb:
+
+    def __init__(self, name="test_lemaitremot"):
+        self.name = name
+        self.generator_templates = FakeCollection()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(generator_template_service, "_template_sets", {})
+    return GeneratorTemplateService(FakeDb())
+
+
+async def _create(service, label, **fields):
+    return await service.create_template(GeneratorTemplateCreate(
+        generator_key=fields.pop("generator_key", KEY),
+        enonce_template_html=f"<p>{label}</p>",
+        solution_template_html="<p>{{solution}}</p>",
+        **fields
+    ))
+
+
+async def _best(service, **criteria):
+    template = await service.get_best_template(generator_key=KEY, **criteria)
+    return template.enonce_template_html if template else None
+
+
+@pytest.mark.asyncio
+async def test_priority_resolved_from_one_query(service):
+    await _create(service, "DEFAULT")
+    await _create(service, "A", variant_id="A")
+    await _create(service, "A_6e", variant_id="A", grade="6e")
+    await _create(service, "A_6e_facile", variant_id="A", grade="6e", difficulty="facile")
+    await _create(service, "AUTRE", generator_key="CALCUL_NOMBRES_V1")
+    collection = service.collection
+    collection.finds = 0
+
+    assert await _best(service, variant_id="A", grade="6e", difficulty="facile") == "<p>A_6e_facile</p>"
+    assert await _best(service, variant_id="A", grade="6e", difficulty="difficile") == "<p>A_6e</p>"
+    assert await _best(service, variant_id="A", grade="5e") == "<p>A</p>"
+    # Un template avec difficulté ne sert pas de repli sans grade
+    assert await _best(service, variant_id="A", difficulty="facile") == "<p>A</p>"
+    assert await _best(service, variant_id="B", grade="6e") == "<p>DEFAULT</p>"
+    assert collection.finds == 1
+
+    assert await service.get_best_template(generator_key="INCONNU_V1") is None
+    assert collection.finds == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_templates(service):
+    default = await _create(service, "DEFAULT")
+    assert await _best(service, variant_id="A") == "<p>DEFAULT</p>"
+
+    variant_a = await _create(service, "A", variant_id="A")
+    assert await _best(service, variant_id="A") == "<p>A</p>"
+
+    await service.update_template(variant_a.id, GeneratorTemplateUpdate(enonce_template_html="<p>A v2</p>"))
+    assert await _best(service, variant_id="A") == "<p>A v2</p>"
+
+    assert await service.delete_template(variant_a.id) is True
+    assert await _best(service, variant_id="A") == "<p>DEFAULT</p>"
+    assert await service.delete_template(default.id) is True
+    assert await _best(service, variant_id="A") is None
+    assert service.collection.finds == 5
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_after_ttl(service, monkeypatch):
+    await _best(service)
+    await _best(service)
+    assert service.collection.finds == 1
+
+    monkeypatch.setattr(generator_template_service, "GENERATOR_TEMPLATE_CACHE_TTL_SECONDS", 0)
+    await _best(service)
+    assert service.collection.finds == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_shared_by_database_name(service):
+    # Un autre handle sur la même base (service créé par requête) voit les écritures
+    await _best(service)
+    other_db = FakeDb()
+    other_db.generator_templates = service.collection
+    await _create(GeneratorTemplateService(other_db), "DEFAULT")
+    assert await _best(service) == "<p>DEFAULT</p>"
+
+    # Une autre base a son propre cache
+    elsewhere = GeneratorTemplateService(FakeDb(name="autre_base"))
+    assert await _best(elsewhere) is None
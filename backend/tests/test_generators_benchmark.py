@@ -0,0 +1,91 @@
+"""
+Tests du benchmark des générateurs (matrice générateur × difficulté × preset,
+percentiles, baseline et détection de régressions)
+
+Run with: python -m pytest backend/tests/test_generators_benchmark.py -v
+"""
+
+import copy
+
+import pytest
+
+from backend.generators.benchmark import (
+    BASELINE_FORMAT_VERSION,
+    compare_to_baseline,
+    iter_cases,
+    load_baseline,
+    percentile,
+    run_benchmark,
+    save_baseline,
+)
+from backend.generators.factory import GeneratorFactory
+
+
+@pytest.fixture(scope="module")
+def report():
+    key = GeneratorFactory.list_all()[0]["key"]
+    return run_benchmark(keys=[key], seeds=range(4), alloc_seeds=1, repeat=1)
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_cases_cover_every_generator_difficulty_and_preset():
+    cases = iter_cases()
+    assert {c["generator"] for c in cases} == {g["key"] for g in GeneratorFactory.list_all()}
+    for case in cases:
+        if case["difficulty"] is not None:
+            assert case["params"]["difficulty"] == case["difficulty"]
+
+    key = GeneratorFactory.list_all()[0]["key"]
+    gen_class = GeneratorFactory.get(key)
+    presets = {c["preset"] for c in cases if c["generator"] == key}
+    assert presets == {"default"} | {p.key for p in gen_class.get_presets()}
+
+
+def test_report_is_a_baseline(report, tmp_path):
+    assert report["format_version"] == BASELINE_FORMAT_VERSION
+    assert report["seeds"] == 4
+    metrics = next(iter(report["cases"].values()))
+    assert metrics["runs"] + sum(metrics["errors"].values()) == 4
+    assert metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["p99_ms"]
+    assert metrics["output_bytes"] > 0
+    assert metrics["alloc_peak_kb"] > 0
+
+    path = tmp_path / "baseline.json"
+    save_baseline(report, path)
+    assert load_baseline(path) == report
+    assert compare_to_baseline(report, load_baseline(path)) == []
+
+
+def test_compare_flags_regressions_beyond_tolerance(report):
+    baseline = copy.deepcopy(report)
+    current = copy.deepcopy(report)
+    cid = next(cid for cid, m in baseline["cases"].items() if not m["errors"])
+    baseline["cases"][cid].update({"p95_ms": 1.0, "p99_ms": 1.0, "output_bytes": 1000})
+
+    # Dans la tolérance (ou sous la marge absolue) : pas de régression
+    current["cases"][cid].update({"p95_ms": 1.2, "p99_ms": 2.5, "output_bytes": 1200})
+    assert compare_to_baseline(current, baseline, tolerance=0.25) == []
+
+    current["cases"][cid].update({"p95_ms": 3.0, "output_bytes": 2000, "errors": {"ValueError": 1}})
+    regressions = compare_to_baseline(current, baseline, tolerance=0.25)
+    assert sorted(r["metric"] for r in regressions) == ["errors", "output_bytes", "p95_ms"]
+    assert all(r["case"] == cid for r in regressions)
+
+    # Nouveau cas absent du baseline : ignoré
+    current["cases"]["NOUVEAU_V1|-|default"] = current["cases"][cid]
+    assert len(compare_to_baseline(current, baseline, tolerance=0.25)) == 3
+
+
+def test_compare_rejects_incompatible_baseline(report):
+    with pytest.raises(ValueError):
+        compare_to_baseline(report, dict(report, seeds=50))
+    with pytest.raises(ValueError):
+        compare_to_baseline(report, dict(report, format_version=0))
@@ -0,0 +1,100 @@
+"""
+Tests for the geometry schema render cache (memoization, dedup, disk tier)
+
+Run with: python -m pytest backend/tests/test_geometry_render_cache.py -v
+"""
+
+import pytest
+from backend.geometry_renderer import (
+    GeometryRenderer,
+    GeometryRenderCache,
+    canonical_schema_key,
+)
+
+
+CARRE = '{"type": "schema_geometrique", "figure": "carre", "points": ["A", "B", "C", "D"]}'
+# Même schéma, ordre des clés et espaces différents
+CARRE_REORDERED = '{"type":"schema_geometrique","points":["A","B","C","D"],"figure":"carre"}'
+TRIANGLE = '{"type": "schema_geometrique", "figure": "triangle", "points": ["E", "F", "G"]}'
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    r = GeometryRenderer()
+    r.render_cache = GeometryRenderCache(max_size=8, cache_dir=str(tmp_path))
+    return r
+
+
+class TestCanonicalKey:
+
+    def test_key_order_independent(self):
+        assert canonical_schema_key({"a": 1, "b": [1, 2]}) == canonical_schema_key({"b": [1, 2], "a": 1})
+
+
+class TestGeometryRenderCache:
+
+    def test_lru_eviction(self):
+        cache = GeometryRenderCache(max_size=2, cache_dir=None)
+        cache.set("svg", "k1", "v1")
+        cache.set("svg", "k2", "v2")
+        assert cache.get("svg", "k1") == "v1"  # k1 devient le plus récent
+        cache.set("svg", "k3", "v3")
+        assert cache.get("svg", "k2") is None
+        assert cache.get("svg", "k1") == "v1"
+        assert cache.get("svg", "k3") == "v3"
+
+    def test_disk_tier_survives_memory_clear(self, tmp_path):
+        cache = GeometryRenderCache(max_size=2, cache_dir=str(tmp_path))
+        cache.set("svg", "k1", "<svg>1</svg>")
+        fresh = GeometryRenderCache(max_size=2, cache_dir=str(tmp_path))
+        assert fresh.get("svg", "k1") == "<svg>1</svg>"
+        assert fresh.get_metrics()["disk_hits"] == 1
+
+
+class TestProcessGeometricSchemas:
+
+    def test_identical_schemas_rendered_once(self, renderer):
+        calls = []
+        original = renderer._render_svg_figure
+
+        def counting(schema_data):
+            calls.append(schema_data["figure"])
+            return original(schema_data)
+
+        renderer._render_svg_figure = counting
+        texts = [f"Figure {CARRE}", f"Encore {CARRE_REORDERED} et {TRIANGLE}", None, ""]
+        results = renderer.process_geometric_schemas_batch(texts)
+
+        assert sorted(calls) == ["carre", "triangle"]
+        assert results[0].count("<svg") == 1
+        assert results[1].count("<svg") == 2
+        assert results[2] is None
+        assert results[3] == ""
+
+        # Second export : tout vient du cache
+        renderer.process_geometric_schemas(f"Figure {CARRE}")
+        assert len(calls) == 2
+
+    def test_batch_matches_single_text_processing(self, renderer):
+        text = f"Avant {TRIANGLE} après"
+        assert renderer.process_geometric_schemas_batch([text]) == [renderer.process_geometric_schemas(text)]
+
+    def test_invalid_schema_kept_as_error_marker(self, renderer):
+        text = '{"type": "schema_geometrique", invalide}'
+        assert "[Schéma géométrique invalide]" in renderer.process_geometric_schemas(text)
+
+    def test_render_errors_not_cached(self, renderer):
+        def failing(schema_data):
+            raise ValueError("boom")
+
+        renderer._render_svg_figure = failing
+        result = renderer.process_geometric_schemas(CARRE)
+        assert "[Erreur rendu figure: carre]" in result
+        assert renderer.render_cache.get_metrics()["memory_size"] == 0
+
+    def test_web_rendering_cached(self, renderer):
+        first = renderer.process_geometric_schemas_for_web(CARRE)
+        second = renderer.process_geometric_schemas_for_web(CARRE_REORDERED)
+        assert "data:image/png;base64," in first
+        assert first == second
+        assert renderer.render_cache.get_metrics()["memory_hits"] == 1
@@ -0,0 +1,134 @@
+"""
+Tests de la sérialisation compacte de GeometrySVGRenderer (précision fixe,
+grille en un seul <path>, styles mutualisés) et non-régression de taille
+
+Run with: python -m pytest backend/tests/test_geometry_svg_compact.py -v
+"""
+
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from backend.geometry_svg_renderer import GeometrySVGRenderer, format_coord
+from backend.models.math_models import GeometricFigure
+from backend.services.geometry_render_service import GeometryRenderService
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+FIGURES = [
+    GeometricFigure(type="triangle_rectangle", points=["A", "B", "C"], rectangle_en="B", longueurs_connues={"AB": 3, "BC": 4}),
+    GeometricFigure(type="rectangle", points=["A", "B", "C", "D"], longueurs_connues={"AB": 7, "BC": 3}),
+    GeometricFigure(type="cercle", points=["O"], longueurs_connues={"OA": 5}),
+    GeometricFigure(type="triangle", points=["A", "B", "C"], longueurs_connues={"AB": 5, "BC": 6}),
+    GeometricFigure(type="thales", points=["A", "B", "C", "D", "E"], longueurs_connues={"AD": 3, "DB": 4, "AE": 3, "EC": 4}),
+    GeometricFigure(
+        type="symetrie_axiale", points=["M", "M'"],
+        longueurs_connues={"M_x": 3, "M_y": 5, "M'_x": 7, "M'_y": 5}, proprietes=["axe_vertical", "axe_position_5"]
+    ),
+    GeometricFigure(
+        type="symetrie_axiale", points=["A", "B", "C", "A'", "B'", "C'"],
+        longueurs_connues={
+            "A_x": 2, "A_y": 2, "B_x": 4, "B_y": 6, "C_x": 1, "C_y": 7,
+            "A'_x": 12, "A'_y": 2, "B'_x": 10, "B'_y": 6, "C'_x": 13, "C'_y": 7,
+        },
+        proprietes=["axe_vertical", "axe_position_7", "triangle"]
+    ),
+    GeometricFigure(
+        type="symetrie_centrale", points=["A", "O", "A'"],
+        longueurs_connues={"A_x": 3, "A_y": 4, "O_x": 6, "O_y": 6, "A'_x": 9, "A'_y": 8}
+    ),
+    GeometricFigure(
+        type="alignement_milieu", points=["A", "B"],
+        longueurs_connues={"A_x": 1, "A_y": 2, "B_x": 8, "B_y": 7}, proprietes=["milieu"]
+    ),
+    GeometricFigure(
+        type="quadrilatere", points=["A", "B", "C", "D"],
+        longueurs_connues={"A_x": 2, "A_y": 2, "B_x": 2, "B_y": 7, "C_x": 7, "C_y": 7, "D_x": 7, "D_y": 2},
+        proprietes=["carre"]
+    ),
+    GeometricFigure(
+        type="segments_comparaison", points=["A", "B", "C", "D"],
+        longueurs_connues={"A_x": 1, "A_y": 2, "B_x": 6, "B_y": 3, "C_x": 2, "C_y": 6, "D_x": 9, "D_y": 8},
+        proprietes=["mesure"]
+    ),
+    GeometricFigure(
+        type="droite_numerique", points=["A"],
+        longueurs_connues={"min": 0, "max": 3, "graduation": 0.25, "point_A_abscisse": 1.75}, proprietes=["lire_abscisse"]
+    ),
+]
+
+
+def _render_all(compact: bool):
+    service = GeometryRenderService()
+    service.renderer = GeometrySVGRenderer(width=400, height=300, compact=compact)
+    svgs = []
+    for figure in FIGURES:
+        result = service.render_figure_to_svg(figure)
+        if isinstance(result, dict):
+            svgs.extend([result["figure_svg_question"], result["figure_svg_correction"]])
+        else:
+            svgs.append(result)
+    return svgs
+
+
+@pytest.fixture(scope="module")
+def renders():
+    return _render_all(compact=False), _render_all(compact=True)
+
+
+def _shapes(svg: str):
+    root = ET.fromstring(svg)
+    return {
+        "circle": len(root.findall(f".//{SVG}circle")),
+        "polygon": len(root.findall(f".//{SVG}polygon")),
+        "texts": [t.text for t in root.iter(f"{SVG}text")],
+    }
+
+
+def test_format_coord():
+    assert format_coord(123.456789) == "123.46"
+    assert format_coord(40.0) == "40"
+    assert format_coord(55.714285714285715) == "55.71"
+    assert format_coord(-0.001) == "0"
+
+
+def test_compact_size_regression(renders):
+    plain, compact = renders
+    assert all(svg for svg in plain + compact)
+    for before, after in zip(plain, compact):
+        assert len(after) < len(before)
+    # Référence : 78,2 Ko -> 36,7 Ko sur ces figures
+    assert sum(map(len, compact)) <= 0.5 * sum(map(len, plain))
+
+
+def test_compact_keeps_figure_content(renders):
+    plain, compact = renders
+    for before, after in zip(plain, compact):
+        assert _shapes(after) == _shapes(before)
+        # Les couleurs (tracés de construction, points rouges) restent sur les éléments
+        assert len(re.findall(r'<line[^>]*stroke="#0066CC"', after)) == len(re.findall(r'<line[^>]*stroke="#0066CC"', before))
+
+
+def test_compact_coordinates_and_grid(renders):
+    _, compact = renders
+    for svg in compact:
+        assert not re.search(r'\d\.\d{3,}', svg)
+        assert svg.count('class="grid-line"') <= 1
+
+    grid_svg = next(svg for svg in compact if 'class="grid-line"' in svg)
+    grid = next(p for p in ET.fromstring(grid_svg).iter(f"{SVG}path") if p.get("class") == "grid-line")
+    assert grid.get("d").count("M") == 30  # 15 verticales + 15 horizontales
+
+
+def test_shared_styles_replace_repeated_attributes():
+    renderer = GeometrySVGRenderer(compact=True)
+    svg = renderer.render_number_line({"min": 0, "max": 10, "graduation": 1})
+    root = ET.fromstring(svg)
+    ticks = [line for line in root.iter(f"{SVG}line") if line.get("class")]
+    assert len(ticks) == 11
+    assert all("stroke-width" not in line.attrib for line in ticks)
+    assert f".{ticks[0].get('class')}{{stroke-width:1.5px}}" in root.find(f"{SVG}style").text
+    # Attribut écrasé par la règle .geometry-text : supprimé, rendu inchangé
+    text = GeometrySVGRenderer(compact=True).render_segments({"segments": [{"x1": 1, "y1": 1, "x2": 4, "y2": 1}], "show_measures": True})
+    assert 'font-size="12"' not in text
@@ -0,0 +1,198 @@
+"""
+Tests du registre d'index (constants/indexes.py)
+
+- Détection de dérive (index manquants, en conflit, hors registre)
+- Harnais explain() : les requêtes chaudes doivent utiliser un index (aucun
+  COLLSCAN). Nécessite un mongod local (MONGO_URL) ; ignoré sinon.
+
+Run with: python -m pytest backend/tests/test_index_registry.py -v
+"""
+
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+
+from backend.constants.collections import (
+    AI_ENRICHMENT_CACHE_COLLECTION,
+    CURRICULUM_CHAPTERS_COLLECTION,
+    EXERCISES_COLLECTION,
+    PDF_EXPORT_JOBS_COLLECTION,
+    QUOTA_COUNTERS_COLLECTION,
+    USAGE_DAILY_ROLLUPS_COLLECTION,
+)
+from backend.constants.indexes import CASE_INSENSITIVE_COLLATION, INDEX_REGISTRY, IndexSpec
+from backend.services.index_manager import apply_index_registry, diff_collection_indexes, has_drift
+
+
+class FakeIndexCursor:
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for index_info in self.indexes:
+            yield index_info
+
+
+class FakeCollection:
+
+    def __init__(self, indexes):
+        self.indexes = [{"name": "_id_", "key": {"_id": 1}}] + indexes
+        self.created = []
+
+    def list_indexes(self):
+        return FakeIndexCursor(self.indexes)
+
+    async def create_index(self, keys, **kwargs):
+        self.created.append((keys, kwargs))
+
+
+SPECS = [
+    IndexSpec(keys=(("code", 1),), unique=True),
+    IndexSpec(keys=(("niveau", 1), ("domaine", 1))),
+    IndexSpec(keys=(("expires_at", 1),), name="ttl", expire_after_seconds=0),
+]
+
+
+@pytest.mark.asyncio
+async def test_diff_reports_missing_conflicts_and_unexpected():
+    collection = FakeCollection([
+        {"name": "code_1", "key": {"code": 1}},  # unique manquant -> conflit
+        {"name": "ttl", "key": {"expires_at": 1}, "expireAfterSeconds": 0},
+        {"name": "legacy_1", "key": {"legacy": 1}},
+    ])
+    report = await diff_collection_indexes(collection, SPECS)
+
+    assert report == {"missing": ["niveau_1_domaine_1"], "conflicts": ["code_1"], "unexpected": ["legacy_1"]}
+
+
+@pytest.mark.asyncio
+async def test_apply_creates_only_missing_indexes(monkeypatch):
+    collection = FakeCollection([{"name": "code_1", "key": {"code": 1}, "unique": True}])
+    monkeypatch.setitem(INDEX_REGISTRY, "test_collection", SPECS)
+
+    dry_report = await apply_index_registry({"test_collection": collection}, ["test_collection"], dry_run=True)
+    assert collection.created == []
+    assert has_drift(dry_report)
+
+    report = await apply_index_registry({"test_collection": collection}, ["test_collection"])
+    assert [kwargs["name"] for _, kwargs in collection.created] == ["niveau_1_domaine_1", "ttl"]
+    assert collection.created[1][1]["expireAfterSeconds"] == 0
+    assert not has_drift(report)
+
+
+@pytest.mark.asyncio
+async def test_diff_compares_collation_locale_and_strength():
+    spec = IndexSpec(keys=(("code", 1),), name="code_ci", collation=CASE_INSENSITIVE_COLLATION)
+    assert spec.create_kwargs()["collation"] == {"locale": "en", "strength": 2}
+
+    # MongoDB renvoie la collation complétée par ses valeurs par défaut
+    full_collation = {"locale": "en", "caseLevel": False, "caseFirst": "off", "strength": 2, "version": "57.1"}
+    collection = FakeCollection([{"name": "code_ci", "key": {"code": 1}, "collation": full_collation}])
+    assert await diff_collection_indexes(collection, [spec]) == {"missing": [], "conflicts": [], "unexpected": []}
+
+    collection = FakeCollection([{"name": "code_ci", "key": {"code": 1}}])
+    assert (await diff_collection_indexes(collection, [spec]))["conflicts"] == ["code_ci"]
+
+
+def test_registry_names_are_unique_per_collection():
+    for collection_name, specs in INDEX_REGISTRY.items():
+        names = [spec.index_name for spec in specs]
+        assert len(names) == len(set(names)), collection_name
+
+
+# ============================================================================
+# Harnais explain() (mongod local)
+# ============================================================================
+
+NOW = datetime.now(timezone.utc)
+
+# (collection, filtre, tri)
+HOT_QUERIES = [
+    (EXERCISES_COLLECTION, {"chapter_code": "6E_N08", "offer": {"$in": ["free", "pro"]}, "difficulty": "facile"}, [("id", 1)]),
+    (EXERCISES_COLLECTION, {"chapter_code": "6E_N08", "offer": "free"}, [("id", 1)]),
+    (EXERCISES_COLLECTION, {"chapter_code": "6E_N08"}, [("id", 1)]),
+    (EXERCISES_COLLECTION, {"chapter_code": "6E_N08", "id": 3}, None),
+    (CURRICULUM_CHAPTERS_COLLECTION, {"code_officiel": "6e_N08"}, None),
+    (CURRICULUM_CHAPTERS_COLLECTION, {"subject": "mathematiques", "niveau": "6e"}, [("code_officiel", 1)]),
+    (USAGE_DAILY_ROLLUPS_COLLECTION, {"owner": "prof@ecole.fr", "day": {"$gte": "2025-01-01"}}, [("day", 1)]),
+    (QUOTA_COUNTERS_COLLECTION, {"key": "free_daily_export:prof@ecole.fr", "window_end": {"$gt": NOW}}, None),
+    (PDF_EXPORT_JOBS_COLLECTION, {"job_id": "abc"}, None),
+    (PDF_EXPORT_JOBS_COLLECTION, {"expires_at": {"$lt": NOW}}, None),
+    (AI_ENRICHMENT_CACHE_COLLECTION, {"key": "abc", "expires_at": {"$gt": NOW}}, None),
+    ("documents", {"guest_id": "guest_abc", "$or": [{"created_at": {"$lt": "2025-01-15"}}, {"created_at": "2025-01-15", "id": {"$lt": "abc"}}]}, [("created_at", -1), ("id", -1)]),
+    ("login_sessions", {"user_email": "prof@ecole.fr"}, [("created_at", 1)]),
+    ("pro_users", {"email": "prof@ecole.fr"}, None),
+]
+
+
+def _plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _plan_stages(value)
+
+
+@pytest_asyncio.fixture
+async def local_db():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), serverSelectionTimeoutMS=1000)
+    try:
+        await client.admin.command("ping")
+    except Exception as e:
+        client.close()
+        pytest.skip(f"mongod local indisponible: {e}")
+
+    db_name = f"test_index_registry_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    await db[EXERCISES_COLLECTION].insert_many([
+        {"chapter_code": "6E_N08", "id": i, "offer": "free" if i % 2 else "pro", "difficulty": "facile"}
+        for i in range(1, 50)
+    ])
+    await apply_index_registry(db)
+    yield db
+    await client.drop_database(db_name)
+    client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("collection_name,query,sort", HOT_QUERIES)
+async def test_hot_queries_do_not_collscan(local_db, collection_name, query, sort):
+    cursor = local_db[collection_name].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    explain = await cursor.explain()
+
+    stages = set(_plan_stages(explain["queryPlanner"]["winningPlan"]))
+    assert "COLLSCAN" not in stages, f"{collection_name} {query}: {stages}"
+
+
+@pytest.mark.asyncio
+async def test_case_insensitive_chapter_code_lookup_is_an_index_hit(local_db):
+    chapters = local_db[CURRICULUM_CHAPTERS_COLLECTION]
+    await chapters.insert_many([{"code_officiel": f"6e_N{i:02d}", "niveau": "6e"} for i in range(1, 30)])
+
+    cursor = chapters.find({"code_officiel": "6E_n08"}, collation=CASE_INSENSITIVE_COLLATION)
+    assert [doc["code_officiel"] for doc in await cursor.to_list(None)] == ["6e_N08"]
+
+    explain = await chapters.find({"code_officiel": "6E_n08"}, collation=CASE_INSENSITIVE_COLLATION).explain()
+    plan = explain["queryPlanner"]["winningPlan"]
+    assert "COLLSCAN" not in set(_plan_stages(plan))
+    assert "code_officiel_ci" in str(plan)
+
+
+@pytest.mark.asyncio
+async def test_registry_has_no_drift_after_apply(local_db):
+    report = await apply_index_registry(local_db, dry_run=True)
+    assert not has_drift(report)
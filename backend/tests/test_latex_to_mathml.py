@@ -0,0 +1,55 @@
+"""
+Tests for the LaTeX to MathML converter used by process_math_content_for_pdf
+
+Run with: python -m pytest backend/tests/test_latex_to_mathml.py -v
+"""
+
+import pytest
+from backend.latex_to_mathml import LaTeXToMathMLConverter, mathml_converter
+from backend.curriculum_data import process_math_content_for_pdf
+from backend.curriculum_complete import process_math_content_for_pdf as process_math_content_for_pdf_complete
+
+
+def frac(a, b):
+    return (
+        '<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline"><mrow><mfrac>'
+        f'<mrow><mn>{a}</mn></mrow><mrow><mn>{b}</mn></mrow></mfrac></mrow></math>'
+    )
+
+
+SQRT_16 = (
+    '<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline"><mrow><msqrt>'
+    '<mrow><mn>16</mn></mrow></msqrt></mrow></math>'
+)
+X_SQUARED = (
+    '<math xmlns="http://www.w3.org/1998/Math/MathML" display="inline"><mrow><msup>'
+    '<mi>x</mi><mrow><mn>2</mn></mrow></msup></mrow></math>'
+)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("", ""),
+    (None, None),
+    ("Bonjour", "Bonjour"),
+    ("Le prix est de 3 euros par 2 kg.", "Le prix est de 3 euros par 2 kg."),
+    ("Il mange 2 de 5 parts et 3 par 7", f"Il mange {frac(2, 5)} parts et {frac(3, 7)}"),
+    ("puis 5/6", f"puis {frac(5, 6)}"),
+    (r"\frac{1}{2} + \sqrt{16} = x^{2}", f"{frac(1, 2)} + {SQRT_16} = {X_SQUARED}"),
+])
+def test_conversion_output(text, expected):
+    assert mathml_converter.convert(text) == expected
+    assert process_math_content_for_pdf(text) == expected
+    assert process_math_content_for_pdf_complete(text) == expected
+
+
+def test_fast_path_returns_same_object():
+    text = "Un énoncé sans aucune notation mathématique."
+    assert LaTeXToMathMLConverter().convert(text) is text
+
+
+def test_repeated_fragments_hit_cache():
+    converter = LaTeXToMathMLConverter()
+    converter.convert(r"\frac{7}{9}")
+    hits_before = converter.cache_info().hits
+    converter.convert(r"et encore \frac{7}{9}")
+    assert converter.cache_info().hits == hits_before + 1
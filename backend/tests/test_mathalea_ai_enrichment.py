@@ -157,7 +157,7 @@ async def test_enrichment_statement_only():
     from ia_engine.exercise_ai_enrichment import enrich_statement
     
     # Mock de enrich_statement pour contrôler la sortie
-    async def mock_enrich_statement(enonce_brut, data, niveau, style=None):
+    async def mock_enrich_statement(enonce_brut, data, niveau, style=None, db=None):
         return f"[ENRICHI] {enonce_brut}"
     
     with patch('ia_engine.exercise_ai_enrichment.enrich_statement', side_effect=mock_enrich_statement):
@@ -207,7 +207,7 @@ async def test_enrichment_correction_only():
     """
     from engine.pdf_engine.sheet_ai_enrichment_helper import apply_ai_enrichment_to_sheet_preview
     
-    async def mock_enrich_correction(solution_brut, data, niveau):
+    async def mock_enrich_correction(solution_brut, data, niveau, db=None):
         return f"[ENRICHI] {solution_brut}"
     
     with patch('ia_engine.exercise_ai_enrichment.enrich_correction', side_effect=mock_enrich_correction):
@@ -257,10 +257,10 @@ async def test_enrichment_both():
     """
     from engine.pdf_engine.sheet_ai_enrichment_helper import apply_ai_enrichment_to_sheet_preview
     
-    async def mock_enrich_statement(enonce_brut, data, niveau, style=None):
+    async def mock_enrich_statement(enonce_brut, data, niveau, style=None, db=None):
         return f"[ENONCE ENRICHI] {enonce_brut}"
     
-    async def mock_enrich_correction(solution_brut, data, niveau):
+    async def mock_enrich_correction(solution_brut, data, niveau, db=None):
         return f"[SOLUTION ENRICHIE] {solution_brut}"
     
     with patch('ia_engine.exercise_ai_enrichment.enrich_statement', side_effect=mock_enrich_statement), \
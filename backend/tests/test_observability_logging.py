@@ -0,0 +1,134 @@
+"""
+Tests du pipeline de logs asynchrone, de l'échantillonnage et des métriques par événement
+
+Run with: python -m pytest backend/tests/test_observability_logging.py -v
+"""
+
+import io
+import logging
+import queue
+import random
+from logging.handlers import QueueListener
+
+import pytest
+
+from backend.observability import logger as obs_module
+from backend.observability import (
+    get_event_metrics,
+    reset_event_metrics,
+    set_request_context,
+    clear_request_context,
+)
+
+
+@pytest.fixture
+def pipeline():
+    """Logger isolé branché sur un ContextQueueHandler + listener"""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(obs_module.ObservabilityFormatter())
+
+    log_queue = queue.Queue()
+    listener = QueueListener(log_queue, handler)
+    target = logging.getLogger("lemaitremot.test_pipeline")
+    target.handlers.clear()
+    target.propagate = False
+    target.setLevel(logging.INFO)
+    target.addHandler(obs_module.ContextQueueHandler(log_queue))
+    listener.start()
+
+    obs = obs_module.ObservabilityLogger("GENERATOR")
+    obs.logger = target
+    reset_event_metrics()
+    yield obs, listener, stream
+    listener.stop()
+    target.handlers.clear()
+    clear_request_context()
+    reset_event_metrics()
+
+
+class TestAsyncPipeline:
+
+    def test_request_context_captured_at_emit_time(self, pipeline):
+        obs, listener, stream = pipeline
+        set_request_context(request_id="req-1")
+        obs.info("event=generate_in", event="generate_in", outcome="in_progress")
+        # Le contexte change avant que le listener ait formaté le record
+        clear_request_context()
+        listener.stop()
+        listener.start()
+
+        output = stream.getvalue()
+        assert "request_id=req-1" in output
+        assert "event=generate_in" in output
+
+    def test_lazy_args_formatted_on_emit(self, pipeline):
+        obs, listener, stream = pipeline
+        payload = ["a"]
+        obs.info("items=%s", payload, event="items")
+        payload.append("b")  # mutation après l'appel
+        listener.stop()
+        listener.start()
+        assert "items=['a']" in stream.getvalue()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = obs_module.ContextQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None)
+        handler.handle(record)
+        handler.handle(logging.LogRecord("x", logging.INFO, __file__, 1, "msg", None, None))
+        assert handler.dropped == 1
+
+
+class TestSamplingAndMetrics:
+
+    def test_sampled_out_events_still_counted(self, pipeline, monkeypatch):
+        obs, listener, stream = pipeline
+        monkeypatch.setitem(obs_module.LOG_SAMPLING, "generate_in", 0.0)
+        for _ in range(5):
+            obs.info("event=generate_in", event="generate_in", outcome="in_progress")
+        obs.info("event=generate_complete", event="generate_complete", outcome="success", duration_ms=42)
+        listener.stop()
+        listener.start()
+
+        output = stream.getvalue()
+        assert "event=generate_in" not in output
+        assert "event=generate_complete" in output
+
+        metrics = get_event_metrics()
+        assert metrics["counters"]["generate_in"] == {"in_progress": 5}
+        assert metrics["sampled_out"] == 5
+        histogram = metrics["durations"]["generate_complete"]
+        assert histogram["count"] == 1
+        assert histogram["buckets_ms"]["50"] == 1
+
+    def test_errors_never_sampled(self, pipeline, monkeypatch):
+        obs, listener, stream = pipeline
+        monkeypatch.setitem(obs_module.LOG_SAMPLING, "generate_exception", 0.0)
+        obs.error("event=generate_exception", event="generate_exception", outcome="error")
+        listener.stop()
+        listener.start()
+        assert "event=generate_exception" in stream.getvalue()
+
+    def test_sampling_does_not_consume_global_random(self, pipeline, monkeypatch):
+        obs, _, _ = pipeline
+        monkeypatch.setitem(obs_module.LOG_SAMPLING, "generate_in", 0.5)
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        obs.info("event=generate_in", event="generate_in")
+        assert random.random() == expected
+
+    def test_disabled_level_skips_record_but_counts(self, pipeline):
+        obs, listener, stream = pipeline
+        obs.debug("event=params", event="params", outcome="in_progress")
+        listener.stop()
+        listener.start()
+        assert stream.getvalue() == ""
+        assert get_event_metrics()["counters"]["params"] == {"in_progress": 1}
+
+
+def test_parse_sampling():
+    assert obs_module._parse_sampling("generate_in=0.01, handler_in=2,bad=x,noeq") == {
+        "generate_in": 0.01,
+        "handler_in": 1.0,
+    }
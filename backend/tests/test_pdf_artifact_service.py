@@ -0,0 +1,201 @@
+"""
+Tests du service d'export PDF par artefacts (Range, ETag, ZIP en streaming)
+
+Run with: python -m pytest backend/tests/test_pdf_artifact_service.py -v
+"""
+
+import io
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services import pdf_artifact_service as service
+
+
+class TestParseRangeHeader:
+
+    def test_absent_or_multi_range_ignored(self):
+        assert service.parse_range_header(None, 100) is None
+        assert service.parse_range_header("bytes=0-9,20-29", 100) is None
+        assert service.parse_range_header("items=0-9", 100) is None
+
+    def test_explicit_open_and_suffix_ranges(self):
+        assert service.parse_range_header("bytes=0-9", 100) == (0, 9)
+        assert service.parse_range_header("bytes=90-", 100) == (90, 99)
+        assert service.parse_range_header("bytes=-10", 100) == (90, 99)
+        assert service.parse_range_header("bytes=50-500", 100) == (50, 99)
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=20-10", "bytes=-0", "bytes=a-b"])
+    def test_unsatisfiable_range(self, header):
+        with pytest.raises(ValueError):
+            service.parse_range_header(header, 100)
+
+
+def test_content_disposition_keeps_accented_titles():
+    header = service.content_disposition("LeMaitreMot_Fractions_Élève.pdf")
+    assert 'filename="LeMaitreMot_Fractions_lve.pdf"' in header
+    assert "filename*=UTF-8''LeMaitreMot_Fractions_%C3%89l%C3%A8ve.pdf" in header
+
+
+def test_export_job_view_lists_artifact_urls():
+    job = {
+        "job_id": "job1",
+        "artifacts": [
+            {"artifact_id": "a1", "variant": "student", "filename": "E.pdf", "status": "ready", "size": 10, "etag": "x"},
+            {"artifact_id": "a2", "variant": "correction", "filename": "C.pdf", "status": "pending"},
+        ],
+        "metadata": {"sheet_id": "s1", "user_email": "prof@example.com", "exports_remaining": 2},
+        "owner": "prof@example.com",
+        "expires_at": datetime.now(timezone.utc) + timedelta(hours=1),
+    }
+    view = service.export_job_view(job)
+    # Ni email ni quotas dans la vue publique
+    assert view["metadata"] == {"sheet_id": "s1"}
+    assert "owner" not in view
+    assert view["status"] == "pending"
+    assert view["artifacts"][0]["url"] == "/api/mathalea/exports/job1/artifacts/a1"
+    assert view["artifacts"][0]["size"] == 10
+    assert "size" not in view["artifacts"][1]
+    assert view["bundle_url"] == "/api/mathalea/exports/job1/bundle.zip"
+
+
+@pytest.mark.asyncio
+async def test_zip_bundle_is_streamed_and_valid(monkeypatch):
+    contents = {"a1": b"%PDF-1.7 sujet" * 1000, "a2": b"%PDF-1.7 corrige" * 1000}
+
+    async def fake_iter(db_instance, artifact_id, start=0, end=None):
+        data = contents[artifact_id]
+        for offset in range(0, len(data), 4096):
+            yield data[offset:offset + 4096]
+
+    monkeypatch.setattr(service, "iter_artifact_bytes", fake_iter)
+    artifacts = [
+        {"artifact_id": "a1", "filename": "Sujet.pdf"},
+        {"artifact_id": "a2", "filename": "Corrigé.pdf"},
+    ]
+    chunks = [chunk async for chunk in service.iter_zip_bundle(None, artifacts)]
+
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.read("Sujet.pdf") == contents["a1"]
+        assert archive.read("Corrigé.pdf") == contents["a2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_render_marks_artifact_failed():
+    updates = []
+
+    class FakeCollection:
+        async def update_one(self, query, update):
+            updates.append((query, update))
+
+    class FakeDb(dict):
+        def __getitem__(self, name):
+            return FakeCollection()
+
+    async def failing_render():
+        raise RuntimeError("boom")
+
+    job = {"job_id": "job1", "artifacts": [{"artifact_id": "a1", "variant": "student", "filename": "E.pdf"}]}
+    await service.run_export_job(FakeDb(), job, {"student": failing_render()})
+
+    query, update = updates[0]
+    assert query == {"job_id": "job1", "artifacts.artifact_id": "a1"}
+    assert update["$set"]["artifacts.$.status"] == service.ARTIFACT_FAILED
+    assert update["$set"]["artifacts.$.error"] == "boom"
+
+
+def test_only_owner_can_read_job():
+    job = {"job_id": "job1", "artifacts": [], "owner": "prof@example.com"}
+    assert service.is_export_job_owner(job, "prof@example.com")
+    assert not service.is_export_job_owner(job, "autre@example.com")
+    assert not service.is_export_job_owner(job, None)
+    assert not service.is_export_job_owner({"job_id": "job2", "artifacts": [], "owner": None}, None)
+
+
+class FakeJobsCollection:
+
+    def __init__(self, job):
+        self.job = job
+        self.updates = []
+
+    async def find_one(self, query, projection=None):
+        return dict(self.job) if query["job_id"] == self.job["job_id"] else None
+
+    async def update_one(self, query, update, array_filters=None):
+        self.updates.append((query, update, array_filters))
+
+
+class FakeJobsDb(dict):
+
+    def __init__(self, collection):
+        super().__init__()
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return self.collection
+
+
+def _job(created_at, statuses):
+    return {
+        "job_id": "job1",
+        "artifacts": [
+            {"artifact_id": f"a{i}", "variant": f"v{i}", "filename": f"{i}.pdf", "status": status}
+            for i, status in enumerate(statuses)
+        ],
+        "created_at": created_at,
+        "expires_at": created_at + timedelta(hours=24),
+    }
+
+
+@pytest.mark.asyncio
+async def test_stale_pending_artifacts_marked_failed():
+    old = datetime.now(timezone.utc) - timedelta(seconds=service.PDF_EXPORT_JOB_TIMEOUT_SECONDS + 1)
+    collection = FakeJobsCollection(_job(old, ["ready", "pending"]))
+
+    job = await service.get_export_job(FakeJobsDb(collection), "job1")
+
+    assert [a["status"] for a in job["artifacts"]] == ["ready", "failed"]
+    assert service.export_job_view(job)["status"] == "failed"
+    query, update, array_filters = collection.updates[0]
+    assert update["$set"]["artifacts.$[stale].status"] == service.ARTIFACT_FAILED
+    assert array_filters == [{"stale.status": service.ARTIFACT_PENDING}]
+
+
+@pytest.mark.asyncio
+async def test_recent_pending_artifacts_left_pending():
+    collection = FakeJobsCollection(_job(datetime.now(timezone.utc), ["pending"]))
+
+    job = await service.get_export_job(FakeJobsDb(collection), "job1")
+
+    assert job["artifacts"][0]["status"] == "pending"
+    assert collection.updates == []
+
+
+@pytest.mark.asyncio
+async def test_on_success_only_called_when_all_artifacts_ready(monkeypatch):
+    class FakeBucket:
+        async def upload_from_stream_with_id(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(service, "_bucket", lambda db_instance: FakeBucket())
+    collection = FakeJobsCollection(_job(datetime.now(timezone.utc), ["pending", "pending"]))
+    recorded = []
+
+    async def record():
+        recorded.append(True)
+
+    async def failing_render():
+        raise RuntimeError("boom")
+
+    job = collection.job
+    assert await service.run_export_job(
+        FakeJobsDb(collection), job, {"v0": service.rendered(b"%PDF"), "v1": failing_render()}, on_success=record
+    ) is False
+    assert recorded == []
+
+    assert await service.run_export_job(
+        FakeJobsDb(collection), job, {"v0": service.rendered(b"%PDF"), "v1": service.rendered(b"%PDF")}, on_success=record
+    ) is True
+    assert recorded == [True]
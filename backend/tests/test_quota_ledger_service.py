@@ -0,0 +1,242 @@
+"""
+Tests du ledger de quotas d'export (réservation atomique, annulation, lecture
+seule, fenêtre glissante invités, initialisation depuis db.exports)
+
+Run with: python -m pytest backend/tests/test_quota_ledger_service.py -v
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from backend.services import quota_ledger_service as service
+
+
+def _value(doc, field):
+    # "events.2" : élément d'indice 2 du tableau events
+    name, _, index = field.partition(".")
+    value = doc.get(name)
+    if index:
+        return value[int(index)] if value is not None and int(index) < len(value) else None
+    return value
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        value = _value(doc, field)
+        if isinstance(condition, dict):
+            for op, operand in condition.items():
+                if op == "$exists" and (value is not None) != operand:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _pull(values, condition):
+    if isinstance(condition, dict):
+        return [value for value in values if not _matches({"v": value}, {"v": condition})]
+    return [value for value in values if value != condition]
+
+
+class FakeCollection:
+    """Collection en mémoire ; chaque opération cède la main (entrelacement des coroutines)"""
+
+    def __init__(self):
+        self.docs = []
+
+    def _find(self, query):
+        return next((doc for doc in self.docs if _matches(doc, query)), None)
+
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        doc = self._find(query)
+        return dict(doc) if doc else None
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        await asyncio.sleep(0)
+        doc = self._find(query)
+        if doc is None:
+            return None
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        for field, condition in update.get("$pull", {}).items():
+            doc[field] = _pull(doc.get(field, []), condition)
+        for field, push in update.get("$push", {}).items():
+            doc[field] = (doc.get(field, []) + push["$each"])[push["$slice"]:]
+        doc.update(update.get("$set", {}))
+        return dict(doc)
+
+    async def update_one(self, query, update):
+        await self.find_one_and_update(query, update)
+
+    async def insert_one(self, doc):
+        await asyncio.sleep(0)
+        if any(existing["key"] == doc["key"] for existing in self.docs):
+            raise DuplicateKeyError("duplicate key")
+        self.docs.append(dict(doc))
+
+
+class FakeHistoryCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeExportsCollection:
+    """db.exports (historique)"""
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.finds = 0
+
+    def find(self, query, projection=None):
+        self.finds += 1
+        return FakeHistoryCursor([dict(doc) for doc in self.docs if _matches(doc, query)])
+
+
+@pytest.fixture
+def db():
+    return {
+        service.QUOTA_COUNTERS_COLLECTION: FakeCollection(),
+        service.EXPORTS_HISTORY_COLLECTION: FakeExportsCollection(),
+    }
+
+
+NOW = datetime(2025, 1, 15, 10, 30, 12, 345678, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_exceed_limit(db):
+    reservations = await asyncio.gather(*(
+        service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+        for _ in range(10)
+    ))
+    granted = [r for r in reservations if r.granted]
+
+    assert len(granted) == 3
+    assert len(db[service.QUOTA_COUNTERS_COLLECTION].docs) == 1
+    denied = next(r for r in reservations if not r.granted)
+    assert denied.remaining == 0
+    assert denied.window_end == datetime(2025, 1, 16, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_release_returns_reservation(db):
+    reservations = [
+        await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+        for _ in range(3)
+    ]
+    await service.release_quota(db, reservations[-1])
+
+    status = await service.get_quota_status(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+    assert status["used"] == 2
+    assert (await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)).granted
+
+
+@pytest.mark.asyncio
+async def test_expired_window_starts_new_window(db):
+    for _ in range(3):
+        await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+
+    tomorrow = NOW + timedelta(days=1)
+    reservation = await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=tomorrow)
+
+    assert reservation.granted
+    assert reservation.used == 1
+    assert reservation.window_start == datetime(2025, 1, 16, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_guest_status_is_read_only_and_rolling(db):
+    status = await service.get_quota_status(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW)
+    assert status == {"used": 0, "remaining": 3, "limit": 3, "resets_at": None, "exceeded": False}
+    assert db[service.QUOTA_COUNTERS_COLLECTION].docs == []
+
+    day = timedelta(days=1)
+    for offset in (0, 10, 20, 21):
+        await service.record_quota_usage(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + offset * day)
+
+    # 30 jours glissants (comme l'ancien comptage sur db.exports), pas une
+    # fenêtre ouverte au premier export
+    status = await service.get_quota_status(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + 21 * day)
+    assert status["used"] == 3
+    assert status["exceeded"]
+    assert status["resets_at"] == NOW.replace(microsecond=345000) + 40 * day
+
+    status = await service.get_quota_status(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + 41 * day)
+    assert status["used"] == 2
+    assert not status["exceeded"]
+
+
+@pytest.mark.asyncio
+async def test_rolling_reservation_frees_slot_as_oldest_export_ages_out(db):
+    day = timedelta(days=1)
+    for offset in (0, 5, 10):
+        assert (await service.reserve_quota(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + offset * day)).granted
+
+    denied = await service.reserve_quota(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + 29 * day)
+    assert not denied.granted
+    assert denied.window_end == NOW.replace(microsecond=345000) + 30 * day
+
+    reservation = await service.reserve_quota(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + 31 * day)
+    assert reservation.granted
+    assert reservation.used == 3
+
+    await service.release_quota(db, reservation)
+    status = await service.get_quota_status(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW + 31 * day)
+    assert status["used"] == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_counters_are_seeded_from_exports_history(db):
+    history = db[service.EXPORTS_HISTORY_COLLECTION]
+    history.docs = [
+        # Exports d'avant le déploiement du ledger
+        {"user_email": "prof@ecole.fr", "created_at": NOW - timedelta(hours=2)},
+        {"user_email": "prof@ecole.fr", "created_at": NOW - timedelta(hours=1)},
+        {"user_email": "prof@ecole.fr", "created_at": NOW - timedelta(days=1)},
+        {"guest_id": "guest_abc", "created_at": NOW - timedelta(days=29)},
+        {"guest_id": "guest_abc", "created_at": NOW - timedelta(days=31)},
+    ]
+
+    status = await service.get_quota_status(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+    assert status["used"] == 2
+    assert db[service.QUOTA_COUNTERS_COLLECTION].docs == []
+
+    assert (await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)).used == 3
+    assert not (await service.reserve_quota(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)).granted
+
+    reservation = await service.reserve_quota(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW)
+    assert reservation.granted and reservation.used == 2
+
+    # Compteurs initialisés une seule fois : l'historique n'est plus relu
+    finds = history.finds
+    await service.reserve_quota(db, service.GUEST_EXPORT_QUOTA, "guest_abc", now=NOW)
+    await service.get_quota_status(db, service.FREE_DAILY_EXPORT_QUOTA, "prof@ecole.fr", now=NOW)
+    assert history.finds == finds
@@ -0,0 +1,175 @@
+"""
+Tests de la configuration du stockage de rate limiting et du stockage
+partagé entre workers (SharedCounterStorage)
+
+Run with: python -m pytest backend/tests/test_rate_limit_storage.py -v
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+from pymongo.errors import ServerSelectionTimeoutError
+from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from backend.middleware import rate_limit
+from backend.middleware.rate_limit_storage import SharedCounterStorage
+
+
+class FakeCountersCollection:
+    """Collection MongoDB minimale en mémoire (bulk_write $inc/$max, find $in)"""
+
+    def __init__(self):
+        self.docs = {}
+        self.bulk_writes = 0
+        self.fail = False
+
+    def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise ServerSelectionTimeoutError("mongo injoignable")
+        self.bulk_writes += 1
+        for op in operations:
+            doc = self.docs.setdefault(op._filter["_id"], {"_id": op._filter["_id"], "count": 0})
+            doc["count"] += op._doc["$inc"]["count"]
+            doc["expires_at"] = max(doc.get("expires_at", op._doc["$max"]["expires_at"]), op._doc["$max"]["expires_at"])
+
+    def find(self, query, projection=None):
+        if self.fail:
+            raise ServerSelectionTimeoutError("mongo injoignable")
+        return [self.docs[key] for key in query["_id"]["$in"] if key in self.docs]
+
+    def delete_many(self, query):
+        for key in query.get("_id", {}).get("$in", list(self.docs)):
+            self.docs.pop(key, None)
+
+
+def _shared_storage(collection):
+    return storage_from_string("shared+mongodb://db:27017", collection=collection, sync_interval=0)
+
+
+def _worker_app(collection):
+    """Une app + un Limiter slowapi : un worker uvicorn"""
+    limiter = Limiter(
+        key_func=get_remote_address,
+        strategy="sliding-window-counter",
+        storage_uri="shared+mongodb://db:27017",
+        storage_options={"collection": collection, "sync_interval": 0},
+    )
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.post("/api/auth/request-login")
+    @limiter.limit("5/15minutes")
+    async def request_login(request: Request):
+        return {"ok": True}
+
+    return TestClient(app), limiter._storage
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_spaced_requests_each_cost_one_token(monkeypatch, shared):
+    """60/15min : 60 requêtes espacées de 6 s passent toutes, la 61e est refusée"""
+    storage = _shared_storage(FakeCountersCollection()) if shared else storage_from_string("memory://")
+    limiter = STRATEGIES[rate_limit.RATE_LIMIT_STRATEGY](storage)
+    item = parse("60/15minutes")
+
+    # Début d'une fenêtre de 15 min : toutes les requêtes tombent dans la même
+    clock = [time.time() // 900 * 900 + 900]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    accepted = 0
+    for _ in range(60):
+        accepted += limiter.hit(item, "1.2.3.4", "/api/auth/verify-login")
+        clock[0] += 6
+    assert accepted == 60
+    assert not limiter.hit(item, "1.2.3.4", "/api/auth/verify-login")
+
+
+def test_two_workers_share_one_budget():
+    """Deux Limiters (deux workers) sur la même base : 5/15minutes au total"""
+    collection = FakeCountersCollection()
+    workers = [_worker_app(collection), _worker_app(collection)]
+
+    statuses = []
+    for i in range(8):
+        client, _ = workers[i % 2]
+        statuses.append(client.post("/api/auth/request-login").status_code)
+        # Synchronisation de fond de chaque worker entre deux requêtes
+        for _, storage in workers:
+            storage.sync()
+
+    assert statuses == [200] * 5 + [429] * 3
+    assert sum(doc["count"] for doc in collection.docs.values()) == 5
+
+
+def test_hits_between_syncs_are_bounded_per_worker():
+    collection = FakeCountersCollection()
+    (first, first_storage), (second, second_storage) = _worker_app(collection), _worker_app(collection)
+
+    # Sans synchronisation, chaque worker applique au moins la limite localement
+    assert [first.post("/api/auth/request-login").status_code for _ in range(6)] == [200] * 5 + [429]
+    assert second.post("/api/auth/request-login").status_code == 200
+    assert collection.bulk_writes == 0
+
+    first_storage.sync()
+    second_storage.sync()
+    assert second.post("/api/auth/request-login").status_code == 429
+    assert sum(doc["count"] for doc in collection.docs.values()) == 6
+
+
+def test_sync_failure_keeps_local_decisions_and_retries():
+    collection = FakeCountersCollection()
+    storage = _shared_storage(collection)
+    limiter = STRATEGIES["sliding-window-counter"](storage)
+    item = parse("5/15minutes")
+
+    collection.fail = True
+    assert all(limiter.hit(item, "1.2.3.4") for _ in range(3))
+    assert not storage.sync()
+
+    collection.fail = False
+    assert storage.sync()
+    assert sum(doc["count"] for doc in collection.docs.values()) == 3
+    assert limiter.get_window_stats(item, "1.2.3.4").remaining == 2
+
+
+def test_close_flushes_pending_hits():
+    collection = FakeCountersCollection()
+    storage = _shared_storage(collection)
+    STRATEGIES["sliding-window-counter"](storage).hit(parse("10/1hour"), "1.2.3.4")
+    storage.close()
+    assert sum(doc["count"] for doc in collection.docs.values()) == 1
+
+
+def test_storage_config_defaults_to_memory_without_mongo(monkeypatch):
+    monkeypatch.delenv("RATE_LIMIT_STORAGE_URI", raising=False)
+    monkeypatch.delenv("MONGO_URL", raising=False)
+    assert rate_limit.rate_limit_storage_config() == ("memory://", {})
+
+
+def test_storage_config_defaults_to_shared_store(monkeypatch):
+    monkeypatch.delenv("RATE_LIMIT_STORAGE_URI", raising=False)
+    monkeypatch.setenv("MONGO_URL", "mongodb://db:27017")
+    monkeypatch.setenv("DB_NAME", "lemaitremot")
+
+    uri, options = rate_limit.rate_limit_storage_config()
+    assert uri == "shared+mongodb://db:27017"
+    assert options["database_name"] == "lemaitremot"
+    assert options["collection_name"] == "rate_limit_shared_counters"
+    assert isinstance(storage_from_string(uri, **options), SharedCounterStorage)
+
+
+def test_storage_config_limits_mongo_uri(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_STORAGE_URI", "mongodb://db:27017")
+    monkeypatch.setenv("DB_NAME", "lemaitremot")
+
+    uri, options = rate_limit.rate_limit_storage_config()
+    assert uri == "mongodb://db:27017"
+    assert options["database_name"] == "lemaitremot"
+    assert options["window_collection_name"] == "rate_limit_windows"
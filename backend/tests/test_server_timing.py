@@ -0,0 +1,120 @@
+"""
+Tests du timing par étape (stage / timed_stage, listener Mongo) et du
+middleware Server-Timing
+
+Run with: python -m pytest backend/tests/test_server_timing.py -v
+"""
+
+import asyncio
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.server_timing import ServerTimingMiddleware
+from backend.observability.timing import (
+    MongoStageListener,
+    begin_request_timing,
+    end_request_timing,
+    get_stage_timings,
+    server_timing_enabled,
+    stage,
+    timed_stage,
+)
+
+
+def _parse_header(value: str):
+    stages = {}
+    for part in value.split(", "):
+        name, *params = part.split(";")
+        stages[name] = dict(p.split("=", 1) for p in params)
+    return stages
+
+
+def test_flag_is_read_after_import(monkeypatch):
+    """SERVER_TIMING vient du .env chargé par server.py après l'import du module"""
+    monkeypatch.delenv("SERVER_TIMING", raising=False)
+    assert not server_timing_enabled()
+    monkeypatch.setenv("SERVER_TIMING", "1")
+    assert server_timing_enabled()
+
+
+def test_stage_is_a_shared_noop_outside_a_request():
+    assert get_stage_timings() is None
+    assert stage("mongo") is stage("generator")
+    with stage("mongo"):
+        pass
+
+
+def test_timings_accumulate_per_stage():
+    timings, token = begin_request_timing()
+    try:
+        with stage("generator"):
+            time.sleep(0.002)
+        with stage("generator"):
+            pass
+        MongoStageListener().succeeded(SimpleNamespace(duration_micros=1500))
+    finally:
+        end_request_timing(token)
+
+    totals = timings.totals()
+    assert totals["generator"][1] == 2 and totals["generator"][0] >= 2
+    assert totals["mongo"] == (1.5, 1)
+    assert get_stage_timings() is None
+
+    header = _parse_header(timings.header(total_ms=10))
+    assert header["mongo"] == {"dur": "1.5", "desc": '"1"'}
+    assert header["total"] == {"dur": "10.0"}
+    assert re.fullmatch(r"generator=[\d.]+ms/2 mongo=1\.5ms/1", timings.summary())
+
+
+@pytest.mark.asyncio
+async def test_timed_stage_wraps_sync_and_async_functions():
+    @timed_stage("pdf")
+    async def render():
+        await asyncio.sleep(0)
+        return b"%PDF"
+
+    @timed_stage("template")
+    def fill(value):
+        return f"<p>{value}</p>"
+
+    timings, token = begin_request_timing()
+    try:
+        assert await render() == b"%PDF"
+        assert fill(3) == "<p>3</p>"
+    finally:
+        end_request_timing(token)
+    assert set(timings.totals()) == {"pdf", "template"}
+    assert fill.__name__ == "fill"
+
+
+def test_middleware_emits_server_timing_header():
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/async")
+    async def async_endpoint():
+        with stage("generator"):
+            await asyncio.sleep(0.001)
+        MongoStageListener().succeeded(SimpleNamespace(duration_micros=2000))
+        return {"ok": True}
+
+    @app.get("/sync")
+    def sync_endpoint():
+        # Exécuté dans le threadpool : même collecteur (contexte copié)
+        with stage("template"):
+            pass
+        return {"ok": True}
+
+    client = TestClient(app)
+    header = _parse_header(client.get("/async").headers["server-timing"])
+    assert set(header) == {"generator", "mongo", "total"}
+    assert header["mongo"]["dur"] == "2.0"
+    assert float(header["total"]["dur"]) >= float(header["generator"]["dur"])
+
+    # Nouveau collecteur par requête : rien ne fuit de /async
+    assert set(_parse_header(client.get("/sync").headers["server-timing"])) == {"template", "total"}
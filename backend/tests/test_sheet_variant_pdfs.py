@@ -0,0 +1,87 @@
+"""
+Tests de l'export multi-variantes des fiches (préparation commune + rendus parallèles)
+
+Run with: python -m pytest backend/tests/test_sheet_variant_pdfs.py -v
+"""
+
+import pytest
+
+try:
+    from backend.engine.pdf_engine import mathalea_sheet_pdf_builder as builder
+except OSError as e:  # bibliothèques natives de WeasyPrint (pango) absentes
+    pytest.skip(f"WeasyPrint indisponible: {e}", allow_module_level=True)
+
+
+PREVIEW = {
+    "titre": "Fiche fractions",
+    "niveau": "6e",
+    "items": [
+        {
+            "exercise_type_summary": {"titre": "Fractions", "domaine": "Nombres"},
+            "generated": {
+                "questions": [
+                    {"enonce_brut": "Calculer 1/2 + 1/4\nJustifier.", "solution_brut": "3/4"},
+                    {
+                        "enonce_brut": "<p>Compléter</p><table><tr><td>1</td></tr></table>",
+                        "solution_brut": "<p>Voir tableau</p>",
+                    },
+                ]
+            },
+        }
+    ],
+}
+
+
+def test_prepared_preview_renders_same_html():
+    prepared = builder.prepare_sheet_preview(PREVIEW)
+    raw = dict(PREVIEW, _date=prepared["_date"])
+
+    assert builder._build_html_subject(prepared) == builder._build_html_subject(raw)
+    assert builder._build_html_student(prepared, layout="eco") == builder._build_html_student(raw, layout="eco")
+    assert builder._build_html_correction(prepared) == builder._build_html_correction(raw)
+    # Le preview d'origine n'est pas modifié
+    assert "_enonce_html" not in PREVIEW["items"][0]["generated"]["questions"][0]
+
+
+def test_variant_html_keeps_author_css():
+    """CSS dans un <style> du document (feuille auteur), comme les builders d'une variante"""
+    prepared = builder.prepare_sheet_preview(PREVIEW)
+    assert builder._build_variant_html(prepared, "subject", "eco") == builder._build_html_subject(prepared)
+    assert builder._build_variant_html(prepared, "student", "classic") == builder._build_html_student(
+        prepared, layout="classic"
+    )
+    assert builder._build_variant_html(prepared, "correction", "eco") == builder._build_html_correction(prepared)
+    assert builder._build_variant_html(prepared, "student", "eco").count("<style>") == 1
+
+
+def test_variant_css_matches_inline_css():
+    assert builder._variant_css("subject") in builder._build_html_subject(PREVIEW)
+    assert builder._variant_css("student_eco") in builder._build_html_student(PREVIEW, layout="eco")
+    assert builder._variant_css("correction") in builder._build_html_correction(PREVIEW)
+
+
+@pytest.mark.asyncio
+async def test_build_sheet_variant_pdfs_without_pool(monkeypatch):
+    monkeypatch.setattr(builder, "SHEET_PDF_WORKERS", 0)
+    pdfs = await builder.build_sheet_variant_pdfs(PREVIEW)
+    assert set(pdfs) == {"subject", "student", "correction"}
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs.values())
+
+
+@pytest.mark.asyncio
+async def test_build_sheet_variant_pdfs_in_process_pool():
+    pdfs = await builder.build_sheet_variant_pdfs(PREVIEW, variants=("student", "correction"), layout="classic")
+    assert set(pdfs) == {"student", "correction"}
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs.values())
+
+
+@pytest.mark.asyncio
+async def test_shutdown_render_pool_stops_workers():
+    await builder.build_sheet_variant_pdfs(PREVIEW, variants=("subject",))
+    pool = builder._render_pool
+    assert pool is not None
+
+    builder.shutdown_render_pool()
+    assert builder._render_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(builder._render_variant_pdf, "")
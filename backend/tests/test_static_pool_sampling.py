@@ -0,0 +1,125 @@
+"""
+Tests des pools d'exercices figés indexés (StaticExercisePool) et du tirage
+seedé O(count) (seeded_sample) utilisés par GM07/GM08/TESTS_DYN
+
+Les sorties attendues sont figées sur des pools synthétiques : un changement
+d'algorithme de tirage (donc des lots servis pour un seed donné) doit être
+volontaire. Les tirages d'un exercice seul sont figés sur les sorties de
+l'implémentation d'avant les pools indexés (mêmes exercices pour un seed donné).
+
+Run with: python -m pytest backend/tests/test_static_pool_sampling.py -v
+"""
+
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.data import gm07_exercises, gm08_exercises, tests_dyn_exercises
+from backend.data.static_pool import StaticExercisePool, seeded_sample
+from backend.services.gm07_handler import generate_gm07_batch, generate_gm07_exercise
+from backend.services.gm08_handler import generate_gm08_exercise
+from backend.services.static_exercise_repository import StaticExerciseRepository
+
+POOL = [{"id": i} for i in range(1, 11)]
+
+
+def _ids(exercises):
+    return [ex["id"] for ex in exercises]
+
+
+def test_seeded_sample_golden_outputs():
+    assert _ids(seeded_sample(POOL, 4, 42)) == [2, 1, 7, 5]
+    assert _ids(seeded_sample(POOL, 3, 12345)) == _ids(seeded_sample(POOL, 3, 12345))
+    # Pool trop petit : tout le pool, sans doublons
+    assert sorted(_ids(seeded_sample(POOL, 15, 7))) == list(range(1, 11))
+    assert seeded_sample([], 3, 1) == []
+
+
+def test_seeded_sample_first_pick_matches_choice_and_leaves_pool_untouched():
+    snapshot = list(POOL)
+    for seed in range(100):
+        assert seeded_sample(POOL, 3, seed)[0] == random.Random(seed).choice(POOL)
+    assert POOL == snapshot
+
+
+def test_pool_index_matches_offer_rules():
+    exercises = [
+        {"id": 1, "offer": "free", "difficulty": "facile"},
+        {"id": 2, "offer": "pro", "difficulty": "facile"},
+        {"id": 3, "offer": "free", "difficulty": "moyen"},
+    ]
+    pool = StaticExercisePool(exercises)
+    assert _ids(pool.get()) == [1, 3]
+    assert _ids(pool.get("PRO")) == [1, 2, 3]
+    assert _ids(pool.get("pro", "Facile")) == [1, 2]
+    assert pool.get("free", "difficile") == ()
+    # Lookup sans copie
+    assert pool.get("pro", "facile") is pool.get("pro", "facile")
+
+    pro_only = StaticExercisePool(exercises, pro_only=True)
+    assert _ids(pro_only.get("pro")) == [2]
+    assert _ids(StaticExercisePool(exercises[:1], pro_only=True).get("pro")) == [1]
+
+
+def test_data_modules_serve_indexed_pools():
+    free_facile = [ex for ex in gm07_exercises.GM07_EXERCISES if ex["offer"] == "free" and ex["difficulty"] == "facile"]
+    assert gm07_exercises.get_gm07_exercises("free", "facile") == free_facile
+
+    selected, meta = gm07_exercises.get_gm07_batch("pro", None, 5, seed=12345)
+    assert selected == gm07_exercises.get_gm07_batch("pro", None, 5, seed=12345)[0]
+    assert len(set(_ids(selected))) == 5 and meta["returned"] == 5
+
+    templates, info = tests_dyn_exercises.get_tests_dyn_batch("pro", None, 10, seed=99)
+    assert info["returned"] == info["available"] == len(templates)
+
+
+@pytest.mark.asyncio
+async def test_gm07_handler_golden_outputs():
+    db = MagicMock()
+    no_svg = {"figure_svg": None, "figure_svg_enonce": None, "figure_svg_solution": None}
+    with patch.object(StaticExerciseRepository, "list_by_chapter", new_callable=AsyncMock, return_value=POOL), \
+            patch("backend.services.gm07_handler.generate_exercise_svgs", return_value=no_svg):
+        exercises, meta = await generate_gm07_batch(db, offer="pro", count=4, seed=42)
+        single = await generate_gm07_exercise(db, offer="pro", seed=42)
+
+    assert [ex["metadata"]["exercise_id"] for ex in exercises] == [2, 1, 7, 5]
+    assert meta["returned"] == 4 and meta["available"] == 10
+    # Exercice seul : mélange complet du pool puis premier élément (tirage historique)
+    assert single["metadata"]["exercise_id"] == 8
+
+
+# (offre, difficulté, seed) -> id servi avant les pools indexés
+LEGACY_SINGLE_PICKS = [
+    (None, None, 1, {"gm07": 3, "gm08": 3, "tests_dyn": 1}),
+    ("free", None, 42, {"gm07": 21, "gm08": 21, "tests_dyn": 3}),
+    ("pro", "moyen", 7, {"gm07": 12, "gm08": 7, "tests_dyn": 2}),
+    ("pro", None, 12345, {"gm07": 14, "gm08": 14, "tests_dyn": 2}),
+    ("free", "facile", 99, {"gm07": 10, "gm08": 4, "tests_dyn": 1}),
+]
+
+
+@pytest.mark.parametrize("offer,difficulty,seed,expected", LEGACY_SINGLE_PICKS)
+def test_data_module_single_picks_match_legacy_outputs(offer, difficulty, seed, expected):
+    picks = {
+        "gm07": gm07_exercises.get_random_gm07_exercise(offer, difficulty, seed),
+        "gm08": gm08_exercises.get_random_gm08_exercise(offer, difficulty, seed),
+        "tests_dyn": tests_dyn_exercises.get_random_tests_dyn_exercise(offer, difficulty, seed),
+    }
+    assert {chapter: exercise["id"] for chapter, exercise in picks.items()} == expected
+    assert gm07_exercises.get_exercise_by_seed_index(offer, difficulty, seed)["id"] == expected["gm07"]
+    assert gm08_exercises.get_exercise_by_seed_index(offer, difficulty, seed)["id"] == expected["gm08"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed,expected", [(42, 8), (0, 8), (7, 9)])
+async def test_handler_single_picks_match_legacy_outputs(seed, expected):
+    db = MagicMock()
+    no_svg = {"figure_svg": None, "figure_svg_enonce": None, "figure_svg_solution": None}
+    with patch.object(StaticExerciseRepository, "list_by_chapter", new_callable=AsyncMock, return_value=POOL), \
+            patch("backend.services.gm07_handler.generate_exercise_svgs", return_value=no_svg), \
+            patch("backend.services.gm08_handler.generate_exercise_svgs", return_value=no_svg):
+        gm07 = await generate_gm07_exercise(db, offer="pro", seed=seed)
+        gm08 = await generate_gm08_exercise(db, offer="pro", seed=seed)
+
+    assert gm07["metadata"]["exercise_id"] == gm08["metadata"]["exercise_id"] == expected
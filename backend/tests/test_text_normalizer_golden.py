@@ -0,0 +1,72 @@
+"""
+Corpus golden de TextNormalizer : les sorties attendues ont été produites par
+l'ancienne chaîne de re.sub (un appel par règle, une regex par prénom) et
+doivent rester identiques octet par octet avec les règles compilées/fusionnées.
+
+Les cas limites couvrent les dépendances entre règles qui imposent l'ordre
+des passes (multiplication avant puissances, approximation avant degrés,
+\\frac avant la suppression des \\( \\)).
+
+Run with: python -m pytest backend/tests/test_text_normalizer_golden.py -v
+"""
+
+import pytest
+
+from backend.services.text_normalizer import TextNormalizer
+
+normalizer = TextNormalizer()
+
+MATH_SYMBOLS_CORPUS = [
+    ("Calcule 3 * 4 puis 12 x 5.", "Calcule 3 × 4 puis 12 × 5."),
+    ("L'aire du carré vaut 5^2 = 25 cm^2 et le volume du cube 2^3 cm^3.",
+     "L'aire du carré vaut 5² = 25 cm² et le volume du cube 2³ cm³."),
+    ("La longueur AB mesure environ 7,5 cm (AB ~= 7.5).", "La longueur AB mesure ≈ 7,5 cm (AB ≈ 7.5)."),
+    ("L'angle ABC mesure 60 deg et l'angle BCA 45deg.", "L'angle ABC mesure 60° et l'angle BCA 45°."),
+    ("3^2x4 = 36", "3² × 4 = 36"),
+    ("10 degenviron", "10°≈"),
+    ("x^23 n'est pas un carré ; 2^2^3", "x^23 n'est pas un carré ; 2²³"),
+    ("2 x 3 x 4", "2 × 3 x 4"),
+    ("a*b *  c", "a × b × c"),
+    ("", ""),
+]
+
+PERSONAL_NAMES_CORPUS = [
+    ("Marie et Jean-Pierre mesurent le segment [AB]. LÉA aussi, mais pas Jeanne ni Mariette.",
+     "[point] et [point]-[point] mesurent le segment [AB]. [point] aussi, mais pas Jeanne ni Mariette."),
+    ("Chloé, chloé et CHLOÉ tracent le triangle ABC avec Hugo.",
+     "[point], [point] et [point] tracent le triangle ABC avec [point]."),
+    ("JeanMarie et Gabriel_ restent", "JeanMarie et Gabriel_ restent"),
+    ("Le triangle ABC", "Le triangle ABC"),
+]
+
+LATEX_CORPUS = [
+    ("\\frac{3}{4} + \\frac {1} {2} = \\(\\frac{5}{4}\\)", "3/4 + 1/2 = 5/4"),
+    ("\\frac{\\(a}{b\\)} et \\\\(x\\)", "a/b et \\x"),
+    ("Sans antislash : 1/2 + 1/4", "Sans antislash : 1/2 + 1/4"),
+    ("\\frac{}{2} \\alpha", "\\frac{}{2} \\alpha"),
+]
+
+
+@pytest.mark.parametrize("text,expected", MATH_SYMBOLS_CORPUS)
+def test_normalize_math_symbols_golden(text, expected):
+    assert normalizer.normalize_math_symbols(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", PERSONAL_NAMES_CORPUS)
+def test_remove_personal_names_golden(text, expected):
+    assert normalizer.remove_personal_names(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", LATEX_CORPUS)
+def test_clean_latex_symbols_golden(text, expected):
+    assert normalizer.clean_latex_symbols(text) == expected
+
+
+def test_geometry_points_unchanged():
+    result = normalizer.validate_geometry_points("Soit A, B et X trois points ; Z est loin.", ["A", "B", "C"])
+    assert result == {
+        'valid': False,
+        'found_points': ['A', 'B', 'X', 'Z'],
+        'unexpected_points': ['X', 'Z'],
+        'missing_points': ['C'],
+    }
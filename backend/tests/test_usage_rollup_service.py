@@ -0,0 +1,134 @@
+"""
+Tests des rollups d'usage quotidiens (analytics Pro)
+
+Run with: python -m pytest backend/tests/test_usage_rollup_service.py -v
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.services import usage_rollup_service as service
+
+
+class FakeCursor:
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class FakeCollection:
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+        self.updates = []
+        self.bulk_operations = []
+
+    def find(self, query=None, projection=None):
+        return FakeCursor(self.docs)
+
+    async def update_one(self, query, update, upsert=False):
+        self.updates.append((query, update, upsert))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_operations.extend(operations)
+
+    def list_indexes(self):
+        return FakeCursor([])
+
+    async def create_index(self, keys, **kwargs):
+        pass
+
+
+class FakeDb(dict):
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+@pytest.fixture
+def db():
+    return FakeDb(
+        documents=FakeCollection(),
+        exports=FakeCollection(),
+        **{service.USAGE_DAILY_ROLLUPS_COLLECTION: FakeCollection()}
+    )
+
+
+def test_rollup_day_accepts_iso_strings_and_datetimes():
+    assert service.rollup_day("2025-01-15T23:30:00+00:00") == "2025-01-15"
+    assert service.rollup_day("2025-01-15T23:30:00-02:00") == "2025-01-16"
+    assert service.rollup_day(datetime(2025, 1, 15, 8, tzinfo=timezone.utc)) == "2025-01-15"
+    assert service.rollup_day(datetime(2025, 1, 15, 8)) == "2025-01-15"
+
+
+@pytest.mark.asyncio
+async def test_record_document_and_export_increment_counters(db):
+    await service.record_document(db, {
+        "guest_id": "guest_abc", "matiere": "Mathématiques", "created_at": "2025-01-15T10:00:00+00:00"
+    })
+    await service.record_export(db, {
+        "user_email": "prof@ecole.fr", "template_used": None, "created_at": datetime(2025, 1, 15, tzinfo=timezone.utc)
+    })
+    await service.record_export(db, {"user_email": None, "template_used": "classique"})
+
+    updates = db[service.USAGE_DAILY_ROLLUPS_COLLECTION].updates
+    assert len(updates) == 2
+    query, update, upsert = updates[0]
+    assert query == {"owner": "guest_abc", "day": "2025-01-15"}
+    assert update["$inc"] == {"documents": 1, "subjects.Mathématiques": 1}
+    assert upsert
+    query, update, _ = updates[1]
+    assert query == {"owner": "prof@ecole.fr", "day": "2025-01-15"}
+    assert update["$inc"] == {"exports": 1, "templates.standard": 1}
+
+
+def test_summarize_rollups():
+    rollups = [
+        {"day": "2024-11-01", "documents": 2, "subjects": {"Mathématiques": 2}},
+        {"day": "2025-01-10", "documents": 1, "exports": 3, "subjects": {"Français": 1},
+         "templates": {"minimaliste": 2, "standard": 1}},
+        {"day": "2025-01-15", "exports": 1, "templates": {"minimaliste": 1}},
+    ]
+    usage = service.summarize_rollups(rollups, recent_since_day="2025-01-01")
+
+    assert usage["documents"] == 3
+    assert usage["exports"] == 4
+    assert usage["recent_documents"] == 1
+    assert usage["recent_exports"] == 4
+    assert usage["subjects"] == {"Mathématiques": 2, "Français": 1}
+    assert usage["templates"] == {"minimaliste": 3, "standard": 1}
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_absolute_counters(db):
+    db.documents.docs = [
+        {"user_id": "prof@ecole.fr", "matiere": "Mathématiques", "created_at": "2025-01-15T10:00:00+00:00"},
+        {"user_id": "prof@ecole.fr", "matiere": "Mathématiques", "created_at": "2025-01-15T11:00:00+00:00"},
+        {"guest_id": "guest_abc", "matiere": "Français", "created_at": "2025-01-16T11:00:00+00:00"},
+        {"matiere": "Français", "created_at": "2025-01-16T11:00:00+00:00"},
+    ]
+    db.exports.docs = [
+        {"user_email": "prof@ecole.fr", "template_used": "minimaliste",
+         "created_at": datetime(2025, 1, 15, 12, tzinfo=timezone.utc)},
+    ]
+
+    written = await service.backfill_usage_rollups(db, batch_size=1)
+
+    assert written == 2
+    operations = {
+        op._filter["owner"]: op._doc["$set"]
+        for op in db[service.USAGE_DAILY_ROLLUPS_COLLECTION].bulk_operations
+    }
+    assert operations["prof@ecole.fr"]["documents"] == 2
+    assert operations["prof@ecole.fr"]["exports"] == 1
+    assert operations["prof@ecole.fr"]["subjects"] == {"Mathématiques": 2}
+    assert operations["prof@ecole.fr"]["templates"] == {"minimaliste": 1}
+    assert operations["guest_abc"]["subjects"] == {"Français": 1}
@@ -488,7 +488,8 @@ function MainApp() {
   const fetchDocuments = async () => {
     if (!guestId) return;
     try {
-      const response = await axios.get(`${API}/documents?guest_id=${guestId}`);
+      // Résumés uniquement (le document complet est chargé à l'ouverture)
+      const response = await axios.get(`${API}/documents?guest_id=${guestId}&limit=6`);
       setDocuments(response.data.documents);
     } catch (error) {
       console.error("Erreur lors du chargement des documents:", error);
@@ -766,12 +767,19 @@ function MainApp() {
     }
   };
 
-  const openRecentDocument = (doc) => {
-    console.log('📂 Opening recent document:', doc);
-    // Set the document as current
-    setCurrentDocument(doc);
-    // Flag it for the wizard to pre-fill and jump to step 3
-    setOpenedDocument(doc);
+  const openRecentDocument = async (summary) => {
+    console.log('📂 Opening recent document:', summary);
+    try {
+      // The list only carries summaries: load the full document (exercises, schemas)
+      const response = await axios.get(`${API}/documents/${summary.id}?guest_id=${guestId}`);
+      const doc = response.data.document;
+      // Set the document as current
+      setCurrentDocument(doc);
+      // Flag it for the wizard to pre-fill and jump to step 3
+      setOpenedDocument(doc);
+    } catch (error) {
+      console.error("Erreur lors de l'ouverture du document:", error);
+    }
   };
 
   const handleDocumentOpened = () => {